@@ -72,3 +72,18 @@ class MenuResolutionResponse(BaseModel):
     def get_ambiguous_items(self) -> List[ResolvedItem]:
         """Get items that are ambiguous and need clarification"""
         return [item for item in self.resolved_items if item.is_ambiguous]
+
+
+class DisambiguationChoice(BaseModel):
+    """
+    LLM choice for one ambiguous item in a batched disambiguation call
+    """
+    request_number: int = Field(description="Number of the item request this choice answers (1-based)")
+    choice: str = Field(description="Exact menu item name chosen, or CLARIFICATION_NEEDED")
+
+
+class BatchDisambiguationResponse(BaseModel):
+    """
+    Response from a batched disambiguation call (one choice per ambiguous item)
+    """
+    choices: List[DisambiguationChoice] = Field(description="One choice per item request")
@@ -7,10 +7,9 @@ Used when commands need clarification, error handling, or dynamic responses.
 
 import logging
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
 from app.agents.agent_response import ClarificationResponse, ClarificationContext
 from app.agents.prompts.clarification_prompts import get_clarification_prompt
-from app.core.config import settings
+from app.core.llm_registry import llm_registry
 
 logger = logging.getLogger(__name__)
 
@@ -67,12 +66,8 @@ async def clarification_agent_service(
         # Get formatted prompt
         prompt = get_clarification_prompt(batch_result, clarification_context)
         
-        # Set up LangChain with structured output
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0.1
-        ).with_structured_output(ClarificationResponse, method="function_calling")
+        # Shared LLM with structured output
+        llm = llm_registry.get_llm("gpt-4o", temperature=0.1, schema=ClarificationResponse)
         
         # Execute with structured output
         result = await llm.ainvoke(prompt)
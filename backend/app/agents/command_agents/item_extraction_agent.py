@@ -7,9 +7,8 @@ from user input without doing any menu resolution. Pure LLM processing with stru
 
 import logging
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from app.core.config import settings
+from app.core.llm_registry import llm_registry
 from app.agents.agent_response.item_extraction_response import ItemExtractionResponse, ExtractedItem
 from app.agents.prompts.item_extraction_prompts import build_item_extraction_prompt
 
@@ -31,12 +30,8 @@ async def item_extraction_agent(user_input: str, context: Dict[str, Any]) -> Ite
         ItemExtractionResponse with extracted items and metadata
     """
     try:
-        # Set up LLM with structured output
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0.1
-        ).with_structured_output(ItemExtractionResponse, method="function_calling")
+        # Shared LLM with structured output
+        llm = llm_registry.get_llm("gpt-4o", temperature=0.1, schema=ItemExtractionResponse)
         
         # Get context data
         conversation_history = context.get("conversation_history", [])
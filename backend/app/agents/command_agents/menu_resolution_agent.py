@@ -5,12 +5,15 @@ Second agent in the pipeline that resolves extracted items against the menu data
 Uses direct service calls + LLM for intelligent matching and disambiguation.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, Tuple
 from app.core.config import settings
-from app.agents.agent_response.menu_resolution_response import MenuResolutionResponse, ResolvedItem
+from app.core.llm_registry import llm_registry
+from app.agents.agent_response.menu_resolution_response import MenuResolutionResponse, ResolvedItem, BatchDisambiguationResponse
+from app.agents.prompts.menu_resolution_prompts import build_batch_disambiguation_prompt
 from app.agents.agent_response.item_extraction_response import ItemExtractionResponse
+from app.services.menu_search_index import is_confident_match
 
 logger = logging.getLogger(__name__)
 
@@ -64,23 +67,37 @@ async def menu_resolution_agent(extraction_response: ItemExtractionResponse, con
                 clarification_questions=["There was an error accessing the menu. Please try again later."]
             )
         
-        # Set up LLM for disambiguation only
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0.1
-        )
-        
         resolved_items = []
         needs_clarification = False
         clarification_questions = []
+        extracted_items = extraction_response.extracted_items
+        semaphore = asyncio.Semaphore(settings.MENU_RESOLUTION_MAX_CONCURRENCY)
+        
+        async def search(extracted_item):
+            async with semaphore:
+                return await menu_service.search_menu_items_scored(restaurant_id, extracted_item.item_name)
+        
+        # Direct menu search for every item at once (fast pre-filtering, results in original order)
+        scored_matches = await asyncio.gather(*(search(item) for item in extracted_items))
+        all_matches = [[item for item, _, _ in scored] for scored in scored_matches]
+        # A lone fuzzy-only hit may be a different item entirely, so it isn't auto-resolved
+        single_match_confident = {
+            index: is_confident_match(score, exact)
+            for index, scored in enumerate(scored_matches) if len(scored) == 1
+            for _, score, exact in scored
+        }
+        
+        # Disambiguate all items with multiple matches together
+        ambiguous_indexes = [index for index, matches in enumerate(all_matches) if len(matches) > 1]
+        choices = await _disambiguate_items(
+            [(extracted_items[index].item_name, all_matches[index]) for index in ambiguous_indexes],
+            semaphore
+        )
+        best_matches = dict(zip(ambiguous_indexes, choices))
         
         # Process each extracted item
-        for extracted_item in extraction_response.extracted_items:
+        for index, (extracted_item, matches) in enumerate(zip(extracted_items, all_matches)):
             print(f"🔍 Processing: {extracted_item.item_name}")
-            
-            # Direct database search (fast pre-filtering)
-            matches = await menu_service.search_menu_items(restaurant_id, extracted_item.item_name)
             print(f"   Database found: {[item.name for item in matches]}")
             
             if len(matches) == 0:
@@ -100,6 +117,26 @@ async def menu_resolution_agent(extraction_response: ItemExtractionResponse, con
                     clarification_question=f"Sorry, we don't have {extracted_item.item_name} on our menu"
                 ))
                 
+            elif len(matches) == 1 and not single_match_confident[index]:
+                # Single fuzzy-only match ("wings" -> "Onion Rings") - confirm before adding
+                menu_item = matches[0]
+                print(f"   ❓ Weak single match - confirming: {menu_item.name}")
+                needs_clarification = True
+                clarification_questions.append(f"Did you mean: {menu_item.name}?")
+                resolved_items.append(ResolvedItem(
+                    item_name=extracted_item.item_name,
+                    quantity=extracted_item.quantity,
+                    size=extracted_item.size,
+                    modifiers=extracted_item.modifiers,
+                    special_instructions=extracted_item.special_instructions,
+                    menu_item_id=0,
+                    resolved_name=None,
+                    confidence=0.5,
+                    is_ambiguous=True,
+                    suggested_options=[menu_item.name],
+                    clarification_question=f"Did you mean: {menu_item.name}?"
+                ))
+                
             elif len(matches) == 1:
                 # Single match - success!
                 menu_item = matches[0]  # We now have the full object
@@ -122,8 +159,8 @@ async def menu_resolution_agent(extraction_response: ItemExtractionResponse, con
                 # Multiple matches - use LLM for disambiguation
                 print(f"   🤔 Multiple matches found: {[item.name for item in matches]}")
                 
-                # Use helper function for LLM disambiguation
-                best_match = await _disambiguate_with_llm(matches, extracted_item.item_name)
+                # Chosen by the (batched or concurrent) LLM disambiguation above
+                best_match = best_matches[index]
                 
                 if best_match == "CLARIFICATION_NEEDED":
                     # LLM determined clarification is needed
@@ -212,6 +249,59 @@ async def menu_resolution_agent(extraction_response: ItemExtractionResponse, con
         )
 
 
+async def _disambiguate_items(requests: List[Tuple[str, List[Any]]], semaphore: asyncio.Semaphore) -> List[str]:
+    """
+    Disambiguate several items, in one batched LLM call or concurrent per-item calls.
+    
+    Args:
+        requests: List of (user_request, matches) tuples
+        semaphore: Concurrency limit for per-item calls
+        
+    Returns:
+        Selected item name or "CLARIFICATION_NEEDED" per request, in request order
+    """
+    if not requests:
+        return []
+    
+    if settings.MENU_RESOLUTION_BATCH_DISAMBIGUATION and len(requests) > 1:
+        return await _disambiguate_batch_with_llm(requests)
+    
+    async def disambiguate(user_request, matches):
+        async with semaphore:
+            return await _disambiguate_with_llm(matches, user_request)
+    
+    return list(await asyncio.gather(*(disambiguate(user_request, matches) for user_request, matches in requests)))
+
+
+async def _disambiguate_batch_with_llm(requests: List[Tuple[str, List[Any]]]) -> List[str]:
+    """
+    Use one LLM call to disambiguate every ambiguous item in the turn.
+    
+    Args:
+        requests: List of (user_request, matches) tuples
+        
+    Returns:
+        Selected item name or "CLARIFICATION_NEEDED" per request, in request order
+    """
+    from app.commands.command_type_schema import CommandType
+    clarification_needed = CommandType.CLARIFICATION_NEEDED.value
+    
+    try:
+        prompt = build_batch_disambiguation_prompt(requests, clarification_needed)
+        llm = llm_registry.get_llm("gpt-4o", temperature=0.1, schema=BatchDisambiguationResponse)
+        
+        response = await llm.ainvoke(prompt)
+        choices = {choice.request_number: choice.choice.strip().strip('"').strip("'") for choice in response.choices}
+        best_matches = [choices.get(i + 1, clarification_needed) for i in range(len(requests))]
+        print(f"   🧠 LLM chose (batched): {best_matches}")
+        
+        return best_matches
+        
+    except Exception as e:
+        print(f"   ❌ Batched LLM disambiguation failed: {e}")
+        return [clarification_needed] * len(requests)
+
+
 async def _disambiguate_with_llm(matches: List[Any], user_request: str) -> str:
     """
     Use LLM to disambiguate between multiple matches.
@@ -243,11 +333,7 @@ async def _disambiguate_with_llm(matches: List[Any], user_request: str) -> str:
         Just return the best match name or "{clarification_needed}", nothing else.
         """
         
-        llm = ChatOpenAI(
-            model=settings.OPENAI_MODEL,
-            temperature=0.1,
-            api_key=settings.OPENAI_API_KEY
-        )
+        llm = llm_registry.get_llm("gpt-4o", temperature=0.1)
         
         response = await llm.ainvoke(prompt)
         best_match = response.content.strip().strip('"').strip("'")
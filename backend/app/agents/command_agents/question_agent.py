@@ -4,7 +4,6 @@ Question Agent - Handles customer questions about the restaurant, menu, and orde
 
 import logging
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 from langchain.agents import create_openai_functions_agent, AgentExecutor
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -12,7 +11,7 @@ from app.agents.state import ConversationWorkflowState
 from app.agents.agent_response.question_response import QuestionResponse
 from app.agents.prompts.question_prompts import get_question_prompt
 from app.constants.audio_phrases import AudioPhraseType
-from app.core.config import settings
+from app.core.llm_registry import llm_registry
 from app.services.menu_service import MenuService
 from app.services.restaurant_service import RestaurantService
 
@@ -141,12 +140,8 @@ async def question_agent_node(state: ConversationWorkflowState, context: Dict[st
         # Create tools for the agent
         tools = create_question_tools(menu_service, restaurant_service, int(state.restaurant_id))
         
-        # Create LLM
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0.1
-        )
+        # Shared LLM (agent executor needs the raw chat model)
+        llm = llm_registry.get_chat_model("gpt-4o", temperature=0.1)
         
         # Create agent prompt
         prompt = ChatPromptTemplate.from_messages([
@@ -7,12 +7,11 @@ Uses LLM with structured output to extract target references and removal details
 
 import logging
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
 
 from app.agents.state import ConversationWorkflowState
 from app.agents.agent_response.remove_item_response import RemoveItemResponse
 from app.constants.audio_phrases import AudioPhraseType
-from app.core.config import settings
+from app.core.llm_registry import llm_registry
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +28,8 @@ async def remove_item_agent_node(user_input: str, current_order_items: list) ->
         RemoveItemResponse with parsed removal requests
     """
     try:
-        # Set up LLM with structured output
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0.1
-        ).with_structured_output(RemoveItemResponse, method="function_calling")
+        # Shared LLM with structured output
+        llm = llm_registry.get_llm("gpt-4o", temperature=0.1, schema=RemoveItemResponse)
         
         # Create structured prompt
         from app.agents.prompts.remove_item_prompts import get_remove_item_prompt
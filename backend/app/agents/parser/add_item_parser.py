@@ -49,7 +49,12 @@ class AddItemParser(BaseParser):
                 "order_state": context.get("order_state", {})
             }
             
-            extraction_response = await item_extraction_agent(user_input, extraction_context)
+            speculative_extraction = context.get("speculative_extraction")
+            if speculative_extraction is not None:
+                # Started on the raw transcript while the intent was being classified
+                extraction_response = await speculative_extraction
+            else:
+                extraction_response = await item_extraction_agent(user_input, extraction_context)
             
             if not extraction_response.success:
                 logger.warning("Item extraction failed")
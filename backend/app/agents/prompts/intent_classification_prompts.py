@@ -2,10 +2,55 @@
 Simple intent classification prompts
 """
 
-from typing import Dict, Any
+import json
+from typing import Dict, Any, List, Tuple
 from langchain_core.prompts import PromptTemplate
 
 
+# (utterance, intent, confidence) - shown to the LLM and used to train the local fast-path classifier
+INTENT_EXAMPLES: List[Tuple[str, str, float]] = [
+    ("I'd like a Big Mac and fries", "ADD_ITEM", 0.95),
+    ("Remove my fries", "REMOVE_ITEM", 0.9),
+    ("That's all", "CONFIRM_ORDER", 0.95),
+    ("How much is a burger?", "QUESTION", 0.9),
+    ("Thank you", "SMALL_TALK", 0.95),
+    ("Can you repeat that?", "REPEAT", 0.85),
+]
+
+# (utterance, intent, guidance suffix)
+EDGE_CASE_EXAMPLES: List[Tuple[str, str, str]] = [
+    ("Cancel my fries", "REMOVE_ITEM", " (not CLEAR_ORDER)"),
+    ("Clear the order", "CLEAR_ORDER", ""),
+    ("I'll have what she's having", "REPEAT", ""),
+    ("Is the shake large?", "QUESTION", " (not MODIFY_ITEM)"),
+    ("Make it two", "SET_QUANTITY", " for that item"),
+    ("No pickles", "MODIFY_ITEM", " for that item"),
+]
+
+# Context shown before the arrow for edge cases that depend on a prior reference
+_EDGE_CASE_CONTEXT = {
+    "Make it two": " following a referenced item",
+    "No pickles": " after a burger reference",
+}
+
+
+def _format_examples() -> str:
+    """Render INTENT_EXAMPLES as prompt lines"""
+    lines = []
+    for utterance, intent, confidence in INTENT_EXAMPLES:
+        payload = json.dumps({"intent": intent, "confidence": confidence, "cleansed_input": utterance}, ensure_ascii=False)
+        lines.append(f'"{utterance}" → {payload}')
+    return "\n".join(lines)
+
+
+def _format_edge_cases() -> str:
+    """Render EDGE_CASE_EXAMPLES as prompt lines"""
+    return "\n".join(
+        f'- "{utterance}"{_EDGE_CASE_CONTEXT.get(utterance, "")} → {intent}{suffix}'
+        for utterance, intent, suffix in EDGE_CASE_EXAMPLES
+    )
+
+
 def get_intent_classification_prompt(user_input: str, context: Dict[str, Any]) -> str:
     """
     Build the prompt for LLM intent classification using PromptTemplate
@@ -48,20 +93,10 @@ INTENT TYPES:
 - UNKNOWN: Unclear or ambiguous intent
 
 EXAMPLES:
-"I'd like a Big Mac and fries" → {{"intent": "ADD_ITEM", "confidence": 0.95, "cleansed_input": "I'd like a Big Mac and fries"}}
-"Remove my fries" → {{"intent": "REMOVE_ITEM", "confidence": 0.9, "cleansed_input": "Remove my fries"}}
-"That's all" → {{"intent": "CONFIRM_ORDER", "confidence": 0.95, "cleansed_input": "That's all"}}
-"How much is a burger?" → {{"intent": "QUESTION", "confidence": 0.9, "cleansed_input": "How much is a burger?"}}
-"Thank you" → {{"intent": "SMALL_TALK", "confidence": 0.95, "cleansed_input": "Thank you"}}
-"Can you repeat that?" → {{"intent": "REPEAT", "confidence": 0.85, "cleansed_input": "Can you repeat that?"}}
+{examples}
 
 EDGE CASE GUIDANCE:
-- "Cancel my fries" → REMOVE_ITEM (not CLEAR_ORDER)
-- "Clear the order" → CLEAR_ORDER
-- "I'll have what she's having" → REPEAT
-- "Is the shake large?" → QUESTION (not MODIFY_ITEM)
-- "Make it two" following a referenced item → SET_QUANTITY for that item
-- "No pickles" after a burger reference → MODIFY_ITEM for that item
+{edge_cases}
 
 NOISE FILTERING:
 Ignore non-food-related speech and focus only on ordering intent.
@@ -91,7 +126,7 @@ Return ONLY the JSON response. Do not include any other text.
     # Create PromptTemplate with input variables
     prompt_template = PromptTemplate(
         template=template,
-        input_variables=["user_input", "order_items", "conversation_state", "conversation_history"]
+        input_variables=["user_input", "order_items", "conversation_state", "conversation_history", "examples", "edge_cases"]
     )
     
     # Format the template with actual values
@@ -99,5 +134,7 @@ Return ONLY the JSON response. Do not include any other text.
         user_input=user_input,
         order_items=context.get('order_items', []),
         conversation_state=context.get('conversation_state', 'Ordering'),
-        conversation_history=context.get('conversation_history', [])
+        conversation_history=context.get('conversation_history', []),
+        examples=_format_examples(),
+        edge_cases=_format_edge_cases()
     )
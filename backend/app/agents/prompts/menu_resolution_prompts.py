@@ -95,3 +95,38 @@ Return ONLY the JSON response, no additional text.
 """
     
     return prompt
+
+
+def build_batch_disambiguation_prompt(requests, clarification_needed: str) -> str:
+    """
+    Build the prompt for disambiguating several items in one LLM call.
+    
+    Args:
+        requests: List of (user_request, matches) tuples, matches being MenuItem objects
+        clarification_needed: Value to return when there is no clear choice
+        
+    Returns:
+        Formatted prompt string
+    """
+    requests_text = ""
+    for i, (user_request, matches) in enumerate(requests):
+        requests_text += f'{i+1}. User requested: "{user_request}"\n'
+        requests_text += f"   Found these menu items: {[item.name for item in matches]}\n"
+    
+    prompt = f"""
+        The customer asked for several items. For each request, pick the menu item they meant.
+        
+        {requests_text}
+        For each request, consider:
+        - Fuzzy matching and context
+        - Most common/popular choice
+        - Return the exact menu item name from that request's list
+        
+        IMPORTANT: Only choose a specific item if there's a clear, obvious choice.
+        If the matches are equally valid (like "French Fries" vs "Large French Fries"), 
+        return "{clarification_needed}" for that request instead of guessing.
+        
+        Return exactly one choice per request, using the request number.
+        """
+    
+    return prompt
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
 from fastapi.responses import HTMLResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import Provide, inject
 from typing import Annotated
@@ -15,10 +16,23 @@ from app.services.excel_import_service import ExcelImportService
 from app.services.restaurant_import_service import RestaurantImportService
 from app.services.file_storage_service import S3FileStorageService
 from app.services.voice_service import VoiceService
+from app.services.public_menu_cache import public_menu_cache
 from app.core.config import settings
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+async def _menu_item_names(db: AsyncSession, restaurant_ids: list[int]) -> dict[int, list[str]]:
+    """Menu item names per restaurant (rendered as response audio fragments)"""
+    from app.models.menu_item import MenuItem
+    
+    names: dict[int, list[str]] = {restaurant_id: [] for restaurant_id in restaurant_ids}
+    rows = await db.execute(
+        select(MenuItem.restaurant_id, MenuItem.name).where(MenuItem.restaurant_id.in_(restaurant_ids))
+    )
+    for restaurant_id, name in rows.all():
+        names[restaurant_id].append(name)
+    return names
+
 @router.post("/import")
 @inject
 async def admin_import(
@@ -26,6 +40,7 @@ async def admin_import(
     images: list[UploadFile] = File(None),
     overwrite: bool = Form(False),
     generate_audio: bool = Form(True),
+    audio_in_background: bool = Form(False),
     excel_import_service: ExcelImportService = Depends(Provide[Container.excel_import_service]),
     restaurant_import_service: RestaurantImportService = Depends(Provide[Container.restaurant_import_service]),
     file_storage_service: S3FileStorageService = Depends(Provide[Container.file_storage_service]),
@@ -62,6 +77,9 @@ async def admin_import(
                     detail=f"Import failed: {result.message}"
                 )
         
+        # Lane screens pick up the imported menu on their next load
+        public_menu_cache.invalidate(result.data.get('restaurant_id'))
+        
         # Upload images if provided
         if images:
             await file_storage_service.upload_images(
@@ -70,21 +88,98 @@ async def admin_import(
             )
         
         # Generate audio if requested
+        audio_job_id = None
         if generate_audio:
-            await voice_service.generate_all_canned_phrases(
-                restaurant_id=result.data.get('restaurant_id'),
-                restaurant_name=result.data.get('restaurant_name')
-            )
+            restaurant_id = result.data.get('restaurant_id')
+            menu_item_names = (await _menu_item_names(db, [restaurant_id])).get(restaurant_id, [])
+            if audio_in_background:
+                audio_job_id = voice_service.canned_audio.start_job(
+                    [(restaurant_id, result.data.get('restaurant_name'), menu_item_names)]
+                )
+            else:
+                await voice_service.generate_all_canned_phrases(
+                    restaurant_id=restaurant_id,
+                    restaurant_name=result.data.get('restaurant_name'),
+                    menu_item_names=menu_item_names
+                )
         
         return {
             "message": "Import completed successfully",
             "data": result.data,
             "restaurant_id": result.data.get('restaurant_id'),
-            "restaurant_name": result.data.get('restaurant_name')
+            "restaurant_name": result.data.get('restaurant_name'),
+            "audio_job_id": audio_job_id
         }
         
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Import failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/canned-audio/refresh")
+@inject
+async def refresh_canned_audio(
+    restaurant_id: int = None,
+    voice_service: VoiceService = Depends(Provide[Container.voice_service])
+):
+    """Reload canned phrase URLs from storage (after audio is replaced outside the import flow)"""
+    if restaurant_id is not None:
+        voice_service.canned_phrases.invalidate(restaurant_id)
+        phrases = await voice_service.canned_phrases.load(restaurant_id)
+        return {"message": "Canned audio refreshed", "restaurant_id": restaurant_id, "phrases": len(phrases)}
+    
+    voice_service.canned_phrases.invalidate()
+    return {"message": "Canned audio tables cleared; restaurants reload on next use"}
+
+@router.get("/audio-archive")
+@inject
+async def audio_archive_status(
+    voice_service: VoiceService = Depends(Provide[Container.voice_service])
+):
+    """Backlog and counters of the customer recording archive queue"""
+    return voice_service.audio_archive.get_stats()
+
+@router.post("/canned-audio/jobs", status_code=status.HTTP_202_ACCEPTED)
+@inject
+async def start_canned_audio_job(
+    restaurant_ids: list[int] = Query(None),
+    voice_service: VoiceService = Depends(Provide[Container.voice_service]),
+    db: AsyncSession = Depends(get_db)
+):
+    """Generate missing canned audio and menu item fragments for the given restaurants (all active ones if none given) in the background"""
+    from app.models.restaurant import Restaurant
+    
+    query = select(Restaurant.id, Restaurant.name)
+    query = query.where(Restaurant.id.in_(restaurant_ids)) if restaurant_ids else query.where(Restaurant.is_active.is_(True))
+    rows = (await db.execute(query)).all()
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No matching restaurants")
+    menu_item_names = await _menu_item_names(db, [row.id for row in rows])
+    restaurants = [(row.id, row.name, menu_item_names[row.id]) for row in rows]
+    
+    job_id = voice_service.canned_audio.start_job(restaurants)
+    return {"message": "Canned audio job started", "job_id": job_id, "restaurants": len(restaurants)}
+
+@router.get("/canned-audio/jobs/{job_id}")
+@inject
+async def get_canned_audio_job(
+    job_id: str,
+    voice_service: VoiceService = Depends(Provide[Container.voice_service])
+):
+    """Progress of a canned audio job"""
+    job = await voice_service.canned_audio.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+@router.post("/canned-audio/jobs/{job_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+@inject
+async def resume_canned_audio_job(
+    job_id: str,
+    voice_service: VoiceService = Depends(Provide[Container.voice_service])
+):
+    """Resume a canned audio job interrupted by a restart; finished restaurants and phrases are skipped"""
+    if not await voice_service.canned_audio.resume_job(job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No unfinished job with that ID")
+    return {"message": "Canned audio job resumed", "job_id": job_id}
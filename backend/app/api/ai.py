@@ -2,22 +2,80 @@
 AI API endpoints for processing user interactions
 """
 
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+import json
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import RedirectResponse, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import Provide, inject
 
 from ..core.database import get_db
 from ..core.config import settings
 from ..core.container import Container
-from ..services.audio_pipeline_service import AudioPipelineService
+from ..services.audio_pipeline_service import AudioPipelineService, STREAM_PCM_FORMAT
+from ..services.voice_service import VoiceService
 from ..models.language import Language
 from ..agents.state import ConversationWorkflowState
 
+
+class TTSStreamRequest(BaseModel):
+    text: str
+    voice: Optional[str] = None
+    language: Optional[str] = None
+    restaurant_id: Optional[int] = None
+
 router = APIRouter(prefix="/api/ai", tags=["AI"])
 
 # JWT authentication removed for demo
 
+ALLOWED_AUDIO_TYPES = ["audio/webm", "audio/mp3", "audio/wav", "audio/mpeg", "audio/mp4", "audio/m4a"]
+VALID_LANGUAGES = ["en", "es"]
+
+
+def _raise_for_workflow_errors(workflow_state: dict) -> None:
+    """Map a failed pipeline turn to the HTTP status the frontend expects"""
+    if workflow_state.get('errors') or not workflow_state.get('success', True):
+        # Check error type and return appropriate HTTP status code
+        errors = workflow_state.get('errors', [])
+        error_message = '; '.join(errors) if errors else 'Processing failed'
+        error_lower = error_message.lower()
+        
+        if any(keyword in error_lower for keyword in ['restaurant', 'session']) and 'not found' in error_lower:
+            # Resource not found (404)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=error_message
+            )
+        elif any(keyword in error_lower for keyword in ['invalid', 'inactive']):
+            # Bad request format (400)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_message
+            )
+        else:
+            # Internal server error (500)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Processing failed: {error_message}"
+            )
+
+
+def _pipeline_response(workflow_state: dict) -> dict:
+    """Simplified response for the frontend"""
+    return {
+        "success": True,
+        "session_id": workflow_state.get('session_id'),
+        "audio_url": workflow_state.get('audio_url'),
+        "response_text": workflow_state.get('response_text'),
+        "order_state_changed": workflow_state.get('order_state_changed', False),  # Tell frontend if order was modified
+        "metadata": {
+            "processing_time": 0.0,  # TODO: Add actual timing
+            "cached": False,  # TODO: Add caching logic
+            "errors": workflow_state.get('errors') if workflow_state.get('errors') else None
+        }
+    }
+
 
 @router.post("/process-audio")
 @inject
@@ -53,7 +111,7 @@ async def process_audio(
         )
     
     # Check file type
-    allowed_types = ["audio/webm", "audio/mp3", "audio/wav", "audio/mpeg", "audio/mp4", "audio/m4a"]
+    allowed_types = ALLOWED_AUDIO_TYPES
     if audio_file.content_type not in allowed_types:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -69,7 +127,7 @@ async def process_audio(
         )
     
     # Validate language code
-    valid_languages = ["en", "es"]
+    valid_languages = VALID_LANGUAGES
     if language not in valid_languages:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -86,45 +144,8 @@ async def process_audio(
             db=db
         )
         
-        # Check if workflow processing had errors
-        if workflow_state.get('errors') or not workflow_state.get('success', True):
-            # Check error type and return appropriate HTTP status code
-            errors = workflow_state.get('errors', [])
-            error_message = '; '.join(errors) if errors else 'Processing failed'
-            error_lower = error_message.lower()
-            
-            if any(keyword in error_lower for keyword in ['restaurant', 'session']) and 'not found' in error_lower:
-                # Resource not found (404)
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=error_message
-                )
-            elif any(keyword in error_lower for keyword in ['invalid', 'inactive']):
-                # Bad request format (400)
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=error_message
-                )
-            else:
-                # Internal server error (500)
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Processing failed: {error_message}"
-                )
-        
-        # Return simplified response to frontend
-        return {
-            "success": True,
-            "session_id": workflow_state.get('session_id'),
-            "audio_url": workflow_state.get('audio_url'),
-            "response_text": workflow_state.get('response_text'),
-            "order_state_changed": workflow_state.get('order_state_changed', False),  # Tell frontend if order was modified
-            "metadata": {
-                "processing_time": 0.0,  # TODO: Add actual timing
-                "cached": False,  # TODO: Add caching logic
-                "errors": workflow_state.get('errors') if workflow_state.get('errors') else None
-            }
-        }
+        _raise_for_workflow_errors(workflow_state)
+        return _pipeline_response(workflow_state)
         
     except HTTPException:
         raise
@@ -137,6 +158,172 @@ async def process_audio(
 
 
 
+@router.websocket("/process-audio/stream")
+@inject
+async def process_audio_stream(
+    websocket: WebSocket,
+    session_id: str,
+    restaurant_id: int,
+    language: str = "en",
+    audio_format: str = Query(STREAM_PCM_FORMAT, alias="format"),
+    sample_rate: int = Query(settings.STREAM_DEFAULT_SAMPLE_RATE),
+    audio_pipeline_service: AudioPipelineService = Depends(Provide[Container.audio_pipeline_service]),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Process audio while the customer is still speaking
+
+    The client sends the recording as binary messages while it is captured,
+    then {"type": "end"} at end of speech. 16-bit mono PCM ("pcm16") is
+    segmented at pauses and each segment is transcribed immediately; other
+    formats (webm, wav, mp3, mpeg, mp4, m4a) are buffered and transcribed whole.
+
+    Server messages:
+        {"type": "ready"} once the turn is set up
+        {"type": "partial_transcript", "segment": n, "text": ...} per transcribed segment
+        {"type": "result", ...} with the same body as /process-audio, or
+        {"type": "error", "status": ..., "detail": ...}
+
+    Args:
+        websocket: WebSocket connection
+        session_id: Session ID (frontend gets this from /current endpoint)
+        restaurant_id: Restaurant ID for context
+        language: Language code (en, es) - defaults to English
+        audio_format: "pcm16" or a container format
+        sample_rate: PCM sample rate
+        audio_pipeline_service: Audio pipeline service
+        db: Database session
+    """
+    await websocket.accept()
+
+    allowed_formats = [STREAM_PCM_FORMAT] + [content_type.split('/')[-1] for content_type in ALLOWED_AUDIO_TYPES]
+    if audio_format not in allowed_formats:
+        error = f"Invalid audio format: {audio_format}. Allowed formats: {', '.join(allowed_formats)}"
+    elif language not in VALID_LANGUAGES:
+        error = f"Invalid language '{language}'. Must be one of: {VALID_LANGUAGES}"
+    elif not 8000 <= sample_rate <= 48000:
+        error = f"Invalid sample rate {sample_rate}. Must be between 8000 and 48000"
+    else:
+        error = None
+    if error:
+        await websocket.send_json({"type": "error", "status": status.HTTP_400_BAD_REQUEST, "detail": error})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    async def send_partial_transcript(segment: int, text: str):
+        await websocket.send_json({"type": "partial_transcript", "segment": segment, "text": text})
+
+    stream = audio_pipeline_service.open_audio_stream(
+        session_id=session_id,
+        restaurant_id=restaurant_id,
+        language=language,
+        db=db,
+        audio_format=audio_format,
+        sample_rate=sample_rate,
+        on_transcript=send_partial_transcript
+    )
+    try:
+        await websocket.send_json({"type": "ready"})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                await stream.abort()
+                return
+            if message.get("bytes") is not None:
+                try:
+                    stream.feed(message["bytes"])
+                except ValueError as e:
+                    await stream.abort()
+                    await websocket.send_json({"type": "error", "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "detail": str(e)})
+                    await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG)
+                    return
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = {}
+                if isinstance(control, dict) and control.get("type") == "end":
+                    break
+
+        workflow_state = await stream.finish()
+        try:
+            _raise_for_workflow_errors(workflow_state)
+            await websocket.send_json({"type": "result", **_pipeline_response(workflow_state)})
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+        await websocket.close()
+    except WebSocketDisconnect:
+        await stream.abort()
+
+
+def _audio_stream_response(voice_service: VoiceService, request: dict) -> StreamingResponse:
+    """Stream synthesized MP3 bytes to the client as the provider produces them"""
+    return StreamingResponse(
+        voice_service.stream_voice(**request),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/tts/stream/{stream_id}")
+@inject
+async def stream_registered_tts(
+    stream_id: str,
+    voice_service: VoiceService = Depends(Provide[Container.voice_service])
+):
+    """
+    Play a response registered by the pipeline when TTS_STREAMING_ENABLED is on
+    
+    Args:
+        stream_id: ID from the stream URL returned as audio_url
+        voice_service: Voice service
+        
+    Returns:
+        Streaming MP3 response, or a redirect once the audio is cached
+    """
+    request = await voice_service.get_voice_stream_request(stream_id)
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio stream not found or expired"
+        )
+    
+    # Replays (or a stream someone else already finished) come from the cache
+    cached_url = await voice_service.get_cached_voice_url(**request)
+    if cached_url:
+        return RedirectResponse(cached_url)
+    return _audio_stream_response(voice_service, request)
+
+
+@router.post("/tts/stream")
+@inject
+async def stream_tts(
+    tts_request: TTSStreamRequest,
+    voice_service: VoiceService = Depends(Provide[Container.voice_service])
+):
+    """
+    Synthesize text and stream the audio back as it is generated
+    
+    Args:
+        tts_request: Text plus optional voice, language and restaurant
+        voice_service: Voice service
+        
+    Returns:
+        Streaming MP3 response, or a redirect if the audio is already cached
+    """
+    if not tts_request.text.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Text cannot be empty"
+        )
+    
+    request = tts_request.model_dump()
+    cached_url = await voice_service.get_cached_voice_url(**request)
+    if cached_url:
+        return RedirectResponse(cached_url, status_code=status.HTTP_303_SEE_OTHER)
+    return _audio_stream_response(voice_service, request)
+
+
 @router.get("/health")
 async def ai_health_check():
     """
@@ -2,13 +2,13 @@
 Restaurant management API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Request, Response
 from fastapi.responses import FileResponse
 import os
 from pathlib import Path
 
-from ..core.database import get_db
-from ..repository import RestaurantRepository, CategoryRepository, MenuItemRepository
+from ..core.config import settings
+from ..services.public_menu_cache import public_menu_cache, etag_matches, accepts_gzip
 
 router = APIRouter(prefix="/api/restaurants", tags=["Restaurants"])
 
@@ -35,104 +35,47 @@ async def restaurant_api_health_check():
 
 
 @router.get("/{restaurant_id}/menu")
-async def get_restaurant_menu(restaurant_id: int, db = Depends(get_db)):
+async def get_restaurant_menu(restaurant_id: int, request: Request):
     """
     Get public menu for a restaurant (no authentication required)
     
+    Served from the public menu cache: one query per menu rebuild, a gzipped body
+    for clients that accept it, and 304 Not Modified when If-None-Match is current.
+    
     Args:
         restaurant_id: Restaurant ID
         
     Returns:
-        dict: Restaurant menu with categories and items
+        Response: Restaurant menu with categories and items (JSON)
     """
     try:
-        
-        # Get restaurant info
-        restaurant_repo = RestaurantRepository(db)
-        restaurant = await restaurant_repo.get_by_id(restaurant_id)
-        
-        if not restaurant:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Restaurant not found"
-            )
-        
-        # Get categories
-        category_repo = CategoryRepository(db)
-        categories = await category_repo.get_active_by_restaurant(restaurant_id)
-        
-        # Get menu items for each category
-        menu_item_repo = MenuItemRepository(db)
-        menu_data = []
-        
-        for category in categories:
-            menu_items = await menu_item_repo.get_available_by_category(category.id)
-            
-            # Build category data
-            category_items = []
-            for item in menu_items:
-                # Get tags for this menu item (simplified - no relationships)
-                tags = []
-                try:
-                    # Query tags directly instead of using relationships
-                    from sqlalchemy import select
-                    from ..models.menu_item_tag import MenuItemTag
-                    from ..models.tag import Tag
-                    
-                    tag_result = await db.execute(
-                        select(Tag)
-                        .join(MenuItemTag, Tag.id == MenuItemTag.tag_id)
-                        .where(MenuItemTag.menu_item_id == item.id)
-                    )
-                    tag_records = tag_result.scalars().all()
-                    tags = [{"name": tag.name, "color": tag.color} for tag in tag_records]
-                except Exception:
-                    tags = []
-                
-                category_items.append({
-                    "id": item.id,
-                    "name": item.name,
-                    "price": float(item.price),
-                    "description": item.description,
-                    "image_url": item.image_url,
-                    "sort_order": item.display_order,
-                    "restaurant_id": item.restaurant_id,
-                    "tags": tags
-                })
-            
-            if category_items:
-                menu_data.append({
-                    "id": category.id,
-                    "name": category.name,
-                    "description": category.description,
-                    "sort_order": category.display_order,
-                    "items": category_items
-                })
-        
-        # Sort categories and items
-        menu_data.sort(key=lambda x: x["sort_order"])
-        for category in menu_data:
-            category["items"].sort(key=lambda x: x["sort_order"])
-        
-        return {
-            "restaurant": {
-                "id": restaurant.id,
-                "name": restaurant.name,
-                "primary_color": restaurant.primary_color,
-                "secondary_color": restaurant.secondary_color,
-                "logo_url": restaurant.logo_url
-            },
-            "menu": menu_data,
-            "total_items": sum(len(cat["items"]) for cat in menu_data)
-        }
-        
-    except HTTPException:
-        raise
+        menu = await public_menu_cache.get(restaurant_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve menu: {str(e)}"
         )
+    
+    if menu is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    
+    # Each encoding gets its own strong ETag; revalidation accepts either
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": menu.gzip_etag if use_gzip else menu.etag,
+        "Cache-Control": f"public, max-age={settings.PUBLIC_MENU_MAX_AGE_SECONDS}",
+        "Vary": "Accept-Encoding"
+    }
+    if etag_matches(request.headers.get("if-none-match"), menu.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=menu.gzipped, media_type="application/json", headers=headers)
+    return Response(content=menu.body, media_type="application/json", headers=headers)
 
     """
     Get Excel template structure for restaurant import
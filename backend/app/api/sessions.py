@@ -17,6 +17,7 @@ logger = logging.getLogger(__name__)
 
 class NewCarRequest(BaseModel):
     restaurant_id: int
+    lane_id: Optional[str] = None
 
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
 
@@ -46,7 +47,8 @@ async def new_car(
         order_result = await order_service.handle_new_car(
             db=db,
             restaurant_id=request_data.restaurant_id,
-            customer_name=None
+            customer_name=None,
+            lane_id=request_data.lane_id
         )
         
         if not order_result.is_success:
@@ -66,6 +68,7 @@ async def new_car(
             "data": {
                 "session_id": session_id,
                 "restaurant_id": request_data.restaurant_id,
+                "lane_id": order_result.data.get("lane_id"),
                 "greeting_audio_url": greeting_audio_url,
                 "session": session_data
             }
@@ -81,18 +84,24 @@ async def new_car(
 @router.post("/next-car")
 @inject
 async def next_car(
+    restaurant_id: Optional[int] = None,
+    lane_id: Optional[str] = None,
     order_session_service: OrderSessionService = Depends(Provide[Container.order_session_service])
 ):
     """
     Handle next car (NEXT_CAR event)
     
+    Args:
+        restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+        lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+    
     Returns:
         dict: Result of operation
     """
     try:
-        # Clear current session
-        await order_session_service.clear_current_session_id()
-        logger.info("Next car handled - cleared current session")
+        # Clear the lane's current session
+        await order_session_service.clear_current_session_id(restaurant_id, lane_id)
+        logger.info(f"Next car handled - cleared current session for lane {restaurant_id}/{lane_id}")
         
         return {
             "success": True,
@@ -109,17 +118,23 @@ async def next_car(
 @router.get("/current")
 @inject
 async def get_current_session(
+    restaurant_id: Optional[int] = None,
+    lane_id: Optional[str] = None,
     order_session_service: OrderSessionService = Depends(Provide[Container.order_session_service])
 ):
     """
-    Get current active session
+    Get the active session for a drive-thru lane
+    
+    Args:
+        restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+        lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
     
     Returns:
         dict: Current session data
     """
     try:
         # Get current session from OrderSessionService
-        current_session = await order_session_service.get_current_session()
+        current_session = await order_session_service.get_current_session(restaurant_id, lane_id)
         
         if not current_session:
             raise HTTPException(
@@ -155,18 +170,24 @@ async def get_current_session(
 @router.get("/current-order")
 @inject
 async def get_current_order(
+    restaurant_id: Optional[int] = None,
+    lane_id: Optional[str] = None,
     order_session_service: OrderSessionService = Depends(Provide[Container.order_session_service]),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get current order with items for frontend display
+    Get the current order at a drive-thru lane with items for frontend display
+    
+    Args:
+        restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+        lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
     
     Returns:
         dict: Current order data with items
     """
     try:
         # Get current session
-        current_session = await order_session_service.get_current_session()
+        current_session = await order_session_service.get_current_session(restaurant_id, lane_id)
         
         if not current_session:
             raise HTTPException(
@@ -226,6 +247,39 @@ async def get_current_order(
         )
 
 
+@router.get("/lanes")
+@inject
+async def get_active_lanes(
+    restaurant_id: int,
+    order_session_service: OrderSessionService = Depends(Provide[Container.order_session_service])
+):
+    """
+    List occupied drive-thru lanes for a restaurant
+    
+    Args:
+        restaurant_id: Restaurant ID
+        
+    Returns:
+        dict: lane_id -> session_id for every lane with a car
+    """
+    try:
+        lanes = await order_session_service.list_active_lanes(restaurant_id)
+        return {
+            "success": True,
+            "message": f"{len(lanes)} active lanes",
+            "data": {
+                "restaurant_id": restaurant_id,
+                "lanes": lanes
+            }
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list lanes: {str(e)}"
+        )
+
+
 @router.put("/{session_id}")
 @inject
 async def update_session(
@@ -60,6 +60,9 @@ class AddItemCommand(BaseCommand):
             OrderResult: Result of adding the item
         """
         try:
+            # Ingredients prefetched for the whole command batch, when the invoker loaded them
+            batch_data = {"ingredients": context.ingredient_snapshot} if context.ingredient_snapshot is not None else {}
+            
             # Add item to order using OrderService from context
             result = await context.order_service.add_item_to_order(
                 db=db,
@@ -70,7 +73,8 @@ class AddItemCommand(BaseCommand):
                 restaurant_id=context.restaurant_id,   # NEW: Pass restaurant_id
                 customizations=self.modifiers,  # Pass modifiers as customizations for now
                 special_instructions=self.special_instructions,
-                size=self.size  # Pass size to OrderService for message generation
+                size=self.size,  # Pass size to OrderService for message generation
+                **batch_data
             )
             
             return result
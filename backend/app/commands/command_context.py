@@ -38,6 +38,7 @@ class CommandContext:
     # Runtime data
     current_order: Optional[Dict[str, Any]] = None
     conversation_context: Optional[Dict[str, Any]] = None
+    ingredient_snapshot: Optional[Any] = None  # MenuIngredientSnapshot prefetched for the batch
     
     # Additional metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
@@ -2,12 +2,15 @@
 Command invoker for executing AI commands
 """
 
+import logging
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from .base_command import BaseCommand
 from .command_context import CommandContext
 from ..dto.order_result import OrderResult, CommandBatchResult, ErrorCode
 
+logger = logging.getLogger(__name__)
+
 
 class CommandInvoker:
     """
@@ -79,6 +82,9 @@ class CommandInvoker:
         results = []
         command_names = []
         
+        # Load ingredients for every item the batch adds up front, instead of per item and ingredient
+        await self._prefetch_ingredients(commands, context)
+        
         for index, command in enumerate(commands):
             try:
                 # Execute command with index context for better error reporting
@@ -126,6 +132,41 @@ class CommandInvoker:
             command_names=command_names
         )
     
+    async def _prefetch_ingredients(self, commands: List[BaseCommand], context: CommandContext) -> None:
+        """
+        Load one ingredient snapshot for every item the batch adds
+        
+        Every add reserves its ingredients, so plain adds need the snapshot too;
+        only customized adds contribute ingredient names to look up. Best effort:
+        if it can't be loaded, each command loads what it needs itself.
+        
+        Args:
+            commands: Commands about to be executed
+            context: Command context the snapshot is attached to
+        """
+        from .add_item_command import AddItemCommand
+        from ..core.unit_of_work import UnitOfWork
+        from ..services.menu_ingredient_snapshot import MenuIngredientSnapshot, customization_ingredient_names
+        
+        adds = [command for command in commands if isinstance(command, AddItemCommand)]
+        if not adds or context.db_session is None:
+            return
+        
+        added_names = [
+            name for command in adds if command.modifiers
+            for name in customization_ingredient_names(command.modifiers)[1]
+        ]
+        try:
+            context.ingredient_snapshot = await MenuIngredientSnapshot.load(
+                UnitOfWork(context.db_session),
+                list(dict.fromkeys(command.menu_item_id for command in adds)),
+                restaurant_id=int(context.restaurant_id),
+                ingredient_names=added_names
+            )
+        except Exception as e:
+            logger.warning(f"Ingredient prefetch failed, validating per command: {e}")
+            context.ingredient_snapshot = None
+    
     def get_command_history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get command execution history
@@ -25,6 +25,14 @@ class Settings:
     
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    # Idle pooled connections are PINGed before reuse after this long, instead of a PING per call
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL_SECONDS", "30"))
+    REDIS_RETRY_ATTEMPTS: int = int(os.getenv("REDIS_RETRY_ATTEMPTS", "3"))
+    
+    # Drive-thru lanes (used when a request doesn't name its restaurant/lane)
+    DEFAULT_RESTAURANT_ID: int = int(os.getenv("DEFAULT_RESTAURANT_ID", "1"))
+    DEFAULT_LANE_ID: str = os.getenv("DEFAULT_LANE_ID", "1")
+    LANE_SESSION_TTL_SECONDS: int = int(os.getenv("LANE_SESSION_TTL_SECONDS", "900"))
     
     # App
     APP_NAME: str = "AI DriveThru API"
@@ -43,17 +51,116 @@ class Settings:
     MAX_QUANTITY_PER_ITEM: int = int(os.getenv("MAX_QUANTITY_PER_ITEM", "10"))
     MAX_ORDER_TOTAL: float = float(os.getenv("MAX_ORDER_TOTAL", "200.00"))
     MAX_ITEMS_PER_ORDER: int = int(os.getenv("MAX_ITEMS_PER_ORDER", "50"))
+    # Retries when an item edit loses an optimistic version check to a concurrent change
+    ORDER_MUTATION_MAX_RETRIES: int = int(os.getenv("ORDER_MUTATION_MAX_RETRIES", "3"))
+    
+    # Menu cache: versioned per-item hashes in Redis, an in-process copy per worker,
+    # pub/sub invalidation across workers and background revalidation of the local copy
+    MENU_CACHE_TTL_SECONDS: int = int(os.getenv("MENU_CACHE_TTL_SECONDS", str(24 * 3600)))
+    MENU_CACHE_REFRESH_SECONDS: float = float(os.getenv("MENU_CACHE_REFRESH_SECONDS", "30"))
+    MENU_CACHE_OLD_VERSION_GRACE_SECONDS: int = int(os.getenv("MENU_CACHE_OLD_VERSION_GRACE_SECONDS", "60"))
+    MENU_CACHE_INVALIDATION_CHANNEL: str = os.getenv("MENU_CACHE_INVALIDATION_CHANNEL", "menu:invalidations")
+    # Startup warm-up: /health reports not ready until it finishes (or times out)
+    MENU_CACHE_WARMUP_ENABLED: bool = os.getenv("MENU_CACHE_WARMUP_ENABLED", "True").lower() == "true"
+    MENU_CACHE_WARMUP_CONCURRENCY: int = int(os.getenv("MENU_CACHE_WARMUP_CONCURRENCY", "8"))  # keep within the DB pool
+    MENU_CACHE_WARMUP_PAGE_SIZE: int = int(os.getenv("MENU_CACHE_WARMUP_PAGE_SIZE", "500"))
+    MENU_CACHE_WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("MENU_CACHE_WARMUP_TIMEOUT_SECONDS", "120"))
+    
+    # Menu search index
+    MENU_INDEX_TTL_SECONDS: int = int(os.getenv("MENU_INDEX_TTL_SECONDS", "60"))
+    MENU_SEARCH_TOP_K: int = int(os.getenv("MENU_SEARCH_TOP_K", "5"))
+    # A single fuzzy-only match below this score is confirmed with the customer instead of added
+    MENU_SEARCH_CONFIDENT_SCORE: float = float(os.getenv("MENU_SEARCH_CONFIDENT_SCORE", "0.75"))
+    MENU_RESOLUTION_MAX_CONCURRENCY: int = int(os.getenv("MENU_RESOLUTION_MAX_CONCURRENCY", "4"))
+    # Resolve all ambiguous items of a turn in one LLM call instead of one call per item
+    MENU_RESOLUTION_BATCH_DISAMBIGUATION: bool = os.getenv("MENU_RESOLUTION_BATCH_DISAMBIGUATION", "True").lower() == "true"
+    
+    # Public menu endpoint: serialized + gzipped once per menu version, revalidated by ETag
+    PUBLIC_MENU_CACHE_TTL_SECONDS: int = int(os.getenv("PUBLIC_MENU_CACHE_TTL_SECONDS", "60"))
+    PUBLIC_MENU_MAX_AGE_SECONDS: int = int(os.getenv("PUBLIC_MENU_MAX_AGE_SECONDS", "30"))
     
     # Inventory
     ALLOW_NEGATIVE_INVENTORY: bool = os.getenv("ALLOW_NEGATIVE_INVENTORY", "False").lower() == "true"
+    # Stock held in Redis by open orders across lanes; released when an order sits unchanged this long
+    INVENTORY_RESERVATION_TTL_SECONDS: int = int(os.getenv("INVENTORY_RESERVATION_TTL_SECONDS", "1800"))
+    INVENTORY_RESERVATION_SWEEP_SECONDS: float = float(os.getenv("INVENTORY_RESERVATION_SWEEP_SECONDS", "30"))
     
     # AI Processing
     AI_CONFIDENCE_THRESHOLD: float = float(os.getenv("AI_CONFIDENCE_THRESHOLD", "0.8"))
+    ENABLE_FAST_INTENT_CLASSIFIER: bool = os.getenv("ENABLE_FAST_INTENT_CLASSIFIER", "True").lower() == "true"
+    FAST_INTENT_MODEL_THRESHOLD: float = float(os.getenv("FAST_INTENT_MODEL_THRESHOLD", "0.9"))
+    # Run item extraction alongside intent classification (costs an extra LLM call on non-ADD_ITEM turns)
+    ENABLE_SPECULATIVE_EXTRACTION: bool = os.getenv("ENABLE_SPECULATIVE_EXTRACTION", "False").lower() == "true"
+    
+    # LLM client pool
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    LLM_MAX_CONCURRENCY_PER_MODEL: int = int(os.getenv("LLM_MAX_CONCURRENCY_PER_MODEL", "32"))
+    LLM_REQUEST_TIMEOUT_SECONDS: float = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "30.0"))
+    
+    # Speech-to-Text
+    STT_PROVIDER: str = os.getenv("STT_PROVIDER", "openai")  # openai | mock (local stand-in for load tests)
+    STT_TIMEOUT_SECONDS: float = float(os.getenv("STT_TIMEOUT_SECONDS", "15.0"))
+    STT_MAX_CONCURRENCY: int = int(os.getenv("STT_MAX_CONCURRENCY", "16"))
     
     # Voice Configuration (required - no defaults)
     TTS_VOICE: str = os.getenv("TTS_VOICE", "nova")
     TTS_LANGUAGE: str = os.getenv("TTS_LANGUAGE", "english")
     
+    # Streaming TTS: dynamic responses return a stream URL that plays while synthesis runs
+    TTS_STREAMING_ENABLED: bool = os.getenv("TTS_STREAMING_ENABLED", "False").lower() == "true"
+    TTS_STREAM_BASE_URL: str = os.getenv("TTS_STREAM_BASE_URL", "/api/ai/tts/stream")
+    TTS_STREAM_TTL_SECONDS: int = int(os.getenv("TTS_STREAM_TTL_SECONDS", "300"))
+    TTS_STREAM_IDLE_TIMEOUT_SECONDS: float = float(os.getenv("TTS_STREAM_IDLE_TIMEOUT_SECONDS", "30.0"))
+    
+    # Voice URL cache (in-process LRU in front of Redis) and fleet-wide synthesis single-flight
+    VOICE_URL_CACHE_SIZE: int = int(os.getenv("VOICE_URL_CACHE_SIZE", "2048"))
+    VOICE_URL_CACHE_TTL_SECONDS: int = int(os.getenv("VOICE_URL_CACHE_TTL_SECONDS", "3600"))
+    VOICE_SYNTHESIS_LOCK_SECONDS: int = int(os.getenv("VOICE_SYNTHESIS_LOCK_SECONDS", "30"))
+    VOICE_SYNTHESIS_WAIT_SECONDS: float = float(os.getenv("VOICE_SYNTHESIS_WAIT_SECONDS", "10.0"))
+    VOICE_SYNTHESIS_POLL_SECONDS: float = float(os.getenv("VOICE_SYNTHESIS_POLL_SECONDS", "0.1"))
+    
+    # Canned phrase URL table (in-process, filled with one HEAD per phrase key per restaurant)
+    CANNED_PHRASE_TABLE_TTL_SECONDS: int = int(os.getenv("CANNED_PHRASE_TABLE_TTL_SECONDS", "3600"))
+    CANNED_PHRASE_TABLE_PROBE_CONCURRENCY: int = int(os.getenv("CANNED_PHRASE_TABLE_PROBE_CONCURRENCY", "8"))
+    CANNED_PHRASES_PRELOAD: bool = os.getenv("CANNED_PHRASES_PRELOAD", "True").lower() == "true"
+    
+    # Bulk canned audio generation (restaurant onboarding)
+    CANNED_AUDIO_TTS_CONCURRENCY: int = int(os.getenv("CANNED_AUDIO_TTS_CONCURRENCY", "8"))
+    CANNED_AUDIO_UPLOAD_CONCURRENCY: int = int(os.getenv("CANNED_AUDIO_UPLOAD_CONCURRENCY", "16"))
+    CANNED_AUDIO_RESTAURANT_CONCURRENCY: int = int(os.getenv("CANNED_AUDIO_RESTAURANT_CONCURRENCY", "4"))
+    CANNED_AUDIO_JOB_TTL_SECONDS: int = int(os.getenv("CANNED_AUDIO_JOB_TTL_SECONDS", str(7 * 24 * 3600)))
+    
+    # Templated responses spliced from pre-rendered audio fragments instead of synthesized
+    FRAGMENT_SPLICING_ENABLED: bool = os.getenv("FRAGMENT_SPLICING_ENABLED", "True").lower() == "true"
+    FRAGMENT_CACHE_SIZE: int = int(os.getenv("FRAGMENT_CACHE_SIZE", "1024"))
+    FRAGMENT_TABLE_TTL_SECONDS: int = int(os.getenv("FRAGMENT_TABLE_TTL_SECONDS", "3600"))
+    
+    # Streaming audio ingestion: PCM is cut into segments at pauses and each is transcribed right away
+    STREAM_AUDIO_MAX_BYTES: int = int(os.getenv("STREAM_AUDIO_MAX_BYTES", str(10 * 1024 * 1024)))
+    STREAM_DEFAULT_SAMPLE_RATE: int = int(os.getenv("STREAM_DEFAULT_SAMPLE_RATE", "16000"))
+    STREAM_SILENCE_RMS_THRESHOLD: float = float(os.getenv("STREAM_SILENCE_RMS_THRESHOLD", "500"))
+    STREAM_SEGMENT_SILENCE_MS: int = int(os.getenv("STREAM_SEGMENT_SILENCE_MS", "300"))
+    STREAM_SEGMENT_MAX_MS: int = int(os.getenv("STREAM_SEGMENT_MAX_MS", "10000"))
+    
+    # Recordings are trimmed, downsampled and re-encoded before speech-to-text (ffmpeg optional)
+    AUDIO_PREPROCESSING_ENABLED: bool = os.getenv("AUDIO_PREPROCESSING_ENABLED", "True").lower() == "true"
+    AUDIO_TARGET_SAMPLE_RATE: int = int(os.getenv("AUDIO_TARGET_SAMPLE_RATE", "16000"))
+    AUDIO_MAX_DURATION_SECONDS: float = float(os.getenv("AUDIO_MAX_DURATION_SECONDS", "60"))
+    AUDIO_TRIM_PADDING_MS: int = int(os.getenv("AUDIO_TRIM_PADDING_MS", "200"))
+    AUDIO_TRIM_MIN_RMS: float = float(os.getenv("AUDIO_TRIM_MIN_RMS", "300"))
+    AUDIO_TRIM_NOISE_FACTOR: float = float(os.getenv("AUDIO_TRIM_NOISE_FACTOR", "3.0"))
+    AUDIO_OPUS_BITRATE: str = os.getenv("AUDIO_OPUS_BITRATE", "24k")
+    AUDIO_FFMPEG_TIMEOUT_SECONDS: float = float(os.getenv("AUDIO_FFMPEG_TIMEOUT_SECONDS", "10"))
+    FFMPEG_PATH: str = os.getenv("FFMPEG_PATH", "ffmpeg")
+    
+    # Write-behind archival of customer recordings (local spool uploaded by background workers)
+    AUDIO_ARCHIVE_SPOOL_DIR: str = os.getenv("AUDIO_ARCHIVE_SPOOL_DIR", "storage/audio-spool")
+    AUDIO_ARCHIVE_WORKERS: int = int(os.getenv("AUDIO_ARCHIVE_WORKERS", "2"))
+    AUDIO_ARCHIVE_MAX_ATTEMPTS: int = int(os.getenv("AUDIO_ARCHIVE_MAX_ATTEMPTS", "8"))
+    AUDIO_ARCHIVE_RETRY_BASE_SECONDS: float = float(os.getenv("AUDIO_ARCHIVE_RETRY_BASE_SECONDS", "2.0"))
+    AUDIO_ARCHIVE_FLUSH_TIMEOUT_SECONDS: float = float(os.getenv("AUDIO_ARCHIVE_FLUSH_TIMEOUT_SECONDS", "20.0"))
+    
     # S3 Configuration
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "ai-drivethru-storage")
     S3_REGION: str = os.getenv("S3_REGION", "us-east-1")
@@ -61,4 +168,14 @@ class Settings:
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
     AWS_ENDPOINT_URL: str = os.getenv("AWS_ENDPOINT_URL", "")
 
+    # S3 client pool
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+    S3_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("S3_CONNECT_TIMEOUT_SECONDS", "5.0"))
+    S3_READ_TIMEOUT_SECONDS: float = float(os.getenv("S3_READ_TIMEOUT_SECONDS", "30.0"))
+    S3_RETRY_MODE: str = os.getenv("S3_RETRY_MODE", "standard")  # standard | adaptive (both back off with full jitter)
+    S3_MAX_ATTEMPTS: int = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+    S3_MULTIPART_THRESHOLD_BYTES: int = int(os.getenv("S3_MULTIPART_THRESHOLD_BYTES", str(16 * 1024 * 1024)))
+    S3_MULTIPART_PART_SIZE_BYTES: int = int(os.getenv("S3_MULTIPART_PART_SIZE_BYTES", str(8 * 1024 * 1024)))  # S3 minimum is 5 MiB
+    S3_MULTIPART_CONCURRENCY: int = int(os.getenv("S3_MULTIPART_CONCURRENCY", "4"))
+
 settings = Settings()
@@ -2,12 +2,16 @@
 Dependency injection container for the application
 """
 
+import logging
+
 from dependency_injector import containers, providers
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config import settings
 from .database import get_db
 
+logger = logging.getLogger(__name__)
+
 
 class Container(containers.DeclarativeContainer):
     """
@@ -21,8 +25,23 @@ class Container(containers.DeclarativeContainer):
     
     # Database session will be provided by FastAPI DI directly to services
     
+    # Speech-to-text provider (selected by STT_PROVIDER: openai or mock)
+    stt_provider = providers.Selector(
+        providers.Object(settings.STT_PROVIDER),
+        openai=providers.Singleton(
+            "app.services.stt_provider.OpenAISTTProvider",
+            api_key=settings.OPENAI_API_KEY
+        ),
+        mock=providers.Singleton("app.services.stt_provider.MockSTTProvider")
+    )
+    
     # Core services (no dependencies) - using lazy imports
-    speech_to_text_service = providers.Singleton("app.services.speech_to_text_service.SpeechToTextService")
+    speech_to_text_service = providers.Singleton(
+        "app.services.speech_to_text_service.SpeechToTextService",
+        provider=stt_provider,
+        timeout=settings.STT_TIMEOUT_SECONDS,
+        max_concurrency=settings.STT_MAX_CONCURRENCY
+    )
     validation_service = providers.Singleton("app.services.lightweight_validation_service.LightweightValidationService")
     
     # Redis service with lifecycle management
@@ -43,7 +62,8 @@ class Container(containers.DeclarativeContainer):
         "app.services.file_storage_service.S3FileStorageService",
         bucket_name=settings.S3_BUCKET_NAME,
         region=settings.S3_REGION,
-        endpoint_url=settings.AWS_ENDPOINT_URL
+        endpoint_url=settings.AWS_ENDPOINT_URL,
+        redis_service=redis_service
     )
     
     # Order session service (Redis primary with PostgreSQL fallback)
@@ -71,13 +91,20 @@ class Container(containers.DeclarativeContainer):
         redis_service=redis_service
     )
     
+    # Inventory reservations (stock held by open orders, shared by all lanes)
+    inventory_reservations = providers.Singleton(
+        "app.services.inventory_reservations.InventoryReservations",
+        redis_service=redis_service
+    )
+    
     # Order service (depends on OrderSessionService, CustomizationValidator, and VoiceService)
     order_service = providers.Factory(
         "app.services.order_service.OrderService",
         order_session_service=order_session_service,
         customization_validator=customization_validator,
         voice_service=voice_service,
-        order_validator=order_validator
+        order_validator=order_validator,
+        inventory_reservations=inventory_reservations
     )
     
     # Service factory (for creating services with database sessions)
@@ -117,6 +144,10 @@ class Container(containers.DeclarativeContainer):
         voice_service=voice_service
     )
     
+    speculative_extraction_service = providers.Singleton(
+        "app.core.services.conversation.speculative_extraction_service.SpeculativeExtractionService"
+    )
+    
     # Conversation orchestrator (replaces LangGraph workflow)
     conversation_orchestrator = providers.Singleton(
         "app.core.conversation_orchestrator.ConversationOrchestrator",
@@ -125,7 +156,8 @@ class Container(containers.DeclarativeContainer):
         intent_parser_router_service=intent_parser_router_service,
         command_executor_service=command_executor_service,
         response_aggregator_service=response_aggregator_service,
-        voice_generation_service=voice_generation_service
+        voice_generation_service=voice_generation_service,
+        speculative_extraction_service=speculative_extraction_service
     )
     
     # Audio pipeline service (orchestrates other services)
@@ -152,13 +184,29 @@ class Container(containers.DeclarativeContainer):
         loop = asyncio.get_event_loop()
         loop.run_until_complete(redis.connect())
     
-    def shutdown_resources(self):
-        """Clean up resources on shutdown"""
-        # Disconnect from Redis on shutdown
-        redis = self.redis_service()
-        import asyncio
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(redis.disconnect())
+    async def shutdown_resources(self):
+        """Clean up resources on shutdown (awaited from the app lifespan)"""
+        # Each close runs on its own so one failure doesn't leave the rest open
+        try:
+            await self.redis_service().disconnect()
+        except Exception as e:
+            logger.error(f"Redis disconnect failed: {e}")
+        # Close the STT provider's HTTP connection pool
+        try:
+            await self.speech_to_text_service().close()
+        except Exception as e:
+            logger.error(f"Speech-to-text provider close failed: {e}")
+        # Close the S3 client's connection pool
+        try:
+            await self.file_storage_service().close()
+        except Exception as e:
+            logger.error(f"File storage client close failed: {e}")
+        # Close the shared LLM clients' HTTP connection pools
+        try:
+            from app.core.llm_registry import llm_registry
+            await llm_registry.aclose()
+        except Exception as e:
+            logger.error(f"LLM client registry close failed: {e}")
 
 
 # Container instance will be created in main.py
@@ -23,6 +23,7 @@ from app.core.services.conversation import (
     ResponseAggregatorService,
     VoiceGenerationService
 )
+from app.core.services.conversation.speculative_extraction_service import SpeculativeExtractionService
 from app.commands.intent_classification_schema import IntentType, IntentClassificationResult
 from app.models.state_machine_models import ConversationState
 
@@ -44,7 +45,8 @@ class ConversationOrchestrator:
         intent_parser_router_service: IntentParserRouterService,
         command_executor_service: CommandExecutorService,
         response_aggregator_service: ResponseAggregatorService,
-        voice_generation_service: VoiceGenerationService
+        voice_generation_service: VoiceGenerationService,
+        speculative_extraction_service: Optional[SpeculativeExtractionService] = None
     ):
         """
         Initialize the conversation orchestrator.
@@ -56,6 +58,7 @@ class ConversationOrchestrator:
             command_executor_service: Service for executing commands
             response_aggregator_service: Service for aggregating responses
             voice_generation_service: Service for generating voice responses
+            speculative_extraction_service: Service for running item extraction alongside classification (optional)
         """
         self.intent_classification_service = intent_classification_service
         self.state_transition_service = state_transition_service
@@ -63,6 +66,7 @@ class ConversationOrchestrator:
         self.command_executor_service = command_executor_service
         self.response_aggregator_service = response_aggregator_service
         self.voice_generation_service = voice_generation_service
+        self.speculative_extraction_service = speculative_extraction_service or SpeculativeExtractionService()
         self.logger = logging.getLogger(__name__)
     
     async def process_conversation_turn(
@@ -94,6 +98,7 @@ class ConversationOrchestrator:
         Returns:
             Dictionary containing response text, audio URL, and metadata
         """
+        speculation = None
         try:
             self.logger.info(f"Processing conversation turn: '{user_input}'")
             print(f"\n🚀 CONVERSATION ORCHESTRATOR:")
@@ -103,6 +108,13 @@ class ConversationOrchestrator:
             
             # Step 1: Intent Classification
             print(f"\n🔍 STEP 1: Intent Classification")
+            # Speculatively start item extraction on the raw transcript while we classify
+            speculation = self.speculative_extraction_service.start(
+                user_input=user_input,
+                restaurant_id=str(restaurant_id),
+                conversation_history=conversation_history or [],
+                order_state=order_state or {}
+            )
             intent_result = await self.intent_classification_service.classify_intent(
                 user_input=user_input,
                 conversation_history=conversation_history or [],
@@ -157,6 +169,9 @@ class ConversationOrchestrator:
             from app.core.database import AsyncSessionLocal
             shared_db_session = AsyncSessionLocal()
             print(f"   🔍 DEBUG - Orchestrator creating shared_db_session: {shared_db_session}")
+            speculative_extraction = None
+            if intent_result.intent == IntentType.ADD_ITEM:
+                speculative_extraction = self.speculative_extraction_service.claim(speculation)
             parser_result = await self.intent_parser_router_service.route_to_parser(
                 intent_type=intent_result.intent,
                 user_input=intent_result.cleansed_input,
@@ -165,7 +180,8 @@ class ConversationOrchestrator:
                 conversation_history=conversation_history or [],
                 order_state=order_state or {},
                 current_state="ORDERING",
-                shared_db_session=shared_db_session
+                shared_db_session=shared_db_session,
+                speculative_extraction=speculative_extraction
             )
             
             if not parser_result["success"]:
@@ -253,3 +269,6 @@ class ConversationOrchestrator:
                 "error": str(e),
                 "intent_type": None
             }
+        finally:
+            # Cancel/discard the speculative extraction if this turn didn't use it
+            self.speculative_extraction_service.release(speculation)
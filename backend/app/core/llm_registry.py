@@ -0,0 +1,223 @@
+"""
+LLM Client Registry
+
+Process-wide registry of LangChain chat models. Clients are keyed by model,
+temperature and structured output schema so a turn reuses the same pooled
+HTTP transport (keep-alive connections) and the same schema/tool binding
+instead of rebuilding them on every call.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Type
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMModelMetrics:
+    """Per-model call metrics"""
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    total_latency_ms: float = 0.0
+    clients_created: int = 0
+    bindings_created: int = 0
+
+    @property
+    def avg_latency_ms(self) -> float:
+        """Average latency of completed calls in milliseconds"""
+        completed = self.calls - self.in_flight
+        return self.total_latency_ms / completed if completed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert metrics to dictionary"""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "avg_latency_ms": round(self.avg_latency_ms, 2),
+            "clients_created": self.clients_created,
+            "bindings_created": self.bindings_created
+        }
+
+
+class PooledLLM:
+    """
+    Shared runnable handed out by the registry.
+
+    Wraps a (possibly structured-output) chat model and applies the
+    per-model concurrency cap and metrics around each call.
+    """
+
+    def __init__(self, runnable: Any, model: str, semaphore: asyncio.Semaphore, metrics: LLMModelMetrics):
+        self.runnable = runnable
+        self.model = model
+        self._semaphore = semaphore
+        self._metrics = metrics
+
+    async def ainvoke(self, input: Any, config: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """
+        Invoke the underlying runnable under the model's concurrency cap
+
+        Args:
+            input: Prompt or messages to send
+            config: Optional LangChain runnable config
+
+        Returns:
+            Model output (AIMessage or parsed schema instance)
+        """
+        async with self._semaphore:
+            metrics = self._metrics
+            metrics.calls += 1
+            metrics.in_flight += 1
+            metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+            start = time.perf_counter()
+            try:
+                return await self.runnable.ainvoke(input, config, **kwargs)
+            except Exception:
+                metrics.errors += 1
+                raise
+            finally:
+                metrics.in_flight -= 1
+                metrics.total_latency_ms += (time.perf_counter() - start) * 1000
+
+
+class LLMClientRegistry:
+    """
+    Registry of shared chat model clients.
+
+    All clients share one pooled httpx.AsyncClient. Each model gets its own
+    concurrency cap and metrics.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        max_concurrency_per_model: Optional[int] = None,
+        request_timeout: Optional[float] = None
+    ):
+        self.api_key = api_key
+        self.max_connections = max_connections or settings.LLM_MAX_CONNECTIONS
+        self.max_keepalive_connections = max_keepalive_connections or settings.LLM_MAX_KEEPALIVE_CONNECTIONS
+        self.max_concurrency_per_model = max_concurrency_per_model or settings.LLM_MAX_CONCURRENCY_PER_MODEL
+        self.request_timeout = request_timeout or settings.LLM_REQUEST_TIMEOUT_SECONDS
+
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._chat_models: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._llms: Dict[Tuple[str, float, Optional[Type], str], PooledLLM] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._metrics: Dict[str, LLMModelMetrics] = {}
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Lazily create the shared pooled HTTP transport"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                ),
+                timeout=self.request_timeout
+            )
+        return self._http_client
+
+    def _get_model_metrics(self, model: str) -> LLMModelMetrics:
+        if model not in self._metrics:
+            self._metrics[model] = LLMModelMetrics()
+        return self._metrics[model]
+
+    def _get_semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            self._semaphores[model] = asyncio.Semaphore(self.max_concurrency_per_model)
+        return self._semaphores[model]
+
+    def get_chat_model(self, model: str = "gpt-4o", temperature: float = 0.1) -> ChatOpenAI:
+        """
+        Get the shared raw chat model for a model/temperature pair.
+
+        Use this when a LangChain component (e.g. an agent executor) needs
+        the ChatOpenAI instance itself. Calls made this way share the pooled
+        transport but bypass the registry's concurrency cap and metrics.
+
+        Args:
+            model: OpenAI model name
+            temperature: Sampling temperature
+
+        Returns:
+            Shared ChatOpenAI instance
+        """
+        key = (model, temperature)
+        chat_model = self._chat_models.get(key)
+        if chat_model is None:
+            chat_model = ChatOpenAI(
+                model=model,
+                api_key=self.api_key or settings.OPENAI_API_KEY,
+                temperature=temperature,
+                http_async_client=self._get_http_client()
+            )
+            self._chat_models[key] = chat_model
+            self._get_model_metrics(model).clients_created += 1
+            logger.info(f"Created shared LLM client: {model} (temperature={temperature})")
+        return chat_model
+
+    def get_llm(
+        self,
+        model: str = "gpt-4o",
+        temperature: float = 0.1,
+        schema: Optional[Type] = None,
+        method: str = "function_calling"
+    ) -> PooledLLM:
+        """
+        Get a shared LLM runnable, optionally bound to a structured output schema.
+
+        Args:
+            model: OpenAI model name
+            temperature: Sampling temperature
+            schema: Pydantic model for structured output (None for plain text)
+            method: Structured output method passed to with_structured_output
+
+        Returns:
+            PooledLLM with concurrency cap and metrics applied
+        """
+        key = (model, temperature, schema, method)
+        llm = self._llms.get(key)
+        if llm is None:
+            runnable = self.get_chat_model(model, temperature)
+            if schema is not None:
+                runnable = runnable.with_structured_output(schema, method=method)
+                self._get_model_metrics(model).bindings_created += 1
+            llm = PooledLLM(runnable, model, self._get_semaphore(model), self._get_model_metrics(model))
+            self._llms[key] = llm
+        return llm
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-model metrics
+
+        Returns:
+            Dict mapping model name to its metrics
+        """
+        return {model: metrics.to_dict() for model, metrics in self._metrics.items()}
+
+    async def aclose(self) -> None:
+        """Close the pooled transport and drop cached clients"""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._chat_models.clear()
+        self._llms.clear()
+
+
+# Process-wide registry instance
+llm_registry = LLMClientRegistry()
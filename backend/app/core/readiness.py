@@ -0,0 +1,59 @@
+"""
+Instance readiness
+
+Startup work that should finish before the instance takes traffic (e.g. menu
+cache warm-up) registers here; /health reports not ready until all of it is done.
+"""
+
+import time
+from typing import Dict, Any
+
+
+class Readiness:
+    """
+    Named startup tasks still pending for this process
+    """
+
+    def __init__(self):
+        # task name -> started_at (monotonic)
+        self._pending: Dict[str, float] = {}
+        self._completed: Dict[str, Dict[str, Any]] = {}
+
+    def begin(self, name: str) -> None:
+        """Mark a startup task as running (the instance is not ready until it finishes)"""
+        self._pending.setdefault(name, time.monotonic())
+        self._completed.pop(name, None)
+
+    def finish(self, name: str, **details: Any) -> None:
+        """
+        Mark a startup task as done, whether or not it succeeded
+
+        Args:
+            name: Task name passed to begin()
+            details: Anything worth showing on /health (counts, errors)
+        """
+        started_at = self._pending.pop(name, None)
+        elapsed = time.monotonic() - started_at if started_at is not None else 0.0
+        self._completed[name] = {"seconds": round(elapsed, 3), **details}
+
+    @property
+    def is_ready(self) -> bool:
+        return not self._pending
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get readiness for the health check
+
+        Returns:
+            Dict[str, Any]: ready flag, pending tasks with their age, completed task details
+        """
+        now = time.monotonic()
+        return {
+            "ready": self.is_ready,
+            "pending": {name: round(now - started_at, 3) for name, started_at in self._pending.items()},
+            "completed": dict(self._completed)
+        }
+
+
+# Process-wide readiness (each uvicorn worker warms up and reports on its own)
+readiness = Readiness()
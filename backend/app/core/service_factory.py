@@ -80,19 +80,20 @@ class ServiceFactory:
         from app.services.text_to_speech_service import TextToSpeechService
         from app.services.speech_to_text_service import SpeechToTextService
         from app.services.file_storage_service import S3FileStorageService
-        from app.services.redis_service import RedisService
         from app.core.config import settings
         
         # Create dependencies directly
         tts_provider = self.container.tts_provider()
         text_to_speech_service = TextToSpeechService(tts_provider)
         speech_to_text_service = self.container.speech_to_text_service()
+        # The container's Redis is the connected one; the key index is skipped on an unconnected client
+        redis_service = self.container.redis_service()
         file_storage_service = S3FileStorageService(
             bucket_name=settings.S3_BUCKET_NAME,
             region=settings.S3_REGION,
-            endpoint_url=settings.AWS_ENDPOINT_URL
+            endpoint_url=settings.AWS_ENDPOINT_URL,
+            redis_service=redis_service
         )
-        redis_service = RedisService()
         
         return VoiceService(
             text_to_speech_service=text_to_speech_service,
@@ -0,0 +1,364 @@
+"""
+Fast Intent Classifier
+
+Local first-stage classifier that runs before the LLM in
+IntentClassificationService. Formulaic drive-thru turns ("that's all",
+"thank you", "can I get a large fries") are resolved with rules, keyword
+guards and a small naive Bayes model trained on the intent classification
+prompt examples. Anything it is not sure about returns None so the caller
+falls back to the LLM.
+"""
+
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Pattern, Tuple
+
+from app.agents.prompts.intent_classification_prompts import INTENT_EXAMPLES, EDGE_CASE_EXAMPLES
+from app.commands.intent_classification_schema import IntentType, IntentClassificationResult
+from app.core.config import settings
+
+
+# Extra labelled utterances for the local model, alongside the prompt examples
+SEED_EXAMPLES: List[Tuple[str, str]] = [
+    ("that's it", "CONFIRM_ORDER"),
+    ("that's everything", "CONFIRM_ORDER"),
+    ("that will be all", "CONFIRM_ORDER"),
+    ("that's all for me", "CONFIRM_ORDER"),
+    ("nothing else", "CONFIRM_ORDER"),
+    ("nothing else thanks", "CONFIRM_ORDER"),
+    ("no that's it", "CONFIRM_ORDER"),
+    ("i'm done", "CONFIRM_ORDER"),
+    ("we're good", "CONFIRM_ORDER"),
+    ("i'm all set", "CONFIRM_ORDER"),
+    ("done ordering", "CONFIRM_ORDER"),
+    ("that's all i need", "CONFIRM_ORDER"),
+    ("clear my order", "CLEAR_ORDER"),
+    ("cancel the whole order", "CLEAR_ORDER"),
+    ("cancel everything", "CLEAR_ORDER"),
+    ("start over", "CLEAR_ORDER"),
+    ("let's start over", "CLEAR_ORDER"),
+    ("remove everything", "CLEAR_ORDER"),
+    ("scrap the order", "CLEAR_ORDER"),
+    ("reset my order", "CLEAR_ORDER"),
+    ("thanks", "SMALL_TALK"),
+    ("thank you so much", "SMALL_TALK"),
+    ("hello", "SMALL_TALK"),
+    ("hi there", "SMALL_TALK"),
+    ("hey", "SMALL_TALK"),
+    ("good morning", "SMALL_TALK"),
+    ("good evening", "SMALL_TALK"),
+    ("how are you", "SMALL_TALK"),
+    ("have a nice day", "SMALL_TALK"),
+    ("can i get a cheeseburger", "ADD_ITEM"),
+    ("i'll have two large fries", "ADD_ITEM"),
+    ("give me a chocolate shake", "ADD_ITEM"),
+    ("i want a coke", "ADD_ITEM"),
+    ("let me get a number one", "ADD_ITEM"),
+    ("i'll take three nuggets", "ADD_ITEM"),
+    ("remove the burger", "REMOVE_ITEM"),
+    ("take off the fries", "REMOVE_ITEM"),
+    ("cancel the shake", "REMOVE_ITEM"),
+    ("get rid of the coke", "REMOVE_ITEM"),
+    ("no onions on that", "MODIFY_ITEM"),
+    ("make the fries large", "MODIFY_ITEM"),
+    ("add cheese to the burger", "MODIFY_ITEM"),
+    ("make that three", "SET_QUANTITY"),
+    ("actually make it two", "SET_QUANTITY"),
+    ("what comes on the burger", "QUESTION"),
+    ("do you have milkshakes", "QUESTION"),
+    ("what sizes do you have", "QUESTION"),
+    ("how much are the fries", "QUESTION"),
+    ("what's in the salad", "QUESTION"),
+    ("um", "UNKNOWN"),
+    ("hold on", "UNKNOWN"),
+    ("what", "UNKNOWN"),
+]
+
+# Intents the fast path is allowed to resolve on its own
+FAST_PATH_INTENTS = {
+    IntentType.CONFIRM_ORDER,
+    IntentType.CLEAR_ORDER,
+    IntentType.SMALL_TALK,
+    IntentType.ADD_ITEM,
+}
+
+# Intents the trained model may resolve (ADD_ITEM is rules-only, see _ADD_ITEM_PATTERN)
+MODEL_INTENTS = {
+    IntentType.CONFIRM_ORDER,
+    IntentType.CLEAR_ORDER,
+    IntentType.SMALL_TALK,
+}
+
+# Words that signal an edit, a question or hesitation - never fast-path these
+GUARD_WORDS = {
+    "remove", "instead", "change", "cancel", "make", "what", "what's", "whats", "how",
+    "does", "do", "is", "are", "which", "actually", "wait", "um", "uh", "umm", "same",
+    "repeat", "having", "hold", "replace", "swap", "don't", "dont", "but", "off", "rid",
+    "another", "again",
+    # Stalls and non-order requests that share the "give me"/"i need"/"i want" openers
+    "second", "seconds", "sec", "minute", "minutes", "moment", "refund", "receipt", "manager", "help",
+    # Things asked for at the window that aren't menu items ("can i get a water cup")
+    "cup", "cups", "lid", "lids", "straw", "straws", "napkin", "napkins", "bag", "total",
+}
+
+# Stems found in drive-thru item names and sizes ("cheeseburger" -> "burger")
+MENU_HINT_STEMS = (
+    "burger", "fries", "fry", "shake", "coke", "cola", "soda", "sprite", "pepsi", "drink", "water",
+    "juice", "lemonade", "tea", "coffee", "latte", "milk", "smoothie", "nugget", "chicken", "wing",
+    "ring", "sandwich", "wrap", "salad", "taco", "burrito", "pizza", "hot dog", "mac", "whopper",
+    "meal", "combo", "number", "sundae", "cone", "cookie", "pie", "muffin", "biscuit", "hash brown",
+    "small", "medium", "large", "regular", "kids",
+)
+
+# Negations are fine inside an ADD_ITEM ("with no pickles") but make short replies ambiguous
+NEGATION_WORDS = {"no", "not", "without", "nope"}
+
+_FILLER_PREFIX = r"(?:(?:ok|okay|yeah|yes|yep|um|uh|so|alright|all right)\s+)?"
+_POLITE_SUFFIX = r"(?:\s+(?:please|thanks|thank you|thank you so much))?"
+
+_RULES: List[Tuple[IntentType, Pattern]] = [
+    (IntentType.CONFIRM_ORDER, re.compile(
+        rf"^{_FILLER_PREFIX}(?:no\s+)?(?:that's|that is|that'll be|that will be|that should be)\s+"
+        rf"(?:all|it|everything|all i need|all we need|all i want)(?:\s+for\s+(?:me|us|now|today))?{_POLITE_SUFFIX}$"
+    )),
+    (IntentType.CONFIRM_ORDER, re.compile(
+        rf"^{_FILLER_PREFIX}(?:i'm|i am|we're|we are)\s+(?:done|good|all set|finished)(?:\s+ordering)?{_POLITE_SUFFIX}$"
+    )),
+    (IntentType.CONFIRM_ORDER, re.compile(
+        rf"^{_FILLER_PREFIX}(?:no\s+)?(?:nothing else|all done|done|done ordering){_POLITE_SUFFIX}$"
+    )),
+    (IntentType.CLEAR_ORDER, re.compile(
+        rf"^{_FILLER_PREFIX}(?:please\s+)?(?:clear|cancel|reset|scrap|delete|remove)\s+"
+        rf"(?:(?:my|the|our|this)\s+)?(?:(?:whole|entire)\s+)?(?:order|everything){_POLITE_SUFFIX}$"
+    )),
+    (IntentType.CLEAR_ORDER, re.compile(
+        rf"^{_FILLER_PREFIX}(?:let's\s+|can we\s+|i want to\s+)?(?:start over|start again){_POLITE_SUFFIX}$"
+    )),
+    (IntentType.SMALL_TALK, re.compile(
+        r"^(?:hi|hello|hey|howdy|good (?:morning|afternoon|evening))(?: there)?$"
+    )),
+    (IntentType.SMALL_TALK, re.compile(
+        r"^(?:thanks|thank you|thank you so much|thanks a lot|cheers|appreciate it)"
+        r"(?:\s+have a (?:good|nice|great) (?:day|one|night))?$"
+    )),
+    (IntentType.SMALL_TALK, re.compile(
+        r"^(?:have a (?:good|nice|great) (?:day|one|night)|how are you(?: doing)?(?: today)?)$"
+    )),
+]
+
+# Every opener also starts non-order requests ("give me a second", "i will have a look"),
+# so the object has to look like a menu item before the fast path takes it
+_ADD_ITEM_OPENER_PATTERN = re.compile(
+    r"^(?:hi\s+|hello\s+|hey\s+|yeah\s+|yes\s+|ok\s+|okay\s+)?"
+    r"(?:can i (?:get|have)|could i (?:get|have)|may i have|i'd like|i would like|i want|i'll have|"
+    r"i will have|i'll take|i will take|i'll get|let me (?:get|have)|give me|get me|we'd like|"
+    r"we would like|we'll have|we want|i need)\s+"
+)
+
+_ADD_ITEM_PATTERN = re.compile(
+    _ADD_ITEM_OPENER_PATTERN.pattern
+    + r"(?:a|an|one|two|three|four|five|six|seven|eight|nine|ten|\d+|some|the)\s+"
+    r"[a-z0-9' ]+$"
+)
+
+# Sentence breaks or trailing-off mid-utterance usually mean background chatter that needs cleansing
+_MULTI_CLAUSE_PATTERN = re.compile(r"(?:\.\.|…|[.!?;]\s+\S)")
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def normalize_utterance(text: str) -> str:
+    """Lowercase, unify apostrophes and strip punctuation other than apostrophes"""
+    text = text.lower().replace("’", "'").replace("‘", "'")
+    return " ".join(_TOKEN_PATTERN.findall(text))
+
+
+@dataclass
+class FastIntentStats:
+    """Hit-rate and latency counters for the fast path"""
+    attempts: int = 0
+    rule_hits: int = 0
+    model_hits: int = 0
+    misses: int = 0
+    hits_by_intent: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    fast_path_ns: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary"""
+        hits = self.rule_hits + self.model_hits
+        return {
+            "attempts": self.attempts,
+            "hits": hits,
+            "rule_hits": self.rule_hits,
+            "model_hits": self.model_hits,
+            "misses": self.misses,
+            "hit_rate": hits / self.attempts if self.attempts else 0.0,
+            "hits_by_intent": dict(self.hits_by_intent),
+            "avg_fast_path_us": (self.fast_path_ns / self.attempts / 1000) if self.attempts else 0.0,
+        }
+
+
+class NaiveBayesIntentModel:
+    """
+    Multinomial naive Bayes over unigrams and bigrams.
+
+    Small enough to train at import time from a few dozen examples and to
+    score an utterance in microseconds.
+    """
+
+    def __init__(self, examples: List[Tuple[str, str]], alpha: float = 0.5):
+        self.alpha = alpha
+        self.class_counts: Counter = Counter()
+        self.feature_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.vocabulary = set()
+        for text, label in examples:
+            self.class_counts[label] += 1
+            features = self.featurize(text)
+            self.feature_counts[label].update(features)
+            self.vocabulary.update(features)
+        self.total_examples = sum(self.class_counts.values())
+        self.feature_totals = {label: sum(counts.values()) for label, counts in self.feature_counts.items()}
+
+    @staticmethod
+    def featurize(text: str) -> List[str]:
+        tokens = ["<s>"] + normalize_utterance(text).split() + ["</s>"]
+        return tokens[1:-1] + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        Predict the most likely intent label
+
+        Returns:
+            Tuple of (label, posterior probability)
+        """
+        features = [f for f in self.featurize(text) if f in self.vocabulary]
+        vocab_size = len(self.vocabulary)
+        log_scores = {}
+        for label, count in self.class_counts.items():
+            score = math.log(count / self.total_examples)
+            denominator = self.feature_totals[label] + self.alpha * vocab_size
+            counts = self.feature_counts[label]
+            for feature in features:
+                score += math.log((counts[feature] + self.alpha) / denominator)
+            log_scores[label] = score
+
+        best = max(log_scores, key=log_scores.get)
+        peak = log_scores[best]
+        normalizer = sum(math.exp(score - peak) for score in log_scores.values())
+        return best, 1.0 / normalizer
+
+
+def build_training_examples() -> List[Tuple[str, str]]:
+    """Combine prompt examples, edge cases and local seed examples"""
+    examples = [(utterance, intent) for utterance, intent, _ in INTENT_EXAMPLES]
+    examples += [(utterance, intent) for utterance, intent, _ in EDGE_CASE_EXAMPLES]
+    examples += SEED_EXAMPLES
+    return examples
+
+
+class FastIntentClassifier:
+    """
+    Deterministic first-stage intent classifier.
+
+    Returns an IntentClassificationResult for high-confidence formulaic
+    turns and None otherwise.
+    """
+
+    RULE_CONFIDENCE = 0.95
+    MAX_MODEL_TOKENS = 6
+    MAX_ADD_ITEM_TOKENS = 14
+
+    def __init__(self, model_threshold: Optional[float] = None):
+        self.model_threshold = model_threshold if model_threshold is not None else settings.FAST_INTENT_MODEL_THRESHOLD
+        self.model = NaiveBayesIntentModel(build_training_examples())
+        self.stats = FastIntentStats()
+
+    def classify(self, user_input: str) -> Optional[IntentClassificationResult]:
+        """
+        Try to classify the utterance locally
+
+        Args:
+            user_input: Raw user input text
+
+        Returns:
+            IntentClassificationResult on a confident hit, None to fall back to the LLM
+        """
+        start = time.perf_counter_ns()
+        self.stats.attempts += 1
+        try:
+            result, source = self._classify(user_input)
+            if result is not None and result.intent not in FAST_PATH_INTENTS:
+                result = None
+            if result is None:
+                self.stats.misses += 1
+            else:
+                if source == "rule":
+                    self.stats.rule_hits += 1
+                else:
+                    self.stats.model_hits += 1
+                self.stats.hits_by_intent[result.intent.value] += 1
+            return result
+        finally:
+            self.stats.fast_path_ns += time.perf_counter_ns() - start
+
+    def _classify(self, user_input: str) -> Tuple[Optional[IntentClassificationResult], Optional[str]]:
+        if not user_input or not user_input.strip():
+            return None, None
+
+        normalized = normalize_utterance(user_input)
+        tokens = normalized.split()
+        if not tokens:
+            return None, None
+
+        # "that's it?" asks whether the order is complete; leave questions to the LLM
+        question = user_input.strip().endswith("?")
+
+        for intent, pattern in _RULES:
+            if question and intent == IntentType.CONFIRM_ORDER:
+                continue
+            if pattern.match(normalized):
+                return self._result(intent, self.RULE_CONFIDENCE, user_input), "rule"
+
+        guarded = any(token in GUARD_WORDS for token in tokens)
+
+        if (
+            not guarded
+            and not question
+            and len(tokens) <= self.MAX_ADD_ITEM_TOKENS
+            and _ADD_ITEM_PATTERN.match(normalized)
+            and self._has_menu_object(normalized)
+            and not _MULTI_CLAUSE_PATTERN.search(user_input.strip())
+        ):
+            return self._result(IntentType.ADD_ITEM, self.RULE_CONFIDENCE, user_input), "rule"
+
+        negated = any(token in NEGATION_WORDS for token in tokens)
+        if not guarded and not negated and len(tokens) <= self.MAX_MODEL_TOKENS and "?" not in user_input:
+            label, probability = self.model.predict(normalized)
+            if label in IntentType.__members__ and IntentType(label) in MODEL_INTENTS and probability >= self.model_threshold:
+                return self._result(IntentType(label), min(probability, self.RULE_CONFIDENCE), user_input), "model"
+
+        return None, None
+
+    @staticmethod
+    def _has_menu_object(normalized: str) -> bool:
+        """An ADD_ITEM opener only counts when the object names something on a menu"""
+        opener = _ADD_ITEM_OPENER_PATTERN.match(normalized)
+        if not opener:
+            return False
+        item_text = normalized[opener.end():]
+        return any(stem in item_text for stem in MENU_HINT_STEMS)
+
+    @staticmethod
+    def _result(intent: IntentType, confidence: float, user_input: str) -> IntentClassificationResult:
+        return IntentClassificationResult(
+            intent=intent,
+            confidence=confidence,
+            cleansed_input=user_input.strip()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate and latency breakdown"""
+        return self.stats.to_dict()
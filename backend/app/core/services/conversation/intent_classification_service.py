@@ -8,13 +8,15 @@ Converted from intent_classifier_node.py to be a reusable service.
 """
 
 import logging
-from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+import time
+from typing import Dict, Any, List, Optional
 from langchain_core.output_parsers import PydanticOutputParser
 from app.commands.intent_classification_schema import IntentType, IntentClassificationResult
 from app.agents.prompts.intent_classification_prompts import get_intent_classification_prompt
 from app.constants.audio_phrases import AudioPhraseType
 from app.core.config import settings
+from app.core.llm_registry import llm_registry
+from app.core.services.conversation.fast_intent_classifier import FastIntentClassifier
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +27,25 @@ class IntentClassificationService:
     
     Pure intent detection - extracts what human wants, doesn't validate against menu.
     Handles multiple items, messy input, and conversation context.
+    
+    Formulaic turns are resolved first by a local FastIntentClassifier; the
+    LLM is only called when the fast path is unsure.
     """
     
-    def __init__(self):
+    def __init__(self, fast_classifier: Optional[FastIntentClassifier] = None):
         """
         Initialize the intent classification service.
+        
+        Args:
+            fast_classifier: Local first-stage classifier (defaults to a new one when
+                ENABLE_FAST_INTENT_CLASSIFIER is on, disabled otherwise)
         """
         self.logger = logging.getLogger(__name__)
+        if fast_classifier is None and settings.ENABLE_FAST_INTENT_CLASSIFIER:
+            fast_classifier = FastIntentClassifier()
+        self.fast_classifier = fast_classifier
+        self._llm_calls = 0
+        self._llm_ms = 0.0
     
     async def classify_intent(
         self,
@@ -52,6 +66,13 @@ class IntentClassificationService:
         Returns:
             IntentClassificationResult with intent, confidence, and cleansed input
         """
+        if self.fast_classifier:
+            fast_result = self.fast_classifier.classify(user_input)
+            if fast_result:
+                self.logger.info(f"Intent fast-path: {fast_result.intent} (confidence: {fast_result.confidence})")
+                return fast_result
+        
+        llm_start = time.perf_counter()
         try:
             # Build context for the LLM (last 3-5 conversation turns)
             context = {
@@ -65,12 +86,8 @@ class IntentClassificationService:
             # Get formatted prompt from the dedicated prompt file
             prompt = get_intent_classification_prompt(user_input, context)
             
-            # Set up LangChain with function calling (more reliable than structured output)
-            llm = ChatOpenAI(
-                model="gpt-4o",
-                api_key=settings.OPENAI_API_KEY,
-                temperature=0.1  
-            ).with_structured_output(IntentClassificationResult, method="function_calling")  
+            # Shared LLM with function calling (more reliable than structured output)
+            llm = llm_registry.get_llm("gpt-4o", temperature=0.1, schema=IntentClassificationResult)
             
             # Execute with structured output
             result = await llm.ainvoke(prompt)
@@ -98,6 +115,22 @@ class IntentClassificationService:
             )
             self.logger.warning(f"Using original input as fallback: '{fallback_result.cleansed_input}'")
             return fallback_result
+        finally:
+            self._llm_calls += 1
+            self._llm_ms += (time.perf_counter() - llm_start) * 1000
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get fast-path hit rate and latency breakdown.
+        
+        Returns:
+            Dict with fast-path stats (if enabled) and LLM call count/latency
+        """
+        return {
+            "fast_path": self.fast_classifier.get_stats() if self.fast_classifier else None,
+            "llm_calls": self._llm_calls,
+            "avg_llm_ms": self._llm_ms / self._llm_calls if self._llm_calls else 0.0
+        }
     
     def should_continue_after_classification(self, result: IntentClassificationResult) -> str:
         """
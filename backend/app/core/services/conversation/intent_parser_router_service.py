@@ -148,7 +148,8 @@ class IntentParserRouterService:
         conversation_history: List[Dict[str, Any]],
         order_state: Dict[str, Any],
         current_state: str = "ORDERING",
-        shared_db_session = None
+        shared_db_session = None,
+        speculative_extraction = None
     ) -> Dict[str, Any]:
         """
         Route intent to appropriate parser and return result.
@@ -161,6 +162,7 @@ class IntentParserRouterService:
             conversation_history: Previous conversation turns
             order_state: Current order state
             current_state: Current conversation state
+            speculative_extraction: Already-running item extraction task for ADD_ITEM (optional)
             
         Returns:
             Dictionary with parsing results and commands
@@ -182,6 +184,8 @@ class IntentParserRouterService:
                 current_state=current_state,
                 shared_db_session=shared_db_session
             )
+            if speculative_extraction is not None and intent_type == IntentType.ADD_ITEM:
+                parser_context["speculative_extraction"] = speculative_extraction
             
             # Debug: Show what context the parser will receive
             print(f"   Parser context keys: {list(parser_context.keys())}")
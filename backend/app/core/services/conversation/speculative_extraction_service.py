@@ -0,0 +1,135 @@
+"""
+Speculative Extraction Service
+
+Opt-in speculation for the most common turn type. Item extraction is started
+on the raw transcript at the same time as intent classification. If the
+intent comes back ADD_ITEM the already-running extraction is handed to the
+AddItemParser; for any other intent it is cancelled and discarded.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+from app.agents.command_agents.item_extraction_agent import item_extraction_agent
+from app.agents.agent_response.item_extraction_response import ItemExtractionResponse
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpeculationStats:
+    """Counters for speculative extraction outcomes"""
+    launched: int = 0
+    saved: int = 0              # Result claimed for an ADD_ITEM turn
+    wasted: int = 0             # LLM call started but result discarded
+    skipped: int = 0            # Cancelled before the LLM call started (e.g. fast-path intent)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary"""
+        resolved = self.saved + self.wasted + self.skipped
+        return {
+            "launched": self.launched,
+            "saved": self.saved,
+            "wasted": self.wasted,
+            "skipped": self.skipped,
+            "hit_rate": self.saved / resolved if resolved else 0.0
+        }
+
+
+class SpeculativeExtraction:
+    """Handle for one in-flight speculative extraction"""
+
+    def __init__(self, user_input: str, context: Dict[str, Any]):
+        self.started = False
+        self.claimed = False
+        self.task = asyncio.create_task(self._run(user_input, context))
+
+    async def _run(self, user_input: str, context: Dict[str, Any]) -> ItemExtractionResponse:
+        self.started = True
+        return await item_extraction_agent(user_input, context)
+
+
+class SpeculativeExtractionService:
+    """
+    Starts, hands off and discards speculative item extractions.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        """
+        Initialize the speculative extraction service.
+
+        Args:
+            enabled: Override for ENABLE_SPECULATIVE_EXTRACTION
+        """
+        self.enabled = settings.ENABLE_SPECULATIVE_EXTRACTION if enabled is None else enabled
+        self.stats = SpeculationStats()
+        self.logger = logging.getLogger(__name__)
+
+    def start(
+        self,
+        user_input: str,
+        restaurant_id: str,
+        conversation_history: List[Dict[str, Any]],
+        order_state: Dict[str, Any]
+    ) -> Optional[SpeculativeExtraction]:
+        """
+        Start item extraction on the raw transcript.
+
+        Args:
+            user_input: Raw user input (before cleansing)
+            restaurant_id: Restaurant identifier
+            conversation_history: Previous conversation turns
+            order_state: Current order state
+
+        Returns:
+            SpeculativeExtraction handle, or None when speculation is disabled
+        """
+        if not self.enabled or not user_input or not user_input.strip():
+            return None
+
+        self.stats.launched += 1
+        return SpeculativeExtraction(user_input, {
+            "restaurant_id": restaurant_id,
+            "conversation_history": conversation_history,
+            "order_state": order_state
+        })
+
+    def claim(self, speculation: Optional[SpeculativeExtraction]) -> Optional[asyncio.Task]:
+        """
+        Claim the extraction for an ADD_ITEM turn.
+
+        Returns:
+            Task resolving to ItemExtractionResponse, or None if there is nothing to claim
+        """
+        if speculation is None or speculation.claimed or speculation.task.cancelled():
+            return None
+        speculation.claimed = True
+        self.stats.saved += 1
+        return speculation.task
+
+    def release(self, speculation: Optional[SpeculativeExtraction]) -> None:
+        """
+        Discard an unclaimed extraction at the end of a turn.
+
+        Safe to call for claimed or missing speculations.
+        """
+        if speculation is None or speculation.claimed:
+            return
+
+        speculation.claimed = True  # Only account for it once
+        if speculation.started:
+            self.stats.wasted += 1
+        else:
+            self.stats.skipped += 1
+        if not speculation.task.done():
+            speculation.task.cancel()
+        elif not speculation.task.cancelled() and speculation.task.exception() is not None:
+            # Reading the exception stops asyncio logging "exception never retrieved"
+            self.logger.debug(f"Discarded failed speculative extraction: {speculation.task.exception()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get saved/wasted speculation counters"""
+        return {"enabled": self.enabled, **self.stats.to_dict()}
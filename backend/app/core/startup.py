@@ -4,45 +4,189 @@ Application Startup Tasks
 Handles initialization tasks that need to run when the application starts
 """
 
+import asyncio
 import logging
+from typing import Optional, Dict, Any
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_async_session
 from app.core.service_factory import ServiceFactory
 from app.core.container import Container
+from app.core.readiness import readiness
 
 logger = logging.getLogger(__name__)
 
+# Startup work that runs past startup_tasks (cancelled on shutdown)
+_background_tasks: set = set()
 
-async def load_menu_cache_on_startup():
+
+async def load_menu_cache_on_startup() -> Optional[Dict[str, Any]]:
     """
     Load menu cache on application startup
     
-    This function should be called when the application starts to pre-populate
-    the menu cache with data from the database.
+    Warms every active restaurant's full menu into the cache (see
+    MenuCacheLoader.warm_up) and marks the instance ready when done. If the
+    warm-up outlasts MENU_CACHE_WARMUP_TIMEOUT_SECONDS the instance is marked
+    ready anyway and loading carries on in the background; menus not loaded
+    yet fall back to the database on first use.
+    
+    Returns:
+        Dict[str, Any]: Warm-up stats, None if it timed out or failed
     """
+    from app.services.menu_cache_loader import MenuCacheLoader
+    from app.services.redis_menu_cache_service import RedisMenuCacheService
+    
+    readiness.begin("menu_cache")
+    task = asyncio.create_task(MenuCacheLoader(RedisMenuCacheService()).warm_up())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
     try:
-        logger.info("Starting menu cache loading on startup...")
-        
-        # For now, skip cache loading during startup to avoid async context issues
-        # The cache will be loaded lazily on first use
-        logger.info("Skipping menu cache loading during startup (will load on first use)")
-        
+        stats = await asyncio.wait_for(asyncio.shield(task), settings.MENU_CACHE_WARMUP_TIMEOUT_SECONDS)
+        readiness.finish("menu_cache", **stats)
+        return stats
+    except asyncio.TimeoutError:
+        logger.warning("Menu cache warm-up timed out; serving traffic while it finishes in the background")
+        readiness.finish("menu_cache", timed_out=True)
     except Exception as e:
         logger.error(f"Menu cache loading failed: {e}")
         # Don't raise the exception - we want the app to start even if cache loading fails
         logger.warning("Application will continue without menu cache")
+        readiness.finish("menu_cache", error=str(e))
+    return None
+
+
+def start_menu_cache_warm_up():
+    """Warm the menu cache in the background; /health reports not ready until it's done"""
+    if not settings.MENU_CACHE_WARMUP_ENABLED:
+        logger.info("Menu cache warm-up disabled (menus load on first use)")
+        return
+    
+    # Not ready from this point on, before the task gets to run
+    readiness.begin("menu_cache")
+    task = asyncio.create_task(load_menu_cache_on_startup())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def preload_canned_phrases(container: Container):
+    """
+    Resolve every active restaurant's canned phrase URLs into memory
+    
+    Restaurants that fail to load here are loaded on their first canned response.
+    """
+    if not settings.CANNED_PHRASES_PRELOAD:
+        logger.info("Canned phrase preload disabled (tables load on first use)")
+        return
+    
+    try:
+        from app.models.restaurant import Restaurant
+        
+        async with get_async_session() as db:
+            result = await db.execute(select(Restaurant.id).where(Restaurant.is_active.is_(True)))
+            restaurant_ids = [row[0] for row in result.fetchall()]
+        
+        voice_service = container.voice_service()
+        loaded = await voice_service.canned_phrases.preload(restaurant_ids)
+        logger.info(f"Preloaded canned phrase tables for {loaded} restaurants")
+    except Exception as e:
+        logger.error(f"Canned phrase preload failed: {e}")
+        logger.warning("Canned phrase tables will load on first use")
+
+
+async def start_audio_archive(container: Container):
+    """
+    Start the archive workers and re-queue recordings spooled before the last shutdown
+    """
+    try:
+        voice_service = container.voice_service()
+        recovered = await voice_service.audio_archive.start()
+        logger.info(f"Audio archive queue started ({recovered} spooled recordings recovered)")
+    except Exception as e:
+        logger.error(f"Audio archive queue failed to start: {e}")
+        logger.warning("Recordings will be spooled and the workers started on first use")
+
+
+async def start_menu_cache_sync():
+    """
+    Subscribe this worker to menu cache invalidations from the other workers
+    
+    Without the listener a worker's in-process menu copy still catches up on
+    its next background revalidation (MENU_CACHE_REFRESH_SECONDS).
+    """
+    try:
+        from app.services.redis_menu_cache_service import RedisMenuCacheService
+        
+        await RedisMenuCacheService().start_invalidation_listener()
+        logger.info("Menu cache invalidation listener started")
+    except Exception as e:
+        logger.error(f"Menu cache invalidation listener failed to start: {e}")
+
+
+async def start_inventory_reservation_sweeper(container: Container):
+    """
+    Release stock held by orders abandoned without a cancel (one sweeper per worker)
+    """
+    if not settings.ENABLE_INVENTORY_CHECKING:
+        return
+    try:
+        await container.inventory_reservations().start()
+        logger.info("Inventory reservation sweeper started")
+    except Exception as e:
+        logger.error(f"Inventory reservation sweeper failed to start: {e}")
 
 
-async def startup_tasks():
+async def startup_tasks(container: Container = None):
     """
     Run all startup tasks
     
     This function should be called when the application starts
+    
+    Args:
+        container: Application container (needed for service warm-up)
     """
     logger.info("Running application startup tasks...")
     
-    # Skip menu cache loading during startup to avoid async context issues
-    # Cache will be loaded lazily on first use
-    logger.info("Skipping menu cache loading during startup (lazy loading enabled)")
+    if container is not None:
+        await preload_canned_phrases(container)
+        await start_audio_archive(container)
+        await start_inventory_reservation_sweeper(container)
+    
+    await start_menu_cache_sync()
+    start_menu_cache_warm_up()
     
     logger.info("Application startup tasks completed")
+
+
+async def shutdown_tasks(container: Container):
+    """
+    Run shutdown tasks that need the event loop (before the container's resources close)
+    
+    Args:
+        container: Application container
+    """
+    logger.info("Running application shutdown tasks...")
+    
+    # Upload spooled recordings while storage is still open; leftovers stay spooled for the next start
+    try:
+        voice_service = container.voice_service()
+        drained = await voice_service.audio_archive.stop()
+        logger.info(f"Audio archive queue stopped ({'drained' if drained else 'backlog left in spool'})")
+    except Exception as e:
+        logger.error(f"Audio archive flush failed: {e}")
+    
+    try:
+        await container.inventory_reservations().stop()
+    except Exception as e:
+        logger.error(f"Inventory reservation sweeper failed to stop: {e}")
+    
+    for task in list(_background_tasks):
+        task.cancel()
+    
+    try:
+        from app.services.redis_menu_cache_service import menu_snapshot_cache
+        await menu_snapshot_cache.stop_listener()
+    except Exception as e:
+        logger.error(f"Menu cache invalidation listener failed to stop: {e}")
+    
+    logger.info("Application shutdown tasks completed")
@@ -11,6 +11,7 @@ from ..repository.restaurant_repository import RestaurantRepository
 from ..repository.menu_item_repository import MenuItemRepository
 from ..repository.inventory_repository import InventoryRepository
 from ..repository.menu_item_ingredient_repository import MenuItemIngredientRepository
+from ..repository.ingredient_repository import IngredientRepository
 
 
 class UnitOfWork:
@@ -92,6 +93,13 @@ class UnitOfWork:
             self._repositories['menu_item_ingredients'] = MenuItemIngredientRepository(self.db)
         return self._repositories['menu_item_ingredients']
     
+    @property
+    def ingredients(self) -> IngredientRepository:
+        """Get IngredientRepository instance"""
+        if 'ingredients' not in self._repositories:
+            self._repositories['ingredients'] = IngredientRepository(self.db)
+        return self._repositories['ingredients']
+    
     async def commit(self):
         """Commit all changes in the transaction"""
         if not self._committed:
@@ -0,0 +1,69 @@
+"""
+Cached menu item DTO - the menu cache's read-only stand-in for MenuItem
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Optional, Tuple, Dict, Any
+
+from sqlalchemy import inspect
+
+
+@dataclass(frozen=True, slots=True)
+class CachedMenuItem:
+    """
+    Immutable menu item as stored in the menu cache
+
+    Has the MenuItem attributes the turn path reads (id, name, price,
+    is_available, ...) without an ORM instance, session or lazy loads, so one
+    instance can be shared by every request in the process.
+    """
+    id: int
+    name: str
+    description: Optional[str]
+    price: float
+    image_url: Optional[str]
+    category_id: Optional[int]
+    restaurant_id: int
+    is_available: bool
+    is_upsell: bool
+    is_special: bool
+    prep_time_minutes: Optional[int]
+    display_order: Optional[int]
+    updated_at: Optional[str]
+    tags: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_model(cls, item) -> "CachedMenuItem":
+        """Copy a MenuItem (tags only if already loaded - never lazy-load in async code)"""
+        tags = ()
+        if "tags" not in inspect(item).unloaded:
+            tags = tuple(link.tag.name for link in item.tags if link.tag is not None)
+        return cls(
+            id=item.id,
+            name=item.name,
+            description=item.description,
+            price=float(item.price) if item.price else 0.0,
+            image_url=item.image_url,
+            category_id=item.category_id,
+            restaurant_id=item.restaurant_id,
+            is_available=bool(item.is_available),
+            is_upsell=bool(item.is_upsell),
+            is_special=bool(item.is_special),
+            prep_time_minutes=item.prep_time_minutes,
+            display_order=item.display_order,
+            updated_at=item.updated_at.isoformat() if item.updated_at else None,
+            tags=tags
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedMenuItem":
+        # Ignore fields written by a newer deploy sharing the same Redis
+        fields = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        return cls(**{**fields, "tags": tuple(data.get("tags") or ())})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "tags": list(self.tags)}
+
+    @property
+    def formatted_price(self) -> str:
+        return f"${self.price:.2f}" if self.price else "$0.00"
@@ -2,9 +2,9 @@
 Ingredient repository for data access operations
 """
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from .base_repository import BaseRepository
 from ..models.ingredient import Ingredient
 
@@ -34,6 +34,27 @@ class IngredientRepository(BaseRepository[Ingredient]):
         )
         return result.scalar_one_or_none()
     
+    async def get_by_names_and_restaurant(self, names: Iterable[str], restaurant_id: int) -> Dict[str, Ingredient]:
+        """
+        Get several ingredients of a restaurant by name in one query (case-insensitive)
+        
+        Args:
+            names: Ingredient names
+            restaurant_id: Restaurant ID
+            
+        Returns:
+            Dict[str, Ingredient]: Ingredients found, keyed by lowercased name
+        """
+        names = {name.lower() for name in names}
+        if not names:
+            return {}
+        
+        result = await self.db.execute(
+            select(Ingredient)
+            .where(func.lower(Ingredient.name).in_(names), Ingredient.restaurant_id == restaurant_id)
+        )
+        return {ingredient.name.lower(): ingredient for ingredient in result.scalars().all()}
+    
     async def get_by_restaurant(self, restaurant_id: int, skip: int = 0, limit: int = 100) -> List[Ingredient]:
         """
         Get all ingredients for a restaurant
@@ -2,9 +2,9 @@
 Inventory repository for data access operations
 """
 
-from typing import Optional, List
+from typing import Optional, List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, case, func
 from .base_repository import BaseRepository
 from ..models.inventory import Inventory
 
@@ -29,6 +29,41 @@ class InventoryRepository(BaseRepository[Inventory]):
         """
         return await self.get_by_field("ingredient_id", ingredient_id)
     
+    async def consume_stock(self, quantities: Dict[int, float], allow_negative: bool = False) -> List[int]:
+        """
+        Take stock off several ingredients in one UPDATE, skipping any row that
+        doesn't have enough left (unless negative stock is allowed)
+        
+        Args:
+            quantities: Quantity to take by ingredient ID
+            allow_negative: Take it even when there isn't enough; the stock bottoms
+                out at zero (current_stock has a >= 0 check constraint)
+            
+        Returns:
+            List[int]: Ingredient IDs whose stock was taken
+        """
+        quantities = {ingredient_id: quantity for ingredient_id, quantity in quantities.items() if quantity}
+        if not quantities:
+            return []
+        
+        needed = case(quantities, value=Inventory.ingredient_id)
+        statement = update(Inventory).where(Inventory.ingredient_id.in_(quantities))
+        if allow_negative:
+            # One short row would otherwise violate the constraint and roll back the whole UPDATE
+            remaining = func.greatest(Inventory.current_stock - needed, 0)
+        else:
+            statement = statement.where(Inventory.current_stock >= needed)
+            remaining = Inventory.current_stock - needed
+        result = await self.db.execute(
+            statement
+            .values(current_stock=remaining)
+            .returning(Inventory.ingredient_id)
+            .execution_options(synchronize_session=False)
+        )
+        consumed = list(result.scalars().all())
+        await self.db.flush()  # Flush but don't commit - use UnitOfWork
+        return consumed
+    
     async def get_low_stock_items(self, skip: int = 0, limit: int = 100) -> List[Inventory]:
         """
         Get all inventory items that are low on stock
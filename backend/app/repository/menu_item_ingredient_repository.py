@@ -2,11 +2,13 @@
 MenuItemIngredient repository for data access operations
 """
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from .base_repository import BaseRepository
 from ..models.menu_item_ingredient import MenuItemIngredient
+from ..models.ingredient import Ingredient
 
 
 class MenuItemIngredientRepository(BaseRepository[MenuItemIngredient]):
@@ -51,6 +53,32 @@ class MenuItemIngredientRepository(BaseRepository[MenuItemIngredient]):
         """
         return await self.get_all_by_filter({"menu_item_id": menu_item_id}, skip, limit)
     
+    async def get_by_menu_items_with_inventory(self, menu_item_ids: Iterable[int]) -> Dict[int, List[MenuItemIngredient]]:
+        """
+        Get the ingredients of several menu items, each with its ingredient and
+        that ingredient's inventory, in one joined query
+        
+        Args:
+            menu_item_ids: Menu item IDs
+            
+        Returns:
+            Dict[int, List[MenuItemIngredient]]: Ingredients by menu item ID (empty list for items without any)
+        """
+        menu_item_ids = list(dict.fromkeys(menu_item_ids))
+        menu_item_ingredients: Dict[int, List[MenuItemIngredient]] = {menu_item_id: [] for menu_item_id in menu_item_ids}
+        if not menu_item_ids:
+            return menu_item_ingredients
+        
+        result = await self.db.execute(
+            select(MenuItemIngredient)
+            .where(MenuItemIngredient.menu_item_id.in_(menu_item_ids))
+            .options(joinedload(MenuItemIngredient.ingredient).joinedload(Ingredient.inventory))
+            .order_by(MenuItemIngredient.menu_item_id, MenuItemIngredient.id)
+        )
+        for menu_item_ingredient in result.scalars().all():
+            menu_item_ingredients[menu_item_ingredient.menu_item_id].append(menu_item_ingredient)
+        return menu_item_ingredients
+    
     async def get_by_ingredient(self, ingredient_id: int, skip: int = 0, limit: int = 100) -> List[MenuItemIngredient]:
         """
         Get all menu items that use a specific ingredient
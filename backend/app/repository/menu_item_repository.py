@@ -2,11 +2,13 @@
 MenuItem repository for data access operations
 """
 
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from sqlalchemy.orm import selectinload
 from .base_repository import BaseRepository
 from ..models.menu_item import MenuItem
+from ..models.menu_item_tag import MenuItemTag
 
 
 class MenuItemRepository(BaseRepository[MenuItem]):
@@ -90,6 +92,53 @@ class MenuItemRepository(BaseRepository[MenuItem]):
         """
         return await self.get_all_by_filter({"restaurant_id": restaurant_id}, skip, limit)
     
+    async def stream_by_restaurant(self, restaurant_id: int, page_size: int = 500) -> AsyncIterator[List[MenuItem]]:
+        """
+        Stream every menu item for a restaurant in pages, with tags loaded
+        
+        Keyset pagination on id, so each page is an index range scan no matter
+        how deep into the menu it is (OFFSET would rescan the skipped rows).
+        
+        Args:
+            restaurant_id: Restaurant ID
+            page_size: Menu items per query
+            
+        Yields:
+            List[MenuItem]: Next page of menu items, ordered by id
+        """
+        last_id = 0
+        while True:
+            result = await self.db.execute(
+                select(MenuItem)
+                .where(MenuItem.restaurant_id == restaurant_id, MenuItem.id > last_id)
+                .order_by(MenuItem.id)
+                .limit(page_size)
+                .options(selectinload(MenuItem.tags).selectinload(MenuItemTag.tag))
+            )
+            page = result.scalars().all()
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1].id
+    
+    async def get_all_by_restaurant(self, restaurant_id: int, page_size: int = 500) -> List[MenuItem]:
+        """
+        Get every menu item for a restaurant (get_by_restaurant stops at its limit)
+        
+        Args:
+            restaurant_id: Restaurant ID
+            page_size: Menu items per query
+            
+        Returns:
+            List[MenuItem]: All menu items for the restaurant, ordered by id
+        """
+        menu_items: List[MenuItem] = []
+        async for page in self.stream_by_restaurant(restaurant_id, page_size):
+            menu_items.extend(page)
+        return menu_items
+    
     async def get_available_by_restaurant(self, restaurant_id: int, skip: int = 0, limit: int = 100) -> List[MenuItem]:
         """
         Get all available menu items for a restaurant
@@ -2,11 +2,15 @@
 Restaurant repository for data access operations
 """
 
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import contains_eager
 from .base_repository import BaseRepository
 from ..models.restaurant import Restaurant
+from ..models.category import Category
+from ..models.menu_item import MenuItem
+from ..models.menu_item_tag import MenuItemTag
 
 
 class RestaurantRepository(BaseRepository[Restaurant]):
@@ -103,4 +107,60 @@ class RestaurantRepository(BaseRepository[Restaurant]):
             restaurant = await self.get_by_id(restaurant_id)
             return restaurant is not None and getattr(restaurant, 'is_active', True)
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+    async def stream_active_ids(self, page_size: int = 1000) -> AsyncIterator[List[int]]:
+        """
+        Stream the IDs of all active restaurants in pages (keyset pagination on id)
+        
+        Args:
+            page_size: IDs per query
+            
+        Yields:
+            List[int]: Next page of restaurant IDs, ascending
+        """
+        last_id = 0
+        while True:
+            result = await self.db.execute(
+                select(Restaurant.id)
+                .where(Restaurant.is_active.is_(True), Restaurant.id > last_id)
+                .order_by(Restaurant.id)
+                .limit(page_size)
+            )
+            ids = list(result.scalars().all())
+            if not ids:
+                return
+            yield ids
+            if len(ids) < page_size:
+                return
+            last_id = ids[-1]
+    
+    async def get_public_menu(self, restaurant_id: int) -> Optional[Restaurant]:
+        """
+        Load a restaurant with its active categories, available items and their tags in one query
+
+        Outer joins keep the restaurant when it has no categories, items or tags;
+        the join criteria filter the collections rather than the restaurant.
+
+        Args:
+            restaurant_id: Restaurant ID
+
+        Returns:
+            Optional[Restaurant]: Restaurant with categories, menu_items and tags populated, None if not found
+        """
+        result = await self.db.execute(
+            select(Restaurant)
+            .outerjoin(Restaurant.categories.and_(Category.is_active.is_(True)))
+            .outerjoin(Category.menu_items.and_(MenuItem.is_available.is_(True)))
+            .outerjoin(MenuItem.tags)
+            .outerjoin(MenuItemTag.tag)
+            .where(Restaurant.id == restaurant_id)
+            .options(
+                contains_eager(Restaurant.categories)
+                .contains_eager(Category.menu_items)
+                .contains_eager(MenuItem.tags)
+                .contains_eager(MenuItemTag.tag)
+            )
+            .execution_options(populate_existing=True)
+        )
+        return result.unique().scalar_one_or_none()
@@ -0,0 +1,337 @@
+"""
+Audio archive queue - write-behind archival of customer recordings
+
+Recordings are kept for audit, but nothing in a turn reads them back, so the
+pipeline only spools each recording to local disk and carries on; background
+workers upload the spool to file storage with retries. Spooled recordings
+survive a restart and are picked up again by start().
+
+Spool layout (AUDIO_ARCHIVE_SPOOL_DIR):
+- {id}.audio + {id}.json   waiting to be uploaded (JSON holds name, type, attempts)
+- failed/                  gave up after AUDIO_ARCHIVE_MAX_ATTEMPTS, kept for inspection
+
+Uploads that fail during flush() don't count towards AUDIO_ARCHIVE_MAX_ATTEMPTS:
+a storage outage at shutdown leaves the backlog spooled rather than failed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, Any, Set
+
+from ..core.config import settings
+from .audio_buffer import AudioData
+
+logger = logging.getLogger(__name__)
+
+
+class AudioArchiveQueue:
+    """
+    Durable background uploader for recordings that don't need to block a turn
+    """
+
+    def __init__(
+        self,
+        file_storage_service,
+        spool_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            file_storage_service: Storage the recordings are archived to
+            spool_dir: Local spool directory (defaults to AUDIO_ARCHIVE_SPOOL_DIR)
+            workers: Concurrent uploads (defaults to AUDIO_ARCHIVE_WORKERS)
+            max_attempts: Uploads tried before a recording is moved to failed/ (defaults to AUDIO_ARCHIVE_MAX_ATTEMPTS)
+            retry_base_seconds: First retry delay, doubled per attempt (defaults to AUDIO_ARCHIVE_RETRY_BASE_SECONDS)
+        """
+        self.file_storage_service = file_storage_service
+        self.spool_dir = Path(spool_dir or settings.AUDIO_ARCHIVE_SPOOL_DIR)
+        self.failed_dir = self.spool_dir / "failed"
+        self.workers = max(1, workers or settings.AUDIO_ARCHIVE_WORKERS)
+        self.max_attempts = max_attempts or settings.AUDIO_ARCHIVE_MAX_ATTEMPTS
+        self.retry_base_seconds = settings.AUDIO_ARCHIVE_RETRY_BASE_SECONDS if retry_base_seconds is None else retry_base_seconds
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: Set[asyncio.Task] = set()
+        self._retry_handles: Dict[str, asyncio.TimerHandle] = {}
+        # id -> (size in bytes, spooled at); everything not yet uploaded or given up on
+        self._pending: Dict[str, tuple] = {}
+        self._idle: Optional[asyncio.Event] = None
+        # Set while flush() runs; failures then don't use up an entry's attempts
+        self._flushing = False
+        self._stats = {"enqueued": 0, "uploaded": 0, "retries": 0, "failed": 0, "spool_errors": 0}
+
+    # ===== SPOOL =====
+
+    def _paths(self, archive_id: str):
+        return self.spool_dir / f"{archive_id}.audio", self.spool_dir / f"{archive_id}.json"
+
+    def _write_spool(self, archive_id: str, audio_data: AudioData, metadata: Dict[str, Any]) -> None:
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        audio_path, meta_path = self._paths(archive_id)
+        # Metadata last, and renamed into place: an entry only exists once its audio is complete
+        audio_path.write_bytes(audio_data)
+        tmp_path = meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(metadata))
+        os.replace(tmp_path, meta_path)
+
+    def _read_metadata(self, archive_id: str) -> Dict[str, Any]:
+        return json.loads(self._paths(archive_id)[1].read_text())
+
+    def _update_metadata(self, archive_id: str, metadata: Dict[str, Any]) -> None:
+        meta_path = self._paths(archive_id)[1]
+        tmp_path = meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(metadata))
+        os.replace(tmp_path, meta_path)
+
+    def _remove(self, archive_id: str) -> None:
+        for path in self._paths(archive_id):
+            path.unlink(missing_ok=True)
+
+    def _move_to_failed(self, archive_id: str) -> None:
+        self.failed_dir.mkdir(parents=True, exist_ok=True)
+        for path in self._paths(archive_id):
+            if path.exists():
+                os.replace(path, self.failed_dir / path.name)
+
+    # ===== QUEUE =====
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._idle = asyncio.Event()
+            self._idle.set()
+        if not self._worker_tasks:
+            for _ in range(self.workers):
+                task = asyncio.create_task(self._worker())
+                self._worker_tasks.add(task)
+                task.add_done_callback(self._worker_tasks.discard)
+
+    def _track(self, archive_id: str, size: int, spooled_at: float) -> None:
+        self._pending[archive_id] = (size, spooled_at)
+        self._idle.clear()
+        self._queue.put_nowait(archive_id)
+
+    def _untrack(self, archive_id: str) -> None:
+        self._pending.pop(archive_id, None)
+        if not self._pending:
+            self._idle.set()
+
+    async def start(self) -> int:
+        """
+        Start the workers and queue recordings left in the spool by a previous run
+
+        Returns:
+            int: Number of recovered recordings
+        """
+        self._ensure_started()
+        if not self.spool_dir.exists():
+            return 0
+
+        recovered = 0
+        for meta_path in sorted(self.spool_dir.glob("*.json")):
+            archive_id = meta_path.stem
+            audio_path = self._paths(archive_id)[0]
+            if archive_id in self._pending or not audio_path.exists():
+                continue
+            self._track(archive_id, audio_path.stat().st_size, meta_path.stat().st_mtime)
+            recovered += 1
+        if recovered:
+            logger.info(f"Recovered {recovered} spooled recordings for archival")
+        return recovered
+
+    async def enqueue(
+        self,
+        audio_data: AudioData,
+        file_name: str,
+        content_type: str,
+        restaurant_id: Optional[int] = None,
+        session_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Spool a recording for upload; returns once it is safely on local disk
+
+        Args:
+            audio_data: Recording bytes (written straight from the caller's buffer)
+            file_name: Original file name
+            content_type: MIME type
+            restaurant_id: Restaurant ID for multitenancy
+            session_id: Session ID for tracking
+
+        Returns:
+            str: Archive ID, or None if the recording couldn't be spooled
+        """
+        self._ensure_started()
+        archive_id = uuid.uuid4().hex
+        metadata = {
+            "file_name": file_name,
+            "content_type": content_type,
+            "restaurant_id": restaurant_id,
+            "session_id": session_id,
+            "attempts": 0,
+        }
+        try:
+            await asyncio.to_thread(self._write_spool, archive_id, audio_data, metadata)
+        except OSError as e:
+            self._stats["spool_errors"] += 1
+            logger.error(f"Failed to spool recording {file_name} for archival: {e}")
+            return None
+
+        self._stats["enqueued"] += 1
+        self._track(archive_id, len(audio_data), time.time())
+        return archive_id
+
+    async def _worker(self) -> None:
+        while True:
+            archive_id = await self._queue.get()
+            try:
+                await self._upload(archive_id)
+            except Exception as e:
+                logger.error(f"Unexpected error archiving recording {archive_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _upload(self, archive_id: str) -> None:
+        try:
+            metadata = await asyncio.to_thread(self._read_metadata, archive_id)
+            audio_data = await asyncio.to_thread(self._paths(archive_id)[0].read_bytes)
+        except (OSError, ValueError) as e:
+            logger.error(f"Spooled recording {archive_id} is unreadable, moving it to failed/: {e}")
+            await asyncio.to_thread(self._move_to_failed, archive_id)
+            self._stats["failed"] += 1
+            self._untrack(archive_id)
+            return
+
+        try:
+            result = await self.file_storage_service.store_file(
+                file_data=audio_data,
+                file_name=metadata["file_name"],
+                content_type=metadata["content_type"],
+                restaurant_id=metadata.get("restaurant_id")
+            )
+            error = None if result.is_success else result.message
+        except Exception as e:
+            error = str(e)
+
+        if error is None:
+            await asyncio.to_thread(self._remove, archive_id)
+            self._stats["uploaded"] += 1
+            self._untrack(archive_id)
+            logger.debug(f"Archived recording {metadata['file_name']} ({archive_id})")
+            return
+
+        if self._flushing:
+            delay = self.retry_base_seconds * 2 ** max(metadata["attempts"] - 1, 0)
+            logger.warning(f"Archiving {metadata['file_name']} failed during flush (not counted as an attempt): {error}")
+            self._stats["retries"] += 1
+            self._retry_handles[archive_id] = asyncio.get_running_loop().call_later(delay, self._retry, archive_id)
+            return
+
+        metadata["attempts"] += 1
+        if metadata["attempts"] >= self.max_attempts:
+            logger.error(f"Giving up archiving {metadata['file_name']} after {metadata['attempts']} attempts: {error}")
+            await asyncio.to_thread(self._move_to_failed, archive_id)
+            self._stats["failed"] += 1
+            self._untrack(archive_id)
+            return
+
+        await asyncio.to_thread(self._update_metadata, archive_id, metadata)
+        delay = self.retry_base_seconds * 2 ** (metadata["attempts"] - 1)
+        logger.warning(f"Archiving {metadata['file_name']} failed (attempt {metadata['attempts']}), retrying in {delay:.1f}s: {error}")
+        self._stats["retries"] += 1
+        self._retry_handles[archive_id] = asyncio.get_running_loop().call_later(delay, self._retry, archive_id)
+
+    def _retry(self, archive_id: str) -> None:
+        self._retry_handles.pop(archive_id, None)
+        self._queue.put_nowait(archive_id)
+
+    # ===== LIFECYCLE =====
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Upload everything spooled so far, retrying each failure once without waiting out its backoff
+
+        Failures during the flush don't count towards max_attempts, so a storage
+        outage leaves recordings spooled instead of moving them to failed/.
+
+        Args:
+            timeout: Give up waiting after this many seconds (defaults to AUDIO_ARCHIVE_FLUSH_TIMEOUT_SECONDS)
+
+        Returns:
+            bool: True if the backlog drained; anything left stays spooled for the next start()
+        """
+        if not self._pending:
+            return True
+        self._ensure_started()
+        timeout = settings.AUDIO_ARCHIVE_FLUSH_TIMEOUT_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        retried: Set[str] = set()
+
+        self._flushing = True
+        try:
+            while self._pending and time.monotonic() < deadline:
+                for archive_id, handle in list(self._retry_handles.items()):
+                    if archive_id in retried:
+                        continue
+                    handle.cancel()
+                    self._retry(archive_id)
+                    retried.add(archive_id)
+                # Done once everything left has failed its one flush retry
+                if all(archive_id in retried and archive_id in self._retry_handles for archive_id in self._pending):
+                    break
+                try:
+                    await asyncio.wait_for(self._idle.wait(), timeout=min(0.1, max(0.0, deadline - time.monotonic())))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._flushing = False
+
+        if self._pending:
+            logger.warning(f"{len(self._pending)} recordings still spooled after flush; they will be archived on next start")
+            return False
+        return True
+
+    async def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush the backlog, then stop the workers (shutdown)
+
+        Returns:
+            bool: True if nothing was left in the spool
+        """
+        drained = await self.flush(timeout)
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in list(self._worker_tasks):
+            task.cancel()
+        if self._worker_tasks:
+            await asyncio.gather(*list(self._worker_tasks), return_exceptions=True)
+        # Whatever is left is re-read from the spool by the next start()
+        self._queue = None
+        self._pending.clear()
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get archival counters and backlog
+
+        Returns:
+            Dict[str, Any]: Backlog size/bytes/age plus enqueued, uploaded, retried and failed counts
+        """
+        now = time.time()
+        return {
+            **self._stats,
+            "backlog": len(self._pending),
+            "backlog_bytes": sum(size for size, _ in self._pending.values()),
+            "oldest_seconds": round(max((now - spooled_at for _, spooled_at in self._pending.values()), default=0.0), 1),
+            "waiting_to_retry": len(self._retry_handles),
+            "workers": len(self._worker_tasks),
+        }
@@ -0,0 +1,42 @@
+"""
+Audio buffer helpers - read an upload once and share it without copying
+
+A turn's recording (up to 10 MB) is read from the upload a single time into
+an immutable bytes object and passed around as a memoryview over it.
+Validation, archival, preprocessing and speech-to-text all work on that one
+buffer; as_bytes() hands the original object to APIs that insist on bytes.
+"""
+
+from typing import Union
+
+from fastapi import UploadFile
+
+AudioData = Union[bytes, bytearray, memoryview]
+
+
+async def read_upload(audio_file: UploadFile) -> memoryview:
+    """
+    Read an uploaded file exactly once
+
+    Args:
+        audio_file: Upload to read (from the start)
+
+    Returns:
+        memoryview: Read-only view over the file contents
+    """
+    await audio_file.seek(0)
+    return memoryview(await audio_file.read())
+
+
+def as_bytes(data: AudioData) -> bytes:
+    """
+    bytes for the given buffer, without copying when it views a whole bytes object
+
+    io.BytesIO and HTTP clients copy memoryviews but share bytes, so
+    unwrapping the view keeps a single copy of the audio in memory.
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, memoryview) and isinstance(data.obj, bytes) and data.nbytes == len(data.obj) and data.contiguous:
+        return data.obj
+    return bytes(data)
@@ -2,12 +2,14 @@
 Audio Pipeline Service for orchestrating the complete audio processing flow
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 import time
 import uuid
 
+from ..core.config import settings
 from ..dto.order_result import OrderResult
 from ..models.language import Language
 from .validation_interface import ValidationServiceInterface
@@ -16,6 +18,11 @@ from ..core.conversation_orchestrator import ConversationOrchestrator
 from ..core.logging import get_logger
 from ..constants.audio_phrases import AudioPhraseType
 from ..repository.restaurant_repository import RestaurantRepository
+from .speech_segmenter import SpeechSegmenter, pcm_to_wav
+from .audio_buffer import AudioData, read_upload
+from .audio_preprocessor import AudioPreprocessor, AudioTooLongError, PreparedAudio
+
+STREAM_PCM_FORMAT = "pcm16"
 
 
 class AudioPipelineService:
@@ -34,6 +41,7 @@ class AudioPipelineService:
         self.validation_service = validation_service
         self.order_session_service = order_session_service
         self.conversation_orchestrator = conversation_orchestrator
+        self.audio_preprocessor = AudioPreprocessor()
         self.logger = get_logger(__name__)
     
     async def process_audio_pipeline(
@@ -70,41 +78,34 @@ class AudioPipelineService:
             await self._validate_request_inputs(restaurant_id, session_id, language, db, request_id)
             self.logger.debug(f"[{request_id}] Input validation passed")
             
+            # Read the upload once; validation, archival and STT share this buffer
+            audio_data = await read_upload(audio_file)
+            self.logger.debug(f"[{request_id}] Read audio data - Size: {audio_data.nbytes} bytes")
+            
             # Step 1: Validate audio file
-            self.logger.debug(f"[{request_id}] Step 1: Validating audio file - Type: {audio_file.content_type}, Size: {audio_file.size}")
+            self.logger.debug(f"[{request_id}] Step 1: Validating audio file - Type: {audio_file.content_type}, Size: {audio_data.nbytes}")
             validation_start = time.time()
-            validation_result = await self._validate_audio_file(audio_file)
+            validation_result = await self._validate_audio_file(audio_file, audio_data)
             validation_duration = time.time() - validation_start
             
-            if not validation_result.success:
+            if validation_result.is_error:
                 self.logger.warning(f"[{request_id}] Audio validation failed: {validation_result.message}")
                 # Instead of raising an exception, generate a fallback response
                 return await self._generate_fallback_response(request_id, session_id, restaurant_id, "Audio validation failed")
             
             self.logger.debug(f"[{request_id}] Audio validation passed in {validation_duration:.2f}s")
             
-            # Read audio data
-            self.logger.info(f"[{request_id}] DEBUG: About to read audio file data...")
-            audio_data = await audio_file.read()
-            self.logger.info(f"[{request_id}] DEBUG: Read audio data - Size: {len(audio_data) if audio_data else 'None'}, Type: {type(audio_data)}")
-            if audio_data:
-                self.logger.info(f"[{request_id}] DEBUG: First 20 bytes: {audio_data[:20].hex() if len(audio_data) >= 20 else audio_data.hex()}")
-            else:
-                self.logger.error(f"[{request_id}] DEBUG: audio_data is None! This is the problem!")
-            
-            # Step 2: Store audio file
-            self.logger.debug(f"[{request_id}] Step 2: Storing audio file")
+            # Step 2: Archive audio file (spooled locally and uploaded in the background)
+            self.logger.debug(f"[{request_id}] Step 2: Archiving audio file")
             store_start = time.time()
             store_result = await self._store_audio_file(audio_file, audio_data, restaurant_id, session_id)
             store_duration = time.time() - store_start
             
-            if not store_result.success or not store_result.data:
-                self.logger.error(f"[{request_id}] Audio storage failed: {store_result.message}")
-                # Instead of raising an exception, generate a fallback response
-                return await self._generate_fallback_response(request_id, session_id, restaurant_id, "Audio storage failed")
-            
-            file_id = store_result.data["file_id"]
-            self.logger.info(f"[{request_id}] Audio stored successfully - File ID: {file_id}, Duration: {store_duration:.2f}s")
+            if store_result.is_success:
+                self.logger.info(f"[{request_id}] Audio queued for archival - Archive ID: {store_result.data['archive_id']}, Duration: {store_duration:.2f}s")
+            else:
+                # Nothing in the turn needs the stored recording, so carry on without it
+                self.logger.error(f"[{request_id}] Audio archival failed: {store_result.message}")
             
             # Step 3: Speech-to-text
             self.logger.info(f"[{request_id}] DEBUG: Step 3: Starting speech-to-text transcription...")
@@ -131,22 +132,51 @@ class AudioPipelineService:
             
             self.logger.info(f"[{request_id}] Speech transcribed successfully - Duration: {speech_duration:.2f}s")
             
-            # Step 4: Safety validation
-            self.logger.debug(f"[{request_id}] Step 4: Validating transcript for safety")
-            validation_start = time.time()
-            guard_result = await self._validate_transcript(transcript)
-            validation_duration = time.time() - validation_start
-            
-            if not guard_result.success:
-                self.logger.warning(f"[{request_id}] Transcript validation failed: {guard_result.message}")
-                raise ValueError(f"Transcript validation failed: {guard_result.message}")
+            return await self._run_conversation_turn(request_id, transcript, session_id, restaurant_id, start_time)
             
-            self.logger.debug(f"[{request_id}] Transcript validation passed in {validation_duration:.2f}s")
-            
-            # Step 5: Store transcript (already done in Step 3.5)
-            self.logger.debug(f"[{request_id}] Step 5: Transcript already stored in Step 3.5")
+        except Exception as e:
+            return await self._error_state(request_id, session_id, restaurant_id, start_time, e)
+    
+    async def _run_conversation_turn(
+        self,
+        request_id: str,
+        transcript: str,
+        session_id: str,
+        restaurant_id: int,
+        start_time: float,
+        workflow_state: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the post-transcription steps shared by uploaded and streamed audio
+        
+        Args:
+            request_id: Request ID for log correlation
+            transcript: What the customer said
+            session_id: Session ID for conversation state
+            restaurant_id: Restaurant ID for context
+            start_time: When the request started (for the total duration log)
+            workflow_state: Session state fetched ahead of time, if any
             
-            # Step 6: Get session state from OrderSessionService
+        Returns:
+            Dict[str, Any]: Completed workflow state
+        """
+        # Step 4: Safety validation
+        self.logger.debug(f"[{request_id}] Step 4: Validating transcript for safety")
+        validation_start = time.time()
+        guard_result = await self._validate_transcript(transcript)
+        validation_duration = time.time() - validation_start
+        
+        if not guard_result.success:
+            self.logger.warning(f"[{request_id}] Transcript validation failed: {guard_result.message}")
+            raise ValueError(f"Transcript validation failed: {guard_result.message}")
+        
+        self.logger.debug(f"[{request_id}] Transcript validation passed in {validation_duration:.2f}s")
+        
+        # Step 5: Store transcript (already done in Step 3.5)
+        self.logger.debug(f"[{request_id}] Step 5: Transcript already stored in Step 3.5")
+        
+        # Step 6: Get session state from OrderSessionService
+        if workflow_state is None:
             self.logger.debug(f"[{request_id}] Step 6: Retrieving session state")
             session_start = time.time()
             workflow_state = await self.order_session_service.get_conversation_workflow_state(
@@ -155,75 +185,120 @@ class AudioPipelineService:
             )
             session_duration = time.time() - session_start
             self.logger.debug(f"[{request_id}] Session state retrieved in {session_duration:.2f}s - State: {workflow_state.get('current_state', 'UNKNOWN')}")
-            
-            # Step 7: Feed into orchestrator (black box)
-            self.logger.debug(f"[{request_id}] Step 7: Processing through conversation orchestrator")
-            workflow_start = time.time()
-            completed_workflow_state = await self.conversation_orchestrator.process_conversation_turn(
-                user_input=workflow_state.get('user_input', transcript),
-                session_id=workflow_state.get('session_id', session_id),
-                restaurant_id=int(workflow_state.get('restaurant_id', restaurant_id)),
-                conversation_history=workflow_state.get('conversation_history', []),
-                order_state=workflow_state.get('order_state', {})
+        else:
+            workflow_state = {**workflow_state, "user_input": transcript}
+            self.logger.debug(f"[{request_id}] Step 6: Using prefetched session state - State: {workflow_state.get('current_state', 'UNKNOWN')}")
+        
+        # Step 7: Feed into orchestrator (black box)
+        self.logger.debug(f"[{request_id}] Step 7: Processing through conversation orchestrator")
+        workflow_start = time.time()
+        completed_workflow_state = await self.conversation_orchestrator.process_conversation_turn(
+            user_input=workflow_state.get('user_input', transcript),
+            session_id=workflow_state.get('session_id', session_id),
+            restaurant_id=int(workflow_state.get('restaurant_id', restaurant_id)),
+            conversation_history=workflow_state.get('conversation_history', []),
+            order_state=workflow_state.get('order_state', {})
+        )
+        workflow_duration = time.time() - workflow_start
+        
+        total_duration = time.time() - start_time
+        self.logger.info(f"[{request_id}] Audio pipeline completed successfully - Total duration: {total_duration:.2f}s, Workflow duration: {workflow_duration:.2f}s")
+        
+        # Log response details
+        if completed_workflow_state.get('response_text'):
+            self.logger.info(f"[{request_id}] Response generated: '{completed_workflow_state['response_text'][:100]}{'...' if len(completed_workflow_state['response_text']) > 100 else ''}'")
+        
+        if completed_workflow_state.get('audio_url'):
+            self.logger.info(f"[{request_id}] Audio URL generated: {completed_workflow_state['audio_url']}")
+        
+        if completed_workflow_state.get('error'):
+            self.logger.warning(f"[{request_id}] Orchestrator completed with errors: {completed_workflow_state['error']}")
+        
+        return completed_workflow_state
+    
+    async def _error_state(self, request_id: str, session_id: str, restaurant_id: int, start_time: float, error: Exception) -> Dict[str, Any]:
+        """Workflow state for a turn that failed with an exception, using the canned "come again" audio"""
+        total_duration = time.time() - start_time
+        self.logger.error(f"[{request_id}] Audio pipeline failed after {total_duration:.2f}s - Error: {str(error)}", exc_info=error)
+        
+        # Try to get a canned error response
+        try:
+            # Try to get a "come again" canned response for errors
+            canned_audio_url = await self.voice_service.get_canned_phrase(
+                AudioPhraseType.COME_AGAIN, 
+                restaurant_id
             )
-            workflow_duration = time.time() - workflow_start
             
-            total_duration = time.time() - start_time
-            self.logger.info(f"[{request_id}] Audio pipeline completed successfully - Total duration: {total_duration:.2f}s, Workflow duration: {workflow_duration:.2f}s")
-            
-            # Log response details
-            if completed_workflow_state.get('response_text'):
-                self.logger.info(f"[{request_id}] Response generated: '{completed_workflow_state['response_text'][:100]}{'...' if len(completed_workflow_state['response_text']) > 100 else ''}'")
-            
-            if completed_workflow_state.get('audio_url'):
-                self.logger.info(f"[{request_id}] Audio URL generated: {completed_workflow_state['audio_url']}")
-            
-            if completed_workflow_state.get('error'):
-                self.logger.warning(f"[{request_id}] Orchestrator completed with errors: {completed_workflow_state['error']}")
-            
-            return completed_workflow_state
-            
-        except Exception as e:
-            total_duration = time.time() - start_time
-            self.logger.error(f"[{request_id}] Audio pipeline failed after {total_duration:.2f}s - Error: {str(e)}", exc_info=True)
-            
-            # Try to get a canned error response
-            try:
-                # Get restaurant slug from restaurant_id (you might need to adjust this)
-                restaurant_slug = f"restaurant_{restaurant_id}"
-                
-                # Try to get a "come again" canned response for errors
-                canned_audio_url = await self.voice_service.get_canned_phrase(
-                    AudioPhraseType.COME_AGAIN, 
-                    restaurant_id
-                )
-                
-                if canned_audio_url:
-                    self.logger.info(f"[{request_id}] Using canned error response: {canned_audio_url}")
-                    error_response_text = "I'm sorry, I had trouble processing your request. Could you please repeat your order?"
-                else:
-                    self.logger.warning(f"[{request_id}] No canned error response available, using fallback text")
-                    error_response_text = "I'm sorry, I had trouble processing your request. Please try again."
-                    canned_audio_url = None
-                
-            except Exception as canned_error:
-                self.logger.error(f"[{request_id}] Failed to get canned error response: {str(canned_error)}")
+            if canned_audio_url:
+                self.logger.info(f"[{request_id}] Using canned error response: {canned_audio_url}")
+                error_response_text = "I'm sorry, I had trouble processing your request. Could you please repeat your order?"
+            else:
+                self.logger.warning(f"[{request_id}] No canned error response available, using fallback text")
                 error_response_text = "I'm sorry, I had trouble processing your request. Please try again."
                 canned_audio_url = None
             
-            # Create error workflow state with canned response
-            error_state = {
-                "session_id": session_id,
-                "restaurant_id": restaurant_id,
-                "user_input": "",
-                "response_text": error_response_text,
-                "audio_url": canned_audio_url,
-                "success": False,
-                "errors": [str(e)],
-                "intent_type": None
-            }
-            return error_state
-    
+        except Exception as canned_error:
+            self.logger.error(f"[{request_id}] Failed to get canned error response: {str(canned_error)}")
+            error_response_text = "I'm sorry, I had trouble processing your request. Please try again."
+            canned_audio_url = None
+        
+        # Create error workflow state with canned response
+        return {
+            "session_id": session_id,
+            "restaurant_id": restaurant_id,
+            "user_input": "",
+            "response_text": error_response_text,
+            "audio_url": canned_audio_url,
+            "success": False,
+            "errors": [str(error)],
+            "intent_type": None
+        }
+
+    def open_audio_stream(
+        self,
+        session_id: str,
+        restaurant_id: int,
+        language: str,
+        db: AsyncSession,
+        audio_format: str = STREAM_PCM_FORMAT,
+        sample_rate: Optional[int] = None,
+        on_transcript: Optional[Callable[[int, str], Awaitable[None]]] = None
+    ) -> "AudioStreamSession":
+        """
+        Start a turn whose audio arrives while the customer is still speaking
+
+        Request validation and the session state lookup start immediately, and
+        each speech segment is transcribed as soon as the customer pauses, so
+        only the last segment and the orchestrator remain at end of speech.
+
+        Args:
+            session_id: Session ID for conversation state
+            restaurant_id: Restaurant ID for context
+            language: Language code (en, es)
+            db: Database session (must stay open until the stream finishes)
+            audio_format: "pcm16" (16-bit mono PCM, segmented live) or a container
+                format (webm, wav, ...) which is transcribed whole at end of speech
+            sample_rate: PCM sample rate (defaults to STREAM_DEFAULT_SAMPLE_RATE)
+            on_transcript: Awaited with (segment index, text) as segments are transcribed
+
+        Returns:
+            AudioStreamSession: Feed it audio, then call finish()
+        """
+        return AudioStreamSession(
+            self, session_id, restaurant_id, language, db,
+            audio_format, sample_rate or settings.STREAM_DEFAULT_SAMPLE_RATE, on_transcript
+        )
+
+    async def _warm_up_turn(self, request_id: str, session_id: str, restaurant_id: int, language: str, db: AsyncSession) -> Dict[str, Any]:
+        """Validate the request and fetch session state while audio is still arriving"""
+        _, workflow_state, _ = await asyncio.gather(
+            self._validate_request_inputs(restaurant_id, session_id, language, db, request_id),
+            self.order_session_service.get_conversation_workflow_state(session_id=session_id, user_input=""),
+            # The canned "come again" fallback should be ready too (no storage calls once loaded)
+            self.voice_service.canned_phrases.ensure_loaded(restaurant_id)
+        )
+        return workflow_state
+
     async def _validate_request_inputs(
         self, 
         restaurant_id: int, 
@@ -256,48 +331,26 @@ class AudioPipelineService:
         
         # Language validation is now handled at the controller level
     
-    async def _validate_audio_file(self, audio_file: UploadFile) -> OrderResult:
+    async def _validate_audio_file(self, audio_file: UploadFile, audio_data: AudioData) -> OrderResult:
         """Validate audio file content (basic validation done at controller level)"""
-        try:
-            # Read file content to check if empty
-            file_content = await audio_file.read()
-            if len(file_content) == 0:
-                self.logger.warning("Empty audio file received")
-                return OrderResult.error("File is empty")
-            
-            self.logger.debug(f"Audio file validation passed - Type: {audio_file.content_type}, Size: {len(file_content)} bytes")
-            
-            # CRITICAL: Reset file pointer to beginning so it can be read again
-            await audio_file.seek(0)
-            
-            # TODO: Add duration validation (60 seconds max)
-            # This would require audio processing to check duration
-            
-            return OrderResult.success("Audio file validation passed")
-            
-        except Exception as e:
-            self.logger.error(f"File validation failed: {str(e)}", exc_info=True)
-            return OrderResult.error(f"File validation failed: {str(e)}")
-    
-    async def _store_audio_file(self, audio_file: UploadFile, audio_data: bytes, restaurant_id: int, session_id: str) -> OrderResult:
-        """Store audio file via VoiceService"""
-        self.logger.info(f"DEBUG: _store_audio_file called - audio_data size: {len(audio_data) if audio_data else 'None'}")
-        self.logger.info(f"DEBUG: Storing user audio to S3 - Restaurant: {restaurant_id}, Session: {session_id}")
+        if len(audio_data) == 0:
+            self.logger.warning("Empty audio file received")
+            return OrderResult.error("File is empty")
         
-        # DEBUG: Log what we're passing to VoiceService
-        print(f"DEBUG AudioPipelineService calling VoiceService with:")
-        print(f"  audio_data: {type(audio_data)} - {len(audio_data) if audio_data else 'None'}")
-        print(f"  filename: {audio_file.filename}")
-        print(f"  content_type: {audio_file.content_type}")
-        print(f"  restaurant_id: {restaurant_id}")
-        print(f"  session_id: {session_id}")
+        self.logger.debug(f"Audio file validation passed - Type: {audio_file.content_type}, Size: {len(audio_data)} bytes")
         
+        # Duration (AUDIO_MAX_DURATION_SECONDS of speech) is checked once the audio
+        # is decoded for transcription, see _prepare_audio
+        
+        return OrderResult.success("Audio file validation passed")
+    
+    async def _store_audio_file(self, audio_file: UploadFile, audio_data: AudioData, restaurant_id: int, session_id: str) -> OrderResult:
+        """Queue the audio file for archival via VoiceService (doesn't wait for the upload)"""
         if audio_data is None:
-            print("ERROR: audio_data is None in AudioPipelineService!")
             self.logger.error("audio_data is None in AudioPipelineService._store_audio_file")
             return OrderResult.error("Audio data is None")
         
-        file_id = await self.voice_service.store_uploaded_audio(
+        archive_id = await self.voice_service.archive_uploaded_audio(
             audio_data=audio_data,
             filename=audio_file.filename,
             content_type=audio_file.content_type,
@@ -305,21 +358,39 @@ class AudioPipelineService:
             session_id=session_id
         )
         
-        self.logger.info(f"DEBUG: User audio stored with file_id: {file_id}")
-        
-        if file_id:
-            return OrderResult.success("Audio file stored successfully", data={"file_id": file_id})
+        if archive_id:
+            return OrderResult.success("Audio file queued for archival", data={"archive_id": archive_id})
         else:
-            return OrderResult.error("Failed to store audio file")
+            return OrderResult.error("Failed to spool audio file for archival")
+    
+    async def _prepare_audio(self, audio_data: AudioData, audio_format: str) -> PreparedAudio:
+        """Trim, downsample and re-encode audio for speech-to-text (off the event loop)"""
+        prepare_start = time.time()
+        prepared = await asyncio.to_thread(self.audio_preprocessor.prepare, audio_data, audio_format)
+        if prepared.processed:
+            self.logger.info(
+                f"Audio prepared for STT in {time.time() - prepare_start:.2f}s - "
+                f"{prepared.original_bytes} -> {len(prepared.data)} bytes ({audio_format} -> {prepared.audio_format}), "
+                f"{prepared.duration_seconds:.1f}s of speech"
+            )
+        return prepared
     
-    async def _transcribe_audio(self, audio_file: UploadFile, audio_data: bytes, language: str) -> OrderResult:
+    async def _transcribe_audio(self, audio_file: UploadFile, audio_data: AudioData, language: str) -> OrderResult:
         """Transcribe audio to text"""
         audio_format = audio_file.content_type.split('/')[-1] if audio_file.content_type else "webm"
         selected_language = Language.from_code(language)
         
+        try:
+            prepared = await self._prepare_audio(audio_data, audio_format)
+        except AudioTooLongError as e:
+            self.logger.warning(f"Audio rejected: {e}")
+            return OrderResult.error(str(e))
+        if not prepared.has_speech:
+            return OrderResult.error("No speech detected")
+        
         transcript = await self.voice_service.transcribe_audio(
-            audio_data=audio_data,
-            audio_format=audio_format,
+            audio_data=prepared.data,
+            audio_format=prepared.audio_format,
             language=language
         )
         
@@ -329,7 +400,7 @@ class AudioPipelineService:
                 data={
                     'transcript': transcript,
                     'confidence': 0,  # VoiceService doesn't return confidence yet
-                    'duration': 0     # VoiceService doesn't return duration yet
+                    'duration': prepared.duration_seconds or 0
                 }
             )
         else:
@@ -442,3 +513,184 @@ class AudioPipelineService:
             self.logger.error(f"Transcript validation failed: {str(e)}", exc_info=True)
             return OrderResult.error(f"Transcript validation failed: {str(e)}")
     
+
+
+class AudioStreamSession:
+    """
+    One streamed customer turn, created by AudioPipelineService.open_audio_stream
+    """
+
+    def __init__(
+        self,
+        pipeline: AudioPipelineService,
+        session_id: str,
+        restaurant_id: int,
+        language: str,
+        db: AsyncSession,
+        audio_format: str,
+        sample_rate: int,
+        on_transcript: Optional[Callable[[int, str], Awaitable[None]]] = None
+    ):
+        self.pipeline = pipeline
+        self.session_id = session_id
+        self.restaurant_id = restaurant_id
+        self.language = language
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
+        self.on_transcript = on_transcript
+        self.request_id = str(uuid.uuid4())[:8]
+        self.start_time = time.time()
+        self.logger = pipeline.logger
+
+        # Containers can't be cut mid-stream, so they are only buffered
+        self._segmenter = SpeechSegmenter(sample_rate) if audio_format == STREAM_PCM_FORMAT else None
+        self._audio = bytearray()
+        self._transcriptions: List[asyncio.Task] = []
+        self._finished = False
+
+        self.logger.info(f"[{self.request_id}] Starting audio stream - Session: {session_id}, Restaurant: {restaurant_id}, Language: {language}, Format: {audio_format}")
+        self._warm_up = asyncio.create_task(
+            pipeline._warm_up_turn(self.request_id, session_id, restaurant_id, language, db)
+        )
+        # Surfaced by finish(); don't let an abandoned stream log "exception never retrieved"
+        self._warm_up.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    @property
+    def segments_started(self) -> int:
+        """Number of segments sent for transcription so far"""
+        return len(self._transcriptions)
+
+    def feed(self, chunk: bytes) -> int:
+        """
+        Add audio as it arrives
+
+        Args:
+            chunk: Next piece of the recording
+
+        Returns:
+            int: Number of segments that started transcribing because of this chunk
+
+        Raises:
+            ValueError: If the stream is finished or exceeds STREAM_AUDIO_MAX_BYTES
+        """
+        if self._finished:
+            raise ValueError("Audio stream already finished")
+        if len(self._audio) + len(chunk) > settings.STREAM_AUDIO_MAX_BYTES:
+            raise ValueError(f"Audio stream exceeds {settings.STREAM_AUDIO_MAX_BYTES} bytes")
+
+        self._audio.extend(chunk)
+        if self._segmenter is None:
+            return 0
+        segments = self._segmenter.feed(chunk)
+        for segment in segments:
+            self._transcribe_segment(segment)
+        return len(segments)
+
+    def _transcribe_segment(self, segment: AudioData) -> None:
+        index = len(self._transcriptions)
+        self.logger.debug(f"[{self.request_id}] Transcribing segment {index} ({len(segment)} bytes)")
+        self._transcriptions.append(asyncio.create_task(self._transcribe(index, segment)))
+
+    async def _transcribe(self, index: int, segment: AudioData) -> Optional[str]:
+        if self._segmenter is not None:
+            audio_data, audio_format = pcm_to_wav(segment, self.sample_rate), "wav"
+        else:
+            audio_data, audio_format = segment, self.audio_format
+        prepared = await self.pipeline._prepare_audio(audio_data, audio_format)
+        if not prepared.has_speech:
+            return ""
+        transcript = await self.pipeline.voice_service.transcribe_audio(
+            audio_data=prepared.data,
+            audio_format=prepared.audio_format,
+            language=self.language
+        )
+        if transcript and self.on_transcript:
+            try:
+                await self.on_transcript(index, transcript)
+            except Exception as e:
+                self.logger.warning(f"[{self.request_id}] Partial transcript callback failed: {e}")
+        return transcript
+
+    async def _store_audio(self, recording: AudioData) -> None:
+        # Kept for audit like uploaded audio, but archival never fails the turn
+        if self._segmenter is not None:
+            audio_data, extension, content_type = pcm_to_wav(recording, self.sample_rate), "wav", "audio/wav"
+        else:
+            audio_data, extension, content_type = recording, self.audio_format, f"audio/{self.audio_format}"
+        archive_id = await self.pipeline.voice_service.archive_uploaded_audio(
+            audio_data=audio_data,
+            filename=f"stream_{self.request_id}.{extension}",
+            content_type=content_type,
+            restaurant_id=self.restaurant_id,
+            session_id=self.session_id
+        )
+        if archive_id:
+            self.logger.info(f"[{self.request_id}] Streamed audio queued for archival - Archive ID: {archive_id}")
+        else:
+            self.logger.warning(f"[{self.request_id}] Failed to queue streamed audio for archival")
+
+    async def finish(self) -> Dict[str, Any]:
+        """
+        End of speech: transcribe what's left and run the conversation turn
+
+        Returns:
+            Dict[str, Any]: Completed workflow state, in the same shape as process_audio_pipeline
+        """
+        self._finished = True
+        store_task = None
+        try:
+            if not self._audio:
+                self.logger.warning(f"[{self.request_id}] Empty audio stream received")
+                return await self.pipeline._generate_fallback_response(self.request_id, self.session_id, self.restaurant_id, "Audio validation failed")
+
+            if self._segmenter is not None:
+                tail = self._segmenter.flush()
+                # No more feed() after finish, so the buffer can be shared as is
+                recording = memoryview(self._audio)
+            else:
+                # One immutable copy shared by transcription and archival
+                tail = recording = memoryview(bytes(self._audio))
+            if tail:
+                self._transcribe_segment(tail)
+            store_task = asyncio.create_task(self._store_audio(recording))
+
+            # Usually done by now; raises if the restaurant or session is invalid
+            workflow_state = await self._warm_up
+
+            speech_start = time.time()
+            transcripts = await asyncio.gather(*self._transcriptions)
+            self.logger.info(f"[{self.request_id}] {len(transcripts)} segments transcribed, {time.time() - speech_start:.2f}s after end of speech")
+            if not transcripts or any(transcript is None for transcript in transcripts):
+                self.logger.error(f"[{self.request_id}] Speech transcription failed")
+                return await self.pipeline._generate_fallback_response(self.request_id, self.session_id, self.restaurant_id, "Speech transcription failed")
+
+            transcript = " ".join(text.strip() for text in transcripts if text.strip())
+            if not transcript:
+                self.logger.error(f"[{self.request_id}] Speech transcription failed: no speech")
+                return await self.pipeline._generate_fallback_response(self.request_id, self.session_id, self.restaurant_id, "Speech transcription failed")
+            self.logger.info(f"[{self.request_id}] Transcription result - Text: '{transcript}'")
+
+            return await self.pipeline._run_conversation_turn(
+                self.request_id, transcript, self.session_id, self.restaurant_id, self.start_time, workflow_state
+            )
+        except Exception as e:
+            return await self.pipeline._error_state(self.request_id, self.session_id, self.restaurant_id, self.start_time, e)
+        finally:
+            self._cancel_transcriptions()
+            if store_task is not None:
+                try:
+                    await store_task
+                except Exception as e:
+                    self.logger.error(f"[{self.request_id}] Failed to archive streamed audio: {e}")
+
+    def _cancel_transcriptions(self) -> None:
+        for task in self._transcriptions:
+            task.cancel()
+
+    async def abort(self) -> None:
+        """Drop the stream (e.g. the client disconnected) and cancel outstanding work"""
+        self._finished = True
+        self._warm_up.cancel()
+        self._cancel_transcriptions()
+        await asyncio.gather(self._warm_up, *self._transcriptions, return_exceptions=True)
+        self.logger.info(f"[{self.request_id}] Audio stream aborted")
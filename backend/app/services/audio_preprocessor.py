@@ -0,0 +1,245 @@
+"""
+Audio preprocessor - shrinks customer recordings before they go to speech-to-text
+
+Browser uploads are 44.1/48 kHz (often stereo) recordings with silence and
+engine noise before and after the order. Whisper only needs 16 kHz mono
+speech, so each recording is decoded, trimmed to the speech plus a little
+padding, downmixed and downsampled with NumPy, and re-encoded compactly.
+
+WAV is decoded and encoded natively. Compressed containers (webm, m4a, mp3)
+are decoded with ffmpeg and re-encoded as Opus when ffmpeg is installed;
+without it they are passed through unchanged, so ffmpeg is optional.
+"""
+
+import io
+import logging
+import shutil
+import subprocess
+import wave
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from .audio_buffer import AudioData, as_bytes
+
+logger = logging.getLogger(__name__)
+
+FRAME_MS = 20
+_WAV_FORMATS = ("wav", "wave", "x-wav")
+
+
+class AudioTooLongError(ValueError):
+    """Recording has more speech than AUDIO_MAX_DURATION_SECONDS"""
+
+
+@dataclass
+class PreparedAudio:
+    """Audio ready for speech-to-text"""
+    data: AudioData
+    audio_format: str
+    duration_seconds: Optional[float]  # None when the audio was passed through undecoded
+    original_bytes: int
+    processed: bool = True
+
+    @property
+    def has_speech(self) -> bool:
+        return self.duration_seconds is None or self.duration_seconds > 0
+
+
+class AudioPreprocessor:
+    """
+    Decode, trim, downsample and re-encode recordings for speech-to-text
+    """
+
+    def __init__(
+        self,
+        target_sample_rate: Optional[int] = None,
+        max_duration_seconds: Optional[float] = None,
+        ffmpeg_path: Optional[str] = None
+    ):
+        """
+        Initialize the preprocessor
+
+        Args:
+            target_sample_rate: Output sample rate (defaults to AUDIO_TARGET_SAMPLE_RATE)
+            max_duration_seconds: Longest speech accepted (defaults to AUDIO_MAX_DURATION_SECONDS)
+            ffmpeg_path: ffmpeg executable (defaults to FFMPEG_PATH; compressed input passes through if not found)
+        """
+        self.target_sample_rate = target_sample_rate or settings.AUDIO_TARGET_SAMPLE_RATE
+        self.max_duration_seconds = max_duration_seconds or settings.AUDIO_MAX_DURATION_SECONDS
+        self.ffmpeg = shutil.which(ffmpeg_path or settings.FFMPEG_PATH)
+
+    # ===== DECODING =====
+
+    def decode(self, data: AudioData, audio_format: str) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Decode audio to mono float32 samples in [-1, 1]
+
+        Returns:
+            Tuple of (samples, sample rate), or None if the format can't be decoded here
+        """
+        if audio_format in _WAV_FORMATS:
+            return self._decode_wav(data)
+        if self.ffmpeg:
+            return self._decode_ffmpeg(data), self.target_sample_rate
+        return None
+
+    @staticmethod
+    def _decode_wav(data: AudioData) -> Tuple[np.ndarray, int]:
+        with wave.open(io.BytesIO(as_bytes(data))) as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+        if width == 1:
+            samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+        elif width == 2:
+            samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+        elif width == 4:
+            samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648
+        else:
+            raise ValueError(f"unsupported WAV sample width {width}")
+        if channels > 1:
+            samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+        return samples, rate
+
+    def _decode_ffmpeg(self, data: AudioData) -> np.ndarray:
+        # ffmpeg resamples while decoding, so compressed input arrives at the target rate
+        pcm = self._run_ffmpeg(
+            ["-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(self.target_sample_rate), "pipe:1"], as_bytes(data)
+        )
+        return np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768
+
+    def _run_ffmpeg(self, args, data: bytes) -> bytes:
+        result = subprocess.run(
+            [self.ffmpeg, "-hide_banner", "-loglevel", "error", *args],
+            input=data,
+            capture_output=True,
+            timeout=settings.AUDIO_FFMPEG_TIMEOUT_SECONDS
+        )
+        if result.returncode != 0:
+            raise ValueError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()[:200]}")
+        return result.stdout
+
+    # ===== SIGNAL PROCESSING =====
+
+    @staticmethod
+    def trim(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Cut leading and trailing silence/noise, keeping AUDIO_TRIM_PADDING_MS around the speech
+
+        Frames count as speech when their RMS is well above the recording's
+        noise floor (and above AUDIO_TRIM_MIN_RMS), so steady engine noise is
+        trimmed along with silence. Returns an empty array if nothing is speech.
+        """
+        frame = max(1, sample_rate * FRAME_MS // 1000)
+        count = len(samples) // frame
+        if count == 0:
+            return samples[:0]
+        frames = samples[:count * frame].reshape(count, frame)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+
+        noise_floor = float(np.percentile(rms, 10))
+        threshold = max(settings.AUDIO_TRIM_MIN_RMS / 32768, noise_floor * settings.AUDIO_TRIM_NOISE_FACTOR)
+        speech = np.flatnonzero(rms >= threshold)
+        if len(speech) == 0:
+            return samples[:0]
+
+        padding = settings.AUDIO_TRIM_PADDING_MS * sample_rate // 1000
+        start = max(0, speech[0] * frame - padding)
+        end = min(len(samples), (speech[-1] + 1) * frame + padding)
+        return samples[start:end]
+
+    @staticmethod
+    def resample(samples: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+        """
+        Downsample to target_rate
+
+        Integer ratios (48k/16k) average each block of samples, which also
+        filters out most of what would alias; other ratios (44.1k) are
+        smoothed with a moving average and then linearly interpolated.
+        """
+        if sample_rate <= target_rate or len(samples) == 0:
+            return samples
+        if sample_rate % target_rate == 0:
+            ratio = sample_rate // target_rate
+            usable = len(samples) - len(samples) % ratio
+            return samples[:usable].reshape(-1, ratio).mean(axis=1)
+
+        width = int(round(sample_rate / target_rate))
+        smoothed = np.convolve(samples, np.ones(width, dtype=np.float32) / width, mode="same")
+        positions = np.arange(0, len(samples) * target_rate // sample_rate) * (sample_rate / target_rate)
+        return np.interp(positions, np.arange(len(samples)), smoothed).astype(np.float32)
+
+    # ===== ENCODING =====
+
+    def encode(self, samples: np.ndarray, sample_rate: int) -> Tuple[bytes, str]:
+        """
+        Encode mono samples as Opus in Ogg (with ffmpeg) or 16-bit WAV
+
+        Returns:
+            Tuple of (audio bytes, format for the STT file name)
+        """
+        pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+        if self.ffmpeg:
+            try:
+                return self._run_ffmpeg(
+                    ["-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-i", "pipe:0",
+                     "-c:a", "libopus", "-b:a", settings.AUDIO_OPUS_BITRATE, "-application", "voip", "-f", "ogg", "pipe:1"],
+                    pcm
+                ), "ogg"
+            except (ValueError, subprocess.SubprocessError, OSError) as e:
+                logger.warning(f"Opus encoding failed, sending WAV instead: {e}")
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return buffer.getvalue(), "wav"
+
+    # ===== PIPELINE =====
+
+    def prepare(self, data: AudioData, audio_format: str) -> PreparedAudio:
+        """
+        Turn an uploaded recording into compact speech-only audio
+
+        CPU bound; call it from a worker thread in async code.
+
+        Args:
+            data: Recording bytes (shared, never copied when passed through)
+            audio_format: Container format (webm, m4a, wav, ...)
+
+        Returns:
+            PreparedAudio: Processed audio, or the original if it can't be decoded here
+
+        Raises:
+            AudioTooLongError: If the trimmed speech is longer than the limit
+        """
+        passthrough = PreparedAudio(data, audio_format, duration_seconds=None, original_bytes=len(data), processed=False)
+        if not settings.AUDIO_PREPROCESSING_ENABLED:
+            return passthrough
+
+        try:
+            decoded = self.decode(data, audio_format)
+        except (ValueError, EOFError, wave.Error, subprocess.SubprocessError, OSError) as e:
+            logger.warning(f"Could not decode {audio_format} audio, sending it unprocessed: {e}")
+            return passthrough
+        if decoded is None:
+            return passthrough
+
+        samples, sample_rate = decoded
+        samples = self.resample(self.trim(samples, sample_rate), sample_rate, self.target_sample_rate)
+        sample_rate = min(sample_rate, self.target_sample_rate)
+        duration = len(samples) / sample_rate
+        if duration > self.max_duration_seconds:
+            raise AudioTooLongError(f"Audio has {duration:.1f}s of speech (max {self.max_duration_seconds:.0f}s)")
+        if duration == 0:
+            return PreparedAudio(b"", audio_format, duration_seconds=0.0, original_bytes=len(data))
+
+        encoded, encoded_format = self.encode(samples, sample_rate)
+        if len(encoded) >= len(data):
+            # Already compact (e.g. a short Opus clip); trimming bought nothing
+            return PreparedAudio(data, audio_format, duration_seconds=duration, original_bytes=len(data))
+        return PreparedAudio(encoded, encoded_format, duration_seconds=duration, original_bytes=len(data))
@@ -0,0 +1,389 @@
+"""
+Canned audio generator - bulk pre-generation of canned phrases for onboarding
+
+Generates every AudioPhraseType for many restaurants with bounded TTS and
+upload concurrency. Phrases whose text doesn't depend on the restaurant are
+synthesized once per job and uploaded to each restaurant's path. Phrases
+already in storage are skipped, so a job that dies part-way can be re-run
+(or resumed by job ID) and only does the remaining work.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Callable
+
+from ..core.config import settings
+from ..constants.audio_phrases import AudioPhraseType, AudioPhraseConstants
+from .canned_phrase_table import CannedPhraseTable
+
+logger = logging.getLogger(__name__)
+
+# Keep job records small; the counters say how many failed
+MAX_JOB_ERRORS = 20
+
+
+class CannedAudioGenerator:
+    """
+    Generates canned audio for one or many restaurants and tracks bulk jobs
+    """
+
+    def __init__(
+        self,
+        text_to_speech_service,
+        file_storage_service,
+        canned_phrases: CannedPhraseTable,
+        redis_service=None,
+        tts_concurrency: Optional[int] = None,
+        upload_concurrency: Optional[int] = None,
+        restaurant_concurrency: Optional[int] = None,
+        fragments=None
+    ):
+        """
+        Initialize the canned audio generator
+
+        Args:
+            text_to_speech_service: TTS used to synthesize phrases
+            file_storage_service: Storage the canned audio is written to
+            canned_phrases: Canned phrase URL table (existing phrases are read from it and new ones recorded)
+            redis_service: Where job progress is kept (optional; without it jobs are tracked in-process only)
+            tts_concurrency: Max concurrent TTS requests (defaults to CANNED_AUDIO_TTS_CONCURRENCY)
+            upload_concurrency: Max concurrent uploads (defaults to CANNED_AUDIO_UPLOAD_CONCURRENCY)
+            restaurant_concurrency: Max restaurants in progress at once (defaults to CANNED_AUDIO_RESTAURANT_CONCURRENCY)
+            fragments: Response audio composer whose fragments are rendered alongside the phrases (optional)
+        """
+        self.text_to_speech_service = text_to_speech_service
+        self.file_storage_service = file_storage_service
+        self.canned_phrases = canned_phrases
+        self.redis_service = redis_service
+        self.fragments = fragments
+        # Shared by every job in this process so concurrent jobs don't multiply the limits
+        self._tts_slots = asyncio.Semaphore(max(1, tts_concurrency or settings.CANNED_AUDIO_TTS_CONCURRENCY))
+        self._upload_slots = asyncio.Semaphore(max(1, upload_concurrency or settings.CANNED_AUDIO_UPLOAD_CONCURRENCY))
+        self._restaurant_slots = asyncio.Semaphore(
+            max(1, restaurant_concurrency or settings.CANNED_AUDIO_RESTAURANT_CONCURRENCY)
+        )
+        # job_id -> job record / running task for jobs started by this process
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._job_tasks: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def is_shared_phrase(phrase_type: AudioPhraseType) -> bool:
+        """True if the phrase text is the same for every restaurant"""
+        return (AudioPhraseConstants.get_phrase_text(phrase_type, "A")
+                == AudioPhraseConstants.get_phrase_text(phrase_type, "B"))
+
+    # ===== GENERATION =====
+
+    async def generate_restaurant(
+        self,
+        restaurant_id: int,
+        restaurant_name: str = None,
+        shared_audio: Optional[Dict[str, asyncio.Task]] = None,
+        menu_item_names: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate the canned phrases a restaurant is missing
+
+        Args:
+            restaurant_id: Restaurant ID
+            restaurant_name: Restaurant name for customized phrases
+            shared_audio: Synthesis tasks for restaurant-independent text, shared across a job
+            menu_item_names: Menu item names to render as response fragments (skipped if None)
+
+        Returns:
+            Dict[str, Any]: urls (phrase value -> URL), generated, skipped, fragments_rendered and errors
+        """
+        shared_audio = {} if shared_audio is None else shared_audio
+
+        async with self._restaurant_slots:
+            # Re-check storage for what already exists; if that fails, don't assume nothing does
+            self.canned_phrases.invalidate(restaurant_id)
+            urls = dict(await self.canned_phrases.load(restaurant_id, raise_errors=True))
+            skipped = len(urls)
+
+            missing = [
+                phrase_type for phrase_type in AudioPhraseConstants.get_all_phrase_types()
+                if phrase_type.value not in urls
+            ]
+            outcomes = await asyncio.gather(
+                *(self._generate_phrase(phrase_type, restaurant_id, restaurant_name, shared_audio)
+                  for phrase_type in missing),
+                return_exceptions=True
+            )
+            fragments = await self._render_fragments(restaurant_id, menu_item_names)
+
+        errors = []
+        for phrase_type, outcome in zip(missing, outcomes):
+            if isinstance(outcome, Exception):
+                errors.append(f"restaurant {restaurant_id} {phrase_type.value}: {outcome}")
+            else:
+                urls[phrase_type.value] = outcome
+
+        logger.info(f"Canned audio for restaurant {restaurant_id}: {len(missing) - len(errors)} generated, "
+                    f"{skipped} already present, {len(errors)} failed")
+        return {"urls": urls, "generated": len(missing) - len(errors), "skipped": skipped,
+                "fragments_rendered": fragments["rendered"], "errors": errors + fragments["errors"]}
+
+    async def render_shared_fragments(self) -> Dict[str, Any]:
+        """
+        Render missing fragments every restaurant uses (fixed phrases, quantities)
+
+        Returns:
+            Dict[str, Any]: rendered count and errors
+        """
+        return await self._render_fragments(None, None, include_shared=True)
+
+    async def _render_fragments(self, restaurant_id: Optional[int], menu_item_names: Optional[List[str]],
+                                include_shared: bool = False) -> Dict[str, Any]:
+        if self.fragments is None or (menu_item_names is None and not include_shared):
+            return {"rendered": 0, "errors": []}
+        stats = await self.fragments.prerender(
+            restaurant_id, menu_item_names or (), tts_slots=self._tts_slots, include_shared=include_shared
+        )
+        errors = [f"restaurant {restaurant_id}: {stats['failed']} audio fragments failed"] if stats["failed"] else []
+        return {"rendered": stats["rendered"], "errors": errors}
+
+    async def _generate_phrase(
+        self,
+        phrase_type: AudioPhraseType,
+        restaurant_id: int,
+        restaurant_name: Optional[str],
+        shared_audio: Dict[str, asyncio.Task]
+    ) -> str:
+        text = AudioPhraseConstants.get_phrase_text(phrase_type, restaurant_name)
+        if not text:
+            raise ValueError("no text for phrase type")
+
+        if self.is_shared_phrase(phrase_type):
+            task = shared_audio.get(text)
+            if task is None or (task.done() and (task.cancelled() or task.exception())):
+                # First restaurant to need this text, or the earlier attempt failed
+                task = asyncio.ensure_future(self._synthesize(text))
+                shared_audio[text] = task
+            audio_data = await asyncio.shield(task)
+        else:
+            audio_data = await self._synthesize(text)
+
+        path = CannedPhraseTable.path(phrase_type, restaurant_id)
+        async with self._upload_slots:
+            store_result = await self.file_storage_service.store_file(
+                file_data=audio_data,
+                file_name=path,
+                content_type="audio/mpeg"
+            )
+        if not store_result.is_success or not store_result.data:
+            raise RuntimeError(f"upload failed: {store_result.message}")
+
+        audio_url = (store_result.data.get('url') or
+                     store_result.data.get('s3_url') or
+                     store_result.data.get('file_path'))
+        self.canned_phrases.record(phrase_type, restaurant_id, audio_url)
+        return audio_url
+
+    async def _synthesize(self, text: str) -> bytes:
+        async with self._tts_slots:
+            audio_chunks = []
+            async for chunk in self.text_to_speech_service.generate_audio_stream(
+                text,
+                voice=AudioPhraseConstants.STANDARD_VOICE
+            ):
+                audio_chunks.append(chunk)
+        if not audio_chunks:
+            raise RuntimeError("TTS returned no audio")
+        return b''.join(audio_chunks)
+
+    async def generate(
+        self,
+        restaurants: Iterable[Tuple[int, Optional[str]]],
+        job_id: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate canned audio for many restaurants
+
+        Restaurants recorded as done in an earlier run of the same job are
+        skipped, and each restaurant only generates phrases missing from storage.
+
+        Args:
+            restaurants: (restaurant_id, restaurant_name) or (restaurant_id, restaurant_name, menu_item_names)
+            job_id: Job to record progress under (a new ID is created if omitted)
+            on_progress: Called with the job record after each restaurant finishes
+
+        Returns:
+            Dict[str, Any]: The final job record
+        """
+        restaurants = [tuple(restaurant) for restaurant in restaurants]
+        job = await self._job_record(job_id or uuid.uuid4().hex, restaurants)
+        job_id = job["job_id"]
+        job.update(status="running", started_at=time.time(), finished_at=None)
+        self._jobs[job_id] = job
+        await self._save_job(job)
+
+        done = set(job["completed_restaurants"])
+        shared_audio: Dict[str, asyncio.Task] = {}
+
+        async def run_one(restaurant_id: int, restaurant_name: Optional[str], menu_item_names=None):
+            try:
+                outcome = await self.generate_restaurant(restaurant_id, restaurant_name, shared_audio, menu_item_names)
+            except Exception as e:
+                # Existing phrases couldn't be checked (storage down etc.) - leave the restaurant for the next run
+                outcome = {"generated": 0, "skipped": 0, "fragments_rendered": 0,
+                           "errors": [f"restaurant {restaurant_id}: {e}"]}
+
+            job["generated"] += outcome["generated"]
+            job["skipped"] += outcome["skipped"]
+            job["fragments_rendered"] += outcome["fragments_rendered"]
+            job["failed"] += len(outcome["errors"])
+            job["errors"] = (job["errors"] + outcome["errors"])[-MAX_JOB_ERRORS:]
+            if not outcome["errors"]:
+                job["completed_restaurants"].append(restaurant_id)
+            job["restaurants_done"] += 1
+            await self._save_job(job)
+            if on_progress:
+                on_progress(job)
+
+        try:
+            if any(len(restaurant) > 2 for restaurant in restaurants):
+                # Shared fragments once up front so restaurants don't race to render them
+                shared = await self.render_shared_fragments()
+                job["fragments_rendered"] += shared["rendered"]
+                job["errors"] = (job["errors"] + shared["errors"])[-MAX_JOB_ERRORS:]
+
+            await asyncio.gather(*(
+                run_one(*restaurant)
+                for restaurant in restaurants
+                if restaurant[0] not in done
+            ))
+            job["status"] = "completed" if len(set(job["completed_restaurants"])) >= len(restaurants) else "incomplete"
+        except Exception as e:
+            job["status"] = "failed"
+            job["errors"] = (job["errors"] + [str(e)])[-MAX_JOB_ERRORS:]
+            raise
+        finally:
+            job["shared_phrases_synthesized"] = len(shared_audio)
+            job["finished_at"] = time.time()
+            await self._save_job(job)
+            for task in shared_audio.values():
+                if not task.done():
+                    task.cancel()
+
+        logger.info(f"Canned audio job {job_id} {job['status']}: {job['generated']} generated, "
+                    f"{job['skipped']} already present, {job['failed']} failed")
+        return job
+
+    # ===== BACKGROUND JOBS =====
+
+    def start_job(self, restaurants: Iterable[Tuple[int, Optional[str]]], job_id: Optional[str] = None) -> str:
+        """
+        Run generate() in the background
+
+        Args:
+            restaurants: (restaurant_id, restaurant_name[, menu_item_names]) tuples
+            job_id: Existing job to resume, or None for a new job
+
+        Returns:
+            str: Job ID to poll with get_job()
+        """
+        job_id = job_id or uuid.uuid4().hex
+        if job_id in self._job_tasks:
+            return job_id
+
+        task = asyncio.create_task(self._run_job(list(restaurants), job_id))
+        self._job_tasks[job_id] = task
+        task.add_done_callback(lambda _: self._job_tasks.pop(job_id, None))
+        return job_id
+
+    async def _run_job(self, restaurants: List[Tuple[int, Optional[str]]], job_id: str) -> None:
+        try:
+            await self.generate(restaurants, job_id=job_id)
+        except Exception as e:
+            logger.error(f"Canned audio job {job_id} failed: {e}")
+
+    async def resume_job(self, job_id: str) -> bool:
+        """
+        Restart an interrupted job from its stored record
+
+        Returns:
+            bool: True if the job was restarted (or is already running here), False if unknown or finished
+        """
+        if job_id in self._job_tasks:
+            return True
+
+        job = await self.get_job(job_id)
+        if not job or job["status"] == "completed":
+            return False
+
+        self.start_job([tuple(restaurant) for restaurant in job["restaurants"]], job_id=job_id)
+        return True
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's progress
+
+        Returns:
+            Dict[str, Any]: Job record, or None if unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return {**job, "running": job_id in self._job_tasks}
+
+        data = await self.redis_service.get(self._job_key(job_id)) if self.redis_service else None
+        if not data:
+            return None
+        job = json.loads(data)
+        # Stored as running but nobody here is running it: the process died mid-job
+        return {**job, "running": False}
+
+    async def wait_for_jobs(self) -> None:
+        """Wait for background jobs to finish (tests/shutdown)"""
+        if self._job_tasks:
+            await asyncio.gather(*list(self._job_tasks.values()), return_exceptions=True)
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"canned_audio:job:{job_id}"
+
+    async def _job_record(self, job_id: str, restaurants: List[Tuple[int, Optional[str]]]) -> Dict[str, Any]:
+        previous = await self.get_job(job_id)
+        job = {
+            "job_id": job_id,
+            "status": "pending",
+            "restaurants": [list(restaurant) for restaurant in restaurants],
+            "total_restaurants": len(restaurants),
+            "restaurants_done": 0,
+            "completed_restaurants": [],
+            "generated": 0,
+            "skipped": 0,
+            "fragments_rendered": 0,
+            "failed": 0,
+            "errors": [],
+            "started_at": None,
+            "finished_at": None
+        }
+        if previous:
+            # Resuming: finished restaurants stay done, the rest are retried
+            completed = [rid for rid in previous.get("completed_restaurants", [])
+                         if any(rid == restaurant[0] for restaurant in restaurants)]
+            job.update(
+                completed_restaurants=completed,
+                restaurants_done=len(completed),
+                generated=previous.get("generated", 0),
+                skipped=previous.get("skipped", 0)
+            )
+        return job
+
+    async def _save_job(self, job: Dict[str, Any]) -> None:
+        if not self.redis_service:
+            return
+        try:
+            await self.redis_service.set(
+                self._job_key(job["job_id"]),
+                json.dumps(job),
+                ttl=settings.CANNED_AUDIO_JOB_TTL_SECONDS
+            )
+        except Exception as e:
+            # Progress is best-effort; generation carries on
+            logger.warning(f"Failed to save canned audio job {job['job_id']}: {e}")
@@ -0,0 +1,210 @@
+"""
+Canned phrase table - in-process map of canned audio URLs per restaurant
+
+Canned responses (greetings, COME_AGAIN, state-machine-only replies) used to
+probe storage on every turn. The table is filled by checking each known
+phrase key of a restaurant once, either at startup or the first time the
+restaurant is seen, so the turn path is a dictionary lookup; entries older
+than the TTL keep being served while a background task reloads them.
+(Listing restaurants/{id}/audio/ instead would also walk every archived
+recording stored under that prefix, so the cost would grow with call history.)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Dict, Any, Iterable
+
+from ..core.config import settings
+from ..constants.audio_phrases import AudioPhraseType
+
+logger = logging.getLogger(__name__)
+
+
+class CannedPhraseTable:
+    """
+    AudioPhraseType x restaurant -> audio URL, loaded lazily per restaurant
+    """
+
+    def __init__(self, file_storage_service, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the canned phrase table
+
+        Args:
+            file_storage_service: Storage the canned audio lives in
+            ttl_seconds: Reload a restaurant's entries after this long (defaults to CANNED_PHRASE_TABLE_TTL_SECONDS)
+        """
+        self.file_storage_service = file_storage_service
+        self.ttl_seconds = settings.CANNED_PHRASE_TABLE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        # restaurant_id -> ({phrase value: url}, loaded_at or None if never fully loaded)
+        self._tables: Dict[int, tuple] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "load_failures": 0}
+
+    @staticmethod
+    def path(phrase_type: AudioPhraseType, restaurant_id: int) -> str:
+        """Storage key for a restaurant's canned phrase"""
+        return f"restaurants/{restaurant_id}/audio/{phrase_type.value}.mp3"
+
+    @staticmethod
+    def _key(restaurant_id) -> Any:
+        # Callers pass restaurant IDs as int or str; share one table for both
+        try:
+            return int(restaurant_id)
+        except (TypeError, ValueError):
+            return restaurant_id
+
+    def is_loaded(self, restaurant_id: int) -> bool:
+        entry = self._tables.get(self._key(restaurant_id))
+        return entry is not None and entry[1] is not None and time.monotonic() - entry[1] < self.ttl_seconds
+
+    async def ensure_loaded(self, restaurant_id: int) -> None:
+        """
+        Load a restaurant's table if it has never been loaded; if it is only
+        stale, keep serving it and reload it in the background
+        """
+        entry = self._tables.get(self._key(restaurant_id))
+        if entry is None or entry[1] is None:
+            await self.load(restaurant_id)
+        elif not self.is_loaded(restaurant_id):
+            self.refresh_in_background(restaurant_id)
+
+    async def get(self, phrase_type: AudioPhraseType, restaurant_id: int) -> Optional[str]:
+        """
+        Get a canned phrase URL, loading the restaurant's table on first use
+
+        Args:
+            phrase_type: Type of canned phrase
+            restaurant_id: Restaurant ID
+
+        Returns:
+            str: Audio URL if the phrase exists, None otherwise
+        """
+        await self.ensure_loaded(restaurant_id)
+
+        entry = self._tables.get(self._key(restaurant_id))
+        url = entry[0].get(phrase_type.value) if entry else None
+        self._stats["hits" if url else "misses"] += 1
+        return url
+
+    def record(self, phrase_type: AudioPhraseType, restaurant_id: int, url: str) -> None:
+        """Add a phrase that was just found or generated"""
+        entry = self._tables.get(self._key(restaurant_id))
+        if entry is None:
+            # Not a full load, so let the next get() wait for the rest
+            entry = ({}, None)
+            self._tables[self._key(restaurant_id)] = entry
+        entry[0][phrase_type.value] = url
+
+    async def load(self, restaurant_id: int, raise_errors: bool = False) -> Dict[str, str]:
+        """
+        (Re)load a restaurant's canned phrases by checking each phrase key
+
+        Concurrent callers for the same restaurant share one load.
+
+        Args:
+            restaurant_id: Restaurant ID
+            raise_errors: Re-raise storage errors instead of returning the last known entries
+
+        Returns:
+            Dict[str, str]: Phrase value -> URL
+        """
+        key = self._key(restaurant_id)
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if raise_errors:
+                raise
+            # Keep whatever we had; the next lookup tries again
+            entry = self._tables.get(key)
+            return entry[0] if entry else {}
+
+    def refresh_in_background(self, restaurant_id: int) -> None:
+        """Reload a stale table without making the caller wait for it"""
+        key = self._key(restaurant_id)
+        if key in self._loading:
+            return
+        task = asyncio.create_task(self._load(key))
+        self._loading[key] = task
+
+        def done(finished: asyncio.Task) -> None:
+            self._loading.pop(key, None)
+            if not finished.cancelled():
+                # Already logged and counted by _load; the stale entries stay in place
+                finished.exception()
+
+        task.add_done_callback(done)
+
+    async def _load(self, restaurant_id: int) -> Dict[str, str]:
+        slots = asyncio.Semaphore(max(1, settings.CANNED_PHRASE_TABLE_PROBE_CONCURRENCY))
+
+        async def probe(key: str) -> bool:
+            async with slots:
+                return await self.file_storage_service.file_exists(key)
+
+        paths = [self.path(phrase_type, restaurant_id) for phrase_type in AudioPhraseType]
+        try:
+            found = await asyncio.gather(*(probe(path) for path in paths))
+        except Exception as e:
+            self._stats["load_failures"] += 1
+            logger.warning(f"Failed to load canned phrases for restaurant {restaurant_id}: {e}")
+            raise
+
+        phrases = {
+            phrase_type.value: self.file_storage_service.get_url(path)
+            for phrase_type, path, exists in zip(AudioPhraseType, paths, found)
+            if exists
+        }
+        self._tables[restaurant_id] = (phrases, time.monotonic())
+        self._stats["loads"] += 1
+        logger.info(f"Loaded {len(phrases)} canned phrases for restaurant {restaurant_id}")
+        return phrases
+
+    async def preload(self, restaurant_ids: Iterable[int], concurrency: int = 8) -> int:
+        """
+        Load several restaurants' tables (e.g. at startup)
+
+        Args:
+            restaurant_ids: Restaurants to load
+            concurrency: Max restaurants loaded at once
+
+        Returns:
+            int: Number of restaurants loaded
+        """
+        slots = asyncio.Semaphore(max(1, concurrency))
+
+        async def load_one(restaurant_id: int):
+            async with slots:
+                await self.load(restaurant_id)
+
+        restaurant_ids = list(restaurant_ids)
+        await asyncio.gather(*(load_one(restaurant_id) for restaurant_id in restaurant_ids))
+        return len(restaurant_ids)
+
+    def invalidate(self, restaurant_id: Optional[int] = None) -> None:
+        """
+        Drop cached entries so the next lookup reloads them
+
+        Args:
+            restaurant_id: Restaurant to drop (None drops all)
+        """
+        if restaurant_id is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(self._key(restaurant_id), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get table counters
+
+        Returns:
+            Dict[str, Any]: Hit/miss/load counts and number of restaurants loaded
+        """
+        return {**self._stats, "restaurants": len(self._tables)}
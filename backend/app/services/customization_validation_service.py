@@ -9,6 +9,7 @@ import logging
 
 from ..core.unit_of_work import UnitOfWork
 from ..dto.order_result import OrderResult
+from .menu_ingredient_snapshot import MenuIngredientSnapshot, customization_ingredient_names
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +52,8 @@ class CustomizationValidationService:
         menu_item_id: int, 
         ingredient_name: str, 
         restaurant_id: int,
-        uow: UnitOfWork
+        uow: UnitOfWork,
+        ingredients: Optional[MenuIngredientSnapshot] = None
     ) -> ValidationResult:
         """
         Validate removing an ingredient from a menu item
@@ -61,6 +63,7 @@ class CustomizationValidationService:
             ingredient_name: Name of ingredient to remove
             restaurant_id: Restaurant ID for scoping
             uow: Unit of work for database access
+            ingredients: Snapshot already loaded for the command batch, if any
             
         Returns:
             ValidationResult: Validation result with success/error info
@@ -69,16 +72,10 @@ class CustomizationValidationService:
             logger.info(f"Validating removal of '{ingredient_name}' from menu item {menu_item_id}")
             
             # 1. Get all ingredients for this menu item
-            menu_item_ingredients = await uow.menu_item_ingredients.get_by_menu_item(menu_item_id)
+            ingredients = await self._ingredients(uow, restaurant_id, ingredients, menu_item_id)
             
             # 2. Check if ingredient exists in the menu item
-            ingredient_found = False
-            for menu_ingredient in menu_item_ingredients:
-                if menu_ingredient.ingredient and menu_ingredient.ingredient.name.lower() == ingredient_name.lower():
-                    ingredient_found = True
-                    break
-            
-            if not ingredient_found:
+            if not ingredients.menu_item_ingredient(menu_item_id, ingredient_name):
                 # Get menu item name for better error message
                 menu_item = await uow.menu_items.get_by_id(menu_item_id)
                 menu_name = menu_item.name if menu_item else f"Menu item {menu_item_id}"
@@ -112,7 +109,8 @@ class CustomizationValidationService:
         menu_item_id: int, 
         ingredient_name: str, 
         restaurant_id: int,
-        uow: UnitOfWork
+        uow: UnitOfWork,
+        ingredients: Optional[MenuIngredientSnapshot] = None
     ) -> ValidationResult:
         """
         Validate adding an ingredient to a menu item
@@ -122,6 +120,7 @@ class CustomizationValidationService:
             ingredient_name: Name of ingredient to add
             restaurant_id: Restaurant ID for scoping
             uow: Unit of work for database access
+            ingredients: Snapshot already loaded for the command batch, if any
             
         Returns:
             ValidationResult: Validation result with success/error info and extra cost
@@ -130,7 +129,8 @@ class CustomizationValidationService:
             logger.info(f"Validating addition of '{ingredient_name}' to menu item {menu_item_id}")
             
             # 1. Check if ingredient exists in the restaurant
-            ingredient = await uow.ingredients.get_by_name_and_restaurant(ingredient_name, restaurant_id)
+            ingredients = await self._ingredients(uow, restaurant_id, ingredients, menu_item_id, [ingredient_name])
+            ingredient = ingredients.ingredient(ingredient_name)
             
             if not ingredient:
                 return ValidationResult(
@@ -141,7 +141,7 @@ class CustomizationValidationService:
                 )
             
             # 2. Calculate extra cost for adding this ingredient
-            extra_cost = await self.calculate_extra_cost(menu_item_id, ingredient_name, restaurant_id, uow)
+            extra_cost = await self.calculate_extra_cost(menu_item_id, ingredient_name, restaurant_id, uow, ingredients)
             
             # 3. Success - ingredient can be added
             cost_message = f" (extra cost: ${extra_cost:.2f})" if extra_cost > 0 else " (no extra cost)"
@@ -168,7 +168,8 @@ class CustomizationValidationService:
         menu_item_id: int, 
         ingredient_name: str, 
         restaurant_id: int,
-        uow: UnitOfWork
+        uow: UnitOfWork,
+        ingredients: Optional[MenuIngredientSnapshot] = None
     ) -> float:
         """
         Calculate the extra cost for adding an ingredient to a menu item
@@ -178,23 +179,23 @@ class CustomizationValidationService:
             ingredient_name: Name of ingredient to add
             restaurant_id: Restaurant ID for scoping
             uow: Unit of work for database access
+            ingredients: Snapshot already loaded for the command batch, if any
             
         Returns:
             float: Extra cost for adding the ingredient
         """
         try:
             # 1. Get the ingredient to check its unit cost
-            ingredient = await uow.ingredients.get_by_name_and_restaurant(ingredient_name, restaurant_id)
+            ingredients = await self._ingredients(uow, restaurant_id, ingredients, menu_item_id, [ingredient_name])
+            ingredient = ingredients.ingredient(ingredient_name)
             if not ingredient:
                 return 0.0
             
             # 2. Check if this ingredient is already in the menu item
-            menu_item_ingredients = await uow.menu_item_ingredients.get_by_menu_item(menu_item_id)
-            
-            for menu_ingredient in menu_item_ingredients:
-                if menu_ingredient.ingredient and menu_ingredient.ingredient.name.lower() == ingredient_name.lower():
-                    # Ingredient already exists - return the additional_cost from MenuItemIngredient
-                    return float(menu_ingredient.additional_cost) if menu_ingredient.additional_cost else 0.0
+            menu_ingredient = ingredients.menu_item_ingredient(menu_item_id, ingredient_name)
+            if menu_ingredient:
+                # Ingredient already exists - return the additional_cost from MenuItemIngredient
+                return float(menu_ingredient.additional_cost) if menu_ingredient.additional_cost else 0.0
             
             # 3. Ingredient not in menu item - use the ingredient's unit_cost
             return float(ingredient.unit_cost) if ingredient.unit_cost else 0.0
@@ -208,16 +209,22 @@ class CustomizationValidationService:
         menu_item_id: int, 
         customizations: List[str], 
         restaurant_id: int,
-        uow: UnitOfWork
+        uow: UnitOfWork,
+        ingredients: Optional[MenuIngredientSnapshot] = None
     ) -> Dict[str, ValidationResult]:
         """
         Validate a list of customizations for a menu item
         
+        The menu item's ingredients and every ingredient the customizations name
+        are loaded up front (at most two queries, none when the command batch's
+        snapshot already has them).
+        
         Args:
             menu_item_id: ID of the menu item
             customizations: List of customization strings (e.g., ["no onions", "extra cheese"])
             restaurant_id: Restaurant ID for scoping
             uow: Unit of work for database access
+            ingredients: Snapshot already loaded for the command batch, if any
             
         Returns:
             Dict[str, ValidationResult]: Validation results for each customization
@@ -225,6 +232,10 @@ class CustomizationValidationService:
         results = {}
         total_extra_cost = 0.0
         
+        removed, added = customization_ingredient_names(customizations)
+        if removed or added:
+            ingredients = await self._ingredients(uow, restaurant_id, ingredients, menu_item_id, added)
+        
         for customization in customizations:
             customization_lower = customization.lower().strip()
             
@@ -232,7 +243,7 @@ class CustomizationValidationService:
                 # Remove ingredient
                 ingredient_name = customization_lower[3:].strip()
                 result = await self.validate_remove_ingredient(
-                    menu_item_id, ingredient_name, restaurant_id, uow
+                    menu_item_id, ingredient_name, restaurant_id, uow, ingredients
                 )
                 results[customization] = result
                 
@@ -244,7 +255,7 @@ class CustomizationValidationService:
                     ingredient_name = customization_lower[4:].strip()
                 
                 result = await self.validate_add_ingredient(
-                    menu_item_id, ingredient_name, restaurant_id, uow
+                    menu_item_id, ingredient_name, restaurant_id, uow, ingredients
                 )
                 results[customization] = result
                 
@@ -261,4 +272,17 @@ class CustomizationValidationService:
         
         logger.info(f"Validated {len(customizations)} customizations, total extra cost: ${total_extra_cost:.2f}")
         return results
-
+    
+    async def _ingredients(
+        self,
+        uow: UnitOfWork,
+        restaurant_id: int,
+        ingredients: Optional[MenuIngredientSnapshot],
+        menu_item_id: int,
+        ingredient_names: List[str] = ()
+    ) -> MenuIngredientSnapshot:
+        """Snapshot holding this menu item and these names, loading only what it is missing"""
+        if ingredients is None or ingredients.restaurant_id != restaurant_id:
+            ingredients = MenuIngredientSnapshot(restaurant_id)
+        await ingredients.ensure(uow, [menu_item_id], ingredient_names)
+        return ingredients
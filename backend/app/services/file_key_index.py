@@ -0,0 +1,153 @@
+"""
+File key index - which object key a stored file ID lives at
+
+Lets S3 reads and deletes go straight to the object instead of listing a
+prefix to find it. One Redis hash per bucket, with no TTL:
+
+    file_index:{bucket}   HASH  file_id -> object key
+                                __complete__ -> set once a backfill has indexed the whole bucket
+
+Until the bucket is marked complete a miss isn't authoritative, so callers
+fall back to listing and write what they find back into the index. A file
+that is stored but can't be indexed clears the flag again.
+"""
+
+import logging
+from typing import Optional, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPLETE_FIELD = "__complete__"
+
+
+class FileKeyIndex:
+    """
+    file_id -> object key mapping for one bucket, stored in Redis
+    """
+
+    def __init__(self, redis_service, bucket_name: str):
+        """
+        Initialize the file key index
+
+        Args:
+            redis_service: RedisService owning the connection
+            bucket_name: Bucket whose objects are indexed
+        """
+        self.redis = redis_service
+        self.bucket_name = bucket_name
+
+    @property
+    def index_key(self) -> str:
+        return f"file_index:{self.bucket_name}"
+
+    async def lookup(self, file_id: str) -> Tuple[Optional[str], bool]:
+        """
+        Look up a file's object key in one round trip
+
+        Args:
+            file_id: Unique file identifier
+
+        Returns:
+            tuple: (object key or None, whether a miss is authoritative)
+        """
+        if not self.redis.connected:
+            return None, False
+
+        try:
+            key, complete = await self.redis.redis_client.hmget(self.index_key, [file_id, COMPLETE_FIELD])
+            return key, bool(complete)
+        except Exception as e:
+            logger.error(f"File index lookup failed for {file_id}: {e}")
+            return None, False
+
+    async def put(self, file_id: str, key: str) -> bool:
+        """
+        Record where a file is stored
+
+        Returns:
+            bool: True if recorded, False otherwise
+        """
+        return await self.put_many({file_id: key})
+
+    async def put_many(self, keys: Dict[str, str]) -> bool:
+        """
+        Record several files in one round trip
+
+        Args:
+            keys: file_id -> object key
+
+        Returns:
+            bool: True if recorded, False otherwise
+        """
+        if not keys:
+            return True
+        if not self.redis.connected:
+            return False
+
+        try:
+            await self.redis.redis_client.hset(self.index_key, mapping=keys)
+            return True
+        except Exception as e:
+            logger.error(f"File index update failed ({len(keys)} entries): {e}")
+            return False
+
+    async def remove(self, file_id: str) -> bool:
+        """
+        Forget a file's location
+
+        Returns:
+            bool: True if removed, False otherwise
+        """
+        if not self.redis.connected:
+            return False
+
+        try:
+            await self.redis.redis_client.hdel(self.index_key, file_id)
+            return True
+        except Exception as e:
+            logger.error(f"File index removal failed for {file_id}: {e}")
+            return False
+
+    async def mark_complete(self) -> bool:
+        """
+        Mark the index as covering every object in the bucket
+
+        Returns:
+            bool: True if marked, False otherwise
+        """
+        return await self.put_many({COMPLETE_FIELD: "1"})
+
+    async def mark_incomplete(self) -> bool:
+        """
+        Make misses non-authoritative again (a file was stored but couldn't be indexed)
+
+        Returns:
+            bool: True if cleared, False otherwise
+        """
+        if not self.redis.connected:
+            return False
+
+        try:
+            await self.redis.redis_client.hdel(self.index_key, COMPLETE_FIELD)
+            return True
+        except Exception as e:
+            logger.error(f"File index complete flag could not be cleared: {e}")
+            return False
+
+    async def count(self) -> int:
+        """
+        Get the number of indexed files (for monitoring/debugging)
+
+        Returns:
+            int: Indexed file count
+        """
+        if not self.redis.connected:
+            return 0
+
+        try:
+            client = self.redis.redis_client
+            size = await client.hlen(self.index_key)
+            return size - (1 if await client.hexists(self.index_key, COMPLETE_FIELD) else 0)
+        except Exception as e:
+            logger.error(f"File index count failed: {e}")
+            return 0
@@ -2,14 +2,24 @@
 File storage service with interface for local and cloud storage
 """
 
+import asyncio
+import logging
 import os
 import uuid
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, BinaryIO
+from contextlib import AsyncExitStack
+from typing import Optional, Dict, Any, BinaryIO, AsyncIterator, List
 from datetime import datetime
 from pathlib import Path
 
+from ..core.config import settings
 from ..dto.order_result import OrderResult
+from .file_key_index import FileKeyIndex
+
+logger = logging.getLogger(__name__)
+
+# Stored-but-unindexed files a process remembers while the key index can't be written
+MAX_UNINDEXED_FILES = 10000
 
 
 class FileStorageInterface(ABC):
@@ -32,6 +42,76 @@ class FileStorageInterface(ABC):
         """
         pass
     
+    async def store_stream(self, chunks: AsyncIterator[bytes], file_name: str, content_type: str, restaurant_id: int = None, order_id: int = None) -> OrderResult:
+        """
+        Store a file whose bytes arrive as a stream
+        
+        Backends that can upload incrementally override this; the default
+        collects the stream and hands it to store_file.
+        
+        Args:
+            chunks: Async iterator of file bytes
+            file_name: Original file name
+            content_type: MIME type of the file
+            
+        Returns:
+            OrderResult: Storage result with file information
+        """
+        file_data = b"".join([chunk async for chunk in chunks])
+        return await self.store_file(file_data, file_name, content_type, restaurant_id=restaurant_id, order_id=order_id)
+    
+    @abstractmethod
+    async def file_exists(self, key: str) -> bool:
+        """
+        Check whether a file exists at a storage key/path
+        
+        Args:
+            key: Storage key (e.g. an organized canned-phrase path)
+            
+        Returns:
+            bool: True if the file exists
+        """
+        pass
+    
+    @abstractmethod
+    async def list_keys(self, prefix: str) -> List[str]:
+        """
+        List the keys/paths of all files under a prefix
+        
+        Args:
+            prefix: Key prefix (e.g. "restaurants/1/audio/")
+            
+        Returns:
+            List[str]: Matching keys
+        """
+        pass
+    
+    @abstractmethod
+    async def read_file(self, key: str) -> Optional[bytes]:
+        """
+        Read a file's bytes by storage key/path
+        
+        Args:
+            key: Storage key
+            
+        Returns:
+            Optional[bytes]: File bytes, or None if no file exists at the key
+        """
+        pass
+    
+    @abstractmethod
+    def get_url(self, key: str) -> str:
+        """
+        Get the URL (or local path) clients use to fetch a stored file
+        
+        Args:
+            key: Storage key
+            
+        Returns:
+            str: File URL
+        """
+        pass
+    
     @abstractmethod
     async def get_file(self, file_id: str) -> OrderResult:
         """
@@ -107,7 +187,7 @@ class LocalFileStorageService(FileStorageInterface):
         self.files_path.mkdir(parents=True, exist_ok=True)
         self.transcripts_path.mkdir(parents=True, exist_ok=True)
     
-    async def store_file(self, file_data: bytes, file_name: str, content_type: str) -> OrderResult:
+    async def store_file(self, file_data: bytes, file_name: str, content_type: str, restaurant_id: int = None, order_id: int = None) -> OrderResult:
         """Store file locally"""
         try:
             # Generate unique file ID
@@ -149,6 +229,30 @@ class LocalFileStorageService(FileStorageInterface):
         except Exception as e:
             return OrderResult.error(f"Failed to store file: {str(e)}")
     
+    async def file_exists(self, key: str) -> bool:
+        """Check whether a file exists under the storage root"""
+        return (self.base_path / key).is_file()
+    
+    async def list_keys(self, prefix: str) -> List[str]:
+        """List files under the storage root whose relative path starts with prefix"""
+        return sorted(
+            path.relative_to(self.base_path).as_posix()
+            for path in self.base_path.rglob("*")
+            if path.is_file() and path.relative_to(self.base_path).as_posix().startswith(prefix)
+        )
+    
+    async def read_file(self, key: str) -> Optional[bytes]:
+        """Read a file under the storage root"""
+        path = self.base_path / key
+        if not path.is_file():
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    def get_url(self, key: str) -> str:
+        """Local file path for a storage key"""
+        return str(self.base_path / key)
+    
     async def get_file(self, file_id: str) -> OrderResult:
         """Retrieve file from local storage"""
         try:
@@ -248,9 +352,14 @@ class LocalFileStorageService(FileStorageInterface):
 class S3FileStorageService(FileStorageInterface):
     """
     AWS S3 file storage implementation for production
+
+    Uses one long-lived aioboto3 client per event loop so requests share a
+    pooled, keep-alive connection set instead of blocking the loop on
+    synchronous boto3 calls. Retries are handled by botocore's standard or
+    adaptive retry mode (exponential backoff with full jitter).
     """
     
-    def __init__(self, bucket_name: str, region: str = "us-east-1", endpoint_url: str = None):
+    def __init__(self, bucket_name: str, region: str = "us-east-1", endpoint_url: str = None, redis_service=None):
         """
         Initialize S3 file storage
         
@@ -258,13 +367,14 @@ class S3FileStorageService(FileStorageInterface):
             bucket_name: S3 bucket name
             region: AWS region
             endpoint_url: Custom endpoint URL (for LocalStack, MinIO, etc.)
+            redis_service: RedisService for the file_id -> key index (falls back to listing without it)
         """
         self.bucket_name = bucket_name
         self.region = region
-        
-        # Initialize boto3 S3 client
-        import boto3
-        import os
+        self.endpoint_url = endpoint_url or None
+        self.key_index = FileKeyIndex(redis_service, bucket_name) if redis_service else None
+        # file_id -> key for files stored while the index couldn't be written; retried on the next write
+        self._unindexed: Dict[str, str] = {}
         
         # DEBUG: Log S3 configuration (without credentials)
         print(f"DEBUG S3FileStorageService initialization:")
@@ -273,161 +383,435 @@ class S3FileStorageService(FileStorageInterface):
         print(f"  endpoint_url: {endpoint_url}")
         print(f"  AWS credentials: {'SET' if os.getenv('AWS_ACCESS_KEY_ID') and os.getenv('AWS_SECRET_ACCESS_KEY') else 'NOT_SET'}")
         
-        client_kwargs = {'region_name': region}
-        if endpoint_url:
-            client_kwargs['endpoint_url'] = endpoint_url
-        self.s3_client = boto3.client('s3', **client_kwargs)
+        # The client is created lazily on first use, inside the running event loop
+        self._session = None
+        self._client = None
+        self._client_stack: Optional[AsyncExitStack] = None
+        self._client_loop = None
+        self._client_lock: Optional[asyncio.Lock] = None
+        self._bucket_checked = False
+    
+    def _client_config(self):
+        """Build the pooled client configuration from settings"""
+        from aiobotocore.config import AioConfig
+        
+        return AioConfig(
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.S3_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.S3_READ_TIMEOUT_SECONDS,
+            retries={"mode": settings.S3_RETRY_MODE, "total_max_attempts": settings.S3_MAX_ATTEMPTS},
+            tcp_keepalive=True
+        )
+    
+    async def _get_client(self):
+        """
+        Get the shared S3 client, creating it on first use
+        
+        aiohttp connection pools are tied to the event loop that created them,
+        so a new client is opened if we are called from a different loop
+        (e.g. a script calling asyncio.run more than once).
+        
+        Returns:
+            aiobotocore S3 client
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop is loop:
+            return self._client
+        
+        if self._client_lock is None or self._client_loop is not loop:
+            self._client_lock = asyncio.Lock()
+            self._client_loop = loop
+            self._client = None
+            self._client_stack = None
         
-        print(f"DEBUG: S3 client created successfully")
+        async with self._client_lock:
+            if self._client is None:
+                import aioboto3
+                
+                if self._session is None:
+                    self._session = aioboto3.Session()
+                client_kwargs = {'region_name': self.region, 'config': self._client_config()}
+                if self.endpoint_url:
+                    client_kwargs['endpoint_url'] = self.endpoint_url
+                
+                stack = AsyncExitStack()
+                self._client = await stack.enter_async_context(self._session.client('s3', **client_kwargs))
+                self._client_stack = stack
+                print(f"DEBUG: S3 client created (pool size {settings.S3_MAX_POOL_CONNECTIONS})")
+        return self._client
+    
+    async def close(self) -> None:
+        """Close the S3 client and its connection pool"""
+        stack = self._client_stack
+        self._client = None
+        self._client_stack = None
+        if stack is not None:
+            await stack.aclose()
+    
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        """Check whether a botocore ClientError means the object/bucket doesn't exist"""
+        code = str(getattr(error, "response", {}).get("Error", {}).get("Code", ""))
+        return code in ("404", "NoSuchKey", "NotFound", "NoSuchBucket")
     
     async def _ensure_bucket_exists(self):
-        """Ensure the S3 bucket exists, create if it doesn't"""
+        """Ensure the S3 bucket exists, create if it doesn't (checked once per service)"""
+        if self._bucket_checked:
+            return
+        
+        client = await self._get_client()
         try:
-            print(f"DEBUG: Checking if bucket exists: {self.bucket_name}")
-            # Check if bucket exists
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
-            print(f"DEBUG: Bucket exists: {self.bucket_name}")
-        except self.s3_client.exceptions.NoSuchBucket:
-            print(f"DEBUG: Bucket doesn't exist, creating: {self.bucket_name}")
-            # Create bucket if it doesn't exist
-            self.s3_client.create_bucket(Bucket=self.bucket_name)
-            print(f"DEBUG: Bucket created: {self.bucket_name}")
+            await client.head_bucket(Bucket=self.bucket_name)
         except Exception as e:
-            print(f"DEBUG: Error checking bucket: {str(e)}")
-            # Try to create anyway
+            if not self._is_not_found(e):
+                print(f"DEBUG: Error checking bucket: {str(e)}")
+            # Create the bucket if it doesn't exist (or we can't tell)
             try:
                 print(f"DEBUG: Attempting to create bucket: {self.bucket_name}")
-                self.s3_client.create_bucket(Bucket=self.bucket_name)
-                print(f"DEBUG: Bucket created after error: {self.bucket_name}")
+                await client.create_bucket(Bucket=self.bucket_name)
+                print(f"DEBUG: Bucket created: {self.bucket_name}")
             except Exception as create_error:
-                print(f"DEBUG: Failed to create bucket: {str(create_error)}")
-                raise
+                code = getattr(create_error, "response", {}).get("Error", {}).get("Code", "")
+                if code not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
+                    print(f"DEBUG: Failed to create bucket: {str(create_error)}")
+                    raise
+        self._bucket_checked = True
+    
+    def _build_key(self, file_name: str, content_type: str, restaurant_id: int = None, order_id: int = None):
+        """
+        Create the organized S3 key for a new file
+        
+        Returns:
+            tuple: (file_id, s3_key)
+        """
+        # Determine file extension
+        extension = self._get_extension_from_content_type(content_type)
+        if not extension:
+            extension = Path(file_name).suffix or ".bin"
+        
+        file_id = str(uuid.uuid4())  # Always needed for metadata
+        if "/" in file_name and not file_name.startswith("files/"):
+            # file_name is already an organized path (e.g., "audio/canned/greeting_restaurant_20.mp3")
+            # Use it directly as the S3 key
+            s3_key = file_name
+        elif restaurant_id and order_id:
+            # For audio files, use UUID to avoid conflicts
+            s3_key = f"restaurants/{restaurant_id}/orders/{order_id}/audio/{file_id}{extension}"
+        elif restaurant_id:
+            # Use original filename for both images and audio to maintain readability
+            if content_type and content_type.startswith('image/'):
+                s3_key = f"restaurants/{restaurant_id}/images/{file_name}"
+            else:
+                s3_key = f"restaurants/{restaurant_id}/audio/{file_name}"
+        else:
+            # Fallback to old structure with UUID
+            s3_key = f"files/{file_id}{extension}"
+        return file_id, s3_key
+    
+    def get_url(self, s3_key: str) -> str:
+        """Public URL for an object key"""
+        return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
+    
+    def _stored_metadata(self, file_id: str, file_name: str, content_type: str, size: int, s3_key: str) -> Dict[str, Any]:
+        return {
+            "file_id": file_id,
+            "original_name": file_name,
+            "content_type": content_type,
+            "size": size,
+            "stored_at": datetime.now().isoformat(),
+            "s3_key": s3_key,
+            "s3_url": self.get_url(s3_key)
+        }
     
     async def store_file(self, file_data: bytes, file_name: str, content_type: str, restaurant_id: int = None, order_id: int = None) -> OrderResult:
         """Store file in S3 with restaurant/order organization"""
         try:
-            # DEBUG: Log what we're receiving
-            print(f"DEBUG S3FileStorageService.store_file called with:")
-            print(f"  file_data: {type(file_data)} - {len(file_data) if file_data else 'None'}")
-            print(f"  file_name: {file_name}")
-            print(f"  content_type: {content_type}")
-            print(f"  restaurant_id: {restaurant_id}")
-            print(f"  order_id: {order_id}")
-            
             if file_data is None:
-                print("ERROR: file_data is None!")
                 return OrderResult.error("File data is None")
-            
-            # Ensure bucket exists
-            print(f"DEBUG: About to ensure bucket exists: {self.bucket_name}")
-            await self._ensure_bucket_exists()
-            print(f"DEBUG: Bucket exists check completed")
-            
-            # Determine file extension
-            extension = self._get_extension_from_content_type(content_type)
-            if not extension:
-                extension = Path(file_name).suffix or ".bin"
-            
-            # Create organized S3 key structure
-            if "/" in file_name and not file_name.startswith("files/"):
-                # file_name is already an organized path (e.g., "audio/canned/greeting_restaurant_20.mp3")
-                # Use it directly as the S3 key
-                file_id = str(uuid.uuid4())  # Still need file_id for metadata
-                s3_key = file_name
-            elif restaurant_id and order_id:
-                # For audio files, use UUID to avoid conflicts
-                file_id = str(uuid.uuid4())
-                s3_key = f"restaurants/{restaurant_id}/orders/{order_id}/audio/{file_id}{extension}"
-            elif restaurant_id:
-                # Use original filename for both images and audio to maintain readability
-                file_id = str(uuid.uuid4())  # Still need file_id for metadata
-                if content_type and content_type.startswith('image/'):
-                    s3_key = f"restaurants/{restaurant_id}/images/{file_name}"
-                else:
-                    s3_key = f"restaurants/{restaurant_id}/audio/{file_name}"
-            else:
-                # Fallback to old structure with UUID
-                file_id = str(uuid.uuid4())
-                s3_key = f"files/{file_id}{extension}"
-            
-            # DEBUG: Log right before S3 upload
-            print(f"DEBUG: About to upload to S3:")
-            print(f"  Bucket: {self.bucket_name}")
-            print(f"  Key: {s3_key}")
-            print(f"  Body (file_data): {type(file_data)} - {len(file_data) if file_data else 'None'}")
-            print(f"  ContentType: {content_type} (type: {type(content_type)})")
-            print(f"  FileName: {file_name} (type: {type(file_name)})")
-            print(f"  S3 Client: {type(self.s3_client)}")
-            
-            if file_data is None:
-                print("ERROR: file_data is None right before S3 upload!")
-                return OrderResult.error("File data is None right before S3 upload")
-            
             if content_type is None:
-                print("ERROR: content_type is None right before S3 upload!")
-                return OrderResult.error("Content type is None right before S3 upload")
-                
+                return OrderResult.error("Content type is None")
             if file_name is None:
-                print("ERROR: file_name is None right before S3 upload!")
-                return OrderResult.error("File name is None right before S3 upload")
+                return OrderResult.error("File name is None")
             
-            if self.s3_client is None:
-                print("ERROR: S3 client is None!")
-                return OrderResult.error("S3 client is None")
-            
-            # Upload to S3
-            response = self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=file_data,
-                ContentType=content_type,
-                Metadata={
-                    "original_name": file_name,
-                    "file_id": file_id
-                }
-            )
+            await self._ensure_bucket_exists()
+            file_id, s3_key = self._build_key(file_name, content_type, restaurant_id, order_id)
+            object_metadata = {"original_name": file_name, "file_id": file_id}
             
-            # Store metadata
-            metadata = {
-                "file_id": file_id,
-                "original_name": file_name,
-                "content_type": content_type,
-                "size": len(file_data),
-                "stored_at": datetime.now().isoformat(),
-                "s3_key": s3_key,
-                "s3_url": f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
-            }
+            if len(file_data) >= settings.S3_MULTIPART_THRESHOLD_BYTES:
+                # Large bodies go up as parallel parts; slicing a memoryview avoids copies
+                view = memoryview(file_data)
+                part_size = self._part_size()
+                
+                async def parts():
+                    for offset in range(0, len(view), part_size):
+                        yield view[offset:offset + part_size]
+                
+                await self._multipart_upload(parts(), s3_key, content_type, object_metadata)
+            else:
+                client = await self._get_client()
+                await client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=file_data,
+                    ContentType=content_type,
+                    Metadata=object_metadata
+                )
+            await self._index_file(file_id, s3_key)
             
             return OrderResult.success(
                 "File stored successfully in S3",
-                data=metadata
+                data=self._stored_metadata(file_id, file_name, content_type, len(file_data), s3_key)
             )
             
         except Exception as e:
             return OrderResult.error(f"Failed to store file in S3: {str(e)}")
     
-    async def get_file(self, file_id: str) -> OrderResult:
-        """Retrieve file from S3"""
+    async def store_stream(self, chunks: AsyncIterator[bytes], file_name: str, content_type: str, restaurant_id: int = None, order_id: int = None) -> OrderResult:
+        """
+        Stream a file into S3 as it is produced
+        
+        Chunks are buffered into parts and each part is uploaded as soon as it
+        is full, so upload overlaps with production and memory stays bounded to
+        roughly S3_MULTIPART_CONCURRENCY parts. Streams smaller than one part
+        are sent with a single put_object.
+        """
         try:
-            # List objects to find the file
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=f"files/{file_id}"
+            await self._ensure_bucket_exists()
+            file_id, s3_key = self._build_key(file_name, content_type, restaurant_id, order_id)
+            object_metadata = {"original_name": file_name, "file_id": file_id}
+            part_size = self._part_size()
+            
+            stream = chunks.__aiter__()
+            buffer = bytearray()
+            exhausted = False
+            # Fill the first part before deciding between single and multipart upload
+            while len(buffer) < part_size:
+                try:
+                    buffer.extend(await stream.__anext__())
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+            
+            if exhausted:
+                client = await self._get_client()
+                await client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=bytes(buffer),
+                    ContentType=content_type,
+                    Metadata=object_metadata
+                )
+                size = len(buffer)
+            else:
+                size = await self._multipart_upload(
+                    self._rechunk(buffer, stream, part_size), s3_key, content_type, object_metadata
+                )
+            await self._index_file(file_id, s3_key)
+            
+            return OrderResult.success(
+                "File stored successfully in S3",
+                data=self._stored_metadata(file_id, file_name, content_type, size, s3_key)
             )
             
-            if 'Contents' not in response or not response['Contents']:
-                return OrderResult.error("File not found")
+        except Exception as e:
+            return OrderResult.error(f"Failed to stream file to S3: {str(e)}")
+    
+    @staticmethod
+    def _part_size() -> int:
+        # S3 rejects non-final parts under 5 MiB
+        return max(settings.S3_MULTIPART_PART_SIZE_BYTES, 5 * 1024 * 1024)
+    
+    @staticmethod
+    async def _rechunk(buffer: bytearray, stream: AsyncIterator[bytes], part_size: int) -> AsyncIterator[bytes]:
+        """Regroup arbitrary stream chunks into part_size parts"""
+        while True:
+            while len(buffer) >= part_size:
+                yield bytes(buffer[:part_size])
+                del buffer[:part_size]
+            try:
+                buffer.extend(await stream.__anext__())
+            except StopAsyncIteration:
+                break
+        if buffer:
+            yield bytes(buffer)
+    
+    async def _multipart_upload(self, parts: AsyncIterator[bytes], s3_key: str, content_type: str, object_metadata: Dict[str, str]) -> int:
+        """
+        Upload parts concurrently as one multipart object
+        
+        Args:
+            parts: Part bodies in order (all but the last at least 5 MiB)
+            s3_key: Destination key
+            content_type: MIME type of the object
+            object_metadata: User metadata stored with the object
             
-            # Get the first matching file
-            s3_key = response['Contents'][0]['Key']
+        Returns:
+            int: Total bytes uploaded
             
-            # Retrieve file from S3
-            file_response = self.s3_client.get_object(
+        Raises:
+            Exception: If any part fails; the multipart upload is aborted first
+        """
+        client = await self._get_client()
+        upload = await client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            ContentType=content_type,
+            Metadata=object_metadata
+        )
+        upload_id = upload["UploadId"]
+        slots = asyncio.Semaphore(max(1, settings.S3_MULTIPART_CONCURRENCY))
+        tasks = []
+        size = 0
+        
+        async def upload_part(part_number: int, body) -> Dict[str, Any]:
+            try:
+                response = await client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=bytes(body) if isinstance(body, memoryview) else body
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            finally:
+                slots.release()
+        
+        try:
+            part_number = 0
+            async for body in parts:
+                # Waiting for a free slot before reading on bounds buffered parts
+                await slots.acquire()
+                part_number += 1
+                size += len(body)
+                tasks.append(asyncio.create_task(upload_part(part_number, body)))
+            
+            completed = await asyncio.gather(*tasks)
+            await client.complete_multipart_upload(
                 Bucket=self.bucket_name,
-                Key=s3_key
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed}
             )
+            return size
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await client.abort_multipart_upload(Bucket=self.bucket_name, Key=s3_key, UploadId=upload_id)
+            except Exception as abort_error:
+                logger.warning(f"Failed to abort multipart upload {upload_id} for {s3_key}: {abort_error}")
+            raise
+    
+    async def file_exists(self, key: str) -> bool:
+        """Check whether an object exists with a single HEAD request"""
+        client = await self._get_client()
+        try:
+            await client.head_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except Exception as e:
+            if self._is_not_found(e):
+                return False
+            raise
+    
+    async def list_keys(self, prefix: str) -> List[str]:
+        """List all object keys under a prefix (paginated)"""
+        client = await self._get_client()
+        paginator = client.get_paginator("list_objects_v2")
+        keys = []
+        async for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+        return keys
+    
+    async def read_file(self, key: str) -> Optional[bytes]:
+        """Read an object's bytes by key with a single GET"""
+        client = await self._get_client()
+        try:
+            response = await client.get_object(Bucket=self.bucket_name, Key=key)
+        except Exception as e:
+            if self._is_not_found(e):
+                return None
+            raise
+        async with response['Body'] as body:
+            return await body.read()
+    
+    async def _index_file(self, file_id: str, s3_key: str) -> None:
+        """Record a stored file in the key index; the upload itself already succeeded"""
+        if not self.key_index:
+            return
+        
+        self._unindexed[file_id] = s3_key
+        if await self.key_index.put_many(dict(self._unindexed)):
+            self._unindexed.clear()
+            return
+        
+        # A complete index would now report this file as missing, and listing only
+        # finds the files/ layout, so this process also remembers it until indexed
+        while len(self._unindexed) > MAX_UNINDEXED_FILES:
+            self._unindexed.pop(next(iter(self._unindexed)))
+        if not await self.key_index.mark_incomplete():
+            logger.error(f"File {file_id} stored at {s3_key} but not indexed, and the index is still marked complete")
+        else:
+            logger.warning(f"File {file_id} stored at {s3_key} but not indexed; reads will fall back to listing")
+    
+    async def _list_key(self, file_id: str) -> Optional[str]:
+        """Find the key of a file stored under the files/ fallback layout by listing"""
+        client = await self._get_client()
+        response = await client.list_objects_v2(
+            Bucket=self.bucket_name,
+            Prefix=f"files/{file_id}",
+            MaxKeys=1
+        )
+        contents = response.get('Contents')
+        return contents[0]['Key'] if contents else None
+    
+    async def _resolve_key(self, file_id: str) -> Optional[str]:
+        """
+        Resolve a file ID to its object key
+        
+        Uses the key index when available. Listing is only needed for files
+        the index hasn't seen yet (before a backfill has marked it complete),
+        and whatever listing finds is written back to the index. Files this
+        process stored while the index couldn't be written resolve from memory.
+        
+        Returns:
+            str: Object key, or None if the file doesn't exist
+        """
+        if file_id in self._unindexed:
+            return self._unindexed[file_id]
+        if self.key_index:
+            s3_key, complete = await self.key_index.lookup(file_id)
+            if s3_key or complete:
+                return s3_key
+        
+        s3_key = await self._list_key(file_id)
+        if s3_key and self.key_index:
+            await self.key_index.put(file_id, s3_key)
+        return s3_key
+    
+    async def get_file(self, file_id: str) -> OrderResult:
+        """Retrieve file from S3"""
+        try:
+            s3_key = await self._resolve_key(file_id)
+            if not s3_key:
+                return OrderResult.error("File not found")
             
-            file_data = file_response['Body'].read()
+            # Retrieve file from S3
+            client = await self._get_client()
+            try:
+                file_response = await client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key
+                )
+            except Exception as e:
+                if self._is_not_found(e):
+                    # Object removed outside this service - drop the stale index entry
+                    if self.key_index:
+                        await self.key_index.remove(file_id)
+                    return OrderResult.error("File not found")
+                raise
+            async with file_response['Body'] as body:
+                file_data = await body.read()
             
             return OrderResult.success(
                 "File retrieved successfully from S3",
@@ -444,27 +828,74 @@ class S3FileStorageService(FileStorageInterface):
     async def delete_file(self, file_id: str) -> OrderResult:
         """Delete file from S3"""
         try:
-            # List objects to find the file
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=f"files/{file_id}"
-            )
-            
-            if 'Contents' not in response or not response['Contents']:
+            s3_key = await self._resolve_key(file_id)
+            if not s3_key:
                 return OrderResult.error("File not found")
             
             # Delete the file
-            s3_key = response['Contents'][0]['Key']
-            self.s3_client.delete_object(
+            client = await self._get_client()
+            await client.delete_object(
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
+            self._unindexed.pop(file_id, None)
+            if self.key_index:
+                await self.key_index.remove(file_id)
             
             return OrderResult.success("File deleted successfully from S3")
             
         except Exception as e:
             return OrderResult.error(f"Failed to delete file from S3: {str(e)}")
     
+    async def backfill_key_index(self, prefix: str = "", concurrency: int = 16) -> Dict[str, int]:
+        """
+        Index objects that were stored before the key index existed
+        
+        Keys in the files/{file_id}.ext layout are indexed from their name;
+        other keys need a HEAD request to read the file_id metadata written by
+        store_file, issued with bounded concurrency. A full-bucket run (no
+        prefix) marks the index complete so misses stop falling back to listing.
+        
+        Args:
+            prefix: Only scan keys under this prefix
+            concurrency: Max concurrent HEAD requests
+            
+        Returns:
+            Dict[str, int]: scanned, indexed and skipped object counts
+            
+        Raises:
+            RuntimeError: If there is no key index to fill
+        """
+        if not self.key_index:
+            raise RuntimeError("No key index configured (S3FileStorageService needs a redis_service)")
+        
+        client = await self._get_client()
+        slots = asyncio.Semaphore(max(1, concurrency))
+        stats = {"scanned": 0, "indexed": 0, "skipped": 0}
+        
+        async def file_id_for(s3_key: str) -> Optional[str]:
+            if s3_key.startswith("files/"):
+                return Path(s3_key).stem
+            async with slots:
+                head = await client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return head.get("Metadata", {}).get("file_id")
+        
+        paginator = client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            s3_keys = [obj["Key"] for obj in page.get("Contents", [])]
+            file_ids = await asyncio.gather(*(file_id_for(s3_key) for s3_key in s3_keys))
+            batch = {file_id: s3_key for file_id, s3_key in zip(file_ids, s3_keys) if file_id}
+            
+            if not await self.key_index.put_many(batch):
+                raise RuntimeError("Failed to write to the key index")
+            stats["scanned"] += len(s3_keys)
+            stats["indexed"] += len(batch)
+            stats["skipped"] += len(s3_keys) - len(batch)
+        
+        if not prefix:
+            await self.key_index.mark_complete()
+        return stats
+    
     async def store_transcript(self, file_id: str, transcript: str, metadata: Dict[str, Any], restaurant_id: int = None, order_id: int = None) -> OrderResult:
         """Store transcript in S3 with restaurant/order organization"""
         try:
@@ -485,7 +916,8 @@ class S3FileStorageService(FileStorageInterface):
             }
             
             # Upload transcript to S3
-            self.s3_client.put_object(
+            client = await self._get_client()
+            await client.put_object(
                 Bucket=self.bucket_name,
                 Key=transcript_key,
                 Body=json.dumps(transcript_data),
@@ -506,22 +938,25 @@ class S3FileStorageService(FileStorageInterface):
             transcript_key = f"transcripts/{file_id}.json"
             
             # Retrieve transcript from S3
-            response = self.s3_client.get_object(
+            client = await self._get_client()
+            response = await client.get_object(
                 Bucket=self.bucket_name,
                 Key=transcript_key
             )
+            async with response['Body'] as body:
+                raw = await body.read()
             
             import json
-            transcript_data = json.loads(response['Body'].read().decode('utf-8'))
+            transcript_data = json.loads(raw.decode('utf-8'))
             
             return OrderResult.success(
                 "Transcript retrieved successfully from S3",
                 data=transcript_data
             )
             
-        except self.s3_client.exceptions.NoSuchKey:
-            return OrderResult.error("Transcript not found")
         except Exception as e:
+            if self._is_not_found(e):
+                return OrderResult.error("Transcript not found")
             return OrderResult.error(f"Failed to retrieve transcript from S3: {str(e)}")
     
     def _get_extension_from_content_type(self, content_type: str) -> Optional[str]:
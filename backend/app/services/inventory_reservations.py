@@ -0,0 +1,405 @@
+"""
+Inventory reservations - stock held by open orders across all lanes
+
+The database keeps the stock on hand; Redis keeps how much of it open orders
+have claimed, so concurrent lanes can't sell the same last units. Each check
+and hold is one Lua script, all or nothing over every ingredient of a line:
+
+    inventory:{ingredient_id}:reserved   STRING  quantity held by open orders (INCRBYFLOAT)
+    reservation:{holder}                 HASH    "{order_item_id}|{ingredient_id}" -> quantity
+    inventory:reservations:expiry        ZSET    holder scored by expiry (epoch seconds)
+
+A holder is an order ID, or the claim ID of an order being confirmed. Lines
+reserve on add, give back on remove/clear/cancel, and expire after
+INVENTORY_RESERVATION_TTL_SECONDS without a change (swept in the background).
+On confirm the order's reservation is claimed, taken off the database stock
+with a guarded UPDATE, then released.
+
+The counter keys are derived inside the scripts from the hash contents, so
+the scripts assume a single Redis instance (no cluster slot routing).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expired reservations released per script call
+_SWEEP_BATCH = 100
+
+# Helpers shared by the scripts
+_LIB = """
+local function counter(ingredient)
+    return 'inventory:' .. ingredient .. ':reserved'
+end
+
+-- {field, ingredient, quantity} held in a reservation hash, for one line ('' = all lines)
+local function holdings(hash, line)
+    local held = {}
+    local fields = redis.call('HGETALL', hash)
+    for i = 1, #fields, 2 do
+        local sep = string.find(fields[i], '|', 1, true)
+        if line == '' or string.sub(fields[i], 1, sep - 1) == line then
+            table.insert(held, {fields[i], string.sub(fields[i], sep + 1), tonumber(fields[i + 1])})
+        end
+    end
+    return held
+end
+
+local function give_back(ingredient, quantity)
+    local left = tonumber(redis.call('INCRBYFLOAT', counter(ingredient), -quantity))
+    if left <= 1e-9 then
+        redis.call('DEL', counter(ingredient))
+    end
+end
+"""
+
+# KEYS: reservation hash, expiry set
+# ARGV: holder, expires_at, order_item_id, enforce ('1' checks stock), replace ('1' drops
+#       what the line already holds first), then ingredient_id, quantity, stock per ingredient
+_RESERVE = _LIB + """
+local line = ARGV[3]
+local held = {}
+local previous = {}
+if ARGV[5] == '1' then
+    held = holdings(KEYS[1], line)
+    for _, h in ipairs(held) do
+        previous[h[2]] = h[3]
+    end
+end
+if ARGV[4] == '1' then
+    for pos = 6, #ARGV, 3 do
+        local ingredient = ARGV[pos]
+        local reserved = tonumber(redis.call('GET', counter(ingredient)) or '0') - (previous[ingredient] or 0)
+        local stock = tonumber(ARGV[pos + 2])
+        if reserved + tonumber(ARGV[pos + 1]) > stock + 1e-9 then
+            return {'INSUFFICIENT', ingredient, tostring(stock - reserved)}
+        end
+    end
+end
+for _, h in ipairs(held) do
+    give_back(h[2], h[3])
+    redis.call('HDEL', KEYS[1], h[1])
+end
+for pos = 6, #ARGV, 3 do
+    redis.call('INCRBYFLOAT', counter(ARGV[pos]), ARGV[pos + 1])
+    redis.call('HINCRBYFLOAT', KEYS[1], line .. '|' .. ARGV[pos], ARGV[pos + 1])
+end
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+end
+return {'OK'}
+"""
+
+# KEYS: reservation hash, expiry set
+# ARGV: holder, order_item_id ('' releases the whole reservation)
+_RELEASE = _LIB + """
+local held = holdings(KEYS[1], ARGV[2])
+for _, h in ipairs(held) do
+    give_back(h[2], h[3])
+    redis.call('HDEL', KEYS[1], h[1])
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+end
+return #held
+"""
+
+# KEYS: reservation hash, expiry set, claim hash
+# ARGV: order_id, claim_id, claim expires_at
+_CLAIM = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {}
+end
+redis.call('RENAME', KEYS[1], KEYS[3])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[2])
+return redis.call('HGETALL', KEYS[3])
+"""
+
+# KEYS: expiry set
+# ARGV: now, max holders to release
+_RELEASE_EXPIRED = _LIB + """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, holder in ipairs(expired) do
+    local hash = 'reservation:' .. holder
+    for _, h in ipairs(holdings(hash, '')) do
+        give_back(h[2], h[3])
+    end
+    redis.call('DEL', hash)
+    redis.call('ZREM', KEYS[1], holder)
+end
+return #expired
+"""
+
+SCRIPTS = {
+    "reserve": _RESERVE,
+    "release": _RELEASE,
+    "claim": _CLAIM,
+    "release_expired": _RELEASE_EXPIRED,
+}
+
+
+def ingredient_demand(
+    menu_item_ingredients: Iterable[Any],
+    quantity: int,
+    removed: Iterable[str] = ()
+) -> Dict[int, Tuple[float, float]]:
+    """
+    Quantity of each ingredient one order line needs, with the stock it is checked against
+
+    Args:
+        menu_item_ingredients: Recipe rows with ingredient and inventory loaded (MenuIngredientSnapshot)
+        quantity: Number of the menu item ordered
+        removed: Lowercased ingredient names left out ("no onions")
+
+    Returns:
+        Dict[int, Tuple[float, float]]: ingredient ID -> (quantity needed, stock on hand);
+        ingredients without an inventory row aren't tracked
+    """
+    removed = set(removed)
+    demand: Dict[int, Tuple[float, float]] = {}
+    for menu_item_ingredient in menu_item_ingredients:
+        ingredient = menu_item_ingredient.ingredient
+        if not ingredient or not ingredient.inventory or ingredient.name.lower() in removed:
+            continue
+        needed = float(menu_item_ingredient.quantity) * quantity
+        previous = demand.get(ingredient.id, (0.0, 0.0))[0]
+        demand[ingredient.id] = (previous + needed, float(ingredient.inventory.current_stock))
+    return demand
+
+
+@dataclass
+class ReservationResult:
+    """Outcome of a reservation"""
+    status: str                                 # OK, INSUFFICIENT, UNAVAILABLE, ERROR
+    ingredient_id: Optional[int] = None         # First ingredient short, for INSUFFICIENT
+    available: float = 0.0                      # Its stock not held by other orders
+    error: Optional[str] = None
+
+    @property
+    def is_success(self) -> bool:
+        return self.status == "OK"
+
+    @property
+    def is_insufficient(self) -> bool:
+        return self.status == "INSUFFICIENT"
+
+
+class InventoryReservations:
+    """
+    Atomic per-ingredient reservation counters in Redis
+    """
+
+    EXPIRY_KEY = "inventory:reservations:expiry"
+
+    def __init__(self, redis_service):
+        """
+        Initialize inventory reservations
+
+        Args:
+            redis_service: RedisService owning the connection
+        """
+        self.redis = redis_service
+        self._client = None
+        self._scripts: Dict[str, Any] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def counter_key(ingredient_id: int) -> str:
+        return f"inventory:{ingredient_id}:reserved"
+
+    @staticmethod
+    def reservation_key(holder: str) -> str:
+        return f"reservation:{holder}"
+
+    def _get_script(self, name: str):
+        """Register scripts against the current client (re-registered after reconnect)"""
+        client = self.redis.redis_client
+        if client is not self._client:
+            self._client = client
+            self._scripts = {key: client.register_script(source) for key, source in SCRIPTS.items()}
+        return self._scripts[name]
+
+    @property
+    def available(self) -> bool:
+        return bool(self.redis.connected and self.redis.redis_client)
+
+    async def reserve(
+        self,
+        order_id: str,
+        order_item_id: str,
+        demand: Dict[int, Tuple[float, float]],
+        replace: bool = False,
+        enforce: bool = True,
+        ttl: Optional[int] = None
+    ) -> ReservationResult:
+        """
+        Hold stock for one order line, all of its ingredients or none
+
+        Args:
+            order_id: Order the line belongs to
+            order_item_id: Order line ID
+            demand: ingredient ID -> (quantity, stock on hand), from ingredient_demand()
+            replace: Drop what the line already holds first (quantity changes)
+            enforce: Refuse when stock not held by other orders is short
+                (off records the hold anyway, for ALLOW_NEGATIVE_INVENTORY)
+            ttl: Seconds the order's reservation lives without a change
+
+        Returns:
+            ReservationResult: OK, INSUFFICIENT with the ingredient short, UNAVAILABLE or ERROR
+        """
+        if not self.available:
+            return ReservationResult(status="UNAVAILABLE")
+
+        ttl = ttl or settings.INVENTORY_RESERVATION_TTL_SECONDS
+        args = [order_id, str(time.time() + ttl), order_item_id, "1" if enforce else "0", "1" if replace else "0"]
+        for ingredient_id, (quantity, stock) in demand.items():
+            args += [str(ingredient_id), repr(float(quantity)), repr(float(stock))]
+        try:
+            reply = await self._get_script("reserve")(
+                keys=[self.reservation_key(order_id), self.EXPIRY_KEY], args=args
+            )
+        except Exception as e:
+            logger.error(f"Failed to reserve inventory for order {order_id}: {e}")
+            return ReservationResult(status="ERROR", error=str(e))
+
+        if reply[0] == "INSUFFICIENT":
+            return ReservationResult(status="INSUFFICIENT", ingredient_id=int(reply[1]), available=max(float(reply[2]), 0.0))
+        return ReservationResult(status="OK")
+
+    async def release(self, holder: str, order_item_id: Optional[str] = None) -> int:
+        """
+        Give back what an order (or one of its lines, or a claim) holds
+
+        Args:
+            holder: Order ID or claim ID
+            order_item_id: Only release this line
+
+        Returns:
+            int: Number of ingredient holds released
+        """
+        if not self.available:
+            return 0
+
+        try:
+            return await self._get_script("release")(
+                keys=[self.reservation_key(holder), self.EXPIRY_KEY], args=[holder, order_item_id or ""]
+            )
+        except Exception as e:
+            logger.error(f"Failed to release inventory reservation {holder}: {e}")
+            return 0
+
+    async def claim(self, order_id: str) -> Tuple[Optional[str], Dict[int, float]]:
+        """
+        Take over an order's reservation for committing it to the database
+
+        The holds stay counted until the claim is released, so the stock stays
+        spoken for while the database is updated. Only one caller gets a
+        reservation's contents; a claim that is never released expires like an order.
+
+        Args:
+            order_id: Order being confirmed
+
+        Returns:
+            Tuple[Optional[str], Dict[int, float]]: Claim ID to release afterwards and
+            quantity by ingredient ID; (None, {}) when the order holds nothing
+        """
+        if not self.available:
+            return None, {}
+
+        claim_id = f"{order_id}:claim:{uuid.uuid4().hex[:12]}"
+        try:
+            reply = await self._get_script("claim")(
+                keys=[self.reservation_key(order_id), self.EXPIRY_KEY, self.reservation_key(claim_id)],
+                args=[order_id, claim_id, str(time.time() + settings.INVENTORY_RESERVATION_TTL_SECONDS)]
+            )
+        except Exception as e:
+            logger.error(f"Failed to claim inventory reservation for order {order_id}: {e}")
+            return None, {}
+        if not reply:
+            return None, {}
+        return claim_id, self._quantities(reply)
+
+    async def get(self, holder: str) -> Dict[int, float]:
+        """
+        Quantity held by an order (or claim), by ingredient ID
+        """
+        if not self.available:
+            return {}
+        try:
+            fields = await self.redis.redis_client.hgetall(self.reservation_key(holder))
+        except Exception as e:
+            logger.error(f"Failed to read inventory reservation {holder}: {e}")
+            return {}
+        return self._quantities([value for pair in fields.items() for value in pair])
+
+    async def get_reserved(self, ingredient_ids: List[int]) -> Dict[int, float]:
+        """
+        Quantity held by all open orders, by ingredient ID (for monitoring/debugging)
+        """
+        if not self.available or not ingredient_ids:
+            return {}
+        try:
+            values = await self.redis.redis_client.mget([self.counter_key(i) for i in ingredient_ids])
+        except Exception as e:
+            logger.error(f"Failed to read reserved inventory: {e}")
+            return {}
+        return {ingredient_id: float(value or 0) for ingredient_id, value in zip(ingredient_ids, values)}
+
+    async def release_expired(self, limit: int = _SWEEP_BATCH) -> int:
+        """
+        Release reservations of orders that haven't changed within their TTL
+
+        Returns:
+            int: Number of reservations released
+        """
+        if not self.available:
+            return 0
+        try:
+            return await self._get_script("release_expired")(keys=[self.EXPIRY_KEY], args=[str(time.time()), str(limit)])
+        except Exception as e:
+            logger.error(f"Failed to release expired inventory reservations: {e}")
+            return 0
+
+    @staticmethod
+    def _quantities(flat: List[str]) -> Dict[int, float]:
+        """Sum "{order_item_id}|{ingredient_id}" -> quantity pairs per ingredient"""
+        quantities: Dict[int, float] = {}
+        for field, value in zip(flat[::2], flat[1::2]):
+            ingredient_id = int(field.rsplit("|", 1)[1])
+            quantities[ingredient_id] = quantities.get(ingredient_id, 0.0) + float(value)
+        return quantities
+
+    # Background expiry
+
+    async def start(self) -> None:
+        """Start releasing expired reservations every INVENTORY_RESERVATION_SWEEP_SECONDS (one sweeper per process)"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(settings.INVENTORY_RESERVATION_SWEEP_SECONDS)
+            try:
+                while await self.release_expired() >= _SWEEP_BATCH:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Inventory reservation sweep failed: {e}")
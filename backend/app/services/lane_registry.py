@@ -0,0 +1,197 @@
+"""
+Lane registry - which session is at which drive-thru lane
+
+Replaces the single global current-session pointer with one pointer per
+restaurant lane, so one deployment can serve many lanes at once:
+
+    lane:{restaurant_id}:{lane_id}:session   STRING  session ID at the lane (O(1) lookup)
+    restaurant:{restaurant_id}:lanes         SET     lane IDs with a session, for listing
+    session:{session_id}:lane                STRING  reverse pointer back to the lane
+"""
+
+import json
+import logging
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# KEYS: lane pointer, restaurant lane set, reverse session pointer
+# ARGV: session_id, ttl, lane_id, reverse pointer value
+_ASSIGN = """
+local previous = redis.call('GET', KEYS[1])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+redis.call('SADD', KEYS[2], ARGV[3])
+redis.call('SET', KEYS[3], ARGV[4], 'EX', tonumber(ARGV[2]))
+return previous
+"""
+
+# KEYS: lane pointer, restaurant lane set
+# ARGV: expected session_id ('' clears whatever is there), lane_id
+_RELEASE = """
+local current = redis.call('GET', KEYS[1])
+if current and ARGV[1] ~= '' and current ~= ARGV[1] then
+    return false
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[2])
+return current
+"""
+
+
+class LaneRegistry:
+    """
+    Per-restaurant, per-lane current session pointers in Redis
+    """
+
+    def __init__(self, redis_service):
+        """
+        Initialize the lane registry
+
+        Args:
+            redis_service: RedisService owning the connection
+        """
+        self.redis = redis_service
+        self._client = None
+        self._scripts: Dict[str, Any] = {}
+
+    @staticmethod
+    def lane_key(restaurant_id: int, lane_id: str) -> str:
+        return f"lane:{restaurant_id}:{lane_id}:session"
+
+    @staticmethod
+    def lanes_key(restaurant_id: int) -> str:
+        return f"restaurant:{restaurant_id}:lanes"
+
+    @staticmethod
+    def session_key(session_id: str) -> str:
+        return f"session:{session_id}:lane"
+
+    def _get_script(self, name: str):
+        """Register scripts against the current client (re-registered after reconnect)"""
+        client = self.redis.redis_client
+        if client is not self._client:
+            self._client = client
+            self._scripts = {
+                "assign": client.register_script(_ASSIGN),
+                "release": client.register_script(_RELEASE),
+            }
+        return self._scripts[name]
+
+    async def get_session_id(self, restaurant_id: int, lane_id: str) -> Optional[str]:
+        """
+        Get the session currently at a lane
+
+        Args:
+            restaurant_id: Restaurant ID
+            lane_id: Drive-thru lane identifier
+
+        Returns:
+            str: Session ID if the lane is occupied, None otherwise
+        """
+        return await self.redis.get(self.lane_key(restaurant_id, lane_id))
+
+    async def assign(self, restaurant_id: int, lane_id: str, session_id: str, ttl: int = 900) -> Optional[str]:
+        """
+        Point a lane at a session in one atomic round trip
+
+        Args:
+            restaurant_id: Restaurant ID
+            lane_id: Drive-thru lane identifier
+            session_id: Session ID now at the lane
+            ttl: Time to live in seconds (default 15 minutes)
+
+        Returns:
+            str: Session ID that was previously at the lane, if any
+
+        Raises:
+            ConnectionError: If Redis is not connected
+        """
+        if not self.redis.connected:
+            raise ConnectionError("Redis not connected")
+
+        location = json.dumps({"restaurant_id": restaurant_id, "lane_id": lane_id})
+        return await self._get_script("assign")(
+            keys=[self.lane_key(restaurant_id, lane_id), self.lanes_key(restaurant_id), self.session_key(session_id)],
+            args=[session_id, str(ttl), lane_id, location]
+        )
+
+    def queue_assign(self, pipe, restaurant_id: int, lane_id: str, session_id: str, ttl: int = 900) -> None:
+        """
+        Queue assign() on a caller's MULTI pipeline, so it commits with the caller's other writes
+
+        Plain commands rather than the script: no SCRIPT EXISTS round trip and no
+        NOSCRIPT failure half way through the transaction. The first reply queued
+        is the session ID that was previously at the lane.
+
+        Args:
+            pipe: Transactional pipeline from RedisService.pipeline()
+            restaurant_id: Restaurant ID
+            lane_id: Drive-thru lane identifier
+            session_id: Session ID now at the lane
+            ttl: Time to live in seconds (default 15 minutes)
+        """
+        lane_key = self.lane_key(restaurant_id, lane_id)
+        pipe.get(lane_key)
+        pipe.set(lane_key, session_id, ex=ttl)
+        pipe.sadd(self.lanes_key(restaurant_id), lane_id)
+        pipe.set(self.session_key(session_id), json.dumps({"restaurant_id": restaurant_id, "lane_id": lane_id}), ex=ttl)
+
+    async def release(self, restaurant_id: int, lane_id: str, session_id: Optional[str] = None) -> Optional[str]:
+        """
+        Clear a lane, optionally only if it still points at session_id
+
+        Args:
+            restaurant_id: Restaurant ID
+            lane_id: Drive-thru lane identifier
+            session_id: Only clear the lane if this session is still there
+
+        Returns:
+            str: Session ID that was cleared, None if nothing was cleared
+        """
+        if not self.redis.connected:
+            return None
+
+        try:
+            return await self._get_script("release")(
+                keys=[self.lane_key(restaurant_id, lane_id), self.lanes_key(restaurant_id)],
+                args=[session_id or "", lane_id]
+            )
+        except Exception as e:
+            logger.error(f"Failed to release lane {restaurant_id}/{lane_id}: {e}")
+            return None
+
+    async def get_session_lane(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the lane a session was assigned to
+
+        Returns:
+            dict: {"restaurant_id", "lane_id"} if known, None otherwise
+        """
+        value = await self.redis.get(self.session_key(session_id))
+        return json.loads(value) if value else None
+
+    async def list_lanes(self, restaurant_id: int) -> Dict[str, str]:
+        """
+        Get all occupied lanes for a restaurant (for monitoring/debugging)
+
+        Returns:
+            dict: lane_id -> session_id
+        """
+        if not self.redis.connected:
+            return {}
+
+        try:
+            client = self.redis.redis_client
+            lane_ids = sorted(await client.smembers(self.lanes_key(restaurant_id)))
+            if not lane_ids:
+                return {}
+            session_ids = await client.mget([self.lane_key(restaurant_id, lane_id) for lane_id in lane_ids])
+
+            expired = [lane_id for lane_id, session_id in zip(lane_ids, session_ids) if session_id is None]
+            if expired:
+                # Pointers that timed out are pruned lazily from the listing set
+                await client.srem(self.lanes_key(restaurant_id), *expired)
+            return {lane_id: session_id for lane_id, session_id in zip(lane_ids, session_ids) if session_id}
+        except Exception as e:
+            logger.error(f"Failed to list lanes for restaurant {restaurant_id}: {e}")
+            return {}
@@ -6,6 +6,7 @@ Abstract interface for menu caching to allow different implementations
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
+from app.dto.cached_menu_item import CachedMenuItem
 from app.models.menu_item import MenuItem
 
 
@@ -13,17 +14,17 @@ class MenuCacheInterface(ABC):
     """Abstract interface for menu caching operations"""
     
     @abstractmethod
-    async def get_menu_items(self, restaurant_id: int) -> List[MenuItem]:
+    async def get_menu_items(self, restaurant_id: int) -> List[CachedMenuItem]:
         """Get all menu items for a restaurant from cache"""
         pass
     
     @abstractmethod
-    async def get_menu_item_by_id(self, restaurant_id: int, menu_item_id: int) -> Optional[MenuItem]:
+    async def get_menu_item_by_id(self, restaurant_id: int, menu_item_id: int) -> Optional[CachedMenuItem]:
         """Get a specific menu item by ID from cache"""
         pass
     
     @abstractmethod
-    async def search_menu_items(self, restaurant_id: int, query: str) -> List[MenuItem]:
+    async def search_menu_items(self, restaurant_id: int, query: str) -> List[CachedMenuItem]:
         """Search menu items by name/description from cache"""
         pass
     
@@ -4,10 +4,16 @@ Menu Cache Loader Service
 Loads menu data into cache on application startup
 """
 
+import asyncio
 import logging
-from typing import List
+import time
+from typing import List, Dict, Any, Optional, Callable
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_session
 from app.core.unit_of_work import UnitOfWork
+from app.repository.menu_item_repository import MenuItemRepository
+from app.repository.restaurant_repository import RestaurantRepository
 from app.services.menu_cache_interface import MenuCacheInterface
 from app.models.menu_item import MenuItem
 
@@ -17,14 +23,82 @@ logger = logging.getLogger(__name__)
 class MenuCacheLoader:
     """Service to load menu data into cache on startup"""
     
-    def __init__(self, cache_service: MenuCacheInterface):
+    def __init__(self, cache_service: MenuCacheInterface, session_factory: Optional[Callable[[], AsyncSession]] = None):
         """
         Initialize menu cache loader
         
         Args:
             cache_service: Menu cache service implementation
+            session_factory: Opens a database session (warm-up uses one per concurrent restaurant)
         """
         self.cache_service = cache_service
+        self.session_factory = session_factory or get_async_session
+    
+    async def warm_up(
+        self,
+        concurrency: Optional[int] = None,
+        page_size: Optional[int] = None,
+        reuse_cached: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Load every active restaurant's full menu into the cache, several restaurants at a time
+        
+        Restaurant IDs and menu items are both read with keyset pagination, so
+        no menu is truncated and no query gets slower deeper into the table.
+        A restaurant whose menu is already in the cache (e.g. warmed by another
+        worker) is loaded from the cache instead of the database.
+        
+        Args:
+            concurrency: Restaurants loaded at once, each on its own session (defaults to MENU_CACHE_WARMUP_CONCURRENCY)
+            page_size: Rows per query (defaults to MENU_CACHE_WARMUP_PAGE_SIZE)
+            reuse_cached: Take menus already in the cache instead of reloading them from the database
+            
+        Returns:
+            Dict[str, Any]: restaurants, items, from_cache, failures and seconds
+        """
+        concurrency = concurrency or settings.MENU_CACHE_WARMUP_CONCURRENCY
+        page_size = page_size or settings.MENU_CACHE_WARMUP_PAGE_SIZE
+        stats = {"restaurants": 0, "items": 0, "from_cache": 0, "failures": 0}
+        started_at = time.perf_counter()
+        
+        if not await self.cache_service.is_cache_available():
+            logger.warning("Cache service not available, skipping menu cache warm-up")
+            return {**stats, "skipped": True, "seconds": 0.0}
+        
+        slots = asyncio.Semaphore(max(1, concurrency))
+        
+        async def warm_restaurant(restaurant_id: int) -> None:
+            async with slots:
+                try:
+                    if reuse_cached:
+                        cached = await self.cache_service.get_menu_items(restaurant_id)
+                        if cached:
+                            stats["from_cache"] += 1
+                            stats["items"] += len(cached)
+                            return
+                    async with self.session_factory() as db:
+                        menu_items = await MenuItemRepository(db).get_all_by_restaurant(restaurant_id, page_size)
+                    if menu_items:
+                        await self.cache_service.cache_menu_items(restaurant_id, menu_items)
+                        stats["items"] += len(menu_items)
+                except Exception as e:
+                    stats["failures"] += 1
+                    logger.error(f"Menu cache warm-up failed for restaurant {restaurant_id}: {e}")
+        
+        tasks = []
+        async with self.session_factory() as db:
+            async for restaurant_ids in RestaurantRepository(db).stream_active_ids(page_size):
+                # Restaurants start loading while later pages of IDs are still being read
+                tasks.extend(asyncio.create_task(warm_restaurant(restaurant_id)) for restaurant_id in restaurant_ids)
+        stats["restaurants"] = len(tasks)
+        await asyncio.gather(*tasks)
+        
+        stats["seconds"] = round(time.perf_counter() - started_at, 3)
+        logger.info(
+            f"Menu cache warm-up: {stats['restaurants']} restaurants, {stats['items']} items "
+            f"({stats['from_cache']} already cached, {stats['failures']} failed) in {stats['seconds']}s"
+        )
+        return stats
     
     async def load_all_restaurants(self, db: AsyncSession) -> None:
         """
@@ -41,13 +115,14 @@ class MenuCacheLoader:
                 logger.warning("Cache service not available, skipping menu cache loading")
                 return
             
-            # Get all restaurants
-            async with UnitOfWork(db) as uow:
-                restaurants = await uow.restaurants.get_all()
-                logger.info(f"Found {len(restaurants)} restaurants to cache")
-                
-                for restaurant in restaurants:
-                    await self._load_restaurant_menu(restaurant.id, db)
+            # Get all active restaurants (every page, not just the first 100)
+            restaurant_ids = []
+            async for page in RestaurantRepository(db).stream_active_ids():
+                restaurant_ids.extend(page)
+            logger.info(f"Found {len(restaurant_ids)} restaurants to cache")
+            
+            for restaurant_id in restaurant_ids:
+                await self._load_restaurant_menu(restaurant_id, db)
             
             logger.info("Menu cache loading completed successfully")
             
@@ -89,7 +164,7 @@ class MenuCacheLoader:
         try:
             async with UnitOfWork(db) as uow:
                 # Get all menu items for the restaurant
-                menu_items = await uow.menu_items.get_by_restaurant(restaurant_id)
+                menu_items = await uow.menu_items.get_all_by_restaurant(restaurant_id)
                 
                 if not menu_items:
                     logger.warning(f"No menu items found for restaurant {restaurant_id}")
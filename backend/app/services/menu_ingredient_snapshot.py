@@ -0,0 +1,113 @@
+"""
+Menu ingredient snapshot
+
+Ingredients (with their inventory) of the menu items a command batch touches,
+plus the restaurant ingredients its customizations name, loaded with one query
+each instead of one per ingredient. Validation reads from the snapshot and only
+goes back to the database for menu items or names it hasn't seen yet.
+"""
+
+from typing import Dict, List, Optional, Iterable, Tuple
+from ..core.unit_of_work import UnitOfWork
+from ..models.ingredient import Ingredient
+from ..models.menu_item_ingredient import MenuItemIngredient
+
+
+def customization_ingredient_names(customizations: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split customizations into the ingredient names they remove and add
+
+    Args:
+        customizations: Customization strings (e.g., ["no onions", "extra cheese", "add bacon"])
+
+    Returns:
+        Tuple[List[str], List[str]]: Lowercased names after "no ", and after "extra "/"add "
+    """
+    removed, added = [], []
+    for customization in customizations:
+        customization_lower = customization.lower().strip()
+        if customization_lower.startswith("no "):
+            removed.append(customization_lower[3:].strip())
+        elif customization_lower.startswith("extra "):
+            added.append(customization_lower[6:].strip())
+        elif customization_lower.startswith("add "):
+            added.append(customization_lower[4:].strip())
+    return removed, added
+
+
+class MenuIngredientSnapshot:
+    """
+    Menu item ingredients and named restaurant ingredients for one command batch
+    (one database session); not shared across requests
+    """
+
+    def __init__(self, restaurant_id: Optional[int] = None):
+        self.restaurant_id = restaurant_id
+        self._menu_item_ingredients: Dict[int, List[MenuItemIngredient]] = {}
+        # lowercased name -> ingredient, None when the restaurant has no such ingredient
+        self._ingredients: Dict[str, Optional[Ingredient]] = {}
+
+    @classmethod
+    async def load(
+        cls,
+        uow: UnitOfWork,
+        menu_item_ids: Iterable[int],
+        restaurant_id: Optional[int] = None,
+        ingredient_names: Iterable[str] = ()
+    ) -> "MenuIngredientSnapshot":
+        """
+        Load a snapshot for a set of menu items (and, with a restaurant, ingredient names)
+
+        Args:
+            uow: Unit of work for database access
+            menu_item_ids: Menu items whose ingredients and inventory to load
+            restaurant_id: Restaurant whose ingredients the names refer to
+            ingredient_names: Ingredient names to look up
+
+        Returns:
+            MenuIngredientSnapshot: Loaded snapshot
+        """
+        snapshot = cls(restaurant_id)
+        await snapshot.ensure(uow, menu_item_ids, ingredient_names)
+        return snapshot
+
+    async def ensure(self, uow: UnitOfWork, menu_item_ids: Iterable[int] = (), ingredient_names: Iterable[str] = ()) -> None:
+        """
+        Load whichever of these menu items and names the snapshot doesn't have yet
+
+        Args:
+            uow: Unit of work for database access
+            menu_item_ids: Menu item IDs needed
+            ingredient_names: Ingredient names needed (ignored without a restaurant)
+        """
+        missing_items = [menu_item_id for menu_item_id in menu_item_ids if menu_item_id not in self._menu_item_ingredients]
+        if missing_items:
+            self._menu_item_ingredients.update(
+                await uow.menu_item_ingredients.get_by_menu_items_with_inventory(missing_items)
+            )
+
+        if self.restaurant_id is None:
+            return
+        missing_names = {name.lower() for name in ingredient_names} - self._ingredients.keys()
+        if missing_names:
+            found = await uow.ingredients.get_by_names_and_restaurant(missing_names, self.restaurant_id)
+            self._ingredients.update({name: found.get(name) for name in missing_names})
+
+    def has_menu_item(self, menu_item_id: int) -> bool:
+        return menu_item_id in self._menu_item_ingredients
+
+    def menu_item_ingredients(self, menu_item_id: int) -> List[MenuItemIngredient]:
+        """Ingredients of a loaded menu item, each with ingredient and inventory loaded"""
+        return self._menu_item_ingredients.get(menu_item_id, [])
+
+    def ingredient(self, name: str) -> Optional[Ingredient]:
+        """Restaurant ingredient by name (case-insensitive), None if the restaurant has none"""
+        return self._ingredients.get(name.lower())
+
+    def menu_item_ingredient(self, menu_item_id: int, name: str) -> Optional[MenuItemIngredient]:
+        """A menu item's ingredient by name (case-insensitive)"""
+        name = name.lower()
+        for menu_item_ingredient in self.menu_item_ingredients(menu_item_id):
+            if menu_item_ingredient.ingredient and menu_item_ingredient.ingredient.name.lower() == name:
+                return menu_item_ingredient
+        return None
@@ -0,0 +1,410 @@
+"""
+Menu Search Index
+
+Per-restaurant compiled menu index used for item lookups. Names are normalized
+once when the index is built; lookups go through an inverted token index with
+phonetic and character-trigram keys so ASR misspellings ("big mack",
+"chese burger") still find the right item.
+"""
+
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Words that never identify a menu item
+MENU_STOPWORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'please', 'i', 'would', 'like', 'to', 'add',
+    'get', 'want', 'need', 'have', 'can', 'could', 'will', 'shall', 'may', 'might',
+    'this', 'that', 'these', 'those', 'my', 'your', 'his', 'her', 'its', 'our', 'their',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'do', 'does', 'did', 'done',
+    'meal', 'combo', 'with', 'without', 'extra', 'no', 'yes', 'some', 'any', 'all'
+}
+
+# Match strengths per query keyword
+EXACT_TOKEN_SCORE = 1.0
+PARTIAL_TOKEN_SCORE = 0.8
+PHONETIC_TOKEN_SCORE = 0.7
+TRIGRAM_TOKEN_SCALE = 0.6
+TRIGRAM_MIN_SIMILARITY = 0.5
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+_PHONETIC_RULES = [
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'ght'), 't'),
+    (re.compile(r'qu'), 'kw'),
+    (re.compile(r'ck'), 'k'),
+    (re.compile(r'c(?=[eiy])'), 's'),
+    (re.compile(r'ch'), 'x'),
+    (re.compile(r'sh'), 'x'),
+    (re.compile(r'c'), 'k'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'z'), 's'),
+]
+
+
+def normalize_menu_text(text: str) -> str:
+    """
+    Normalize text for menu matching.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Lowercased text with punctuation removed and whitespace collapsed
+    """
+    normalized = unicodedata.normalize('NFKC', text.lower())
+    normalized = _PUNCTUATION.sub(' ', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def extract_menu_keywords(text: str) -> List[str]:
+    """
+    Extract meaningful keywords from normalized text, removing stopwords.
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        List of keywords
+    """
+    return [word for word in text.lower().split() if word not in MENU_STOPWORDS and len(word) > 1]
+
+
+def phonetic_key(token: str) -> str:
+    """
+    Build a rough phonetic key for a token.
+
+    Collapses common English spelling variants (ck/c/k, ph/f, qu/kw), then
+    drops non-leading vowels and repeated letters, so "mack" and "mac" or
+    "nugets" and "nuggets" share a key.
+
+    Args:
+        token: Normalized token
+
+    Returns:
+        Phonetic key (empty for tokens too short to be meaningful)
+    """
+    if len(token) < 3 or not token.isalpha():
+        return ""
+    key = token
+    for pattern, replacement in _PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    head, tail = key[0], re.sub(r'[aeiouyhw]', '', key[1:])
+    collapsed = [head]
+    for char in tail:
+        if char != collapsed[-1]:
+            collapsed.append(char)
+    # One-letter keys ("coke" -> "k") would collide with too many words
+    return "".join(collapsed) if len(collapsed) > 1 else ""
+
+
+def trigrams(token: str) -> Set[str]:
+    """Character trigrams of a token padded with boundary markers"""
+    padded = f"#{token}#"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def menu_fingerprint(menu_items: List[Any]) -> str:
+    """
+    Fingerprint of the menu fields the index depends on.
+
+    Args:
+        menu_items: MenuItem objects
+
+    Returns:
+        Short hex digest that changes whenever an item is added, removed or renamed
+    """
+    rows = sorted(
+        (item.id or 0, item.name or "", bool(item.is_available), str(getattr(item, "updated_at", None) or ""))
+        for item in menu_items
+    )
+    return hashlib.sha1(repr(rows).encode("utf-8")).hexdigest()[:16]
+
+
+def is_confident_match(score: float, exact: bool) -> bool:
+    """
+    Whether a lone search candidate is safe to use without asking the customer.
+
+    Fuzzy-only hits ("wings" -> "Onion Rings") score below MENU_SEARCH_CONFIDENT_SCORE
+    and share no exact keyword with the item, so they need confirmation.
+
+    Args:
+        score: Aggregate candidate score from search_scored
+        exact: Whether the name or at least one keyword matched exactly
+
+    Returns:
+        True if the candidate can be auto-resolved
+    """
+    return exact or score >= settings.MENU_SEARCH_CONFIDENT_SCORE
+
+
+@dataclass
+class IndexedMenuItem:
+    """Menu item with its pre-normalized search keys"""
+    item: Any
+    normalized_name: str
+    compact_name: str
+    tokens: List[str]
+
+
+class MenuSearchIndex:
+    """
+    Compiled search index for one restaurant's menu.
+
+    Built once per menu version and then only read, so it can be shared by
+    every request for the restaurant.
+    """
+
+    def __init__(self, restaurant_id: int, menu_items: List[Any], version: Optional[str] = None):
+        """
+        Compile the index.
+
+        Args:
+            restaurant_id: Restaurant ID
+            menu_items: MenuItem objects (from cache or database)
+            version: Menu version (defaults to the fingerprint of menu_items)
+        """
+        self.restaurant_id = restaurant_id
+        self.version = version or menu_fingerprint(menu_items)
+        self.entries: List[IndexedMenuItem] = []
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_compact_name: Dict[str, List[int]] = {}
+        self._token_postings: Dict[str, Set[int]] = {}
+        self._phonetic_tokens: Dict[str, Set[str]] = {}
+        self._trigram_tokens: Dict[str, Set[str]] = {}
+        self._token_match_cache: Dict[str, List[Tuple[str, float]]] = {}
+
+        for item in menu_items:
+            normalized = normalize_menu_text(item.name or "")
+            entry = IndexedMenuItem(
+                item=item,
+                normalized_name=normalized,
+                compact_name=normalized.replace(" ", ""),
+                tokens=extract_menu_keywords(normalized)
+            )
+            position = len(self.entries)
+            self.entries.append(entry)
+            self._by_name.setdefault(entry.normalized_name, []).append(position)
+            self._by_compact_name.setdefault(entry.compact_name, []).append(position)
+            for token in entry.tokens:
+                self._token_postings.setdefault(token, set()).add(position)
+
+        for token in self._token_postings:
+            key = phonetic_key(token)
+            if key:
+                self._phonetic_tokens.setdefault(key, set()).add(token)
+            for gram in trigrams(token):
+                self._trigram_tokens.setdefault(gram, set()).add(token)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_by_name(self, name: str) -> Optional[Any]:
+        """
+        Get the menu item whose normalized name equals name.
+
+        Args:
+            name: Menu item name (any case/punctuation/spacing)
+
+        Returns:
+            MenuItem or None if not found
+        """
+        matches = self._exact_matches(normalize_menu_text(name))
+        return matches[0] if matches else None
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Any]:
+        """
+        Search the menu.
+
+        Args:
+            query: Search query
+            limit: Maximum number of candidates (defaults to MENU_SEARCH_TOP_K)
+
+        Returns:
+            List of matching MenuItem objects, best first
+        """
+        return [item for item, _, _ in self.search_scored(query, limit)]
+
+    def search_scored(self, query: str, limit: Optional[int] = None) -> List[Tuple[Any, float, bool]]:
+        """
+        Search the menu and return candidates with their scores.
+
+        Exact name matches win outright. Otherwise each query keyword is matched
+        against the token index (exact, then partial, then phonetic/trigram),
+        and items matching every keyword are preferred over partial matches.
+
+        Args:
+            query: Search query
+            limit: Maximum number of candidates (defaults to MENU_SEARCH_TOP_K)
+
+        Returns:
+            List of (MenuItem, score, exact) tuples with scores in 0.0-1.0, best first;
+            exact is True when the name or at least one keyword matched exactly
+        """
+        limit = limit or settings.MENU_SEARCH_TOP_K
+        normalized_query = normalize_menu_text(query)
+        if not normalized_query:
+            return []
+
+        exact_matches = self._exact_matches(normalized_query)
+        if exact_matches:
+            return [(item, 1.0, True) for item in exact_matches[:limit]]
+
+        keywords = extract_menu_keywords(normalized_query)
+        if not keywords:
+            return []
+
+        # Best strength per (item, keyword)
+        item_scores: Dict[int, List[float]] = {}
+        for keyword_position, keyword in enumerate(keywords):
+            for token, strength in self._match_token(keyword):
+                for position in self._token_postings[token]:
+                    scores = item_scores.setdefault(position, [0.0] * len(keywords))
+                    if strength > scores[keyword_position]:
+                        scores[keyword_position] = strength
+
+        if not item_scores:
+            return []
+
+        full_matches = {position for position, scores in item_scores.items() if all(scores)}
+        candidates = full_matches or set(item_scores)
+
+        ranked = sorted(
+            candidates,
+            key=lambda position: (
+                -sum(item_scores[position]) / len(keywords),
+                len(self.entries[position].tokens),  # Fewer unmatched words first
+                position
+            )
+        )
+        return [
+            (
+                self.entries[position].item,
+                round(sum(item_scores[position]) / len(keywords), 3),
+                EXACT_TOKEN_SCORE in item_scores[position]
+            )
+            for position in ranked[:limit]
+        ]
+
+    def _exact_matches(self, normalized_name: str) -> List[Any]:
+        positions = self._by_name.get(normalized_name) or self._by_compact_name.get(normalized_name.replace(" ", ""))
+        return [self.entries[position].item for position in positions] if positions else []
+
+    def _match_token(self, keyword: str) -> List[Tuple[str, float]]:
+        """Index tokens matching one query keyword, with match strength"""
+        cached = self._token_match_cache.get(keyword)
+        if cached is not None:
+            return cached
+
+        matches: List[Tuple[str, float]] = []
+        if keyword in self._token_postings:
+            matches.append((keyword, EXACT_TOKEN_SCORE))
+        matches.extend(
+            (token, PARTIAL_TOKEN_SCORE) for token in self._token_postings
+            if token != keyword and keyword in token
+        )
+
+        if not matches:
+            # Nothing spelled like it - fall back to sound-alike and near-spelling tokens
+            fuzzy: Dict[str, float] = {}
+            for token in self._phonetic_tokens.get(phonetic_key(keyword), ()):
+                fuzzy[token] = PHONETIC_TOKEN_SCORE
+            keyword_grams = trigrams(keyword)
+            shared: Dict[str, int] = {}
+            for gram in keyword_grams:
+                for token in self._trigram_tokens.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            for token, count in shared.items():
+                similarity = 2 * count / (len(keyword_grams) + len(trigrams(token)))
+                if similarity >= TRIGRAM_MIN_SIMILARITY:
+                    fuzzy[token] = max(fuzzy.get(token, 0.0), round(similarity * TRIGRAM_TOKEN_SCALE, 3))
+            matches = list(fuzzy.items())
+
+        if len(self._token_match_cache) < 4096:
+            self._token_match_cache[keyword] = matches
+        return matches
+
+
+class MenuIndexRegistry:
+    """
+    Process-wide registry of compiled menu indexes.
+
+    Indexes are served without touching the cache or database until they
+    are older than the TTL. A refresh with an unchanged menu fingerprint
+    reuses the existing index instead of recompiling it.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = settings.MENU_INDEX_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._indexes: Dict[int, Tuple[MenuSearchIndex, float]] = {}
+        self._stats = {"hits": 0, "misses": 0, "builds": 0, "reuses": 0, "invalidations": 0}
+
+    def get(self, restaurant_id: int) -> Optional[MenuSearchIndex]:
+        """
+        Get a fresh index for a restaurant.
+
+        Args:
+            restaurant_id: Restaurant ID
+
+        Returns:
+            MenuSearchIndex, or None if missing or older than the TTL
+        """
+        entry = self._indexes.get(restaurant_id)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+            self._stats["hits"] += 1
+            return entry[0]
+        self._stats["misses"] += 1
+        return None
+
+    def build(self, restaurant_id: int, menu_items: List[Any]) -> MenuSearchIndex:
+        """
+        Store an index for the given menu, compiling it only if the menu changed.
+
+        Args:
+            restaurant_id: Restaurant ID
+            menu_items: Current MenuItem objects for the restaurant
+
+        Returns:
+            MenuSearchIndex for the current menu version
+        """
+        version = menu_fingerprint(menu_items)
+        entry = self._indexes.get(restaurant_id)
+        if entry is not None and entry[0].version == version:
+            index = entry[0]
+            self._stats["reuses"] += 1
+        else:
+            index = MenuSearchIndex(restaurant_id, menu_items, version=version)
+            self._stats["builds"] += 1
+            logger.info(f"Compiled menu index for restaurant {restaurant_id}: {len(index)} items (version {version})")
+        self._indexes[restaurant_id] = (index, time.monotonic())
+        return index
+
+    def invalidate(self, restaurant_id: Optional[int] = None) -> None:
+        """
+        Drop the index for a restaurant, or all indexes if restaurant_id is None.
+        """
+        if restaurant_id is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(restaurant_id, None)
+        self._stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry counters and per-restaurant index versions"""
+        return {
+            **self._stats,
+            "indexes": {restaurant_id: entry[0].version for restaurant_id, entry in self._indexes.items()}
+        }
+
+
+# Process-wide registry instance
+menu_index_registry = MenuIndexRegistry()
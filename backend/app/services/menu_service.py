@@ -2,10 +2,17 @@
 Menu Service for accessing menu data
 """
 
-from typing import List, Dict, Optional, Any
+import asyncio
+from typing import List, Dict, Optional, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.unit_of_work import UnitOfWork
 from app.services.menu_cache_interface import MenuCacheInterface
+from app.services.menu_search_index import (
+    MenuSearchIndex,
+    MenuIndexRegistry,
+    menu_index_registry,
+    is_confident_match
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,16 +24,24 @@ class MenuService:
     Uses cache-first approach with database fallback.
     """
     
-    def __init__(self, db: AsyncSession, cache_service: Optional[MenuCacheInterface] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache_service: Optional[MenuCacheInterface] = None,
+        index_registry: Optional[MenuIndexRegistry] = None
+    ):
         """
         Initialize MenuService with database session and cache service
         
         Args:
             db: Database session
             cache_service: Menu cache service (optional)
+            index_registry: Compiled menu index registry (defaults to the shared one)
         """
         self.db = db
         self.cache_service = cache_service
+        self.index_registry = index_registry or menu_index_registry
+        self._index_lock = asyncio.Lock()
     
     async def get_available_items_for_restaurant(self, restaurant_id: int) -> List[str]:
         """
@@ -58,7 +73,7 @@ class MenuService:
             
             # Fallback to database
             async with UnitOfWork(self.db) as uow:
-                menu_items = await uow.menu_items.get_by_restaurant(restaurant_id)
+                menu_items = await uow.menu_items.get_all_by_restaurant(restaurant_id)
                 print(f"   Total menu items in DB: {len(menu_items)}")
                 
                 available_items = [item.name for item in menu_items if item.is_available]
@@ -72,136 +87,96 @@ class MenuService:
     
     async def search_menu_items(self, restaurant_id: int, query: str) -> List[Any]:
         """
-        Search for menu items using flexible keyword matching.
+        Search for menu items using the compiled menu index.
+        
+        Exact name matches are returned on their own; otherwise candidates are
+        ranked by keyword, partial, phonetic and trigram matches (top-k only).
+        
+        Args:
+            restaurant_id: Restaurant ID
+            query: Search query
+            
+        Returns:
+            List of matching MenuItem objects, best first
+        """
+        return [item for item, _, _ in await self.search_menu_items_scored(restaurant_id, query)]
+    
+    async def search_menu_items_scored(self, restaurant_id: int, query: str) -> List[Tuple[Any, float, bool]]:
+        """
+        Search for menu items and keep each candidate's match strength.
+        
+        Callers that act on a single candidate should check it with
+        is_confident_match, since a lone fuzzy hit may be a different item.
         
         Args:
             restaurant_id: Restaurant ID
             query: Search query
             
         Returns:
-            List of matching MenuItem objects
+            List of (MenuItem, score, exact) tuples, best first
         """
         try:
             print(f"\n🔍 DEBUG - SEARCH_MENU_ITEMS:")
             print(f"   Query: '{query}'")
             print(f"   Restaurant ID: {restaurant_id}")
             
-            # Try cache first, then fall back to database
-            if self.cache_service:
-                try:
-                    # Try to get cached menu items (async)
-                    cached_items = await self.cache_service.get_menu_items(restaurant_id)
-                    if cached_items:
-                        print(f"   Cache has {len(cached_items)} items")
-                        
-                        # Normalize query
-                        normalized_query = self._normalize_query(query)
-                        print(f"   Normalized query: '{normalized_query}'")
-                        
-                        # Try exact match first
-                        exact_matches = []
-                        for item in cached_items:
-                            if self._normalize_query(item.name) == normalized_query:
-                                exact_matches.append(item)
-                                print(f"   ✅ EXACT MATCH: '{item.name}'")
-                        
-                        if exact_matches:
-                            print(f"   Found {len(exact_matches)} exact matches")
-                            return exact_matches
-                        
-                        # Fall back to keyword matching
-                        query_words = self._extract_keywords(normalized_query)
-                        print(f"   Query keywords: {query_words}")
-                        matching_items = []
-                        
-                        for item in cached_items:
-                            item_normalized = self._normalize_query(item.name)
-                            item_keywords = self._extract_keywords(item_normalized)
-                            print(f"   Checking item: '{item.name}' (keywords: {item_keywords})")
-                            
-                            # Check if any query keyword matches any item keyword (partial matching)
-                            matches = []
-                            for query_word in query_words:
-                                # Check if query word is contained in any item keyword
-                                item_matches = [query_word in item_keyword for item_keyword in item_keywords]
-                                matches.append(any(item_matches))
-                            print(f"   Keyword matches: {matches}")
-                            if any(matches):
-                                matching_items.append(item)
-                                print(f"   ✅ KEYWORD MATCH: '{item.name}'")
-                            else:
-                                print(f"   ❌ NO MATCH: '{item.name}'")
-                        
-                        print(f"   Final matching items: {[item.name for item in matching_items]}")
-                        return matching_items
-                    else:
-                        print(f"   No cached items found - falling back to database")
-                        return await self._search_database(restaurant_id, query)
-                except Exception as cache_error:
-                    print(f"   Cache error: {cache_error}")
-                    logger.warning(f"Cache search failed: {cache_error}")
-                    return await self._search_database(restaurant_id, query)
-            else:
-                print(f"   No cache service available - falling back to database")
-                return await self._search_database(restaurant_id, query)
+            menu_index = await self.get_menu_index(restaurant_id)
+            if menu_index is None:
+                print(f"   No menu items found for restaurant {restaurant_id}")
+                return []
+            
+            matches = menu_index.search_scored(query)
+            print(f"   Final matching items: {[(item.name, score) for item, score, _ in matches]}")
+            return matches
                 
         except Exception as e:
             print(f"   Error in search_menu_items: {str(e)}")
             # Log error but return empty list to prevent agent failures
             return []
     
-    def _normalize_query(self, query: str) -> str:
+    async def get_menu_index(self, restaurant_id: int) -> Optional[MenuSearchIndex]:
         """
-        Normalize query text for better matching.
+        Get the compiled menu index for a restaurant.
         
-        Args:
-            query: Input query string
-            
-        Returns:
-            Normalized query string
-        """
-        import re
-        import unicodedata
-        
-        # Convert to lowercase
-        normalized = query.lower()
-        
-        # Remove accents and normalize Unicode
-        normalized = unicodedata.normalize('NFKC', normalized)
-        
-        # Remove punctuation except spaces
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        
-        # Collapse multiple spaces into single space
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        # Strip leading/trailing whitespace
-        return normalized.strip()
-    
-    def _extract_keywords(self, text: str) -> List[str]:
-        """
-        Extract meaningful keywords from text, removing stopwords.
+        Served from the process-wide registry while fresh; otherwise menu items
+        are loaded cache-first with database fallback and the index is rebuilt
+        only if the menu changed.
         
         Args:
-            text: Input text
+            restaurant_id: Restaurant ID
             
         Returns:
-            List of keywords
+            MenuSearchIndex or None if the restaurant has no menu items
         """
-        # Common stopwords to remove
-        STOPWORDS = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'please', 'i', 'would', 'like', 'to', 'add',
-            'get', 'want', 'need', 'have', 'can', 'could', 'will', 'shall', 'may', 'might',
-            'this', 'that', 'these', 'those', 'my', 'your', 'his', 'her', 'its', 'our', 'their',
-            'is', 'are', 'was', 'were', 'be', 'been', 'being', 'do', 'does', 'did', 'done',
-            'meal', 'combo', 'with', 'without', 'extra', 'no', 'yes', 'some', 'any', 'all'
-        }
+        menu_index = self.index_registry.get(restaurant_id)
+        if menu_index is not None:
+            return menu_index
         
-        # Split into words and filter out stopwords (case insensitive)
-        words = text.split()
-        keywords = [word.lower() for word in words if word.lower() not in STOPWORDS and len(word) > 1]
-        
-        return keywords
+        # Concurrent lookups (e.g. per-item resolution) share one DB session - load the menu once
+        async with self._index_lock:
+            menu_index = self.index_registry.get(restaurant_id)
+            if menu_index is not None:
+                return menu_index
+            
+            menu_items = []
+            if self.cache_service:
+                try:
+                    menu_items = await self.cache_service.get_menu_items(restaurant_id)
+                except Exception as cache_error:
+                    logger.warning(f"Cache read failed while building menu index: {cache_error}")
+            
+            if not menu_items:
+                menu_items = await self._load_menu_items_from_database(restaurant_id)
+                if menu_items and self.cache_service:
+                    # Write back so the next lookup (in any worker) is served from the cache
+                    try:
+                        await self.cache_service.cache_menu_items(restaurant_id, menu_items)
+                    except Exception as cache_error:
+                        logger.warning(f"Cache write-back failed after database load: {cache_error}")
+            
+            if not menu_items:
+                return None
+            return self.index_registry.build(restaurant_id, menu_items)
     
     async def get_restaurant_name(self, restaurant_id: int) -> str:
         """
@@ -249,7 +224,7 @@ class MenuService:
         """
         try:
             async with UnitOfWork(self.db) as uow:
-                menu_items = await uow.menu_items.get_by_restaurant(restaurant_id)
+                menu_items = await uow.menu_items.get_all_by_restaurant(restaurant_id)
                 categories = await uow.categories.get_by_restaurant(restaurant_id)
                 
                 # Create category mapping
@@ -309,15 +284,17 @@ class MenuService:
             List of ingredient dictionaries with name, quantity, unit, is_optional
         """
         try:
+            # Resolve the name through the menu index (exact, then a single confident match)
+            indexed_item = await self.get_menu_item_by_name(restaurant_id, menu_item_name)
+            if not indexed_item:
+                matches = await self.search_menu_items_scored(restaurant_id, menu_item_name)
+                if len(matches) == 1 and is_confident_match(matches[0][1], matches[0][2]):
+                    indexed_item = matches[0][0]
+            if not indexed_item:
+                return []
+            
             async with UnitOfWork(self.db) as uow:
-                # Find the menu item by name
-                menu_items = await uow.menu_items.get_by_restaurant(restaurant_id)
-                menu_item = None
-                for item in menu_items:
-                    if item.name.lower() == menu_item_name.lower():
-                        menu_item = item
-                        break
-                
+                menu_item = await uow.menu_items.get_by_id(indexed_item.id)
                 if not menu_item:
                     return []
                 
@@ -381,74 +358,22 @@ class MenuService:
             logger.error(f"Failed to get ingredients with costs for restaurant {restaurant_id}: {e}")
             return []
     
-    async def _search_database(self, restaurant_id: int, query: str) -> List[Any]:
+    async def _load_menu_items_from_database(self, restaurant_id: int) -> List[Any]:
         """
-        Search database directly when cache is not available.
+        Load menu items directly from the database when the cache is empty.
         
         Args:
             restaurant_id: Restaurant ID
-            query: Search query
             
         Returns:
-            List of matching MenuItem objects
+            List of MenuItem objects
         """
         try:
-            print(f"   🔄 Searching database directly...")
-            print(f"   Database session: {self.db}")
-            
-            # Get all menu items from database
             from app.repository.menu_item_repository import MenuItemRepository
             menu_item_repo = MenuItemRepository(self.db)
-            print(f"   Repository created: {menu_item_repo}")
-            
-            # Get all menu items for the restaurant
-            menu_items = await menu_item_repo.get_by_restaurant(restaurant_id)
+            menu_items = await menu_item_repo.get_all_by_restaurant(restaurant_id)
             print(f"   Database has {len(menu_items)} items")
-            
-            if not menu_items:
-                return []
-            
-            # Normalize query
-            normalized_query = self._normalize_query(query)
-            print(f"   Normalized query: '{normalized_query}'")
-            
-            # Try exact match first
-            exact_matches = []
-            for item in menu_items:
-                if self._normalize_query(item.name) == normalized_query:
-                    exact_matches.append(item)
-                    print(f"   ✅ EXACT MATCH: '{item.name}'")
-            
-            if exact_matches:
-                print(f"   Found {len(exact_matches)} exact matches")
-                return exact_matches
-            
-            # Fall back to keyword matching
-            query_words = self._extract_keywords(normalized_query)
-            print(f"   Query keywords: {query_words}")
-            matching_items = []
-            
-            for item in menu_items:
-                item_normalized = self._normalize_query(item.name)
-                item_keywords = self._extract_keywords(item_normalized)
-                print(f"   Checking item: '{item.name}' (keywords: {item_keywords})")
-                
-                # Check if any query keyword matches any item keyword (partial matching)
-                matches = []
-                for query_word in query_words:
-                    # Check if query word is contained in any item keyword
-                    item_matches = [query_word in item_keyword for item_keyword in item_keywords]
-                    matches.append(any(item_matches))
-                print(f"   Keyword matches: {matches}")
-                if any(matches):
-                    matching_items.append(item)
-                    print(f"   ✅ KEYWORD MATCH: '{item.name}'")
-                else:
-                    print(f"   ❌ NO MATCH: '{item.name}'")
-            
-            print(f"   Final matching items: {[item.name for item in matching_items]}")
-            return matching_items
-            
+            return list(menu_items)
         except Exception as e:
             print(f"   Database search error: {str(e)}")
             logger.error(f"Database search failed: {e}")
@@ -466,18 +391,10 @@ class MenuService:
             MenuItem object or None if not found
         """
         try:
-            from app.repository.menu_item_repository import MenuItemRepository
-            menu_item_repo = MenuItemRepository(self.db)
-            
-            # Get all menu items for the restaurant
-            menu_items = await menu_item_repo.get_by_restaurant(restaurant_id)
-            
-            # Find the item by name (case-insensitive)
-            for item in menu_items:
-                if self._normalize_query(item.name) == self._normalize_query(item_name):
-                    return item
-            
-            return None
+            menu_index = await self.get_menu_index(restaurant_id)
+            if menu_index is None:
+                return None
+            return menu_index.get_by_name(item_name)
             
         except Exception as e:
             logger.error(f"Failed to get menu item by name: {e}")
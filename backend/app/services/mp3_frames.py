@@ -0,0 +1,126 @@
+"""
+MP3 frame utilities - split MPEG Layer III audio into frames and splice clips
+
+Clips from the same TTS voice share a stream format, so joining them is a
+matter of dropping each clip's tags and Xing/Info header frame and
+concatenating the audio frames. Cutting on frame boundaries keeps every
+decoder in sync, which naive byte concatenation of whole files does not.
+"""
+
+from typing import List, Tuple
+
+# Bitrates in kbps by bitrate index (Layer III)
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates by version bits (3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+_VBR_TAGS = (b"Xing", b"Info", b"VBRI")
+
+
+class Mp3FormatError(ValueError):
+    """Data isn't MPEG Layer III audio, or clips can't be joined"""
+
+
+def _skip_id3v2(data: bytes) -> int:
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _parse_header(data: bytes, offset: int) -> Tuple[Tuple[int, int, int], int]:
+    """Return ((version, sample_rate, channel_mode), frame_length) for the frame at offset"""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        raise Mp3FormatError(f"no frame sync at byte {offset}")
+
+    version = (data[offset + 1] >> 3) & 0x03
+    layer = (data[offset + 1] >> 1) & 0x03
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    padding = (data[offset + 2] >> 1) & 0x01
+    channel_mode = data[offset + 3] >> 6
+
+    if version == 1 or layer != 1:
+        raise Mp3FormatError(f"not MPEG Layer III at byte {offset}")
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        raise Mp3FormatError(f"unsupported bitrate/sample rate at byte {offset}")
+
+    bitrate = (_BITRATES_V1 if version == 3 else _BITRATES_V2)[bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+    samples_factor = 144 if version == 3 else 72
+    frame_length = samples_factor * bitrate // sample_rate + padding
+    return (version, sample_rate, channel_mode), frame_length
+
+
+def split_frames(data: bytes) -> Tuple[Tuple[int, int, int], bytes]:
+    """
+    Strip tags and the VBR header frame from an MP3 clip
+
+    Args:
+        data: MP3 file bytes
+
+    Returns:
+        Tuple of the stream format (version, sample rate, channel mode) and the audio frames
+
+    Raises:
+        Mp3FormatError: If the data isn't a clean run of Layer III frames
+    """
+    end = len(data)
+    if end >= 128 and data[-128:-125] == b"TAG":
+        end -= 128
+
+    offset = _skip_id3v2(data)
+    stream_format = None
+    first_audio = None
+    while offset + 4 <= end:
+        frame_format, frame_length = _parse_header(data, offset)
+        if offset + frame_length > end:
+            # Truncated last frame - dropping it keeps the next clip in sync
+            break
+        if stream_format is None:
+            stream_format = frame_format
+            # The first frame may be a silent Xing/Info/VBRI header describing the whole file
+            if any(tag in data[offset + 4:offset + 40] for tag in _VBR_TAGS):
+                offset += frame_length
+                continue
+        elif frame_format != stream_format:
+            raise Mp3FormatError("stream format changes mid-clip")
+        if first_audio is None:
+            first_audio = offset
+        offset += frame_length
+
+    if first_audio is None:
+        raise Mp3FormatError("no audio frames")
+    return stream_format, data[first_audio:offset]
+
+
+def splice(clips: List[bytes]) -> bytes:
+    """
+    Join MP3 clips into one MP3 on frame boundaries
+
+    Args:
+        clips: MP3 clips in playback order, all from the same encoder settings
+
+    Returns:
+        bytes: A single MP3 stream
+
+    Raises:
+        Mp3FormatError: If a clip isn't Layer III or the clips' formats differ
+    """
+    stream_format = None
+    frames = []
+    for clip in clips:
+        clip_format, clip_frames = split_frames(clip)
+        if stream_format is None:
+            stream_format = clip_format
+        elif clip_format != stream_format:
+            raise Mp3FormatError(f"clip format {clip_format} doesn't match {stream_format}")
+        frames.append(clip_frames)
+    return b"".join(frames)
@@ -11,13 +11,16 @@ from ..core.unit_of_work import UnitOfWork
 from .order_validator import OrderValidator
 from .order_session_interface import OrderSessionInterface
 from .customization_validation_service import CustomizationValidationService
+from .menu_ingredient_snapshot import MenuIngredientSnapshot, customization_ingredient_names
+from .inventory_reservations import InventoryReservations, ingredient_demand
 from .voice_service import VoiceService
 from ..constants.audio_phrases import AudioPhraseConstants, AudioPhraseType
-from ..dto.order_result import OrderResult, OrderResultStatus
+from ..dto.order_result import ErrorCategory, ErrorCode, OrderResult, OrderResultStatus
 from ..core.config import settings
 import logging
 import json
 import os
+import uuid
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -29,69 +32,53 @@ class OrderService:
     Uses repositories for data access and validator for business logic
     """
     
-    def __init__(self, order_session_service: OrderSessionInterface, customization_validator: CustomizationValidationService, voice_service: VoiceService, order_validator: OrderValidator):
+    def __init__(self, order_session_service: OrderSessionInterface, customization_validator: CustomizationValidationService, voice_service: VoiceService, order_validator: OrderValidator, inventory_reservations: Optional[InventoryReservations] = None):
         # Business logic layer uses OrderSessionService for all storage operations
         self.storage = order_session_service
         self.customization_validator = customization_validator
         self.voice_service = voice_service
         self.order_validator = order_validator
+        # Stock held by open orders across lanes (None: inventory isn't reserved)
+        self.inventory_reservations = inventory_reservations
     
     
-    async def handle_new_car(self, db: AsyncSession, restaurant_id: int, customer_name: Optional[str] = None) -> OrderResult:
+    async def handle_new_car(
+        self,
+        db: AsyncSession,
+        restaurant_id: int,
+        customer_name: Optional[str] = None,
+        lane_id: Optional[str] = None
+    ) -> OrderResult:
         """
         Handle new car arriving (NEW_CAR event)
         
-        If current session exists, cancel it first.
-        Create new session and set as current.
+        Create new session and its order and set it as the lane's current session.
+        If another session was current at this lane, cancel it.
         Generate greeting audio for the new session.
         
         Args:
             restaurant_id: Restaurant ID
             customer_name: Optional customer name
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
             
         Returns:
             OrderResult: Result with new session and greeting audio URL
         """
         try:
-            logger.info(f"Starting handle_new_car for restaurant_id={restaurant_id}, customer_name={customer_name}")
-            
-            # Check if current session exists and cancel it
-            current_session = await self.storage.get_current_session_id()
-            logger.info(f"Current session check result: {current_session}")
-            if current_session:
-                logger.info(f"Cancelling existing session {current_session}")
-                await self._cancel_session(current_session)
+            lane_id = str(lane_id) if lane_id is not None else settings.DEFAULT_LANE_ID
+            logger.info(f"Starting handle_new_car for restaurant_id={restaurant_id}, lane_id={lane_id}, customer_name={customer_name}")
             
-            # Create new session
-            session_id = f"session_{int(datetime.now().timestamp() * 1000)}"
-            logger.info(f"Generated new session_id: {session_id}")
-            
-            # Create session using the proper conversation session method
-            logger.info(f"Calling create_new_conversation_session for session_id={session_id}")
-            session_created = await self.storage.create_new_conversation_session(
-                session_id=session_id,
-                restaurant_id=restaurant_id,
-                customer_name=customer_name
-            )
-            logger.info(f"Session creation result: {session_created}")
-            
-            if not session_created:
-                # Redis is the single source of truth - no fallback to PostgreSQL
-                logger.error(f"Failed to create session {session_id} in Redis - Redis is the single source of truth for sessions")
-                return OrderResult.error(f"Failed to create session: Redis unavailable or session creation failed")
-            
-            # Set current session
-            await self.storage.set_current_session_id(session_id)
-            
-            # Create order and link it to the session
-            order_id = f"redis_{int(datetime.now().timestamp() * 1000)}"
-            logger.info(f"Creating order {order_id} for session {session_id}")
+            # Create new session (random suffix keeps IDs unique across lanes arriving in the same millisecond)
+            session_id = f"session_{int(datetime.now().timestamp() * 1000)}_{uuid.uuid4().hex[:8]}"
+            order_id = f"redis_{int(datetime.now().timestamp() * 1000)}_{uuid.uuid4().hex[:8]}"
+            logger.info(f"Generated new session_id: {session_id}, order_id: {order_id}")
             
             # Create initial order data
             order_data = {
                 "id": order_id,
                 "session_id": session_id,
                 "restaurant_id": restaurant_id,
+                "lane_id": lane_id,
                 "customer_name": customer_name,
                 "status": "ACTIVE",
                 "items": [],
@@ -102,24 +89,23 @@ class OrderService:
                 "updated_at": datetime.now().isoformat()
             }
             
-            # Create order in Redis
-            order_created = await self.storage.create_order(db, order_data)
-            if not order_created:
-                logger.error(f"Failed to create order {order_id}")
-                return OrderResult.error("Failed to create order")
-            
-            # Link order to session
-            session_data = await self.storage.get_session(session_id)
-            if session_data:
-                session_data["order_id"] = order_id
-                await self.storage.update_session(session_id, session_data)
-                logger.info(f"Linked order {order_id} to session {session_id}")
-            else:
-                logger.error(f"Failed to get session data to link order")
-                return OrderResult.error("Failed to link order to session")
+            # Session, linked order and lane pointer go to Redis in one round trip
+            session_data, previous_session = await self.storage.start_lane_session(
+                session_id=session_id,
+                order_data=order_data,
+                restaurant_id=restaurant_id,
+                lane_id=lane_id,
+                customer_name=customer_name
+            )
+            if not session_data:
+                # Redis is the single source of truth - no fallback to PostgreSQL
+                logger.error(f"Failed to create session {session_id} in Redis - Redis is the single source of truth for sessions")
+                return OrderResult.error(f"Failed to create session: Redis unavailable or session creation failed")
             
-            # Get updated session data
-            session_data = await self.storage.get_session(session_id)
+            # The car that was at this lane has left
+            if previous_session and previous_session != session_id:
+                logger.info(f"Cancelling existing session {previous_session}")
+                await self._cancel_session(previous_session)
             
             # Get greeting audio URL for this session using voice service
             greeting_audio_url = await self.voice_service.generate_audio(
@@ -133,6 +119,7 @@ class OrderService:
                 f"New car session created",
                 data={
                     "session": session_data,
+                    "lane_id": lane_id,
                     "greeting_audio_url": greeting_audio_url
                 }
             )
@@ -141,42 +128,50 @@ class OrderService:
             logger.error(f"Failed to handle new car: {str(e)}")
             return OrderResult.error(f"Failed to handle new car: {str(e)}")
     
-    async def handle_next_car(self) -> OrderResult:
+    async def handle_next_car(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None) -> OrderResult:
         """
         Handle next car (NEXT_CAR event)
         
-        Cancel current session and clear pointer.
+        Cancel the lane's current session and clear its pointer.
+        
+        Args:
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
         
         Returns:
             OrderResult: Result of operation
         """
         try:
-            # Get current session
-            current_session = await self.storage.get_current_session_id()
+            # Get current session for this lane
+            current_session = await self.storage.get_current_session_id(restaurant_id, lane_id)
             if current_session:
                 # Cancel current session
                 await self._cancel_session(current_session)
             
-            # Clear current session pointer
-            await self.storage.clear_current_session_id()
+            # Clear the lane pointer (only if no new car has taken the lane meanwhile)
+            await self.storage.clear_current_session_id(restaurant_id, lane_id, session_id=current_session)
             
-            logger.info("Handled next car - cleared current session")
+            logger.info(f"Handled next car at lane {restaurant_id}/{lane_id} - cleared current session")
             return OrderResult.success("Next car handled - session cleared")
             
         except Exception as e:
             logger.error(f"Failed to handle next car: {str(e)}")
             return OrderResult.error(f"Failed to handle next car: {str(e)}")
     
-    async def get_current_session(self) -> OrderResult:
+    async def get_current_session(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None) -> OrderResult:
         """
-        Get current active session
+        Get the active session for a drive-thru lane
+        
+        Args:
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
         
         Returns:
             OrderResult: Result with current session data
         """
         try:
             # Get current session ID
-            current_session = await self.storage.get_current_session_id()
+            current_session = await self.storage.get_current_session_id(restaurant_id, lane_id)
             if not current_session:
                 return OrderResult.error("No active session")
             
@@ -206,8 +201,10 @@ class OrderService:
             OrderResult: Result of update
         """
         try:
-            # Check that this is the current session
-            current_session = await self.storage.get_current_session_id()
+            # Check that this is the current session at its lane
+            lane = await self.storage.get_session_lane(session_id) or {}
+            restaurant_id, lane_id = lane.get("restaurant_id"), lane.get("lane_id")
+            current_session = await self.storage.get_current_session_id(restaurant_id, lane_id)
             if current_session != session_id:
                 logger.warning(f"Attempted to update stale session {session_id}")
                 return OrderResult.error("Session is not current")
@@ -221,7 +218,7 @@ class OrderService:
                     archive_result = await self._archive_session_to_db(db, session_data)
                     if archive_result.success:
                         # Clean up storage
-                        await self.storage.clear_current_session_id()
+                        await self.storage.clear_current_session_id(restaurant_id, lane_id, session_id=session_id)
                         await self.storage.delete_session(session_id)
                         return archive_result
             
@@ -245,29 +242,21 @@ class OrderService:
     
     async def _cancel_session(self, session_id: str):
         """
-        Cancel a session (mark as CANCELLED)
+        Cancel a session (release its inventory holds and delete it)
         
         Args:
             session_id: Session ID to cancel
         """
         try:
-            # Get session data and mark as cancelled
-            session_data = await self.storage.get_session(session_id)
-            if session_data:
-                session_data["status"] = "CANCELLED"
-                session_data["updated_at"] = datetime.now().isoformat()
-                
-                # Update session
-                await self.storage.update_session(session_id, {"status": "CANCELLED"}, ttl=900)
-                
-                # Optionally archive cancellation for analytics
-                # await self._archive_session_to_db(session_data)
-                
+            # The session is deleted outright; marking it CANCELLED first cost two
+            # more round trips for a value nothing read back.
+            if self._reserving_inventory:
+                session_data = await self.storage.get_session(session_id)
+                if session_data and session_data.get("order_id"):
+                    await self.inventory_reservations.release(session_data["order_id"])
+            if await self.storage.delete_session(session_id):
                 logger.info(f"Cancelled session {session_id}")
             
-            # Delete session
-            await self.storage.delete_session(session_id)
-            
         except Exception as e:
             logger.error(f"Failed to cancel session {session_id}: {str(e)}")
     
@@ -438,6 +427,9 @@ class OrderService:
             if not update_success:
                 return OrderResult.error(f"Order {order_id} not found")
             
+            if status == OrderStatus.CANCELLED and self._reserving_inventory:
+                await self.inventory_reservations.release(order_id)
+            
             # Archive to PostgreSQL if order is completed or cancelled
             if status in [OrderStatus.COMPLETED, OrderStatus.CANCELLED] and order_id.startswith("redis_"):
                 return await self.archive_order(db, order_id)
@@ -455,34 +447,99 @@ class OrderService:
             logger.error(f"Failed to update order status: {str(e)}")
             return OrderResult.error(f"Failed to update order status: {str(e)}")
     
-    async def _restore_inventory(self, db: AsyncSession, menu_item_id: int, quantity: int):
+    @property
+    def _reserving_inventory(self) -> bool:
+        return self.inventory_reservations is not None and settings.ENABLE_INVENTORY_CHECKING
+    
+    async def _reserve_inventory(
+        self,
+        db: AsyncSession,
+        order_id: str,
+        order_item_id: str,
+        menu_item_id: int,
+        quantity: int,
+        customizations: Optional[List[str]],
+        menu_item_details: Dict[str, Any],
+        ingredients: Optional[MenuIngredientSnapshot] = None,
+        replace: bool = False,
+        enforce: bool = True
+    ) -> Optional[OrderResult]:
         """
-        Restore inventory when removing an item from order
+        Hold an order line's ingredients against the stock other lanes can still take
         
         Args:
+            order_id: Order ID
+            order_item_id: Order line ID
             menu_item_id: Menu item ID
-            quantity: Quantity being removed
+            quantity: Quantity of the line
+            customizations: Line customizations ("no ..." ingredients aren't held)
+            menu_item_details: Menu item details (for the shortage message)
+            ingredients: Ingredient snapshot loaded for the command batch, if any
+            replace: Replace what the line already holds (quantity changes)
+            enforce: Refuse when stock is short (off just records the hold)
+            
+        Returns:
+            OrderResult: Error result if an ingredient is short, None otherwise (also
+            when Redis can't be reached - orders aren't refused for that)
         """
-        async with UnitOfWork(db) as uow:
-            # Get menu item ingredients
-            menu_item_ingredients = await uow.menu_item_ingredients.get_by_menu_item(menu_item_id)
+        if not self._reserving_inventory:
+            return None
         
-            for menu_item_ingredient in menu_item_ingredients:
-                if not menu_item_ingredient.ingredient:
-                    continue
-                
-                # Get inventory
-                inventory = await uow.inventory.get_by_ingredient(menu_item_ingredient.ingredient_id)
-                if not inventory:
-                    continue
-                
-                # Calculate quantity to restore
-                quantity_to_restore = float(menu_item_ingredient.quantity) * quantity
-                
-                # Update inventory
-                new_stock = float(inventory.current_stock) + quantity_to_restore
-                await uow.inventory.update(inventory.id, current_stock=new_stock)
+        if ingredients is None or not ingredients.has_menu_item(menu_item_id):
+            ingredients = await MenuIngredientSnapshot.load(UnitOfWork(db), [menu_item_id])
+        removed, _ = customization_ingredient_names(customizations or [])
+        demand = ingredient_demand(ingredients.menu_item_ingredients(menu_item_id), quantity, removed)
+        if not demand and not replace:
+            return None
+        
+        reservation = await self.inventory_reservations.reserve(
+            order_id, order_item_id, demand, replace=replace,
+            enforce=enforce and not settings.ALLOW_NEGATIVE_INVENTORY
+        )
+        if reservation.status in ("UNAVAILABLE", "ERROR"):
+            logger.warning(f"Inventory not reserved for order {order_id} ({reservation.status})")
+            return None
+        if not reservation.is_insufficient:
+            return None
+        
+        ingredient_name = next(
+            (line.ingredient.name for line in ingredients.menu_item_ingredients(menu_item_id)
+             if line.ingredient and line.ingredient.id == reservation.ingredient_id),
+            "an ingredient"
+        )
+        item_name = menu_item_details.get("name", "that item")
+        logger.info(f"Inventory short for order {order_id}: {ingredient_name} ({reservation.available} left)")
+        return OrderResult.error(
+            f"Sorry, we don't have enough {ingredient_name} left for {quantity} {item_name}.",
+            [f"Insufficient inventory for '{ingredient_name}': {reservation.available:g} not held by other orders"],
+            error_category=ErrorCategory.BUSINESS,
+            error_code=ErrorCode.INVENTORY_SHORTAGE
+        )
     
+    async def _commit_inventory(self, db: AsyncSession, order_id: str):
+        """
+        Take a confirmed order's held stock off the inventory, then release the hold
+        
+        Args:
+            order_id: Order ID
+        """
+        claim_id, quantities = await self.inventory_reservations.claim(order_id)
+        if not quantities:
+            return
+        
+        try:
+            async with UnitOfWork(db) as uow:
+                consumed = await uow.inventory.consume_stock(
+                    quantities, allow_negative=settings.ALLOW_NEGATIVE_INVENTORY
+                )
+            short = sorted(set(quantities) - set(consumed))
+            if short:
+                # Stock was lowered outside of orders since it was reserved
+                logger.warning(f"Order {order_id} confirmed with ingredients {short} short in inventory")
+        except Exception as e:
+            logger.error(f"Failed to take inventory for order {order_id}: {str(e)}")
+        finally:
+            await self.inventory_reservations.release(claim_id)
     
     # ============================================================================
     # CART OPERATION METHODS - Called by Commands
@@ -499,7 +556,8 @@ class OrderService:
         restaurant_id: int,
         customizations: Optional[List[str]] = None, 
         special_instructions: Optional[str] = None,
-        size: Optional[str] = None
+        size: Optional[str] = None,
+        ingredients: Optional[MenuIngredientSnapshot] = None
     ) -> OrderResult:
         """
         Add item to order - called by AddItemCommand
@@ -515,6 +573,7 @@ class OrderService:
             customizations: List of modifiers/customizations
             special_instructions: Special cooking instructions
             size: Item size (e.g., "Large", "Small")
+            ingredients: Ingredient snapshot loaded for the whole command batch, if any
             
         Returns:
             OrderResult: Result with order_item data and comprehensive message
@@ -565,22 +624,7 @@ class OrderService:
             if not menu_item_details:
                 return OrderResult.error(f"Menu item {menu_item_id} not found or not available")
             
-            # 2. Get current order from storage (Redis first, PostgreSQL fallback)
-            order_data = await self.storage.get_order(db, order_id)
-            if not order_data:
-                # Create new order if it doesn't exist
-                order_data = {
-                    "id": order_id,
-                    "items": [],
-                    "subtotal": 0.0,
-                    "tax_amount": 0.0,
-                    "total_amount": 0.0,
-                    "status": "ACTIVE",
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat()
-                }
-            
-            # 3. Validate customizations if provided
+            # 2. Validate customizations if provided
             extra_cost = 0.0
             if customizations:
                 # Get restaurant_id from menu item details
@@ -593,7 +637,7 @@ class OrderService:
                 
                 # Validate customizations
                 validation_results = await self.customization_validator.validate_customizations(
-                    menu_item_id, customizations, restaurant_id, uow
+                    menu_item_id, customizations, restaurant_id, uow, ingredients
                 )
                 
                 # Check for validation errors
@@ -607,8 +651,13 @@ class OrderService:
                 if validation_errors:
                     return OrderResult.error(f"Invalid customizations: {'; '.join(validation_errors)}")
             
-            # 4. Create order item with unique ID
+            # 3. Create order item with unique ID, holding its ingredients' stock against other lanes
             order_item_id = await self._generate_order_item_id()
+            shortage = await self._reserve_inventory(
+                db, order_id, order_item_id, menu_item_id, quantity, customizations, menu_item_details, ingredients
+            )
+            if shortage:
+                return shortage
             base_price = menu_item_details["price"]
             total_item_price = (base_price + extra_cost) * quantity
             
@@ -626,33 +675,35 @@ class OrderService:
                 "created_at": datetime.now().isoformat()
             }
             
-            # 5. Add to order items list
-            order_data["items"].append(order_item)
-            
-            # 6. Recalculate totals (subtotal, tax, total)
-            await self._recalculate_order_totals(order_data)
-            
-            # 7. Update timestamp
-            order_data["updated_at"] = datetime.now().isoformat()
-            
-            # 8. Save updated order to storage (Redis/PostgreSQL)
+            # 4. Append item and recalculate totals in one atomic storage call
             print(f"   💾 Saving updated order to storage...")
-            print(f"   📊 Order data items count: {len(order_data.get('items', []))}")
-            print(f"   💰 Order total: {order_data.get('total_amount', 0)}")
-            save_success = await self.storage.update_order(db, order_id, order_data, ttl=1800)
-            if not save_success:
+            mutation = await self.storage.add_order_item(db, order_id, order_item, ttl=1800)
+            if mutation.status == "NOT_FOUND":
+                # Create new order if it doesn't exist, then add the item to it
+                await self.storage.create_order(db, {
+                    "id": order_id,
+                    "items": [],
+                    "status": "ACTIVE",
+                    "created_at": datetime.now().isoformat()
+                }, ttl=1800)
+                mutation = await self.storage.add_order_item(db, order_id, order_item, ttl=1800)
+            if not mutation.is_success:
                 print(f"   ❌ Failed to save updated order")
+                if self._reserving_inventory:
+                    await self.inventory_reservations.release(order_id, order_item_id)
                 return OrderResult.error("Failed to save updated order")
-            else:
-                print(f"   ✅ Successfully saved updated order")
+            order_data = mutation.order
+            print(f"   ✅ Successfully saved updated order")
+            print(f"   📊 Order data items count: {len(order_data.get('items', []))}")
+            print(f"   💰 Order total: {order_data.get('total_amount', 0)}")
             
-            # 9. Generate comprehensive message
+            # 5. Generate comprehensive message
             message = self._generate_add_item_message(
                 quantity, menu_item_details, customizations, size, special_instructions
             )
             print(f"   📝 Generated message: {message}")
             
-            # 10. Return OrderResult with order_item data
+            # 6. Return OrderResult with order_item data
             print(f"   ✅ Successfully added {quantity}x {menu_item_details['name']} to order {order_id}")
             logger.info(f"Added {quantity}x {menu_item_details['name']} to order {order_id}")
             
@@ -695,41 +746,21 @@ class OrderService:
             OrderResult: Result of item removal
         """
         try:
-            # 1. Get current order from storage (Redis first, PostgreSQL fallback)
-            order_data = await self.storage.get_order(db, order_id)
-            if not order_data:
+            # 1. Remove item and recalculate totals in one atomic storage call
+            mutation = await self.storage.remove_order_item(db, order_id, order_item_id, ttl=1800)
+            if mutation.status == "NOT_FOUND":
                 return OrderResult.error(f"Order {order_id} not found")
-            
-            # 2. Find order item by order_item_id
-            items = order_data.get("items", [])
-            item_to_remove = None
-            item_index = -1
-            
-            for i, item in enumerate(items):
-                if item.get("id") == order_item_id:
-                    item_to_remove = item
-                    item_index = i
-                    break
-            
-            if not item_to_remove:
+            if mutation.status == "ITEM_NOT_FOUND":
                 return OrderResult.error(f"Order item {order_item_id} not found in order")
-            
-            # 3. Remove item from order items list
-            removed_item = items.pop(item_index)
-            order_data["items"] = items
-            
-            # 4. Recalculate order totals (subtotal, tax, total)
-            await self._recalculate_order_totals(order_data)
-            
-            # 5. Update timestamp
-            order_data["updated_at"] = datetime.now().isoformat()
-            
-            # 6. Save updated order to storage (Redis/PostgreSQL)
-            save_success = await self.storage.update_order(db, order_id, order_data, ttl=1800)
-            if not save_success:
+            if not mutation.is_success:
                 return OrderResult.error("Failed to save updated order")
             
-            # 7. Return OrderResult with success message
+            removed_item = mutation.item
+            order_data = mutation.order
+            if self._reserving_inventory:
+                await self.inventory_reservations.release(order_id, order_item_id)
+            
+            # 2. Return OrderResult with success message
             item_name = removed_item.get("menu_item", {}).get("name", "item")
             logger.info(f"Removed {item_name} from order {order_id}")
             return OrderResult.success(
@@ -769,78 +800,37 @@ class OrderService:
             OrderResult: Result of modifying the item
         """
         try:
-            # 1. Get current order from storage (Redis first, PostgreSQL fallback)
-            order_data = await self.storage.get_order(db, order_id)
-            if not order_data:
-                return OrderResult.error(f"Order {order_id} not found")
-            
-            # 2. Find order item by order_item_id
-            items = order_data.get("items", [])
-            item_to_modify = None
-            item_index = -1
-            
-            for i, item in enumerate(items):
-                if item.get("id") == order_item_id:
-                    item_to_modify = item
-                    item_index = i
-                    break
-            
-            if not item_to_modify:
-                return OrderResult.error(f"Order item {order_item_id} not found in order")
-            
-            # 3. Apply changes to the item
-            changes_applied = []
-            
-            for change_op, change_value in changes.items():
-                if change_op == "remove_modifier":
-                    # Remove a modifier from customizations
-                    customizations = item_to_modify.get("customizations", [])
-                    if change_value in customizations:
-                        customizations.remove(change_value)
-                        item_to_modify["customizations"] = customizations
-                        changes_applied.append(f"removed {change_value}")
-                
-                elif change_op == "add_modifier":
-                    # Add a modifier to customizations
-                    customizations = item_to_modify.get("customizations", [])
-                    if change_value not in customizations:
-                        customizations.append(change_value)
-                        item_to_modify["customizations"] = customizations
-                        changes_applied.append(f"added {change_value}")
+            for attempt in range(settings.ORDER_MUTATION_MAX_RETRIES + 1):
+                # 1. Get current order from storage (Redis first, PostgreSQL fallback)
+                order_data = await self.storage.get_order(db, order_id)
+                if not order_data:
+                    return OrderResult.error(f"Order {order_id} not found")
                 
-                elif change_op == "set_special_instructions":
-                    # Update special instructions
-                    item_to_modify["special_instructions"] = change_value
-                    changes_applied.append(f"special instructions to: {change_value}")
-                
-                elif change_op == "clear_special_instructions":
-                    # Clear special instructions
-                    item_to_modify["special_instructions"] = None
-                    changes_applied.append("cleared special instructions")
+                # 2. Find order item by order_item_id
+                item_to_modify = next(
+                    (item for item in order_data.get("items", []) if item.get("id") == order_item_id), None
+                )
+                if not item_to_modify:
+                    return OrderResult.error(f"Order item {order_item_id} not found in order")
                 
-                elif change_op == "set_size":
-                    # Update item size (if supported by menu item)
-                    item_to_modify["size"] = change_value
-                    changes_applied.append(f"size to {change_value}")
+                # 3. Apply changes to the item
+                changes_applied = self._apply_item_changes(item_to_modify, changes)
                 
-                else:
-                    # Generic change - just store it
-                    item_to_modify[change_op] = change_value
-                    changes_applied.append(f"{change_op} to {change_value}")
-            
-            # 4. Update the item in the list
-            items[item_index] = item_to_modify
-            order_data["items"] = items
-            
-            # 5. Update timestamp
-            order_data["updated_at"] = datetime.now().isoformat()
+                # 4. Save the item only if the order hasn't changed since it was read
+                mutation = await self.storage.replace_order_item(
+                    db, order_id, item_to_modify, expected_version=order_data.get("version"), ttl=1800
+                )
+                if not mutation.is_conflict:
+                    break
+                logger.info(f"Order {order_id} changed while modifying item {order_item_id}, retrying ({attempt + 1})")
             
-            # 6. Save updated order to storage (Redis/PostgreSQL)
-            save_success = await self.storage.update_order(db, order_id, order_data, ttl=1800)
-            if not save_success:
+            if mutation.status == "ITEM_NOT_FOUND":
+                return OrderResult.error(f"Order item {order_item_id} not found in order")
+            if not mutation.is_success:
                 return OrderResult.error("Failed to save updated order")
+            order_data = mutation.order
             
-            # 7. Return OrderResult with success message
+            # 5. Return OrderResult with success message
             item_name = item_to_modify.get("menu_item", {}).get("name", "item")
             logger.info(f"Modified {item_name} in order {order_id}: {', '.join(changes_applied)}")
             return OrderResult.success(
@@ -881,51 +871,45 @@ class OrderService:
             OrderResult: Result of quantity update
         """
         try:
-            # 1. Get current order from storage (Redis first, PostgreSQL fallback)
-            order_data = await self.storage.get_order(db, order_id)
-            if not order_data:
+            # 0. Move the line's stock hold to the new quantity (refused if the stock isn't there)
+            current_item = None
+            if self._reserving_inventory:
+                order_data = await self.storage.get_order(db, order_id)
+                current_item = next(
+                    (item for item in (order_data or {}).get("items", []) if item.get("id") == order_item_id), None
+                )
+                if current_item:
+                    shortage = await self._reserve_inventory(
+                        db, order_id, order_item_id, current_item["menu_item_id"], quantity,
+                        current_item.get("customizations"), current_item.get("menu_item") or {}, replace=True
+                    )
+                    if shortage:
+                        return shortage
+            
+            # 1. Set quantity and recalculate item and order totals in one atomic storage call
+            mutation = await self.storage.set_order_item_quantity(db, order_id, order_item_id, quantity, ttl=1800)
+            if mutation.status == "ITEM_NOT_FOUND" and current_item:
+                # The line was removed after we read it; nothing should stay held for it
+                await self.inventory_reservations.release(order_id, order_item_id)
+            elif not mutation.is_success and current_item:
+                # Put the hold back to what the line still has
+                await self._reserve_inventory(
+                    db, order_id, order_item_id, current_item["menu_item_id"], current_item.get("quantity", 0),
+                    current_item.get("customizations"), current_item.get("menu_item") or {}, replace=True, enforce=False
+                )
+            if mutation.status == "NOT_FOUND":
                 return OrderResult.error(f"Order {order_id} not found")
-            
-            # 2. Find order item by order_item_id
-            items = order_data.get("items", [])
-            item_to_update = None
-            item_index = -1
-            
-            for i, item in enumerate(items):
-                if item.get("id") == order_item_id:
-                    item_to_update = item
-                    item_index = i
-                    break
-            
-            if not item_to_update:
+            if mutation.status == "ITEM_NOT_FOUND":
                 return OrderResult.error(f"Order item {order_item_id} not found in order")
-            
-            # 3. Update quantity on the order item
-            old_quantity = item_to_update.get("quantity", 0)
-            item_to_update["quantity"] = quantity
-            
-            # 4. Recalculate item total and order totals (subtotal, tax, total)
-            unit_price = item_to_update.get("unit_price", 0.0)
-            item_to_update["total_price"] = unit_price * quantity
-            
-            # Update the item in the list
-            items[item_index] = item_to_update
-            order_data["items"] = items
-            
-            # Recalculate overall order totals
-            await self._recalculate_order_totals(order_data)
-            
-            # 5. Update timestamp
-            order_data["updated_at"] = datetime.now().isoformat()
-            
-            # 6. Save updated order to storage (Redis/PostgreSQL)
-            save_success = await self.storage.update_order(db, order_id, order_data, ttl=1800)
-            if not save_success:
+            if not mutation.is_success:
                 return OrderResult.error("Failed to save updated order")
             
-            # 7. Return OrderResult with success message
+            order_data = mutation.order
+            item_to_update = next(item for item in order_data["items"] if item.get("id") == order_item_id)
+            
+            # 2. Return OrderResult with success message
             item_name = item_to_update.get("menu_item", {}).get("name", "item")
-            logger.info(f"Updated {item_name} quantity from {old_quantity} to {quantity} in order {order_id}")
+            logger.info(f"Updated {item_name} quantity to {quantity} in order {order_id}")
             return OrderResult.success(
                 f"Updated {item_name} quantity to {quantity}",
                 data={
@@ -964,29 +948,19 @@ class OrderService:
             if not order_exists:
                 return OrderResult.error("Failed to ensure order exists")
             
-            # 1. Get current order from storage (Redis first, PostgreSQL fallback)
-            order_data = await self.storage.get_order(db, order_id)
-            if not order_data:
+            # 1. Clear items and reset totals in one atomic storage call
+            mutation = await self.storage.clear_order_items(db, order_id, ttl=1800)
+            if mutation.status == "NOT_FOUND":
                 return OrderResult.error(f"Order {order_id} not found")
-            
-            # 2. Clear items list from order
-            item_count = len(order_data.get("items", []))
-            order_data["items"] = []
-            
-            # 3. Reset totals to 0 (subtotal, tax, total)
-            order_data["subtotal"] = 0.0
-            order_data["tax_amount"] = 0.0
-            order_data["total_amount"] = 0.0
-            
-            # 4. Update timestamp
-            order_data["updated_at"] = datetime.now().isoformat()
-            
-            # 5. Save updated order to storage (Redis/PostgreSQL)
-            save_success = await self.storage.update_order(db, order_id, order_data, ttl=1800)
-            if not save_success:
+            if not mutation.is_success:
                 return OrderResult.error("Failed to save updated order")
             
-            # 6. Return OrderResult with success message
+            item_count = mutation.item_count
+            order_data = mutation.order
+            if self._reserving_inventory:
+                await self.inventory_reservations.release(order_id)
+            
+            # 2. Return OrderResult with success message
             logger.info(f"Cleared {item_count} items from order {order_id}")
             return OrderResult.success(
                 f"Cleared all {item_count} items from order",
@@ -1036,20 +1010,27 @@ class OrderService:
             if not items:
                 return OrderResult.error("Cannot confirm empty order. Please add items first.")
             
-            # 3. Update order status to confirmed
-            order_data["status"] = "CONFIRMED"
-            order_data["confirmed_at"] = datetime.now().isoformat()
-            order_data["updated_at"] = datetime.now().isoformat()
+            # 3. Update order status to confirmed (only the changed fields, so items added
+            #    concurrently are not overwritten by this snapshot)
+            status_updates = {
+                "status": "CONFIRMED",
+                "confirmed_at": datetime.now().isoformat()
+            }
+            order_data.update(status_updates)
             
             # 4. Save updated order to storage (Redis/PostgreSQL)
-            save_success = await self.storage.update_order(db, order_id, order_data, ttl=1800)
+            save_success = await self.storage.update_order(db, order_id, status_updates, ttl=1800)
             if not save_success:
                 return OrderResult.error("Failed to save confirmed order")
             
-            # 5. Optionally trigger archival process to PostgreSQL
+            # 5. Take the held stock off the inventory
+            if self._reserving_inventory:
+                await self._commit_inventory(db, order_id)
+            
+            # 6. Optionally trigger archival process to PostgreSQL
             # For now, we'll keep it in Redis until explicitly archived
             
-            # 6. Return OrderResult with confirmation data
+            # 7. Return OrderResult with confirmation data
             item_count = sum(item.get("quantity", 0) for item in items)
             total_amount = order_data.get("total_amount", 0.0)
             
@@ -1105,6 +1086,58 @@ class OrderService:
             logger.error(f"Failed to get menu item details for {menu_item_id}: {str(e)}")
             return None
     
+    def _apply_item_changes(self, item_to_modify: Dict[str, Any], changes: Dict[str, Any]) -> List[str]:
+        """
+        Apply modify_order_item changes to an order item in place - helper method for cart operations
+        
+        Args:
+            item_to_modify: Order item to change
+            changes: Dictionary of changes to apply (e.g., {"remove_modifier": "onions"})
+            
+        Returns:
+            List of human-readable descriptions of the changes applied
+        """
+        changes_applied = []
+            
+        for change_op, change_value in changes.items():
+            if change_op == "remove_modifier":
+                # Remove a modifier from customizations
+                customizations = item_to_modify.get("customizations", [])
+                if change_value in customizations:
+                    customizations.remove(change_value)
+                    item_to_modify["customizations"] = customizations
+                    changes_applied.append(f"removed {change_value}")
+            
+            elif change_op == "add_modifier":
+                # Add a modifier to customizations
+                customizations = item_to_modify.get("customizations", [])
+                if change_value not in customizations:
+                    customizations.append(change_value)
+                    item_to_modify["customizations"] = customizations
+                    changes_applied.append(f"added {change_value}")
+            
+            elif change_op == "set_special_instructions":
+                # Update special instructions
+                item_to_modify["special_instructions"] = change_value
+                changes_applied.append(f"special instructions to: {change_value}")
+            
+            elif change_op == "clear_special_instructions":
+                # Clear special instructions
+                item_to_modify["special_instructions"] = None
+                changes_applied.append("cleared special instructions")
+            
+            elif change_op == "set_size":
+                # Update item size (if supported by menu item)
+                item_to_modify["size"] = change_value
+                changes_applied.append(f"size to {change_value}")
+            
+            else:
+                # Generic change - just store it
+                item_to_modify[change_op] = change_value
+                changes_applied.append(f"{change_op} to {change_value}")
+        
+        return changes_applied
+    
     async def _recalculate_order_totals(self, order_data: Dict[str, Any]) -> None:
         """
         Recalculate order totals - helper method for cart operations
@@ -1237,18 +1270,12 @@ class OrderService:
                 "updated_at": datetime.now().isoformat()
             }
             
-            # Save the new order
+            # Save the new order and link it to the session together
             print(f"   📝 Creating new order with data: {new_order_data}")
-            success = await self.storage.create_order(db, new_order_data)
+            success = await self.storage.create_session_order(db, session_id, new_order_data)
             if success:
                 print(f"   ✅ Successfully created defensive order {redis_order_id}")
-                
-                # Link the order to the session
-                session_data = await self.storage.get_session(session_id)
-                if session_data:
-                    session_data["order_id"] = redis_order_id
-                    await self.storage.update_session(session_id, session_data)
-                    print(f"   🔗 Linked order {redis_order_id} to session {session_id}")
+                print(f"   🔗 Linked order {redis_order_id} to session {session_id}")
                 
                 logger.info(f"Successfully created defensive order {redis_order_id}")
                 return True
@@ -3,8 +3,9 @@ Interface for OrderSessionService - Redis primary with PostgreSQL fallback
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
+from .redis_order_store import OrderMutationResult
 
 
 class OrderSessionInterface(ABC):
@@ -24,9 +25,13 @@ class OrderSessionInterface(ABC):
         pass
 
     @abstractmethod
-    async def get_current_session_id(self) -> Optional[str]:
+    async def get_current_session_id(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None) -> Optional[str]:
         """
-        Get the current active session ID
+        Get the active session ID for a drive-thru lane
+        
+        Args:
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
         
         Returns:
             str: Current session ID if exists, None otherwise
@@ -34,13 +39,15 @@ class OrderSessionInterface(ABC):
         pass
 
     @abstractmethod
-    async def set_current_session_id(self, session_id: str, ttl: int = 900) -> bool:
+    async def set_current_session_id(self, session_id: str, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None, ttl: Optional[int] = None) -> bool:
         """
-        Set the current active session ID
+        Set the active session ID for a drive-thru lane
         
         Args:
             session_id: Session ID to set as current
-            ttl: Time to live in seconds (default 15 minutes)
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+            ttl: Time to live in seconds (defaults to LANE_SESSION_TTL_SECONDS)
             
         Returns:
             bool: True if successful, False otherwise
@@ -48,12 +55,30 @@ class OrderSessionInterface(ABC):
         pass
 
     @abstractmethod
-    async def clear_current_session_id(self) -> bool:
+    async def clear_current_session_id(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None, session_id: Optional[str] = None) -> bool:
         """
-        Clear the current active session ID
+        Clear the active session ID for a drive-thru lane
+        
+        Args:
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+            session_id: Only clear the lane if this session is still current
         
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if a session was cleared, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    async def get_session_lane(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the restaurant lane a session was assigned to
+        
+        Args:
+            session_id: Session ID to look up
+            
+        Returns:
+            dict: {"restaurant_id", "lane_id"} if known, None otherwise
         """
         pass
 
@@ -171,6 +196,131 @@ class OrderSessionInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def add_order_item(self, db: AsyncSession, order_id: str, item: Dict[str, Any], ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically append an item to an order and recalculate totals
+        
+        Args:
+            db: Database session
+            order_id: Order ID to add the item to
+            item: Order item data (must contain id, quantity and unit_price)
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status and the updated order
+        """
+        pass
+
+    @abstractmethod
+    async def remove_order_item(self, db: AsyncSession, order_id: str, order_item_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically remove an item from an order and recalculate totals
+        
+        Args:
+            db: Database session
+            order_id: Order ID containing the item
+            order_item_id: ID of the order item to remove
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status, the updated order and the removed item
+        """
+        pass
+
+    @abstractmethod
+    async def set_order_item_quantity(self, db: AsyncSession, order_id: str, order_item_id: str, quantity: int, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically set an item's quantity and recalculate totals
+        
+        Args:
+            db: Database session
+            order_id: Order ID containing the item
+            order_item_id: ID of the order item to update
+            quantity: New quantity
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status and the updated order
+        """
+        pass
+
+    @abstractmethod
+    async def replace_order_item(self, db: AsyncSession, order_id: str, item: Dict[str, Any], expected_version: Optional[int] = None, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Replace an existing order item if the order is still at expected_version
+        
+        Args:
+            db: Database session
+            order_id: Order ID containing the item
+            item: Updated order item (matched by id)
+            expected_version: Order version the item was read at (None skips the check)
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status (CONFLICT if the order changed) and the updated order
+        """
+        pass
+
+    @abstractmethod
+    async def clear_order_items(self, db: AsyncSession, order_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically remove all items from an order
+        
+        Args:
+            db: Database session
+            order_id: Order ID to clear
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status, the updated order and the cleared item count
+        """
+        pass
+
+    @abstractmethod
+    async def start_lane_session(
+        self,
+        session_id: str,
+        order_data: Dict[str, Any],
+        restaurant_id: Optional[int] = None,
+        lane_id: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        session_ttl: int = 900,
+        order_ttl: int = 1800
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Create a conversation session and its order and make it current at a lane, in one round trip
+        
+        Args:
+            session_id: New session ID
+            order_data: Order data (must contain 'id'); linked as the session's order_id
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+            customer_name: Optional customer name
+            session_ttl: Session time to live in seconds (default 15 minutes)
+            order_ttl: Order time to live in seconds (default 30 minutes)
+            
+        Returns:
+            Tuple[dict, str]: Stored session data (None on failure) and the session previously at the lane
+        """
+        pass
+
+    @abstractmethod
+    async def create_session_order(self, db: AsyncSession, session_id: str, order_data: Dict[str, Any], ttl: int = 1800) -> bool:
+        """
+        Create an order and link it to an existing session
+        
+        Args:
+            db: Database session (not used for Redis-only approach)
+            session_id: Session the order belongs to
+            order_data: Order data dictionary (must contain 'id')
+            ttl: Time to live in seconds for the order (default 30 minutes)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        pass
+
     @abstractmethod
     async def archive_order_to_postgres(self, db: AsyncSession, order_data: Dict[str, Any]) -> Optional[int]:
         """
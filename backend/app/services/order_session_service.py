@@ -3,11 +3,13 @@ OrderSessionService - Redis primary with PostgreSQL fallback
 Implements OrderSessionInterface for managing sessions and orders
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from .order_session_interface import OrderSessionInterface
 from .redis_service import RedisService
+from .redis_order_store import OrderMutationResult
 from ..core.unit_of_work import UnitOfWork
+from ..core.config import settings
 from ..models.order import Order, OrderStatus
 from ..models.order_item import OrderItem
 from ..models.session_models import ConversationSessionData
@@ -50,10 +52,21 @@ class OrderSessionService(OrderSessionInterface):
             logger.error(f"Failed to check Redis availability: {e}")
             return False
 
-    async def get_current_session_id(self) -> Optional[str]:
+    def _lane(self, restaurant_id: Optional[int], lane_id: Optional[str]) -> Tuple[int, str]:
+        """Resolve restaurant/lane, defaulting for callers that don't name one"""
+        return (
+            restaurant_id if restaurant_id is not None else settings.DEFAULT_RESTAURANT_ID,
+            str(lane_id) if lane_id is not None else settings.DEFAULT_LANE_ID
+        )
+
+    async def get_current_session_id(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None) -> Optional[str]:
         """
-        Get the current active session ID
+        Get the active session ID for a drive-thru lane
         
+        Args:
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+            
         Returns:
             str: Current session ID if exists, None otherwise
         """
@@ -62,18 +75,26 @@ class OrderSessionService(OrderSessionInterface):
             return None
         
         try:
-            return await self.redis.get("current:session")
+            return await self.redis.lanes.get_session_id(*self._lane(restaurant_id, lane_id))
         except Exception as e:
             logger.error(f"Failed to get current session ID: {e}")
             return None
 
-    async def set_current_session_id(self, session_id: str, ttl: int = 900) -> bool:
+    async def set_current_session_id(
+        self,
+        session_id: str,
+        restaurant_id: Optional[int] = None,
+        lane_id: Optional[str] = None,
+        ttl: Optional[int] = None
+    ) -> bool:
         """
-        Set the current active session ID
+        Set the active session ID for a drive-thru lane
         
         Args:
             session_id: Session ID to set as current
-            ttl: Time to live in seconds (default 15 minutes)
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+            ttl: Time to live in seconds (defaults to LANE_SESSION_TTL_SECONDS)
             
         Returns:
             bool: True if successful, False otherwise
@@ -83,28 +104,75 @@ class OrderSessionService(OrderSessionInterface):
             return False
         
         try:
-            return await self.redis.set("current:session", session_id, ttl)
+            restaurant_id, lane_id = self._lane(restaurant_id, lane_id)
+            previous = await self.redis.lanes.assign(
+                restaurant_id, lane_id, session_id, ttl or settings.LANE_SESSION_TTL_SECONDS
+            )
+            if previous and previous != session_id:
+                logger.info(f"Lane {restaurant_id}/{lane_id} moved from session {previous} to {session_id}")
+            else:
+                logger.info(f"Set current session for lane {restaurant_id}/{lane_id} to {session_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to set current session ID: {e}")
             return False
 
-    async def clear_current_session_id(self) -> bool:
+    async def clear_current_session_id(
+        self,
+        restaurant_id: Optional[int] = None,
+        lane_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> bool:
         """
-        Clear the current active session ID
+        Clear the active session ID for a drive-thru lane
         
+        Args:
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+            session_id: Only clear the lane if this session is still current
+            
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if a session was cleared, False otherwise
         """
         if not await self.is_redis_available():
             logger.warning("Redis not available, cannot clear current session")
             return False
         
         try:
-            return await self.redis.delete("current:session")
+            cleared = await self.redis.lanes.release(*self._lane(restaurant_id, lane_id), session_id=session_id)
+            return cleared is not None
         except Exception as e:
             logger.error(f"Failed to clear current session ID: {e}")
             return False
 
+    async def get_session_lane(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the restaurant lane a session was assigned to
+        
+        Args:
+            session_id: Session ID to look up
+            
+        Returns:
+            dict: {"restaurant_id", "lane_id"} if known, None otherwise
+        """
+        try:
+            return await self.redis.lanes.get_session_lane(session_id)
+        except Exception as e:
+            logger.error(f"Failed to get lane for session {session_id}: {e}")
+            return None
+
+    async def list_active_lanes(self, restaurant_id: int) -> Dict[str, str]:
+        """
+        Get all occupied lanes for a restaurant
+        
+        Args:
+            restaurant_id: Restaurant ID
+            
+        Returns:
+            dict: lane_id -> session_id
+        """
+        return await self.redis.lanes.list_lanes(restaurant_id)
+
     async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Get session data by ID
@@ -296,22 +364,17 @@ class OrderSessionService(OrderSessionInterface):
             return False
         
         try:
-            redis_order = await self.redis.get_order(order_id)
-            if redis_order:
-                # Merge updates
-                redis_order.update(updates)
-                redis_order["updated_at"] = datetime.now().isoformat()
-                
-                success = await self.redis.set_order(order_id, redis_order, ttl)
-                if success:
-                    logger.info(f"Updated Redis order {order_id}")
-                    return True
-                else:
-                    logger.error(f"Failed to update Redis order {order_id}")
-                    return False
-            else:
+            # Merged server-side in one atomic round trip
+            result = await self.redis.orders.update(order_id, updates, ttl)
+            if result.is_success:
+                logger.info(f"Updated Redis order {order_id}")
+                return True
+            elif result.status == "NOT_FOUND":
                 logger.error(f"Order {order_id} not found in Redis for update")
                 return False
+            else:
+                logger.error(f"Failed to update Redis order {order_id}: {result.status}")
+                return False
         except Exception as e:
             logger.error(f"Failed to update Redis order {order_id}: {e}")
             return False
@@ -343,6 +406,185 @@ class OrderSessionService(OrderSessionInterface):
             logger.error(f"Failed to delete Redis order {order_id}: {e}")
             return False
 
+    async def add_order_item(self, db: AsyncSession, order_id: str, item: Dict[str, Any], ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically append an item to an order in Redis and recalculate totals
+        
+        Args:
+            db: Database session (not used for Redis-only approach)
+            order_id: Order ID to add the item to
+            item: Order item data (must contain id, quantity and unit_price)
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status and the updated order
+        """
+        if not await self.is_redis_available():
+            logger.error("Redis not available - cannot add order item (Redis is single source of truth)")
+            return OrderMutationResult(status="UNAVAILABLE")
+        return await self.redis.orders.add_item(order_id, item, ttl)
+
+    async def remove_order_item(self, db: AsyncSession, order_id: str, order_item_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically remove an item from an order in Redis and recalculate totals
+        
+        Args:
+            db: Database session (not used for Redis-only approach)
+            order_id: Order ID containing the item
+            order_item_id: ID of the order item to remove
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status, the updated order and the removed item
+        """
+        if not await self.is_redis_available():
+            logger.error("Redis not available - cannot remove order item (Redis is single source of truth)")
+            return OrderMutationResult(status="UNAVAILABLE")
+        return await self.redis.orders.remove_item(order_id, order_item_id, ttl)
+
+    async def set_order_item_quantity(self, db: AsyncSession, order_id: str, order_item_id: str, quantity: int, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically set an item's quantity in Redis and recalculate totals
+        
+        Args:
+            db: Database session (not used for Redis-only approach)
+            order_id: Order ID containing the item
+            order_item_id: ID of the order item to update
+            quantity: New quantity
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status and the updated order
+        """
+        if not await self.is_redis_available():
+            logger.error("Redis not available - cannot update order item (Redis is single source of truth)")
+            return OrderMutationResult(status="UNAVAILABLE")
+        return await self.redis.orders.set_item_quantity(order_id, order_item_id, quantity, ttl)
+
+    async def replace_order_item(self, db: AsyncSession, order_id: str, item: Dict[str, Any], expected_version: Optional[int] = None, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Replace an existing order item in Redis if the order is still at expected_version
+        
+        Args:
+            db: Database session (not used for Redis-only approach)
+            order_id: Order ID containing the item
+            item: Updated order item (matched by id)
+            expected_version: Order version the item was read at (None skips the check)
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status (CONFLICT if the order changed) and the updated order
+        """
+        if not await self.is_redis_available():
+            logger.error("Redis not available - cannot update order item (Redis is single source of truth)")
+            return OrderMutationResult(status="UNAVAILABLE")
+        return await self.redis.orders.replace_item(order_id, item, ttl, expected_version)
+
+    async def clear_order_items(self, db: AsyncSession, order_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Atomically remove all items from an order in Redis
+        
+        Args:
+            db: Database session (not used for Redis-only approach)
+            order_id: Order ID to clear
+            ttl: Time to live in seconds for Redis (default 30 minutes)
+            
+        Returns:
+            OrderMutationResult: Mutation status, the updated order and the cleared item count
+        """
+        if not await self.is_redis_available():
+            logger.error("Redis not available - cannot clear order (Redis is single source of truth)")
+            return OrderMutationResult(status="UNAVAILABLE")
+        return await self.redis.orders.clear_items(order_id, ttl)
+
+    async def start_lane_session(
+        self,
+        session_id: str,
+        order_data: Dict[str, Any],
+        restaurant_id: Optional[int] = None,
+        lane_id: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        session_ttl: int = 900,
+        order_ttl: int = 1800
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Create a conversation session and its order and make it current at a lane
+        
+        Session, order and lane pointer are written in one MULTI round trip, so a
+        lane never points at a session whose order doesn't exist yet.
+        
+        Args:
+            session_id: New session ID
+            order_data: Order data (must contain 'id'); linked as the session's order_id
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
+            customer_name: Optional customer name
+            session_ttl: Session time to live in seconds (default 15 minutes)
+            order_ttl: Order time to live in seconds (default 30 minutes)
+            
+        Returns:
+            Tuple[dict, str]: Stored session data (None on failure) and the session previously at the lane
+        """
+        if not await self.is_redis_available():
+            logger.error(f"Redis is not available - cannot create session {session_id}")
+            return None, None
+        
+        try:
+            restaurant_id, lane_id = self._lane(restaurant_id, lane_id)
+            session_data = self._new_conversation_session_data(session_id, restaurant_id, customer_name)
+            session_data["order_id"] = order_data["id"]
+            
+            pipe = self.redis.pipeline()
+            self.redis.lanes.queue_assign(pipe, restaurant_id, lane_id, session_id, settings.LANE_SESSION_TTL_SECONDS)
+            pipe.setex(f"session:{session_id}", session_ttl, json.dumps(session_data))
+            self.redis.orders.queue_create(pipe, order_data["id"], order_data, order_ttl)
+            replies = await pipe.execute()
+            
+            logger.info(f"Started session {session_id} with order {order_data['id']} at lane {restaurant_id}/{lane_id}")
+            return session_data, replies[0]
+        except Exception as e:
+            logger.error(f"Failed to start session {session_id} at lane {lane_id}: {e}")
+            return None, None
+
+    async def create_session_order(self, db: AsyncSession, session_id: str, order_data: Dict[str, Any], ttl: int = 1800) -> bool:
+        """
+        Create an order and link it to an existing session
+        
+        One read of the session, then the order and the updated session are
+        written together in one MULTI round trip.
+        
+        Args:
+            db: Database session (not used for Redis-only approach)
+            session_id: Session the order belongs to
+            order_data: Order data dictionary (must contain 'id')
+            ttl: Time to live in seconds for the order (default 30 minutes)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not await self.is_redis_available():
+            logger.error("Redis not available - cannot create order (Redis is single source of truth)")
+            return False
+        
+        try:
+            session_data = await self.get_session(session_id)
+            if not session_data:
+                logger.error(f"Session {session_id} not found to link order {order_data.get('id')}")
+                return False
+            session_data["order_id"] = order_data["id"]
+            session_data["updated_at"] = datetime.now().isoformat()
+            
+            pipe = self.redis.pipeline()
+            self.redis.orders.queue_create(pipe, order_data["id"], order_data, ttl)
+            pipe.setex(f"session:{session_id}", 900, json.dumps(session_data))
+            await pipe.execute()
+            
+            logger.info(f"Created Redis order {order_data['id']} for session {session_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to create order for session {session_id}: {e}")
+            return False
+
     async def archive_order_to_postgres(self, db: AsyncSession, order_data: Dict[str, Any]) -> Optional[int]:
         """
         Archive order from Redis to PostgreSQL
@@ -477,47 +719,19 @@ class OrderSessionService(OrderSessionInterface):
             return False
         
         try:
-            logger.info(f"Creating session data structure for {session_id}")
-            # Create default session data with new structure
-            session_data = {
-                "id": session_id,
-                "restaurant_id": restaurant_id,
-                "customer_name": customer_name,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                
-                # New workflow fields
-                "conversation_state": ConversationState.IDLE.value,
-                "conversation_history": [],
-                "conversation_context": {
-                    "turn_counter": 0,
-                    "last_action_uuid": None,
-                    "thinking_since": None,
-                    "timeout_at": None,
-                    "expectation": "free_form_ordering"
-                },
-                "order_state": {
-                    "line_items": [],
-                    "last_mentioned_item_ref": None,
-                    "totals": {}
-                }
-            }
-            logger.info(f"Session data structure created successfully for {session_id}")
-            
-            # Validate session data before storing
+            # Build and validate default session data
             try:
                 logger.info(f"Validating session data for {session_id}")
-                validated_session = ConversationSessionData(**session_data)
+                session_data = self._new_conversation_session_data(session_id, restaurant_id, customer_name)
                 logger.info(f"Session data validation successful for {session_id}")
             except Exception as e:
                 logger.error(f"Session data validation failed for {session_id}: {e}")
-                logger.error(f"Session data that failed validation: {session_data}")
                 return False
             
             # Create session in Redis
             try:
                 logger.info(f"Converting session data to JSON for {session_id}")
-                session_json = json.dumps(validated_session.model_dump())
+                session_json = json.dumps(session_data)
                 logger.info(f"JSON conversion successful for {session_id}, length: {len(session_json)}")
                 
                 logger.info(f"Storing session in Redis with key 'session:{session_id}'")
@@ -545,6 +759,39 @@ class OrderSessionService(OrderSessionInterface):
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
 
+    def _new_conversation_session_data(self, session_id: str, restaurant_id: int, customer_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build validated default session data for a new conversation
+        
+        Raises:
+            ValueError: If the data doesn't validate (e.g. non-positive restaurant ID)
+        """
+        now = datetime.now().isoformat()
+        session_data = {
+            "id": session_id,
+            "restaurant_id": restaurant_id,
+            "customer_name": customer_name,
+            "created_at": now,
+            "updated_at": now,
+            
+            # New workflow fields
+            "conversation_state": ConversationState.IDLE.value,
+            "conversation_history": [],
+            "conversation_context": {
+                "turn_counter": 0,
+                "last_action_uuid": None,
+                "thinking_since": None,
+                "timeout_at": None,
+                "expectation": "free_form_ordering"
+            },
+            "order_state": {
+                "line_items": [],
+                "last_mentioned_item_ref": None,
+                "totals": {}
+            }
+        }
+        return ConversationSessionData(**session_data).model_dump()
+
     def _session_data_to_workflow_state(self, session_data: Dict[str, Any], user_input: str) -> ConversationWorkflowState:
         """
         Convert session data to ConversationWorkflowState.
@@ -686,64 +933,19 @@ class OrderSessionService(OrderSessionInterface):
         
         return session_data
 
-    async def set_current_session_id(self, session_id: str) -> bool:
+    async def get_current_session(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
-        Set the current active session ID.
+        Get the active session data for a drive-thru lane.
         
         Args:
-            session_id: Session ID to set as current
-            
-        Returns:
-            bool: True if successful, False otherwise
-        """
-        try:
-            success = await self.redis.set("current_session", session_id, ttl=900)
-            if success:
-                logger.info(f"Set current session to {session_id}")
-            return success
-        except Exception as e:
-            logger.error(f"Failed to set current session {session_id}: {e}")
-            return False
-
-    async def get_current_session_id(self) -> Optional[str]:
-        """
-        Get the current active session ID.
-        
-        Returns:
-            Optional[str]: Current session ID if found, None otherwise
-        """
-        try:
-            session_id = await self.redis.get("current_session")
-            return session_id
-        except Exception as e:
-            logger.error(f"Failed to get current session: {e}")
-            return None
-
-    async def clear_current_session_id(self) -> bool:
-        """
-        Clear the current active session ID.
-        
-        Returns:
-            bool: True if successful, False otherwise
-        """
-        try:
-            success = await self.redis.delete("current_session")
-            if success:
-                logger.info("Cleared current session")
-            return success
-        except Exception as e:
-            logger.error(f"Failed to clear current session: {e}")
-            return False
-
-    async def get_current_session(self) -> Optional[Dict[str, Any]]:
-        """
-        Get the current active session data.
+            restaurant_id: Restaurant ID (defaults to DEFAULT_RESTAURANT_ID)
+            lane_id: Drive-thru lane identifier (defaults to DEFAULT_LANE_ID)
         
         Returns:
             Optional[Dict[str, Any]]: Current session data if found, None otherwise
         """
         try:
-            current_session_id = await self.get_current_session_id()
+            current_session_id = await self.get_current_session_id(restaurant_id, lane_id)
             if not current_session_id:
                 return None
             
@@ -13,6 +13,7 @@ from ..core.unit_of_work import UnitOfWork
 from ..core.config import settings
 from ..dto.order_result import ErrorCategory, ErrorCode, OrderResult, OrderResultStatus
 from ..constants.order_limits import OrderLimits
+from .menu_ingredient_snapshot import MenuIngredientSnapshot
 
 
 class OrderValidator:
@@ -112,13 +113,20 @@ class OrderValidator:
             data={"item_count": item_count}
         )
     
-    async def _validate_customizations(self, uow: UnitOfWork, menu_item_id: int, customizations: List[str]) -> OrderResult:
+    async def _validate_customizations(
+        self,
+        uow: UnitOfWork,
+        menu_item_id: int,
+        customizations: List[str],
+        ingredients: Optional[MenuIngredientSnapshot] = None
+    ) -> OrderResult:
         """
         Validate menu item customizations
         
         Args:
             menu_item_id: Menu item ID
             customizations: List of customizations
+            ingredients: Snapshot already loaded for the command batch, if any
             
         Returns:
             OrderResult: Validation result
@@ -127,8 +135,11 @@ class OrderValidator:
         warnings = []
         
         # Get menu item ingredients to validate customizations
-        ingredients = await uow.menu_item_ingredients.get_by_menu_item(menu_item_id)
-        ingredient_names = [ing.ingredient.name.lower() for ing in ingredients if ing.ingredient]
+        ingredients = ingredients or MenuIngredientSnapshot()
+        await ingredients.ensure(uow, [menu_item_id])
+        ingredient_names = [
+            ing.ingredient.name.lower() for ing in ingredients.menu_item_ingredients(menu_item_id) if ing.ingredient
+        ]
         
         for customization in customizations:
             customization_lower = customization.lower()
@@ -167,15 +178,14 @@ class OrderValidator:
         errors = []
         warnings = []
         
-        # Get all ingredients for this menu item
-        menu_item_ingredients = await uow.menu_item_ingredients.get_by_menu_item(menu_item_id)
+        # Ingredients with their inventory joined in, in one query
+        ingredients = await MenuIngredientSnapshot.load(uow, [menu_item_id])
         
-        for menu_item_ingredient in menu_item_ingredients:
+        for menu_item_ingredient in ingredients.menu_item_ingredients(menu_item_id):
             if not menu_item_ingredient.ingredient:
                 continue
             
-            # Get inventory for this ingredient
-            inventory = await uow.inventory.get_by_ingredient(menu_item_ingredient.ingredient_id)
+            inventory = menu_item_ingredient.ingredient.inventory
             if not inventory:
                 if not settings.ALLOW_NEGATIVE_INVENTORY:
                     errors.append(f"No inventory tracking for ingredient '{menu_item_ingredient.ingredient.name}'")
@@ -0,0 +1,258 @@
+"""
+Public menu cache - serialized, precompressed menu responses per restaurant
+
+The lane screens fetch GET /api/restaurants/{id}/menu on every page load. The
+response is built from one eager-loaded query, serialized and gzipped once, and
+kept in process with an ETag (hash of the body) so repeat loads are a
+dictionary lookup, and clients that already have the body get a 304.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import get_async_session
+from ..repository.restaurant_repository import RestaurantRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PublicMenu:
+    """One restaurant's menu response, ready to send"""
+
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+    @property
+    def gzip_etag(self) -> str:
+        """ETag of the gzipped body (a strong validator has to differ per representation)"""
+        return gzip_etag(self.etag)
+
+
+def build_menu_response(restaurant) -> Dict[str, Any]:
+    """
+    Shape a restaurant loaded by RestaurantRepository.get_public_menu into the menu response
+
+    Categories without available items are left out; categories and items are
+    ordered by display_order.
+    """
+    menu_data = []
+    for category in sorted(restaurant.categories, key=lambda c: c.display_order):
+        items = [
+            {
+                "id": item.id,
+                "name": item.name,
+                "price": float(item.price),
+                "description": item.description,
+                "image_url": item.image_url,
+                "sort_order": item.display_order,
+                "restaurant_id": item.restaurant_id,
+                "tags": [{"name": link.tag.name, "color": link.tag.color} for link in item.tags if link.tag]
+            }
+            for item in sorted(category.menu_items, key=lambda i: i.display_order)
+        ]
+        if items:
+            menu_data.append({
+                "id": category.id,
+                "name": category.name,
+                "description": category.description,
+                "sort_order": category.display_order,
+                "items": items
+            })
+
+    return {
+        "restaurant": {
+            "id": restaurant.id,
+            "name": restaurant.name,
+            "primary_color": restaurant.primary_color,
+            "secondary_color": restaurant.secondary_color,
+            "logo_url": restaurant.logo_url
+        },
+        "menu": menu_data,
+        "total_items": sum(len(category["items"]) for category in menu_data)
+    }
+
+
+def gzip_etag(etag: str) -> str:
+    """
+    ETag for the gzipped representation of a body with the given identity ETag
+
+    Args:
+        etag: Identity ETag, quoted
+
+    Returns:
+        str: Quoted ETag with a "-gzip" suffix
+    """
+    return f'{etag[:-1]}-gzip"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 asks for GET)
+
+    Either representation's tag counts: the gzip and identity bodies carry the
+    same content, so a client holding one has nothing new to fetch.
+
+    Args:
+        if_none_match: Header value: "*", or a comma-separated list of (possibly W/) tags
+        etag: Current identity ETag, quoted
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = {etag, gzip_etag(etag)}
+    return any(candidate.strip().removeprefix("W/") in current for candidate in if_none_match.split(","))
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Check whether an Accept-Encoding header allows gzip
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br" or "gzip;q=0"
+
+    Returns:
+        bool: True unless gzip is absent or refused with q=0
+    """
+    for coding in (accept_encoding or "").lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() in ("gzip", "*"):
+            quality = params.strip().removeprefix("q=")
+            try:
+                return not params or float(quality) > 0
+            except ValueError:
+                return True
+    return False
+
+
+class PublicMenuCache:
+    """
+    restaurant_id -> PublicMenu, rebuilt after a TTL or an explicit invalidate()
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None
+    ):
+        """
+        Initialize the public menu cache
+
+        Args:
+            ttl_seconds: Rebuild a restaurant's menu after this long (defaults to PUBLIC_MENU_CACHE_TTL_SECONDS)
+            session_factory: Opens the database session a build runs on (one per build, not the caller's)
+        """
+        self.ttl_seconds = settings.PUBLIC_MENU_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.session_factory = session_factory or get_async_session
+        # restaurant_id -> (PublicMenu, built_at)
+        self._menus: Dict[int, tuple] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+        # Bumped by invalidate(), so a build that read the database before an invalidation isn't stored
+        self._generations: Dict[int, int] = {}
+        self._generation = 0
+        self._stats = {"hits": 0, "builds": 0, "unchanged_rebuilds": 0}
+
+    async def get(self, restaurant_id: int) -> Optional[PublicMenu]:
+        """
+        Get a restaurant's menu response, building it on first use or after the TTL
+
+        Concurrent callers for the same restaurant share one build, which runs on
+        its own database session so a caller going away doesn't close it under the others.
+
+        Args:
+            restaurant_id: Restaurant ID
+
+        Returns:
+            PublicMenu: Serialized menu, None if the restaurant doesn't exist
+        """
+        entry = self._menus.get(restaurant_id)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+            self._stats["hits"] += 1
+            return entry[0]
+
+        task = self._loading.get(restaurant_id)
+        if task is None:
+            task = asyncio.create_task(self._build(restaurant_id))
+            self._loading[restaurant_id] = task
+            task.add_done_callback(lambda done: self._loading_done(restaurant_id, done))
+        return await asyncio.shield(task)
+
+    def _loading_done(self, restaurant_id: int, task: asyncio.Task) -> None:
+        # invalidate() may already have replaced the entry with a newer build
+        if self._loading.get(restaurant_id) is task:
+            del self._loading[restaurant_id]
+
+    def _current_generation(self, restaurant_id: int) -> tuple:
+        return self._generation, self._generations.get(restaurant_id, 0)
+
+    async def _build(self, restaurant_id: int) -> Optional[PublicMenu]:
+        generation = self._current_generation(restaurant_id)
+        async with self.session_factory() as db:
+            restaurant = await RestaurantRepository(db).get_public_menu(restaurant_id)
+        if restaurant is None:
+            # Not cached, so a restaurant created later is served straight away
+            return None
+
+        body = json.dumps(build_menu_response(restaurant), separators=(",", ":")).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+        previous = self._menus.get(restaurant_id)
+        if previous is not None and previous[0].etag == etag:
+            # Same menu version: keep the compressed body instead of recompressing it
+            menu = previous[0]
+            self._stats["unchanged_rebuilds"] += 1
+        else:
+            menu = PublicMenu(body=body, gzipped=gzip.compress(body, compresslevel=9), etag=etag)
+            self._stats["builds"] += 1
+            logger.info(f"Built public menu for restaurant {restaurant_id} ({len(body)} bytes, {len(menu.gzipped)} gzipped)")
+
+        if self._current_generation(restaurant_id) != generation:
+            # Invalidated while building: the menu read may predate the change
+            logger.info(f"Public menu for restaurant {restaurant_id} invalidated during its build, not cached")
+            return menu
+        self._menus[restaurant_id] = (menu, time.monotonic())
+        return menu
+
+    def invalidate(self, restaurant_id: Optional[int] = None) -> None:
+        """
+        Drop cached menus so the next request rebuilds them
+
+        Args:
+            restaurant_id: Restaurant to drop (None drops all)
+        """
+        if restaurant_id is None:
+            self._generation += 1
+            self._menus.clear()
+            self._loading.clear()
+        else:
+            self._generations[restaurant_id] = self._generations.get(restaurant_id, 0) + 1
+            self._menus.pop(restaurant_id, None)
+            # The next request starts a fresh build instead of joining one that read the old menu
+            self._loading.pop(restaurant_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dict[str, Any]: Hit/build counts and number of restaurants cached
+        """
+        return {**self._stats, "restaurants": len(self._menus)}
+
+
+# Process-wide cache shared by the restaurant API and menu invalidation
+public_menu_cache = PublicMenuCache()
@@ -1,202 +1,433 @@
 """
 Redis Menu Cache Service
 
-Redis implementation of menu caching for fast menu lookups
+Redis implementation of menu caching for fast menu lookups.
+
+Each restaurant's menu is stored as a versioned hash with one field per item,
+plus a pointer to the current version:
+
+    menu:{restaurant_id}:version            STRING  current version (content fingerprint)
+    menu:{restaurant_id}:items:{version}    HASH    menu_item_id -> item JSON
+
+Every worker keeps the current version in process as immutable CachedMenuItem
+DTOs (the L1). Reads are served from the L1; an entry older than
+MENU_CACHE_REFRESH_SECONDS is still served while one background GET of the
+version pointer revalidates it and slides the Redis TTLs, so steady-state
+menu reads on the turn path touch neither Redis nor Postgres. Writes and
+invalidations are published on MENU_CACHE_INVALIDATION_CHANNEL so the other
+workers drop their copies straight away.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 import redis.asyncio as redis
-from app.models.menu_item import MenuItem
+from app.dto.cached_menu_item import CachedMenuItem
 from app.services.menu_cache_interface import MenuCacheInterface
+from app.services.menu_search_index import menu_index_registry
+from app.services.public_menu_cache import public_menu_cache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class MenuSnapshot:
+    """One version of a restaurant's menu, shared read-only by every request"""
+    restaurant_id: int
+    version: str
+    items: Tuple[CachedMenuItem, ...]
+    by_id: Dict[int, CachedMenuItem] = field(repr=False)
+    available_names: Tuple[str, ...] = field(repr=False)
+
+    @classmethod
+    def build(cls, restaurant_id: int, version: str, items) -> "MenuSnapshot":
+        items = tuple(sorted(items, key=lambda item: (item.display_order or 0, item.id)))
+        return cls(
+            restaurant_id=restaurant_id,
+            version=version,
+            items=items,
+            by_id={item.id: item for item in items},
+            available_names=tuple(item.name for item in items if item.is_available)
+        )
+
+
+def menu_version(item_json: Dict[int, str]) -> str:
+    """Content fingerprint of a serialized menu - the same menu always gets the same version"""
+    digest = hashlib.sha1()
+    for item_id in sorted(item_json):
+        digest.update(item_json[item_id].encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _menu_changed_locally(restaurant_id: Optional[int]) -> None:
+    """Derived in-process caches rebuild on their next lookup"""
+    menu_index_registry.invalidate(restaurant_id)
+    public_menu_cache.invalidate(restaurant_id)
+
+
+class MenuSnapshotCache:
+    """
+    Process-wide L1: restaurant_id -> (MenuSnapshot, last validated), plus the
+    pub/sub listener that applies other workers' invalidations
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        self.refresh_seconds = settings.MENU_CACHE_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self._snapshots: Dict[int, Tuple[MenuSnapshot, float]] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "revalidations": 0, "invalidations": 0}
+
+    def get(self, restaurant_id: int) -> Optional[MenuSnapshot]:
+        entry = self._snapshots.get(restaurant_id)
+        self._stats["hits" if entry else "misses"] += 1
+        return entry[0] if entry else None
+
+    def peek(self, restaurant_id: int) -> Optional[MenuSnapshot]:
+        """Like get(), without counting a hit or miss"""
+        entry = self._snapshots.get(restaurant_id)
+        return entry[0] if entry else None
+
+    def is_stale(self, restaurant_id: int) -> bool:
+        entry = self._snapshots.get(restaurant_id)
+        return entry is None or time.monotonic() - entry[1] >= self.refresh_seconds
+
+    def put(self, snapshot: MenuSnapshot, revalidated: bool = False) -> None:
+        """Store a snapshot as validated now (revalidated=True: same version confirmed in Redis)"""
+        self._snapshots[snapshot.restaurant_id] = (snapshot, time.monotonic())
+        self._stats["revalidations" if revalidated else "loads"] += 1
+
+    def drop(self, restaurant_id: Optional[int] = None) -> None:
+        if restaurant_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(restaurant_id, None)
+
+    def drop_validated_before(self, since: float) -> List[int]:
+        """Drop snapshots last validated before a time.monotonic() value; returns their restaurant IDs"""
+        dropped = [restaurant_id for restaurant_id, entry in self._snapshots.items() if entry[1] < since]
+        for restaurant_id in dropped:
+            del self._snapshots[restaurant_id]
+        return dropped
+
+    async def load(self, restaurant_id: int, loader) -> Optional[MenuSnapshot]:
+        """
+        Run loader(restaurant_id) once for concurrent callers of the same restaurant
+
+        Returns:
+            MenuSnapshot: Whatever the loader stored, None if the menu isn't cached
+        """
+        task = self._loading.get(restaurant_id)
+        if task is None:
+            task = asyncio.create_task(loader(restaurant_id))
+            self._loading[restaurant_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(restaurant_id, None))
+        return await asyncio.shield(task)
+
+    def refresh_in_background(self, restaurant_id: int, loader) -> None:
+        """Revalidate a stale snapshot without making the caller wait for it"""
+        if restaurant_id in self._loading:
+            return
+        task = asyncio.create_task(loader(restaurant_id))
+        self._loading[restaurant_id] = task
+        task.add_done_callback(lambda _: self._loading.pop(restaurant_id, None))
+
+    def apply_invalidation(self, message: Dict[str, Any]) -> None:
+        """
+        Apply a message from MENU_CACHE_INVALIDATION_CHANNEL
+
+        Args:
+            message: {"restaurant_id": id or None for all, "version": new version or None if deleted}
+        """
+        restaurant_id = message.get("restaurant_id")
+        if restaurant_id is not None:
+            entry = self._snapshots.get(restaurant_id)
+            if entry is not None and entry[0].version == message.get("version"):
+                # Our own write, or a worker caching the menu we already have
+                return
+        self.drop(restaurant_id)
+        _menu_changed_locally(restaurant_id)
+        self._stats["invalidations"] += 1
+
+    async def start_listener(self, client: redis.Redis) -> None:
+        """Subscribe to menu invalidations (one listener per process)"""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(client))
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self, client: redis.Redis) -> None:
+        started = time.monotonic()
+        subscribed_before = False
+        while True:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(settings.MENU_CACHE_INVALIDATION_CHANNEL)
+                if subscribed_before:
+                    # Anything published while we weren't subscribed is unknown - start over
+                    self.drop()
+                    _menu_changed_locally(None)
+                else:
+                    # Snapshots loaded since the listener started (the startup warm-up
+                    # runs alongside this subscribe) are current; older ones may not be
+                    for restaurant_id in self.drop_validated_before(started):
+                        _menu_changed_locally(restaurant_id)
+                subscribed_before = True
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.apply_invalidation(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Menu invalidation listener lost its subscription, retrying: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get L1 counters and per-restaurant menu versions"""
+        return {
+            **self._stats,
+            "listening": self._listener is not None and not self._listener.done(),
+            "menus": {restaurant_id: entry[0].version for restaurant_id, entry in self._snapshots.items()}
+        }
+
+
+# Process-wide L1 shared by every RedisMenuCacheService in the worker
+menu_snapshot_cache = MenuSnapshotCache()
+
+
 class RedisMenuCacheService(MenuCacheInterface):
     """Redis implementation of menu caching"""
-    
-    def __init__(self):
-        self.redis_client: Optional[redis.Redis] = None
+
+    # One connection pool per process, however many services are created per request
+    _shared_client: Optional[redis.Redis] = None
+
+    def __init__(self, snapshot_cache: Optional[MenuSnapshotCache] = None, redis_client: Optional[redis.Redis] = None):
+        """
+        Initialize the menu cache
+
+        Args:
+            snapshot_cache: In-process L1 (defaults to the shared one)
+            redis_client: Redis client (defaults to one shared client for REDIS_URL)
+        """
+        self.redis_client = redis_client
+        self.snapshot_cache = snapshot_cache or menu_snapshot_cache
         self.cache_prefix = "menu:"
-        self.available_items_prefix = "available:"
-        self.search_index_prefix = "search:"
-    
+
     async def _get_redis_client(self) -> redis.Redis:
         """Get Redis client, create if not exists"""
         if self.redis_client is None:
-            self.redis_client = redis.from_url(settings.REDIS_URL)
+            if RedisMenuCacheService._shared_client is None:
+                RedisMenuCacheService._shared_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+            self.redis_client = RedisMenuCacheService._shared_client
         return self.redis_client
-    
-    async def _get_cache_key(self, restaurant_id: int, suffix: str = "") -> str:
-        """Generate cache key for restaurant"""
-        return f"{self.cache_prefix}{restaurant_id}{suffix}"
-    
-    async def _get_available_items_key(self, restaurant_id: int) -> str:
-        """Generate cache key for available items"""
-        return f"{self.available_items_prefix}{restaurant_id}"
-    
-    async def _get_search_index_key(self, restaurant_id: int) -> str:
-        """Generate cache key for search index"""
-        return f"{self.search_index_prefix}{restaurant_id}"
-    
-    async def get_menu_items(self, restaurant_id: int) -> List[MenuItem]:
-        """Get all menu items for a restaurant from cache"""
+
+    def _version_key(self, restaurant_id: int) -> str:
+        return f"{self.cache_prefix}{restaurant_id}:version"
+
+    def _items_key(self, restaurant_id: int, version: str) -> str:
+        return f"{self.cache_prefix}{restaurant_id}:items:{version}"
+
+    async def get_snapshot(self, restaurant_id: int) -> Optional[MenuSnapshot]:
+        """
+        Get the current menu version for a restaurant
+
+        Served from the L1; a stale entry is returned as is while it is
+        revalidated in the background. Only an L1 miss waits on Redis.
+
+        Returns:
+            MenuSnapshot: Current menu, None if the restaurant's menu isn't cached
+        """
+        snapshot = self.snapshot_cache.get(restaurant_id)
+        if snapshot is not None:
+            if self.snapshot_cache.is_stale(restaurant_id):
+                self.snapshot_cache.refresh_in_background(restaurant_id, self._revalidate)
+            return snapshot
+        return await self.snapshot_cache.load(restaurant_id, self._revalidate)
+
+    async def _revalidate(self, restaurant_id: int) -> Optional[MenuSnapshot]:
+        """Check the version pointer (sliding the TTLs) and load the hash only if the version moved"""
+        current = self.snapshot_cache.peek(restaurant_id)
         try:
             redis_client = await self._get_redis_client()
-            cache_key = await self._get_cache_key(restaurant_id)
-            
-            cached_data = await redis_client.get(cache_key)
-            if cached_data is None:
-                logger.info(f"No cached menu items found for restaurant {restaurant_id}")
-                return []
-            
-            menu_data = json.loads(cached_data)
-            menu_items = [MenuItem(**item) for item in menu_data]
-            
-            logger.debug(f"Retrieved {len(menu_items)} menu items from cache for restaurant {restaurant_id}")
-            return menu_items
-            
+            ttl = settings.MENU_CACHE_TTL_SECONDS
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(self._version_key(restaurant_id))
+                pipe.expire(self._version_key(restaurant_id), ttl)
+                if current is not None:
+                    pipe.expire(self._items_key(restaurant_id, current.version), ttl)
+                version = (await pipe.execute())[0]
+
+            if version is None:
+                if current is not None:
+                    self.snapshot_cache.drop(restaurant_id)
+                    _menu_changed_locally(restaurant_id)
+                return None
+
+            if current is not None and current.version == version:
+                self.snapshot_cache.put(current, revalidated=True)
+                return current
+
+            fields = await redis_client.hgetall(self._items_key(restaurant_id, version))
+            if not fields:
+                # Pointer moved again and this version's grace period ran out; next read retries
+                return current
+
+            snapshot = MenuSnapshot.build(
+                restaurant_id, version, (CachedMenuItem.from_dict(json.loads(data)) for data in fields.values())
+            )
+            self.snapshot_cache.put(snapshot)
+            if current is not None:
+                _menu_changed_locally(restaurant_id)
+            logger.debug(f"Loaded menu version {version} for restaurant {restaurant_id} ({len(snapshot.items)} items)")
+            return snapshot
+
         except Exception as e:
-            logger.error(f"Error retrieving menu items from cache: {e}")
+            # Keep serving what we have; the next stale read tries again
+            logger.error(f"Error loading menu for restaurant {restaurant_id} from cache: {e}")
+            return current
+
+    async def get_menu_items(self, restaurant_id: int) -> List[CachedMenuItem]:
+        """Get all menu items for a restaurant from cache"""
+        snapshot = await self.get_snapshot(restaurant_id)
+        if snapshot is None:
+            logger.info(f"No cached menu items found for restaurant {restaurant_id}")
             return []
-    
-    async def get_menu_item_by_id(self, restaurant_id: int, menu_item_id: int) -> Optional[MenuItem]:
+        return list(snapshot.items)
+
+    async def get_menu_item_by_id(self, restaurant_id: int, menu_item_id: int) -> Optional[CachedMenuItem]:
         """Get a specific menu item by ID from cache"""
-        try:
-            menu_items = await self.get_menu_items(restaurant_id)
-            for item in menu_items:
-                if item.id == menu_item_id:
-                    return item
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error retrieving menu item {menu_item_id} from cache: {e}")
-            return None
-    
-    async def search_menu_items(self, restaurant_id: int, query: str) -> List[MenuItem]:
+        snapshot = await self.get_snapshot(restaurant_id)
+        return snapshot.by_id.get(menu_item_id) if snapshot else None
+
+    async def search_menu_items(self, restaurant_id: int, query: str) -> List[CachedMenuItem]:
         """Search menu items by name/description from cache"""
-        try:
-            menu_items = await self.get_menu_items(restaurant_id)
-            if not menu_items:
-                return []
-            
-            query_lower = query.lower()
-            matching_items = []
-            
-            for item in menu_items:
-                # Search in name and description
-                if (query_lower in item.name.lower() or 
-                    (item.description and query_lower in item.description.lower())):
-                    matching_items.append(item)
-            
-            logger.debug(f"Found {len(matching_items)} matching items for query '{query}' in restaurant {restaurant_id}")
-            return matching_items
-            
-        except Exception as e:
-            logger.error(f"Error searching menu items in cache: {e}")
+        snapshot = await self.get_snapshot(restaurant_id)
+        if snapshot is None:
             return []
-    
+
+        query_lower = query.lower()
+        matching_items = [
+            item for item in snapshot.items
+            if query_lower in item.name.lower() or (item.description and query_lower in item.description.lower())
+        ]
+        logger.debug(f"Found {len(matching_items)} matching items for query '{query}' in restaurant {restaurant_id}")
+        return matching_items
+
     async def get_available_items(self, restaurant_id: int) -> List[str]:
         """Get available menu item names from cache"""
+        snapshot = await self.get_snapshot(restaurant_id)
+        return list(snapshot.available_names) if snapshot else []
+
+    async def cache_menu_items(self, restaurant_id: int, menu_items) -> None:
+        """
+        Cache menu items for a restaurant as a new menu version
+
+        The item hash and the version pointer are written in one MULTI, so
+        readers see either the old version or the complete new one. The old
+        version's hash is kept for a grace period for readers mid-switch.
+        """
         try:
             redis_client = await self._get_redis_client()
-            available_key = await self._get_available_items_key(restaurant_id)
-            
-            cached_data = await redis_client.get(available_key)
-            if cached_data is None:
-                logger.info(f"No cached available items found for restaurant {restaurant_id}")
-                return []
-            
-            available_items = json.loads(cached_data)
-            logger.debug(f"Retrieved {len(available_items)} available items from cache for restaurant {restaurant_id}")
-            return available_items
-            
-        except Exception as e:
-            logger.error(f"Error retrieving available items from cache: {e}")
-            return []
-    
-    async def cache_menu_items(self, restaurant_id: int, menu_items: List[MenuItem]) -> None:
-        """Cache menu items for a restaurant"""
-        try:
-            redis_client = await self._get_redis_client()
-            
-            # Cache full menu items
-            cache_key = await self._get_cache_key(restaurant_id)
-            menu_data = [item.to_dict() for item in menu_items]
-            await redis_client.setex(cache_key, 3600, json.dumps(menu_data))  # 1 hour TTL
-            
-            # Cache available items list
-            available_items = [item.name for item in menu_items if item.is_available]
-            available_key = await self._get_available_items_key(restaurant_id)
-            await redis_client.setex(available_key, 3600, json.dumps(available_items))  # 1 hour TTL
-            
-            # Build search index for faster searching
-            search_index = {}
-            for item in menu_items:
-                # Index by name words
-                name_words = item.name.lower().split()
-                for word in name_words:
-                    if word not in search_index:
-                        search_index[word] = []
-                    search_index[word].append(item.id)
-                
-                # Index by description words if available
-                if item.description:
-                    desc_words = item.description.lower().split()
-                    for word in desc_words:
-                        if word not in search_index:
-                            search_index[word] = []
-                        search_index[word].append(item.id)
-            
-            search_key = await self._get_search_index_key(restaurant_id)
-            await redis_client.setex(search_key, 3600, json.dumps(search_index))  # 1 hour TTL
-            
-            logger.info(f"Cached {len(menu_items)} menu items for restaurant {restaurant_id}")
-            
+
+            items = [item if isinstance(item, CachedMenuItem) else CachedMenuItem.from_model(item) for item in menu_items]
+            item_json = {item.id: json.dumps(item.to_dict(), separators=(",", ":")) for item in items}
+            version = menu_version(item_json)
+            items_key = self._items_key(restaurant_id, version)
+            ttl = settings.MENU_CACHE_TTL_SECONDS
+
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(items_key)
+                if item_json:
+                    pipe.hset(items_key, mapping=item_json)
+                    pipe.expire(items_key, ttl)
+                pipe.set(self._version_key(restaurant_id), version, ex=ttl, get=True)
+                pipe.publish(
+                    settings.MENU_CACHE_INVALIDATION_CHANNEL,
+                    json.dumps({"restaurant_id": restaurant_id, "version": version})
+                )
+                previous_version = (await pipe.execute())[-2]
+
+            if previous_version and previous_version != version:
+                await redis_client.expire(
+                    self._items_key(restaurant_id, previous_version), settings.MENU_CACHE_OLD_VERSION_GRACE_SECONDS
+                )
+
+            current = self.snapshot_cache.peek(restaurant_id)
+            self.snapshot_cache.put(MenuSnapshot.build(restaurant_id, version, items))
+            if current is None or current.version != version:
+                # Menu changed - recompile the in-process search index and public menu on next lookup
+                _menu_changed_locally(restaurant_id)
+
+            logger.info(f"Cached {len(items)} menu items for restaurant {restaurant_id} (version {version})")
+
         except Exception as e:
             logger.error(f"Error caching menu items: {e}")
             raise
-    
+
     async def invalidate_restaurant_cache(self, restaurant_id: int) -> None:
         """Invalidate cache for a specific restaurant"""
+        self.snapshot_cache.drop(restaurant_id)
+        _menu_changed_locally(restaurant_id)
         try:
             redis_client = await self._get_redis_client()
-            
-            # Delete all cache keys for this restaurant
-            cache_key = await self._get_cache_key(restaurant_id)
-            available_key = await self._get_available_items_key(restaurant_id)
-            search_key = await self._get_search_index_key(restaurant_id)
-            
-            await redis_client.delete(cache_key, available_key, search_key)
+
+            # Drop the pointer; the item hash lingers only for readers mid-switch
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.getdel(self._version_key(restaurant_id))
+                pipe.publish(
+                    settings.MENU_CACHE_INVALIDATION_CHANNEL,
+                    json.dumps({"restaurant_id": restaurant_id, "version": None})
+                )
+                version = (await pipe.execute())[0]
+            if version:
+                await redis_client.expire(
+                    self._items_key(restaurant_id, version), settings.MENU_CACHE_OLD_VERSION_GRACE_SECONDS
+                )
             logger.info(f"Invalidated cache for restaurant {restaurant_id}")
-            
+
         except Exception as e:
             logger.error(f"Error invalidating cache for restaurant {restaurant_id}: {e}")
-    
+
     async def invalidate_all_cache(self) -> None:
         """Invalidate all menu cache"""
+        self.snapshot_cache.drop()
+        _menu_changed_locally(None)
         try:
             redis_client = await self._get_redis_client()
-            
-            # Delete all menu-related keys
-            pattern = f"{self.cache_prefix}*"
-            available_pattern = f"{self.available_items_prefix}*"
-            search_pattern = f"{self.search_index_prefix}*"
-            
-            # Get all matching keys and delete them
-            for pattern in [pattern, available_pattern, search_pattern]:
-                keys = await redis_client.keys(pattern)
-                if keys:
-                    await redis_client.delete(*keys)
-            
+
+            # SCAN rather than KEYS so a large keyspace doesn't block Redis
+            keys = [key async for key in redis_client.scan_iter(match=f"{self.cache_prefix}*", count=1000)]
+            for start in range(0, len(keys), 1000):
+                await redis_client.delete(*keys[start:start + 1000])
+            await redis_client.publish(
+                settings.MENU_CACHE_INVALIDATION_CHANNEL, json.dumps({"restaurant_id": None, "version": None})
+            )
             logger.info("Invalidated all menu cache")
-            
+
         except Exception as e:
             logger.error(f"Error invalidating all cache: {e}")
-    
+
+    async def start_invalidation_listener(self) -> None:
+        """Apply other workers' menu writes and invalidations to this process's L1"""
+        await self.snapshot_cache.start_listener(await self._get_redis_client())
+
     async def is_cache_available(self) -> bool:
         """Check if cache is available and working"""
         try:
@@ -206,9 +437,11 @@ class RedisMenuCacheService(MenuCacheInterface):
         except Exception as e:
             logger.error(f"Cache not available: {e}")
             return False
-    
+
     async def close(self) -> None:
         """Close Redis connection"""
         if self.redis_client:
-            await self.redis_client.close()
+            if self.redis_client is RedisMenuCacheService._shared_client:
+                RedisMenuCacheService._shared_client = None
+            await self.redis_client.aclose()
             self.redis_client = None
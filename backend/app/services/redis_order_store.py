@@ -0,0 +1,492 @@
+"""
+Redis order store - atomic order mutations with optimistic versioning
+
+Orders are kept as Redis hashes instead of a single JSON blob:
+
+    order:{id}          HASH  header fields (JSON-encoded values) incl. version and totals
+    order:{id}:items    HASH  order_item_id -> order item JSON
+    order:{id}:lines    HASH  order_item_id -> "quantity|unit_price"
+    order:{id}:seq      LIST  order_item_ids in the order they were added
+
+Every mutation is one server-side Lua script, so add/remove/quantity changes and
+the totals recalculation happen in a single atomic round trip. Each mutation bumps
+the order version; callers that read-modify-write an item pass expected_version and
+get a CONFLICT back instead of silently overwriting a concurrent change.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Header fields maintained by the scripts themselves
+COMPUTED_FIELDS = {"version", "subtotal", "tax_amount", "total_amount", "updated_at"}
+
+# KEYS: header, items, lines, seq
+# ARGV: ttl, expected_version ('' to skip the check), updated_at (JSON), op args...
+_PROLOGUE = """
+local header, items, lines, seq = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local key_type = redis.call('TYPE', header)
+if type(key_type) == 'table' then key_type = key_type['ok'] end
+if key_type == 'string' then return {'LEGACY', redis.call('GET', header)} end
+if key_type ~= 'hash' then return {'NOT_FOUND'} end
+local version = tonumber(redis.call('HGET', header, 'version') or '0')
+if ARGV[2] ~= '' and tonumber(ARGV[2]) ~= version then
+    return {'CONFLICT', tostring(version)}
+end
+local extra = ''
+"""
+
+# Shared by CREATE and UPDATE: header field pairs followed by an optional full item list
+_WRITE_FIELDS = """
+local function write_fields(start)
+    local field_count = tonumber(ARGV[start])
+    local pos = start + 1
+    for _ = 1, field_count do
+        redis.call('HSET', header, ARGV[pos], ARGV[pos + 1])
+        pos = pos + 2
+    end
+    if ARGV[pos] == '1' then
+        redis.call('DEL', items, lines, seq)
+        pos = pos + 1
+        while pos <= #ARGV do
+            redis.call('HSET', items, ARGV[pos], ARGV[pos + 1])
+            redis.call('HSET', lines, ARGV[pos], ARGV[pos + 2] .. '|' .. ARGV[pos + 3])
+            redis.call('RPUSH', seq, ARGV[pos])
+            pos = pos + 4
+        end
+    end
+end
+"""
+
+# Recalculate totals from the line index, bump version, refresh TTL, return the order
+_EPILOGUE = """
+local subtotal = 0
+for _, line in ipairs(redis.call('HVALS', lines)) do
+    local sep = string.find(line, '|', 1, true)
+    subtotal = subtotal + tonumber(string.sub(line, 1, sep - 1)) * tonumber(string.sub(line, sep + 1))
+end
+local total = string.format('%.2f', subtotal)
+redis.call('HSET', header, 'subtotal', total)
+redis.call('HSET', header, 'tax_amount', '0.0')
+redis.call('HSET', header, 'total_amount', total)
+redis.call('HSET', header, 'updated_at', ARGV[3])
+redis.call('HINCRBY', header, 'version', 1)
+for _, key in ipairs(KEYS) do
+    redis.call('EXPIRE', key, tonumber(ARGV[1]))
+end
+return {'OK', redis.call('HGETALL', header), redis.call('HGETALL', items),
+        redis.call('HGETALL', lines), redis.call('LRANGE', seq, 0, -1), extra}
+"""
+
+_ADD = _PROLOGUE + """
+if redis.call('HSET', items, ARGV[4], ARGV[5]) == 1 then
+    redis.call('RPUSH', seq, ARGV[4])
+end
+redis.call('HSET', lines, ARGV[4], ARGV[6] .. '|' .. ARGV[7])
+""" + _EPILOGUE
+
+_REMOVE = _PROLOGUE + """
+local removed = redis.call('HGET', items, ARGV[4])
+if not removed then return {'ITEM_NOT_FOUND'} end
+extra = {removed, redis.call('HGET', lines, ARGV[4]) or ''}
+redis.call('HDEL', items, ARGV[4])
+redis.call('HDEL', lines, ARGV[4])
+redis.call('LREM', seq, 0, ARGV[4])
+""" + _EPILOGUE
+
+_SET_QUANTITY = _PROLOGUE + """
+local line = redis.call('HGET', lines, ARGV[4])
+if not line then return {'ITEM_NOT_FOUND'} end
+local unit_price = string.sub(line, string.find(line, '|', 1, true) + 1)
+redis.call('HSET', lines, ARGV[4], ARGV[5] .. '|' .. unit_price)
+""" + _EPILOGUE
+
+_REPLACE_ITEM = _PROLOGUE + """
+if redis.call('HEXISTS', items, ARGV[4]) == 0 then return {'ITEM_NOT_FOUND'} end
+redis.call('HSET', items, ARGV[4], ARGV[5])
+redis.call('HSET', lines, ARGV[4], ARGV[6] .. '|' .. ARGV[7])
+""" + _EPILOGUE
+
+_CLEAR = _PROLOGUE + """
+extra = tostring(redis.call('HLEN', items))
+redis.call('DEL', items, lines, seq)
+""" + _EPILOGUE
+
+_UPDATE = _PROLOGUE + _WRITE_FIELDS + """
+write_fields(4)
+""" + _EPILOGUE
+
+# CREATE overwrites whatever is there. ARGV[4] optionally pins the legacy JSON blob
+# being migrated, so a concurrent writer is not clobbered by a stale migration.
+_CREATE = """
+local header, items, lines, seq = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+if ARGV[4] ~= '' and redis.call('GET', header) ~= ARGV[4] then
+    return {'CONFLICT', '0'}
+end
+redis.call('DEL', header, items, lines, seq)
+local extra = ''
+""" + _WRITE_FIELDS + """
+write_fields(5)
+""" + _EPILOGUE
+
+_READ = """
+local header, items, lines, seq = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local key_type = redis.call('TYPE', header)
+if type(key_type) == 'table' then key_type = key_type['ok'] end
+if key_type == 'string' then return {'LEGACY', redis.call('GET', header)} end
+if key_type ~= 'hash' then return {'NOT_FOUND'} end
+return {'OK', redis.call('HGETALL', header), redis.call('HGETALL', items),
+        redis.call('HGETALL', lines), redis.call('LRANGE', seq, 0, -1), ''}
+"""
+
+SCRIPTS = {
+    "add": _ADD,
+    "remove": _REMOVE,
+    "set_quantity": _SET_QUANTITY,
+    "replace_item": _REPLACE_ITEM,
+    "clear": _CLEAR,
+    "update": _UPDATE,
+    "create": _CREATE,
+    "read": _READ,
+}
+
+
+@dataclass
+class OrderMutationResult:
+    """Outcome of a single order store operation"""
+    status: str                                 # OK, NOT_FOUND, ITEM_NOT_FOUND, CONFLICT, UNAVAILABLE, ERROR
+    order: Optional[Dict[str, Any]] = None
+    version: int = 0
+    item: Optional[Dict[str, Any]] = None       # Removed item for remove_item
+    item_count: int = 0                         # Cleared item count for clear_items
+    legacy_blob: Optional[str] = None           # Pre-hash JSON order found at the header key
+    error: Optional[str] = None
+
+    @property
+    def is_success(self) -> bool:
+        return self.status == "OK"
+
+    @property
+    def is_conflict(self) -> bool:
+        return self.status == "CONFLICT"
+
+
+class RedisOrderStore:
+    """
+    Order storage on Redis hashes with one Lua script per mutation
+    """
+
+    def __init__(self, redis_service):
+        """
+        Initialize the order store
+
+        Args:
+            redis_service: RedisService owning the connection
+        """
+        self.redis = redis_service
+        self._client = None
+        self._scripts: Dict[str, Any] = {}
+
+    @staticmethod
+    def keys(order_id: str) -> List[str]:
+        """Redis keys holding one order: header, items, lines, seq"""
+        base = f"order:{order_id}"
+        return [base, f"{base}:items", f"{base}:lines", f"{base}:seq"]
+
+    # Public operations
+
+    async def read(self, order_id: str) -> OrderMutationResult:
+        """
+        Read an order in one round trip, migrating a legacy JSON blob if found
+
+        Args:
+            order_id: Order ID
+
+        Returns:
+            OrderMutationResult: status OK with order, or NOT_FOUND
+        """
+        return await self._run("read", order_id)
+
+    async def create(self, order_id: str, order_data: Dict[str, Any], ttl: int = 1800) -> OrderMutationResult:
+        """
+        Create (or overwrite) an order
+
+        Args:
+            order_id: Order ID
+            order_data: Full order data including items
+            ttl: Time to live in seconds (default 30 minutes)
+        """
+        args = [""] + self._encode_fields(order_data, replace_items=True)
+        return await self._run("create", order_id, ttl=ttl, args=args)
+
+    def queue_create(self, pipe, order_id: str, order_data: Dict[str, Any], ttl: int = 1800) -> None:
+        """
+        Queue create() on a caller's MULTI pipeline, so it commits with the caller's other writes
+
+        Writes the same layout the create script does (version 1, totals from the
+        items) as plain commands, which a transaction can hold without a
+        SCRIPT EXISTS round trip.
+
+        Args:
+            pipe: Transactional pipeline from RedisService.pipeline()
+            order_id: Order ID
+            order_data: Full order data including items
+            ttl: Time to live in seconds (default 30 minutes)
+        """
+        header, items, lines, seq = keys = self.keys(order_id)
+        fields = {
+            key: json.dumps(value)
+            for key, value in order_data.items()
+            if key != "items" and key not in COMPUTED_FIELDS
+        }
+        subtotal = 0.0
+        order_items = []
+        for index, item in enumerate(order_data.get("items") or []):
+            item = item if item.get("id") else {**item, "id": f"item_{index}"}
+            item_id, item_json, quantity, unit_price = self._encode_item(item)
+            order_items.append((item_id, item_json, f"{quantity}|{unit_price}"))
+            subtotal += float(quantity) * float(unit_price)
+
+        total = f"{subtotal:.2f}"
+        fields.update(
+            subtotal=total,
+            tax_amount="0.0",
+            total_amount=total,
+            updated_at=json.dumps(datetime.now().isoformat()),
+            version="1",
+        )
+        pipe.delete(*keys)
+        pipe.hset(header, mapping=fields)
+        for item_id, item_json, line in order_items:
+            pipe.hset(items, item_id, item_json)
+            pipe.hset(lines, item_id, line)
+            pipe.rpush(seq, item_id)
+        for key in keys:
+            pipe.expire(key, ttl)
+
+    async def update(
+        self,
+        order_id: str,
+        updates: Dict[str, Any],
+        ttl: int = 1800,
+        expected_version: Optional[int] = None
+    ) -> OrderMutationResult:
+        """
+        Merge header fields into an order; an "items" key replaces the whole item list
+
+        Args:
+            order_id: Order ID
+            updates: Fields to merge into the order
+            ttl: Time to live in seconds (default 30 minutes)
+            expected_version: Fail with CONFLICT if the order has moved past this version
+        """
+        args = self._encode_fields(updates, replace_items="items" in updates)
+        return await self._run("update", order_id, ttl=ttl, expected_version=expected_version, args=args)
+
+    async def add_item(self, order_id: str, item: Dict[str, Any], ttl: int = 1800) -> OrderMutationResult:
+        """
+        Append an item and recalculate totals
+
+        Args:
+            order_id: Order ID
+            item: Order item with id, quantity and unit_price
+            ttl: Time to live in seconds (default 30 minutes)
+        """
+        return await self._run("add", order_id, ttl=ttl, args=self._encode_item(item))
+
+    async def remove_item(self, order_id: str, order_item_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Remove an item and recalculate totals; the removed item is returned in result.item
+        """
+        return await self._run("remove", order_id, ttl=ttl, args=[order_item_id])
+
+    async def set_item_quantity(
+        self,
+        order_id: str,
+        order_item_id: str,
+        quantity: int,
+        ttl: int = 1800
+    ) -> OrderMutationResult:
+        """
+        Set an item's quantity and recalculate totals
+        """
+        return await self._run("set_quantity", order_id, ttl=ttl, args=[order_item_id, self._number(quantity)])
+
+    async def replace_item(
+        self,
+        order_id: str,
+        item: Dict[str, Any],
+        ttl: int = 1800,
+        expected_version: Optional[int] = None
+    ) -> OrderMutationResult:
+        """
+        Replace an existing item in place, guarded by the order version
+
+        Args:
+            order_id: Order ID
+            item: Updated order item (matched by id)
+            ttl: Time to live in seconds (default 30 minutes)
+            expected_version: Version the item was read at
+        """
+        return await self._run(
+            "replace_item", order_id, ttl=ttl, expected_version=expected_version, args=self._encode_item(item)
+        )
+
+    async def clear_items(self, order_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """
+        Remove all items; the number cleared is returned in result.item_count
+        """
+        return await self._run("clear", order_id, ttl=ttl)
+
+    async def delete(self, order_id: str) -> bool:
+        """
+        Delete an order and its item structures
+
+        Returns:
+            bool: True if the order existed
+        """
+        if not self.redis.connected:
+            return False
+        try:
+            return await self.redis.redis_client.delete(*self.keys(order_id)) > 0
+        except Exception as e:
+            logger.error(f"Redis DELETE failed for order {order_id}: {e}")
+            return False
+
+    # Script execution
+
+    def _get_script(self, name: str):
+        """Register scripts against the current client (re-registered after reconnect)"""
+        client = self.redis.redis_client
+        if client is not self._client:
+            self._client = client
+            self._scripts = {key: client.register_script(source) for key, source in SCRIPTS.items()}
+        return self._scripts[name]
+
+    async def _run(
+        self,
+        name: str,
+        order_id: str,
+        ttl: int = 1800,
+        expected_version: Optional[int] = None,
+        args: Optional[List[str]] = None,
+        migrate: bool = True
+    ) -> OrderMutationResult:
+        """Run one script and decode its reply"""
+        if not self.redis.connected or not self.redis.redis_client:
+            return OrderMutationResult(status="UNAVAILABLE")
+
+        argv = [
+            str(ttl),
+            "" if expected_version is None else str(expected_version),
+            json.dumps(datetime.now().isoformat()),
+        ] + (args or [])
+        try:
+            reply = await self._get_script(name)(keys=self.keys(order_id), args=argv)
+        except Exception as e:
+            logger.error(f"Redis order script '{name}' failed for order {order_id}: {e}")
+            return OrderMutationResult(status="ERROR", error=str(e))
+
+        result = self._decode_reply(reply)
+        if result.status == "LEGACY":
+            if not migrate:
+                return OrderMutationResult(status="ERROR", error="Legacy order could not be migrated")
+            # Convert on first touch, then apply the operation to the migrated order
+            await self._migrate(order_id, result.legacy_blob, ttl)
+            return await self._run(
+                name, order_id, ttl=ttl, expected_version=expected_version, args=args, migrate=False
+            )
+        return result
+
+    async def _migrate(self, order_id: str, legacy_blob: str, ttl: int) -> None:
+        """Convert a legacy JSON blob order to the hash layout"""
+        logger.info(f"Migrating legacy JSON order {order_id} to hash layout")
+        order_data = json.loads(legacy_blob)
+        args = [legacy_blob] + self._encode_fields(order_data, replace_items=True)
+        # CONFLICT here means another request migrated or rewrote it first, which is fine
+        await self._run("create", order_id, ttl=ttl, args=args)
+
+    # Encoding
+
+    @staticmethod
+    def _number(value) -> str:
+        return repr(float(value)) if isinstance(value, float) else str(int(value or 0))
+
+    def _encode_item(self, item: Dict[str, Any]) -> List[str]:
+        return [
+            str(item["id"]),
+            json.dumps(item),
+            self._number(item.get("quantity", 0)),
+            self._number(float(item.get("unit_price", 0.0))),
+        ]
+
+    def _encode_fields(self, data: Dict[str, Any], replace_items: bool) -> List[str]:
+        fields = [(key, value) for key, value in data.items() if key != "items" and key not in COMPUTED_FIELDS]
+        args = [str(len(fields))]
+        for key, value in fields:
+            args.extend([key, json.dumps(value)])
+
+        args.append("1" if replace_items else "0")
+        if replace_items:
+            for index, item in enumerate(data.get("items") or []):
+                item = item if item.get("id") else {**item, "id": f"item_{index}"}
+                args.extend(self._encode_item(item))
+        return args
+
+    # Decoding
+
+    @staticmethod
+    def _pairs(flat: List[str]) -> Dict[str, str]:
+        return dict(zip(flat[0::2], flat[1::2]))
+
+    def _decode_reply(self, reply: List[Any]) -> OrderMutationResult:
+        status = reply[0]
+        if status == "CONFLICT":
+            return OrderMutationResult(status=status, version=int(reply[1]))
+        if status == "LEGACY":
+            try:
+                json.loads(reply[1])
+            except json.JSONDecodeError:
+                logger.error("Failed to parse legacy JSON order")
+                return OrderMutationResult(status="NOT_FOUND")
+            return OrderMutationResult(status=status, legacy_blob=reply[1])
+        if status != "OK":
+            return OrderMutationResult(status=status)
+
+        order = self._assemble_order(
+            self._pairs(reply[1]), self._pairs(reply[2]), self._pairs(reply[3]), reply[4]
+        )
+        result = OrderMutationResult(status=status, order=order, version=order["version"])
+        extra = reply[5]
+        if isinstance(extra, list):
+            result.item = self._load_item(extra[0], extra[1])
+        elif extra:
+            result.item_count = int(extra)
+        return result
+
+    def _assemble_order(
+        self,
+        header: Dict[str, str],
+        items: Dict[str, str],
+        lines: Dict[str, str],
+        seq: List[str]
+    ) -> Dict[str, Any]:
+        """Rebuild the order dict callers have always worked with"""
+        order = {key: json.loads(value) for key, value in header.items()}
+        order["version"] = int(order.get("version", 0))
+        order["items"] = [self._load_item(items[item_id], lines.get(item_id)) for item_id in seq if item_id in items]
+        return order
+
+    @staticmethod
+    def _load_item(item_json: str, line: Optional[str]) -> Dict[str, Any]:
+        item = json.loads(item_json)
+        if line:
+            quantity, unit_price = line.split("|", 1)
+            item["quantity"] = float(quantity) if "." in quantity else int(quantity)
+            item["unit_price"] = float(unit_price)
+            item["total_price"] = item["quantity"] * item["unit_price"]
+        return item
@@ -2,11 +2,15 @@
 Generic Redis service for basic operations and queue simulation
 """
 
-import json
 import asyncio
 from typing import Optional, Dict, Any, List
 import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 from ..core.config import settings
+from .redis_order_store import RedisOrderStore
+from .lane_registry import LaneRegistry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,25 +27,23 @@ class RedisService:
         """Initialize Redis connection"""
         self.redis_client = None
         self.connected = False
+        self.orders = RedisOrderStore(self)
+        self.lanes = LaneRegistry(self)
     
     async def is_connected(self) -> bool:
         """
-        Check if Redis is connected and try to reconnect if needed
+        Check if Redis is connected and try to connect if it never was
+        
+        Does not round-trip to Redis: the pool health-checks connections that
+        have been idle for REDIS_HEALTH_CHECK_INTERVAL_SECONDS before reusing
+        them, and commands that hit a dropped connection are retried on a new one.
         
         Returns:
             bool: True if connected, False otherwise
         """
         if not self.connected or not self.redis_client:
             return await self.connect()
-        
-        try:
-            # Test the connection
-            await self.redis_client.ping()
-            return True
-        except Exception:
-            # Connection lost, try to reconnect
-            logger.warning("Redis connection lost, attempting to reconnect")
-            return await self.connect()
+        return True
 
     async def connect(self) -> bool:
         """
@@ -57,8 +59,9 @@ class RedisService:
                 decode_responses=True,
                 socket_timeout=5,
                 socket_connect_timeout=5,
-                retry_on_timeout=True,
-                health_check_interval=30,
+                retry=Retry(ExponentialBackoff(cap=1.0, base=0.05), settings.REDIS_RETRY_ATTEMPTS),
+                retry_on_error=[RedisConnectionError, RedisTimeoutError],
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
                 client_name="ai-drivethru-backend"
             )
             # Test connection
@@ -183,6 +186,90 @@ class RedisService:
             logger.error(f"Redis EXPIRE failed for key {key}: {e}")
             return False
     
+    # Batched operations (one round trip each)
+    def pipeline(self, transaction: bool = True):
+        """
+        Start a pipeline to send several commands in one round trip
+        
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC so they apply atomically
+            
+        Returns:
+            Pipeline: redis-py pipeline; queue commands on it, then await execute()
+            
+        Raises:
+            ConnectionError: If Redis is not connected
+        """
+        if not self.connected or not self.redis_client:
+            raise ConnectionError("Redis not connected")
+        return self.redis_client.pipeline(transaction=transaction)
+    
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Get several keys at once
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            list: Values in key order, None for missing keys (all None if Redis is unavailable)
+        """
+        if not keys:
+            return []
+        if not self.connected:
+            return [None] * len(keys)
+        
+        try:
+            return await self.redis_client.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis MGET failed for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+    
+    async def set_many(self, values: Dict[str, str], ttl: int = 1800) -> bool:
+        """
+        Set several key-value pairs with the same TTL, atomically
+        
+        Args:
+            values: key -> value
+            ttl: Time to live in seconds (default 30 minutes)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not values:
+            return True
+        if not self.connected:
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            for key, value in values.items():
+                pipe.setex(key, ttl, value)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis SET failed for {len(values)} keys: {e}")
+            return False
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several keys at once
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            int: Number of keys that existed and were deleted
+        """
+        if not keys or not self.connected:
+            return 0
+        
+        try:
+            return await self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Redis DELETE failed for {len(keys)} keys: {e}")
+            return 0
+    
     # Queue simulation operations
     async def get_current_order(self, lane_id: str) -> Optional[str]:
         """
@@ -225,7 +312,7 @@ class RedisService:
         key = f"lane:{lane_id}:current_order"
         return await self.delete(key)
     
-    # Order-specific operations
+    # Order-specific operations (hash layout, see RedisOrderStore)
     async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
         """
         Get order data from Redis
@@ -236,19 +323,12 @@ class RedisService:
         Returns:
             dict: Order data if exists, None otherwise
         """
-        key = f"order:{order_id}"
-        value = await self.get(key)
-        if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse JSON for order {order_id}")
-                return None
-        return None
+        result = await self.orders.read(order_id)
+        return result.order if result.is_success else None
     
     async def set_order(self, order_id: str, order_data: Dict[str, Any], ttl: int = 1800) -> bool:
         """
-        Set order data in Redis
+        Set order data in Redis, replacing any existing order
         
         Args:
             order_id: Order ID
@@ -258,13 +338,8 @@ class RedisService:
         Returns:
             bool: True if successful, False otherwise
         """
-        key = f"order:{order_id}"
-        try:
-            value = json.dumps(order_data)
-            return await self.set(key, value, ttl)
-        except json.JSONEncodeError as e:
-            logger.error(f"Failed to encode order {order_id}: {e}")
-            return False
+        result = await self.orders.create(order_id, order_data, ttl)
+        return result.is_success
     
     async def delete_order(self, order_id: str) -> bool:
         """
@@ -276,8 +351,7 @@ class RedisService:
         Returns:
             bool: True if successful, False otherwise
         """
-        key = f"order:{order_id}"
-        return await self.delete(key)
+        return await self.orders.delete(order_id)
     
     # Utility methods
     async def get_all_lanes(self) -> List[str]:
@@ -300,7 +374,7 @@ class RedisService:
     
     async def ensure_connection(self) -> bool:
         """
-        Ensure Redis connection is available (lazy reconnect)
+        Ensure Redis connection is available (lazy reconnect, no PING, see is_connected)
         
         Returns:
             bool: True if connected, False otherwise
@@ -308,15 +382,7 @@ class RedisService:
         if not self.connected or not self.redis_client:
             logger.warning("Redis not connected, attempting to reconnect")
             return await self.connect()
-        
-        try:
-            await self.redis_client.ping()
-            return True
-        except Exception as e:
-            logger.warning(f"Redis ping failed: {e}, attempting reconnect")
-            self.connected = False
-            self.redis_client = None
-            return await self.connect()
+        return True
     
     async def disconnect(self):
         """Disconnect from Redis"""
@@ -0,0 +1,331 @@
+"""
+Response audio composer - builds templated responses from pre-rendered fragments
+
+Most dynamic responses are templates ("Added 2x Big Burger to order. Would
+you like anything else?"). Instead of synthesizing every combination, the
+fixed phrases, quantities and each restaurant's menu item names are rendered
+once and spliced on MP3 frame boundaries at response time. Text that isn't
+fully covered by fragments returns None so the caller falls back to TTS.
+
+Fragments live in storage, keyed by their normalized words:
+- audio/fragments/{voice}/{slug}.mp3 for phrases shared by every restaurant
+- restaurants/{id}/audio/fragments/{voice}/{slug}.mp3 for menu item names
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+from ..core.config import settings
+from ..constants.audio_phrases import AudioPhraseConstants
+from .mp3_frames import splice, Mp3FormatError
+
+logger = logging.getLogger(__name__)
+
+# Fixed parts of the response templates in OrderService and ResponseAggregatorService
+FIXED_FRAGMENTS = (
+    "Your order has been updated.",
+    "Would you like anything else?",
+    "Added",
+    "I've added",
+    "to order",
+    "to your order",
+    "Removed",
+    "from your order",
+    "Sorry, we don't have",
+    "and",
+)
+
+_NUMBER_WORDS = (
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen",
+    "nineteen", "twenty"
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_QUANTITY = re.compile(r"^(\d+)x?$")
+
+
+def normalize(text: str) -> List[str]:
+    """
+    Split text into the words fragments are matched on
+
+    Lowercases, drops punctuation and apostrophes, and spells out quantities
+    ("2x" and "2" both become "two") so templates and fragments line up.
+    """
+    words = []
+    for word in _WORD.findall(text.lower().replace("'", "").replace("’", "")):
+        quantity = _QUANTITY.match(word)
+        if quantity and int(quantity.group(1)) < len(_NUMBER_WORDS):
+            word = _NUMBER_WORDS[int(quantity.group(1))]
+        words.append(word)
+    return words
+
+
+def slug(text: str) -> str:
+    """Storage-safe fragment name for a piece of text"""
+    return "_".join(normalize(text))
+
+
+class ResponseAudioComposer:
+    """
+    Splices response audio from pre-rendered fragments
+    """
+
+    def __init__(self, text_to_speech_service, file_storage_service, cache_size: Optional[int] = None):
+        """
+        Initialize the composer
+
+        Args:
+            text_to_speech_service: TTS used to pre-render fragments
+            file_storage_service: Storage the fragments live in
+            cache_size: Max fragment clips kept in memory (defaults to FRAGMENT_CACHE_SIZE)
+        """
+        self.text_to_speech_service = text_to_speech_service
+        self.file_storage_service = file_storage_service
+        self.cache_size = settings.FRAGMENT_CACHE_SIZE if cache_size is None else cache_size
+        # (scope, voice) -> ({slug: storage key}, loaded_at); scope is None for shared fragments
+        self._vocabularies: Dict[Tuple[Any, str], tuple] = {}
+        self._loading: Dict[Tuple[Any, str], asyncio.Task] = {}
+        # storage key -> clip bytes
+        self._clips: "OrderedDict[str, bytes]" = OrderedDict()
+        self._stats = {"composed": 0, "fallbacks": 0, "clip_hits": 0, "clip_reads": 0, "splice_errors": 0}
+
+    @staticmethod
+    def fragment_path(fragment_slug: str, voice: str, restaurant_id: Optional[int] = None) -> str:
+        """Storage key for a fragment (shared when restaurant_id is None)"""
+        if restaurant_id is None:
+            return f"audio/fragments/{voice}/{fragment_slug}.mp3"
+        return f"restaurants/{restaurant_id}/audio/fragments/{voice}/{fragment_slug}.mp3"
+
+    @staticmethod
+    def _scope(restaurant_id) -> Any:
+        # Callers pass restaurant IDs as int or str; share one vocabulary for both
+        if restaurant_id is None:
+            return None
+        try:
+            return int(restaurant_id)
+        except (TypeError, ValueError):
+            return restaurant_id
+
+    @staticmethod
+    def shared_fragments() -> List[str]:
+        """Texts of the fragments every restaurant uses: fixed phrases and quantities"""
+        quantities = _NUMBER_WORDS[1:min(settings.MAX_QUANTITY_PER_ITEM, len(_NUMBER_WORDS) - 1) + 1]
+        return list(FIXED_FRAGMENTS) + list(quantities)
+
+    # ===== VOCABULARY =====
+
+    async def _vocabulary(self, scope, voice: str) -> Dict[str, str]:
+        key = (scope, voice)
+        entry = self._vocabularies.get(key)
+        if entry is not None and time.monotonic() - entry[1] < settings.FRAGMENT_TABLE_TTL_SECONDS:
+            return entry[0]
+
+        # Concurrent callers share one listing
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load_vocabulary(scope, voice))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load_vocabulary(self, scope, voice: str) -> Dict[str, str]:
+        prefix = self.fragment_path("", voice, scope)[:-len(".mp3")]
+        try:
+            keys = await self.file_storage_service.list_keys(prefix)
+        except Exception as e:
+            logger.warning(f"Failed to list audio fragments under {prefix}: {e}")
+            entry = self._vocabularies.get((scope, voice))
+            return entry[0] if entry else {}
+
+        vocabulary = {
+            key[len(prefix):-len(".mp3")]: key
+            for key in keys
+            if key.endswith(".mp3") and "/" not in key[len(prefix):]
+        }
+        self._vocabularies[(scope, voice)] = (vocabulary, time.monotonic())
+        return vocabulary
+
+    def invalidate(self, restaurant_id: Optional[int] = None) -> None:
+        """
+        Drop fragment listings so they are reloaded (None drops all, including shared)
+        """
+        if restaurant_id is None:
+            self._vocabularies.clear()
+        else:
+            for key in [key for key in self._vocabularies if key[0] == self._scope(restaurant_id)]:
+                del self._vocabularies[key]
+
+    # ===== COMPOSITION =====
+
+    async def plan(self, text: str, restaurant_id: Optional[int], voice: str) -> Optional[List[str]]:
+        """
+        Cover text with fragments, longest match first
+
+        Returns:
+            List[str]: Storage keys of the fragments in order, or None if some words aren't covered
+        """
+        words = normalize(text)
+        if not words:
+            return None
+
+        vocabulary = dict(await self._vocabulary(None, voice))
+        if restaurant_id is not None:
+            vocabulary.update(await self._vocabulary(self._scope(restaurant_id), voice))
+        if not vocabulary:
+            return None
+
+        longest = max(fragment_slug.count("_") + 1 for fragment_slug in vocabulary)
+        keys = []
+        position = 0
+        while position < len(words):
+            for end in range(min(len(words), position + longest), position, -1):
+                key = vocabulary.get("_".join(words[position:end]))
+                if key:
+                    keys.append(key)
+                    position = end
+                    break
+            else:
+                return None
+        return keys
+
+    async def _clip(self, key: str) -> Optional[bytes]:
+        clip = self._clips.get(key)
+        if clip is not None:
+            self._clips.move_to_end(key)
+            self._stats["clip_hits"] += 1
+            return clip
+
+        clip = await self.file_storage_service.read_file(key)
+        self._stats["clip_reads"] += 1
+        if clip is not None and self.cache_size > 0:
+            self._clips[key] = clip
+            while len(self._clips) > self.cache_size:
+                self._clips.popitem(last=False)
+        return clip
+
+    async def compose(self, text: str, restaurant_id: Optional[int], voice: str) -> Optional[bytes]:
+        """
+        Build the audio for text from fragments
+
+        Args:
+            text: Response text
+            restaurant_id: Restaurant whose menu item fragments may be used
+            voice: TTS voice the fragments were rendered with
+
+        Returns:
+            bytes: One MP3 for the whole text, or None to fall back to TTS
+        """
+        if not settings.FRAGMENT_SPLICING_ENABLED:
+            return None
+
+        try:
+            keys = await self.plan(text, restaurant_id, voice)
+            if not keys:
+                self._stats["fallbacks"] += 1
+                return None
+
+            clips = await asyncio.gather(*(self._clip(key) for key in keys))
+            if any(clip is None for clip in clips):
+                # A fragment was deleted since the listing; reload next time
+                self.invalidate(restaurant_id)
+                self._stats["fallbacks"] += 1
+                return None
+
+            audio = splice(list(clips))
+            self._stats["composed"] += 1
+            return audio
+        except Mp3FormatError as e:
+            self._stats["splice_errors"] += 1
+            logger.warning(f"Could not splice fragments for '{text[:50]}': {e}")
+            return None
+        except Exception as e:
+            self._stats["fallbacks"] += 1
+            logger.warning(f"Fragment composition failed for '{text[:50]}': {e}")
+            return None
+
+    # ===== PRE-RENDERING =====
+
+    async def prerender(
+        self,
+        restaurant_id: Optional[int],
+        menu_item_names: Iterable[str] = (),
+        voice: str = None,
+        tts_slots: Optional[asyncio.Semaphore] = None,
+        include_shared: bool = True
+    ) -> Dict[str, int]:
+        """
+        Render the fragments a restaurant needs that aren't in storage yet
+
+        Shared fragments (fixed phrases, quantities) are rendered once for all
+        restaurants; menu item names are rendered per restaurant.
+
+        Args:
+            restaurant_id: Restaurant whose menu items to render (None renders shared fragments only)
+            menu_item_names: Menu item names
+            voice: TTS voice (defaults to the standard canned voice)
+            tts_slots: Semaphore bounding TTS requests (defaults to CANNED_AUDIO_TTS_CONCURRENCY slots)
+            include_shared: Also render missing shared fragments
+
+        Returns:
+            Dict[str, int]: rendered, skipped and failed fragment counts
+        """
+        voice = voice or AudioPhraseConstants.STANDARD_VOICE
+        restaurant_id = self._scope(restaurant_id)
+        slots = tts_slots or asyncio.Semaphore(max(1, settings.CANNED_AUDIO_TTS_CONCURRENCY))
+        wanted: Dict[Tuple[Any, str], str] = {}
+        for text in self.shared_fragments() if include_shared else ():
+            wanted.setdefault((None, slug(text)), text)
+        if restaurant_id is not None:
+            for name in menu_item_names:
+                if slug(name):
+                    wanted.setdefault((restaurant_id, slug(name)), name)
+
+        # List afresh so fragments rendered by other instances aren't redone
+        scopes = {scope for scope, _ in wanted}
+        existing = {}
+        for scope in scopes:
+            self._vocabularies.pop((scope, voice), None)
+            existing[scope] = await self._vocabulary(scope, voice)
+        missing = {key: text for key, text in wanted.items() if key[1] not in existing[key[0]]}
+
+        async def render(scope, fragment_slug: str, text: str):
+            async with slots:
+                audio_chunks = [chunk async for chunk in self.text_to_speech_service.generate_audio_stream(text, voice=voice)]
+            if not audio_chunks:
+                raise RuntimeError("TTS returned no audio")
+            result = await self.file_storage_service.store_file(
+                file_data=b"".join(audio_chunks),
+                file_name=self.fragment_path(fragment_slug, voice, scope),
+                content_type="audio/mpeg"
+            )
+            if not result.is_success:
+                raise RuntimeError(result.message)
+
+        outcomes = await asyncio.gather(
+            *(render(scope, fragment_slug, text) for (scope, fragment_slug), text in missing.items()),
+            return_exceptions=True
+        )
+        failed = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+        for error in failed[:5]:
+            logger.warning(f"Failed to render audio fragment: {error}")
+
+        # Pick up the new fragments on the next plan()
+        for scope in scopes:
+            self._vocabularies.pop((scope, voice), None)
+        stats = {"rendered": len(missing) - len(failed), "skipped": len(wanted) - len(missing), "failed": len(failed)}
+        logger.info(f"Audio fragments for restaurant {restaurant_id}: {stats}")
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get composer counters
+
+        Returns:
+            Dict[str, Any]: Composed/fallback counts, clip cache hits/reads and cache size
+        """
+        return {**self._stats, "cached_clips": len(self._clips)}
@@ -0,0 +1,116 @@
+"""
+Speech segmenter - splits a live PCM stream into utterance segments at pauses
+
+Used by streaming audio ingestion: each segment is transcribed as soon as the
+customer pauses, so most of the transcript is ready by the time they stop
+talking. Segmentation is energy based (RMS per 20 ms frame), which is enough
+to find the gaps between phrases on a drive-thru speaker post.
+"""
+
+import io
+import wave
+from typing import List, Optional
+
+import numpy as np
+
+from ..core.config import settings
+
+FRAME_MS = 20
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Wrap 16-bit PCM in a WAV container for the STT provider"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class SpeechSegmenter:
+    """
+    Incremental pause detector for 16-bit little-endian mono PCM
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        silence_threshold: Optional[float] = None,
+        min_silence_ms: Optional[int] = None,
+        max_segment_ms: Optional[int] = None
+    ):
+        """
+        Initialize the segmenter
+
+        Args:
+            sample_rate: Sample rate of the incoming PCM
+            silence_threshold: RMS (0-32767) below which a frame counts as silence
+            min_silence_ms: Pause length that closes a segment
+            max_segment_ms: Force a cut after this much audio even without a pause
+        """
+        self.sample_rate = sample_rate
+        self.silence_threshold = silence_threshold or settings.STREAM_SILENCE_RMS_THRESHOLD
+        self.frame_bytes = sample_rate * FRAME_MS // 1000 * 2
+        self.min_silence_frames = (min_silence_ms or settings.STREAM_SEGMENT_SILENCE_MS) // FRAME_MS
+        self.max_segment_frames = (max_segment_ms or settings.STREAM_SEGMENT_MAX_MS) // FRAME_MS
+
+        self._pending = bytearray()  # bytes not yet making up a whole frame
+        self._segment = bytearray()
+        self._segment_frames = 0
+        self._speech_frames = 0
+        self._trailing_silence = 0
+
+    def _is_speech(self, frame: bytes) -> bool:
+        samples = np.frombuffer(frame, dtype="<i2").astype(np.float32)
+        return float(np.sqrt(np.mean(samples * samples))) >= self.silence_threshold
+
+    def _cut(self) -> Optional[bytes]:
+        segment = bytes(self._segment) if self._speech_frames else None
+        self._segment.clear()
+        self._segment_frames = self._speech_frames = self._trailing_silence = 0
+        return segment
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Add audio and return any segments completed by it
+
+        Args:
+            chunk: PCM bytes (any length)
+
+        Returns:
+            List[bytes]: Completed segments containing speech, in order
+        """
+        self._pending.extend(chunk)
+        segments = []
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[:self.frame_bytes])
+            del self._pending[:self.frame_bytes]
+
+            if self._is_speech(frame):
+                self._speech_frames += 1
+                self._trailing_silence = 0
+            elif not self._speech_frames:
+                # Silence before anyone speaks isn't worth sending to STT
+                continue
+            else:
+                self._trailing_silence += 1
+
+            self._segment.extend(frame)
+            self._segment_frames += 1
+
+            if (self._trailing_silence >= self.min_silence_frames
+                    or self._segment_frames >= self.max_segment_frames):
+                segment = self._cut()
+                if segment:
+                    segments.append(segment)
+        return segments
+
+    def flush(self) -> Optional[bytes]:
+        """
+        End of speech: return the last segment, if it contains speech
+        """
+        self._segment.extend(self._pending)
+        self._pending.clear()
+        return self._cut()
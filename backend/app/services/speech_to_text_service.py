@@ -4,24 +4,68 @@ Speech-to-Text service for processing audio input
 
 import openai
 import asyncio
-import io
+import logging
 import os
 from typing import Optional, Dict, Any
 from ..dto.order_result import OrderResult
 from ..models.language import Language
 from ..agents.prompts.drive_thru_context import get_drive_thru_context, get_restaurant_context
+from ..core.config import settings
+from .stt_provider import STTProvider, OpenAISTTProvider
+
+logger = logging.getLogger(__name__)
 
 
 class SpeechToTextService:
     """
     Service for converting audio to text using OpenAI Whisper with multi-language support
+    
+    Transcription runs through an async STTProvider so the event loop is never
+    blocked. Each provider call is bounded by a timeout and a process-wide
+    concurrency limit; cancelling the calling task cancels the in-flight call.
     """
     
-    def __init__(self):
-        """Initialize speech service with OpenAI API key"""
-        self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(
+        self,
+        provider: Optional[STTProvider] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize speech service
+        
+        Args:
+            provider: STT provider to use (defaults to OpenAI Whisper)
+            timeout: Per-call timeout in seconds (defaults to STT_TIMEOUT_SECONDS)
+            max_concurrency: Max concurrent provider calls (defaults to STT_MAX_CONCURRENCY)
+        """
+        self.provider = provider or OpenAISTTProvider(
+            api_key=settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
+        )
+        self.timeout = timeout if timeout is not None else settings.STT_TIMEOUT_SECONDS
+        self.max_concurrency = max_concurrency or settings.STT_MAX_CONCURRENCY
         self.max_retries = 3
         self.retry_delay = 1.0  # seconds
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._in_flight = 0
+        self._stats = {"calls": 0, "timeouts": 0, "retries": 0, "failures": 0}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get transcription counters
+        
+        Returns:
+            Dict[str, Any]: Call, timeout, retry and failure counts plus current in-flight calls
+        """
+        return {
+            **self._stats,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency
+        }
+    
+    async def close(self) -> None:
+        """Release provider resources (HTTP connection pools)"""
+        await self.provider.close()
     
     async def transcribe_audio(
         self, 
@@ -33,7 +77,7 @@ class SpeechToTextService:
         Convert audio data to text using OpenAI Whisper with language support
         
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Raw audio bytes (or a memoryview over them)
             audio_format: Audio format (webm, mp3, wav, etc.)
             language: Language for transcription (defaults to English)
             
@@ -45,17 +89,13 @@ class SpeechToTextService:
             if language is None:
                 language = Language.get_default()
             
-            # Create a temporary file-like object for the audio
-            import io
-            audio_file = io.BytesIO(audio_data)
-            audio_file.name = f"audio.{audio_format}"
-            
             # Create context prompt for better accuracy in drive-thru environment
             context_prompt = get_drive_thru_context()
             
             # Transcribe using OpenAI Whisper with retry logic
             transcript = await self._transcribe_with_retry(
-                audio_file=audio_file,
+                audio_data=audio_data,
+                file_name=f"audio.{audio_format}",
                 language=language,
                 context_prompt=context_prompt
             )
@@ -91,7 +131,7 @@ class SpeechToTextService:
         Transcribe audio with restaurant context for better accuracy
         
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Raw audio bytes (or a memoryview over them)
             context: Restaurant context (menu items, common phrases)
             language: Language for transcription (defaults to English)
             
@@ -110,14 +150,10 @@ class SpeechToTextService:
             # Create enhanced context prompt with restaurant-specific info
             context_prompt = get_restaurant_context(restaurant_name, menu_items)
             
-            # Create a temporary file-like object
-            import io
-            audio_file = io.BytesIO(audio_data)
-            audio_file.name = f"audio.{language.value}"
-            
             # Transcribe with context and retry logic
             transcript = await self._transcribe_with_retry(
-                audio_file=audio_file,
+                audio_data=audio_data,
+                file_name=f"audio.{language.value}",
                 language=language,
                 context_prompt=context_prompt
             )
@@ -146,59 +182,79 @@ class SpeechToTextService:
     
     async def _transcribe_with_retry(
         self, 
-        audio_file: io.BytesIO, 
+        audio_data: bytes, 
+        file_name: str,
         language: Language, 
         context_prompt: str
     ) -> str:
         """
         Transcribe audio with retry logic for transient errors
+        
+        Each attempt holds a concurrency slot and is bounded by the per-call
+        timeout. Retry back-off is spent outside the slot so a waiting retry
+        doesn't starve other lanes. CancelledError is never swallowed.
         """
         last_exception = None
         
         for attempt in range(self.max_retries):
             try:
-                # Reset file pointer for each attempt
-                audio_file.seek(0)
-                
-                # Transcribe using OpenAI Whisper
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text",
-                    language=language.whisper_language_code,
-                    prompt=context_prompt
-                )
+                return await self._transcribe_once(audio_data, file_name, language, context_prompt)
                 
-                return transcript
+            except (openai.APITimeoutError, asyncio.TimeoutError) as e:
+                # Timeout - retry with delay (checked first: APITimeoutError is an APIConnectionError)
+                last_exception = e
+                self._stats["timeouts"] += 1
+                if attempt < self.max_retries - 1:
+                    await self._backoff(attempt, e)
+                    continue
                 
             except openai.APIConnectionError as e:
                 # API unreachable - don't retry
-                raise OrderResult.error(f"OpenAI API is unreachable: {str(e)}")
+                self._stats["failures"] += 1
+                raise Exception(f"OpenAI API is unreachable: {str(e)}")
                 
-            except openai.RateLimitError as e:
-                # Rate limit - retry with delay
+            except (openai.RateLimitError, openai.APIError) as e:
+                # Rate limit or other API errors - retry with delay
                 last_exception = e
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                    
-            except openai.APITimeoutError as e:
-                # Timeout - retry with delay
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                    
-            except openai.APIError as e:
-                # Other API errors - retry with delay
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                    await self._backoff(attempt, e)
                     continue
                     
             except Exception as e:
                 # Unexpected errors - don't retry
-                raise OrderResult.error(f"Unexpected error during transcription: {str(e)}")
+                self._stats["failures"] += 1
+                raise Exception(f"Unexpected error during transcription: {str(e)}")
         
         # If we get here, all retries failed
-        raise OrderResult.error(f"Transcription failed after {self.max_retries} attempts: {str(last_exception)}")
+        self._stats["failures"] += 1
+        raise Exception(f"Transcription failed after {self.max_retries} attempts: {str(last_exception) or type(last_exception).__name__}")
+    
+    async def _backoff(self, attempt: int, error: Exception) -> None:
+        """Sleep before the next retry attempt"""
+        self._stats["retries"] += 1
+        logger.warning(f"Transcription attempt {attempt + 1} failed ({type(error).__name__}), retrying")
+        await asyncio.sleep(self.retry_delay * (attempt + 1))
+    
+    async def _transcribe_once(
+        self,
+        audio_data: bytes,
+        file_name: str,
+        language: Language,
+        context_prompt: str
+    ) -> str:
+        """Run a single provider call under the concurrency limit and timeout"""
+        async with self._semaphore:
+            self._in_flight += 1
+            self._stats["calls"] += 1
+            try:
+                return await asyncio.wait_for(
+                    self.provider.transcribe(
+                        audio_data=audio_data,
+                        file_name=file_name,
+                        language_code=language.whisper_language_code,
+                        prompt=context_prompt
+                    ),
+                    timeout=self.timeout
+                )
+            finally:
+                self._in_flight -= 1
@@ -0,0 +1,140 @@
+"""
+STT Provider interface and implementations
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+import asyncio
+import io
+
+from .audio_buffer import as_bytes
+
+
+class STTProvider(ABC):
+    """
+    Abstract base class for Speech-to-Text providers
+    """
+
+    @abstractmethod
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        file_name: str,
+        language_code: str,
+        prompt: Optional[str] = None
+    ) -> str:
+        """
+        Transcribe audio to text
+
+        Args:
+            audio_data: Raw audio bytes (or a memoryview over them)
+            file_name: File name hint for the audio container (e.g. audio.webm)
+            language_code: ISO language code for transcription
+            prompt: Optional context prompt to bias recognition
+
+        Returns:
+            str: Transcribed text
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release any resources held by the provider"""
+        return None
+
+
+class OpenAISTTProvider(STTProvider):
+    """
+    OpenAI Whisper implementation using the async client
+
+    The async client keeps its HTTP connection pool between calls and never
+    blocks the event loop while waiting on the Whisper round trip.
+    """
+
+    def __init__(self, api_key: str, model: str = "whisper-1"):
+        self.api_key = api_key
+        self.model = model
+        self.client = None
+
+    async def _get_client(self):
+        """Lazy initialization of OpenAI client"""
+        if self.client is None:
+            import openai
+            # Retries are handled by SpeechToTextService so they respect its timeout budget
+            self.client = openai.AsyncOpenAI(api_key=self.api_key, max_retries=0)
+        return self.client
+
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        file_name: str,
+        language_code: str,
+        prompt: Optional[str] = None
+    ) -> str:
+        """
+        Transcribe audio using OpenAI Whisper
+
+        Args:
+            audio_data: Raw audio bytes (or a memoryview over them)
+            file_name: File name hint for the audio container
+            language_code: ISO language code for transcription
+            prompt: Optional context prompt to bias recognition
+
+        Returns:
+            str: Transcribed text
+        """
+        client = await self._get_client()
+
+        # BytesIO shares a bytes object but would copy a memoryview of the upload
+        audio_file = io.BytesIO(as_bytes(audio_data))
+        audio_file.name = file_name
+
+        return await client.audio.transcriptions.create(
+            model=self.model,
+            file=audio_file,
+            response_format="text",
+            language=language_code,
+            prompt=prompt
+        )
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+
+class MockSTTProvider(STTProvider):
+    """
+    Local stand-in STT provider for testing and load tests
+
+    Simulates provider latency with a non-blocking sleep so concurrent
+    lanes can be exercised without network access.
+    """
+
+    def __init__(self, transcript: str = "I'd like a cheeseburger", latency: float = 0.1):
+        self.transcript = transcript
+        self.latency = latency
+        self.calls = 0
+
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        file_name: str,
+        language_code: str,
+        prompt: Optional[str] = None
+    ) -> str:
+        """
+        Mock implementation that returns a fixed transcript
+
+        Args:
+            audio_data: Raw audio bytes (or a memoryview over them)
+            file_name: File name hint for the audio container
+            language_code: ISO language code for transcription
+            prompt: Optional context prompt to bias recognition
+
+        Returns:
+            str: The configured transcript
+        """
+        self.calls += 1
+        await asyncio.sleep(self.latency)  # Simulate provider round trip
+        return self.transcript
@@ -32,8 +32,9 @@ class OpenAITTSProvider(TTSProvider):
     OpenAI TTS implementation
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, chunk_size: int = 4096):
         self.api_key = api_key
+        self.chunk_size = chunk_size
         self.client = None
     
     async def _get_client(self):
@@ -60,24 +61,15 @@ class OpenAITTSProvider(TTSProvider):
         try:
             client = await self._get_client()
             
-            # Generate audio using OpenAI TTS
-            response = await client.audio.speech.create(
+            # Stream the synthesized audio, forwarding bytes as they arrive
+            async with client.audio.speech.with_streaming_response.create(
                 model="tts-1",
                 voice=voice,
                 input=text,
                 response_format="mp3"
-            )
-            
-            # Get the complete audio data
-            audio_data = response.content
-            
-            # Yield in chunks to simulate streaming
-            chunk_size = 1024  # 1KB chunks
-            for i in range(0, len(audio_data), chunk_size):
-                chunk = audio_data[i:i + chunk_size]
-                yield chunk
-                # Small delay to simulate streaming
-                await asyncio.sleep(0.01)
+            ) as response:
+                async for chunk in response.iter_bytes(self.chunk_size):
+                    yield chunk
                     
         except Exception as e:
             # For now, just re-raise - we'll add proper error handling later
@@ -87,8 +79,16 @@ class OpenAITTSProvider(TTSProvider):
 class MockTTSProvider(TTSProvider):
     """
     Mock TTS provider for testing
+    
+    Emits chunk_count chunks spaced chunk_delay apart, like a provider that
+    streams audio while it is still synthesizing.
     """
     
+    def __init__(self, chunk_count: int = 10, chunk_delay: float = 0.1, chunk_size: int = 1024):
+        self.chunk_count = chunk_count
+        self.chunk_delay = chunk_delay
+        self.chunk_size = chunk_size
+    
     async def generate_audio_stream(self, text: str, voice: str = "nova") -> AsyncGenerator[bytes, None]:
         """
         Mock implementation that generates fake audio data
@@ -104,9 +104,9 @@ class MockTTSProvider(TTSProvider):
             raise ValueError("Text cannot be empty")
         
         # Generate fake audio data (silence)
-        fake_audio = b'\x00' * 1024  # 1KB of silence
+        fake_audio = b'\x00' * self.chunk_size
         
         # Simulate streaming by yielding chunks
-        for i in range(10):  # 10 chunks of 1KB each
-            await asyncio.sleep(0.1)  # Simulate processing time
+        for i in range(self.chunk_count):
+            await asyncio.sleep(self.chunk_delay)  # Simulate processing time
             yield fake_audio
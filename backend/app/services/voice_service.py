@@ -8,18 +8,44 @@ Consolidates:
 - Unified S3 bucket naming conventions
 """
 
+import asyncio
 import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, List
 from .text_to_speech_service import TextToSpeechService
 from .speech_to_text_service import SpeechToTextService
 from .file_storage_service import FileStorageInterface
 from .redis_service import RedisService
+from .canned_phrase_table import CannedPhraseTable
+from .canned_audio_generator import CannedAudioGenerator
+from .response_audio_composer import ResponseAudioComposer
+from .audio_archive_queue import AudioArchiveQueue
 from ..constants.audio_phrases import AudioPhraseType, AudioPhraseConstants
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Markers closing the queue that tees streamed audio into the storage upload
+_STREAM_END = object()
+_STREAM_ABORTED = object()
+
+
+# KEYS: synthesis lock; ARGV: owner token. Only the owner may release the lock.
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class StreamAborted(Exception):
+    """The streamed audio ended early and must not be cached"""
+
 
 class VoiceService:
     """
@@ -43,6 +69,41 @@ class VoiceService:
         self.speech_to_text_service = speech_to_text_service
         self.file_storage_service = file_storage_service
         self.redis_service = redis_service
+        self.canned_phrases = CannedPhraseTable(file_storage_service)
+        self.fragments = ResponseAudioComposer(text_to_speech_service, file_storage_service)
+        self.canned_audio = CannedAudioGenerator(
+            text_to_speech_service, file_storage_service, self.canned_phrases, redis_service,
+            fragments=self.fragments
+        )
+        self.audio_archive = AudioArchiveQueue(file_storage_service)
+        # Strong references to fire-and-forget work (e.g. caching streamed audio)
+        self._background_tasks = set()
+        # In-process tier in front of the Redis URL cache: redis key -> (url, expires_at)
+        self._url_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # Synthesis in progress in this process, shared by concurrent misses for the same key
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._cache_stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "remote_coalesced": 0,
+            "synthesized": 0,
+            "spliced": 0
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get voice URL cache counters
+        
+        Returns:
+            Dict[str, Any]: Hit/miss/coalesced counts plus current cache and in-flight sizes
+        """
+        return {
+            **self._cache_stats,
+            "memory_size": len(self._url_cache),
+            "in_flight": len(self._in_flight)
+        }
     
     def _generate_cache_key(
         self, 
@@ -95,9 +156,39 @@ class VoiceService:
         else:
             return f"voice:cache:default:{md5_hash}"
     
+    def _memory_get(self, redis_key: str) -> Optional[str]:
+        """Get a URL from the in-process LRU, dropping it if expired"""
+        entry = self._url_cache.get(redis_key)
+        if entry is None:
+            return None
+        url, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._url_cache[redis_key]
+            return None
+        self._url_cache.move_to_end(redis_key)
+        return url
+    
+    def _memory_set(self, redis_key: str, url: str) -> None:
+        """Put a URL in the in-process LRU, evicting the least recently used entries"""
+        self._url_cache[redis_key] = (url, time.monotonic() + settings.VOICE_URL_CACHE_TTL_SECONDS)
+        self._url_cache.move_to_end(redis_key)
+        while len(self._url_cache) > settings.VOICE_URL_CACHE_SIZE:
+            self._url_cache.popitem(last=False)
+    
+    async def _read_redis_voice_url(self, redis_key: str) -> Optional[str]:
+        """Read a URL from the Redis tier"""
+        if not self.redis_service:
+            return None
+        
+        try:
+            return await self.redis_service.get(redis_key)
+        except Exception as e:
+            logger.warning(f"Redis cache lookup failed: {str(e)}")
+            return None
+    
     async def _get_cached_voice_url(self, md5_hash: str, restaurant_id: int = None) -> Optional[str]:
         """
-        Get cached voice URL from Redis.
+        Get cached voice URL, checking the in-process LRU before Redis.
         
         Args:
             md5_hash: MD5 hash of the voice content
@@ -106,38 +197,42 @@ class VoiceService:
         Returns:
             Cached S3 URL or None if not found
         """
-        if not self.redis_service:
-            return None
-            
-        try:
-            cache_key = self._get_redis_cache_key(md5_hash, restaurant_id)
-            cached_url = await self.redis_service.get(cache_key)
-            if cached_url:
-                logger.info(f"Found cached voice URL in Redis: {cached_url}")
-                return cached_url
-        except Exception as e:
-            logger.warning(f"Redis cache lookup failed: {str(e)}")
+        redis_key = self._get_redis_cache_key(md5_hash, restaurant_id)
+        cached_url = self._memory_get(redis_key)
+        if cached_url:
+            self._cache_stats["memory_hits"] += 1
+            return cached_url
         
+        cached_url = await self._read_redis_voice_url(redis_key)
+        if cached_url:
+            logger.info(f"Found cached voice URL in Redis: {cached_url}")
+            self._cache_stats["redis_hits"] += 1
+            self._memory_set(redis_key, cached_url)
+            return cached_url
+        
+        self._cache_stats["misses"] += 1
         return None
     
     async def _cache_voice_url(self, md5_hash: str, s3_url: str, restaurant_id: int = None, ttl: int = 86400) -> bool:
         """
-        Cache voice URL in Redis.
+        Cache voice URL in memory and in Redis.
         
         Args:
             md5_hash: MD5 hash of the voice content
             s3_url: S3 URL to cache
             restaurant_id: Restaurant ID for multitenancy
-            ttl: Time to live in seconds (default: 24 hours)
+            ttl: Redis time to live in seconds (default: 24 hours)
             
         Returns:
-            True if cached successfully, False otherwise
+            True if cached in Redis, False otherwise
         """
+        cache_key = self._get_redis_cache_key(md5_hash, restaurant_id)
+        self._memory_set(cache_key, s3_url)
+        
         if not self.redis_service:
             return False
             
         try:
-            cache_key = self._get_redis_cache_key(md5_hash, restaurant_id)
             await self.redis_service.set(cache_key, s3_url, ttl)
             logger.info(f"Cached voice URL in Redis: {cache_key}")
             return True
@@ -145,6 +240,55 @@ class VoiceService:
             logger.warning(f"Redis cache storage failed: {str(e)}")
             return False
     
+    def _redis_client(self):
+        """Raw Redis client for locking, or None when Redis isn't connected"""
+        if not self.redis_service or not getattr(self.redis_service, "connected", False):
+            return None
+        return getattr(self.redis_service, "redis_client", None)
+    
+    async def _acquire_synthesis_lock(self, redis_key: str, token: str) -> bool:
+        """
+        Claim fleet-wide responsibility for synthesizing a phrase.
+        
+        Returns:
+            True if this process should synthesize (lock taken, or Redis unavailable),
+            False if another process is already synthesizing it
+        """
+        client = self._redis_client()
+        if client is None:
+            return True
+        
+        try:
+            return bool(await client.set(f"{redis_key}:lock", token, nx=True, ex=settings.VOICE_SYNTHESIS_LOCK_SECONDS))
+        except Exception as e:
+            logger.warning(f"Voice synthesis lock failed, synthesizing anyway: {str(e)}")
+            return True
+    
+    async def _release_synthesis_lock(self, redis_key: str, token: str) -> None:
+        client = self._redis_client()
+        if client is None:
+            return
+        
+        try:
+            await client.eval(_RELEASE_LOCK, 1, f"{redis_key}:lock", token)
+        except Exception as e:
+            logger.warning(f"Voice synthesis lock release failed: {str(e)}")
+    
+    async def _wait_for_remote_synthesis(self, redis_key: str) -> Optional[str]:
+        """
+        Wait for another process to publish the URL for a phrase.
+        
+        Returns:
+            URL once it appears in Redis, or None if it doesn't within VOICE_SYNTHESIS_WAIT_SECONDS
+        """
+        deadline = time.monotonic() + settings.VOICE_SYNTHESIS_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.VOICE_SYNTHESIS_POLL_SECONDS)
+            cached_url = await self._read_redis_voice_url(redis_key)
+            if cached_url:
+                return cached_url
+        return None
+    
     def _get_cache_path(self, cache_key: str, restaurant_id: int = None) -> str:
         """
         Generate the S3 path for cached audio.
@@ -196,24 +340,76 @@ class VoiceService:
             cache_key = self._generate_cache_key(text, voice, language, restaurant_id)
             cache_path = self._get_cache_path(cache_key, restaurant_id)
             
-            # Check Redis cache
+            # Check memory, then Redis
             cached_url = await self._get_cached_voice_url(cache_key, restaurant_id)
             if cached_url:
                 return cached_url
             
-            # Generate new audio
-            logger.info(f"Generating new voice audio for: '{text[:50]}...'")
-            audio_chunks = []
-            
-            async for chunk in self.text_to_speech_service.generate_audio_stream(text, voice):
-                audio_chunks.append(chunk)
-            
-            if not audio_chunks:
-                logger.error("No audio chunks generated")
-                return None
+            # Concurrent misses for the same phrase share one synthesis
+            flight_key = self._get_redis_cache_key(cache_key, restaurant_id)
+            task = self._in_flight.get(flight_key)
+            if task is not None:
+                self._cache_stats["coalesced"] += 1
+            else:
+                task = asyncio.create_task(self._synthesize_voice(text, voice, cache_key, cache_path, restaurant_id))
+                self._in_flight[flight_key] = task
+                task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
             
-            # Combine chunks into complete audio
-            audio_data = b''.join(audio_chunks)
+            # Shielded so one caller going away doesn't cancel the others' synthesis
+            return await asyncio.shield(task)
+                
+        except Exception as e:
+            logger.error(f"Voice generation failed: {str(e)}")
+            return None
+    
+    async def _synthesize_voice(
+        self,
+        text: str,
+        voice: str,
+        cache_key: str,
+        cache_path: str,
+        restaurant_id: int = None
+    ) -> Optional[str]:
+        """
+        Synthesize, upload and cache a phrase (run once per key at a time).
+        
+        A Redis lock extends the single-flight across processes: if another
+        instance is already synthesizing the phrase we wait for its URL instead.
+        
+        Returns:
+            URL to the audio file, or None if generation failed
+        """
+        redis_key = self._get_redis_cache_key(cache_key, restaurant_id)
+        token = uuid.uuid4().hex
+        if not await self._acquire_synthesis_lock(redis_key, token):
+            cached_url = await self._wait_for_remote_synthesis(redis_key)
+            if cached_url:
+                self._cache_stats["remote_coalesced"] += 1
+                self._memory_set(redis_key, cached_url)
+                return cached_url
+            logger.warning(f"Timed out waiting for another instance to synthesize {redis_key} - synthesizing here")
+        
+        try:
+            # Templated responses are spliced from pre-rendered fragments when they're fully covered
+            audio_data = await self.fragments.compose(text, restaurant_id, voice)
+            if audio_data is not None:
+                self._cache_stats["spliced"] += 1
+                logger.info(f"Spliced voice audio from fragments for: '{text[:50]}...'")
+            else:
+                # Generate new audio
+                logger.info(f"Generating new voice audio for: '{text[:50]}...'")
+                audio_chunks = []
+                
+                async for chunk in self.text_to_speech_service.generate_audio_stream(text, voice):
+                    audio_chunks.append(chunk)
+                self._cache_stats["synthesized"] += 1
+                
+                if not audio_chunks:
+                    logger.error("No audio chunks generated")
+                    return None
+                
+                # Combine chunks into complete audio
+                audio_data = b''.join(audio_chunks)
             
             # Store in cache
             logger.info(f"Storing voice audio in cache: {cache_path}")
@@ -223,10 +419,10 @@ class VoiceService:
                 content_type="audio/mpeg"
             )
             
-            if store_result.success and store_result.data:
+            if store_result.is_success and store_result.data:
                 audio_url = store_result.data.get('url') or store_result.data.get('s3_url')
                 
-                # Cache the URL in Redis for faster future access
+                # Cache the URL in memory and Redis for faster future access
                 await self._cache_voice_url(cache_key, audio_url, restaurant_id)
                 
                 logger.info(f"Successfully generated and cached voice audio: {audio_url}")
@@ -238,6 +434,158 @@ class VoiceService:
         except Exception as e:
             logger.error(f"Voice generation failed: {str(e)}")
             return None
+        finally:
+            await self._release_synthesis_lock(redis_key, token)
+    
+    # ===== STREAMING TTS =====
+    
+    async def get_cached_voice_url(
+        self,
+        text: str,
+        voice: str = None,
+        language: str = None,
+        restaurant_id: int = None
+    ) -> Optional[str]:
+        """
+        Get the cached audio URL for a text, without generating anything.
+        
+        Returns:
+            Cached S3 URL or None if the text hasn't been synthesized yet
+        """
+        voice = voice or settings.TTS_VOICE or "nova"
+        language = language or settings.TTS_LANGUAGE or "english"
+        cache_key = self._generate_cache_key(text, voice, language, restaurant_id)
+        return await self._get_cached_voice_url(cache_key, restaurant_id)
+    
+    async def stream_voice(
+        self,
+        text: str,
+        voice: str = None,
+        language: str = None,
+        restaurant_id: int = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream synthesized audio as the provider produces it.
+        
+        Each chunk is also teed into a background upload to the TTS cache, so
+        the next request for the same text gets a cached URL. Only streams that
+        finish are cached; if the listener goes away early the upload is aborted.
+        
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use (defaults to TTS_VOICE from config)
+            language: Language to use (defaults to TTS_LANGUAGE from config)
+            restaurant_id: Restaurant ID for multitenancy (optional)
+            
+        Yields:
+            bytes: MP3 audio chunks
+        """
+        voice = voice or settings.TTS_VOICE or "nova"
+        language = language or settings.TTS_LANGUAGE or "english"
+        cache_key = self._generate_cache_key(text, voice, language, restaurant_id)
+        cache_path = self._get_cache_path(cache_key, restaurant_id)
+        
+        # Unbounded so a slow upload never holds back audio to the customer
+        queue: asyncio.Queue = asyncio.Queue()
+        self._spawn(self._cache_streamed_voice(queue, cache_key, cache_path, restaurant_id))
+        
+        finished = False
+        try:
+            async for chunk in self.text_to_speech_service.generate_audio_stream(text, voice):
+                queue.put_nowait(chunk)
+                yield chunk
+            finished = True
+        finally:
+            queue.put_nowait(_STREAM_END if finished else _STREAM_ABORTED)
+    
+    async def _cache_streamed_voice(
+        self,
+        queue: asyncio.Queue,
+        cache_key: str,
+        cache_path: str,
+        restaurant_id: int = None
+    ) -> Optional[str]:
+        """
+        Upload teed stream chunks to the TTS cache and remember the URL.
+        
+        Returns:
+            Cached S3 URL, or None if the stream was aborted or the upload failed
+        """
+        async def chunks():
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), settings.TTS_STREAM_IDLE_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    raise StreamAborted("stream went idle")
+                if item is _STREAM_END:
+                    return
+                if item is _STREAM_ABORTED:
+                    raise StreamAborted("stream ended early")
+                yield item
+        
+        store_result = await self.file_storage_service.store_stream(
+            chunks(),
+            file_name=cache_path,
+            content_type="audio/mpeg"
+        )
+        if not store_result.is_success or not store_result.data:
+            logger.info(f"Streamed voice audio not cached ({cache_path}): {store_result.message}")
+            return None
+        
+        audio_url = store_result.data.get('url') or store_result.data.get('s3_url') or store_result.data.get('file_path')
+        await self._cache_voice_url(cache_key, audio_url, restaurant_id)
+        logger.info(f"Cached streamed voice audio: {audio_url}")
+        return audio_url
+    
+    async def create_voice_stream(
+        self,
+        text: str,
+        voice: str = None,
+        language: str = None,
+        restaurant_id: int = None
+    ) -> Optional[str]:
+        """
+        Register a text for streaming and get the URL that plays it.
+        
+        The request is kept in Redis so whichever worker serves the stream
+        URL can pick it up.
+        
+        Returns:
+            Stream URL, or None if Redis isn't available
+        """
+        if not self.redis_service:
+            return None
+        
+        stream_id = uuid.uuid4().hex
+        request = json.dumps({"text": text, "voice": voice, "language": language, "restaurant_id": restaurant_id})
+        if not await self.redis_service.set(f"voice:stream:{stream_id}", request, settings.TTS_STREAM_TTL_SECONDS):
+            return None
+        return f"{settings.TTS_STREAM_BASE_URL.rstrip('/')}/{stream_id}"
+    
+    async def get_voice_stream_request(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a registered stream.
+        
+        Returns:
+            Dict with text, voice, language and restaurant_id, or None if unknown/expired
+        """
+        if not self.redis_service:
+            return None
+        
+        value = await self.redis_service.get(f"voice:stream:{stream_id}")
+        return json.loads(value) if value else None
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    async def wait_for_background_tasks(self) -> None:
+        """Wait for background work such as stream caching (tests/shutdown)"""
+        if self._background_tasks:
+            await asyncio.gather(*list(self._background_tasks), return_exceptions=True)
     
     async def clear_cache(self, restaurant_id: int = None) -> bool:
         """
@@ -333,6 +681,20 @@ class VoiceService:
             URL to the audio file, or None if failed
         """
         try:
+            if settings.TTS_STREAMING_ENABLED:
+                # Hand back a stream URL right away; synthesis runs when it is played
+                voice = AudioPhraseConstants.STANDARD_VOICE
+                cached_url = await self.get_cached_voice_url(text, voice, "english", restaurant_id)
+                if cached_url:
+                    return cached_url
+                if settings.FRAGMENT_SPLICING_ENABLED and await self.fragments.plan(text, restaurant_id, voice):
+                    # Splicing is a local concatenation - quicker than starting a stream
+                    return await self.generate_voice(text, voice, "english", restaurant_id)
+                stream_url = await self.create_voice_stream(text, voice, "english", restaurant_id)
+                if stream_url:
+                    return stream_url
+                logger.warning("Could not register TTS stream - falling back to generate-then-upload")
+            
             # Use existing generate_voice method
             return await self.generate_voice(
                 text=text,
@@ -364,42 +726,23 @@ class VoiceService:
             URL to the audio file, or None if failed
         """
         try:
-            # Generate cache path for canned phrase
-            cache_path = self._get_canned_phrase_path(phrase_type, restaurant_id)
-            
-            # Check if already cached
-            logger.info(f"Checking cache for canned phrase: {cache_path}")
-            cached_result = await self.file_storage_service.get_file(cache_path)
-            
-            if cached_result.success and cached_result.data:
-                cached_url = (cached_result.data.get('url') or 
-                            cached_result.data.get('s3_url') or 
-                            cached_result.data.get('file_path'))
-                if cached_url:
-                    logger.info(f"Found cached canned phrase: {cached_url}")
-                    return cached_url
-            
-            # If not found in cache, check if file exists in S3
-            logger.info(f"File not found in cache, checking if it exists in S3: {cache_path}")
-            
-            # Check if file exists in S3
-            bucket_name = getattr(self.file_storage_service, 'bucket_name', None)
-            region = getattr(self.file_storage_service, 'region', 'us-east-1')
+            # In-process table: after the restaurant's first lookup this is a dict hit
+            cached_url = await self.canned_phrases.get(phrase_type, restaurant_id)
+            if cached_url:
+                return cached_url
             
-            if bucket_name:
-                try:
-                    # Check if file exists in S3
-                    self.file_storage_service.s3_client.head_object(Bucket=bucket_name, Key=cache_path)
-                    https_url = f"https://{bucket_name}.s3.{region}.amazonaws.com/{cache_path}"
-                    logger.info(f"Found existing S3 file: {https_url}")
-                    return https_url
-                except self.file_storage_service.s3_client.exceptions.NoSuchKey:
-                    logger.info(f"File does not exist in S3: {cache_path} - will generate new file")
-                except Exception as e:
-                    logger.warning(f"Error checking S3 file existence: {e} - will generate new file")
-                    # Continue to generate new file
-            else:
-                logger.warning(f"No bucket name available - will generate new file")
+            # Not in the table - another instance may have generated it since we loaded
+            cache_path = self._get_canned_phrase_path(phrase_type, restaurant_id)
+            logger.info(f"Canned phrase not in table, checking storage: {cache_path}")
+            try:
+                if await self.file_storage_service.file_exists(cache_path):
+                    audio_url = self.file_storage_service.get_url(cache_path)
+                    logger.info(f"Found existing canned phrase: {audio_url}")
+                    self.canned_phrases.record(phrase_type, restaurant_id, audio_url)
+                    return audio_url
+                logger.info(f"File does not exist in storage: {cache_path} - will generate new file")
+            except Exception as e:
+                logger.warning(f"Error checking storage for canned phrase: {e} - will generate new file")
             
             # Generate new canned phrase
             logger.info(f"🔊 GENERATING NEW CANNED PHRASE: {phrase_type.value}")
@@ -432,12 +775,13 @@ class VoiceService:
                 content_type="audio/mpeg"
             )
             
-            if store_result.success and store_result.data:
+            if store_result.is_success and store_result.data:
                 # For local file storage, use file_path; for S3, use url or s3_url
                 audio_url = (store_result.data.get('url') or 
                            store_result.data.get('s3_url') or 
                            store_result.data.get('file_path'))
                 logger.info(f"🔊 ✅ Successfully generated and stored canned phrase: {audio_url}")
+                self.canned_phrases.record(phrase_type, restaurant_id, audio_url)
                 return audio_url
             else:
                 logger.error(f"🔊 ❌ Failed to store canned phrase: {store_result.message}")
@@ -459,12 +803,13 @@ class VoiceService:
             S3 object key path
         """
         # Use the same path structure as the actual S3 files: restaurants/{id}/audio/{filename}
-        return f"restaurants/{restaurant_id}/audio/{phrase_type.value}.mp3"
+        return CannedPhraseTable.path(phrase_type, restaurant_id)
     
     async def generate_all_canned_phrases(
         self, 
         restaurant_id: int, 
-        restaurant_name: str = None
+        restaurant_name: str = None,
+        menu_item_names: Optional[List[str]] = None
     ) -> Dict[str, str]:
         """
         Generate all canned audio phrases for a restaurant.
@@ -472,26 +817,23 @@ class VoiceService:
         Args:
             restaurant_id: Restaurant ID for multitenancy (required)
             restaurant_name: Restaurant name for customization
+            menu_item_names: Menu item names to pre-render as response fragments (optional)
             
         Returns:
             Dictionary mapping phrase types to their audio URLs
         """
-        results = {}
-        
-        for phrase_type in AudioPhraseConstants.get_all_phrase_types():
-            try:
-                url = await self.get_canned_phrase(phrase_type, restaurant_id, restaurant_name)
-                if url:
-                    results[phrase_type.value] = url
-                    logger.info(f"Generated {phrase_type.value} audio: {url}")
-                else:
-                    logger.error(f"Failed to generate {phrase_type.value} audio")
-                    
-            except Exception as e:
-                logger.error(f"Error generating {phrase_type.value} audio: {str(e)}")
+        # Phrases already in storage are kept; the rest are generated concurrently
+        if menu_item_names is not None:
+            await self.canned_audio.render_shared_fragments()
+        outcome = await self.canned_audio.generate_restaurant(
+            restaurant_id, restaurant_name, menu_item_names=menu_item_names
+        )
+        for error in outcome["errors"]:
+            logger.error(f"Failed to generate canned audio: {error}")
         
-        logger.info(f"Generated {len(results)} canned audio files for restaurant {restaurant_id or 'default'}")
-        return results
+        logger.info(f"Generated {outcome['generated']} canned audio files for restaurant {restaurant_id or 'default'} "
+                    f"({outcome['skipped']} already present)")
+        return outcome["urls"]
     
     # ===== SPEECH-TO-TEXT FUNCTIONALITY =====
     
@@ -590,6 +932,38 @@ class VoiceService:
             logger.error(f"Audio storage failed: {str(e)}")
             return None
     
+    async def archive_uploaded_audio(
+        self,
+        audio_data: bytes,
+        filename: str,
+        content_type: str,
+        restaurant_id: int,
+        session_id: str = None
+    ) -> Optional[str]:
+        """
+        Archive a customer recording without waiting for the upload.
+        
+        The recording is spooled to local disk and uploaded by the archive
+        queue's workers (see AudioArchiveQueue), so it never delays a turn.
+        
+        Args:
+            audio_data: Raw audio bytes
+            filename: Original filename
+            content_type: MIME type
+            restaurant_id: Restaurant ID for multitenancy
+            session_id: Session ID for tracking
+            
+        Returns:
+            Archive ID of the spooled recording, or None if it couldn't be spooled
+        """
+        return await self.audio_archive.enqueue(
+            audio_data=audio_data,
+            file_name=filename,
+            content_type=content_type,
+            restaurant_id=restaurant_id,
+            session_id=session_id
+        )
+    
     async def store_transcript(
         self, 
         file_id: str, 
@@ -2,16 +2,23 @@
 Mock services for testing
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import uuid
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from unittest.mock import AsyncMock
 
+from app.dto.order_result import OrderResult
+from app.services.file_storage_service import FileStorageInterface
+from app.services.redis_order_store import OrderMutationResult
+
 
 class MockOrderSessionService:
     """Mock OrderSessionService for testing"""
     
     def __init__(self):
         self.orders: Dict[str, Dict[str, Any]] = {}
-        self.current_session_id: Optional[str] = None
+        self.lane_sessions: Dict[tuple, str] = {}
+        self.session_lanes: Dict[str, Dict[str, Any]] = {}
     
     async def get_order(self, db, order_id: str) -> Optional[Dict[str, Any]]:
         """Mock get order - returns stored order or None"""
@@ -34,23 +41,92 @@ class MockOrderSessionService:
             return True
         return False
     
+    def _mutated(self, order_id: str, **extra) -> OrderMutationResult:
+        """Recalculate totals and bump version like the Redis order scripts"""
+        order = self.orders[order_id]
+        for item in order["items"]:
+            item["total_price"] = item.get("quantity", 0) * item.get("unit_price", 0.0)
+        order["subtotal"] = order["total_amount"] = round(sum(item["total_price"] for item in order["items"]), 2)
+        order["tax_amount"] = 0.0
+        order["version"] = order.get("version", 0) + 1
+        return OrderMutationResult(status="OK", order=order, version=order["version"], **extra)
+    
+    def _find_item(self, order_id: str, order_item_id: str) -> Optional[Dict[str, Any]]:
+        return next((item for item in self.orders[order_id]["items"] if item.get("id") == order_item_id), None)
+    
+    async def add_order_item(self, db, order_id: str, item: Dict[str, Any], ttl: int = 1800) -> OrderMutationResult:
+        """Mock atomic add item"""
+        if order_id not in self.orders:
+            return OrderMutationResult(status="NOT_FOUND")
+        self.orders[order_id].setdefault("items", []).append(item)
+        return self._mutated(order_id)
+    
+    async def remove_order_item(self, db, order_id: str, order_item_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """Mock atomic remove item"""
+        if order_id not in self.orders:
+            return OrderMutationResult(status="NOT_FOUND")
+        item = self._find_item(order_id, order_item_id)
+        if not item:
+            return OrderMutationResult(status="ITEM_NOT_FOUND")
+        self.orders[order_id]["items"].remove(item)
+        return self._mutated(order_id, item=item)
+    
+    async def set_order_item_quantity(self, db, order_id: str, order_item_id: str, quantity: int, ttl: int = 1800) -> OrderMutationResult:
+        """Mock atomic quantity update"""
+        if order_id not in self.orders:
+            return OrderMutationResult(status="NOT_FOUND")
+        item = self._find_item(order_id, order_item_id)
+        if not item:
+            return OrderMutationResult(status="ITEM_NOT_FOUND")
+        item["quantity"] = quantity
+        return self._mutated(order_id)
+    
+    async def replace_order_item(self, db, order_id: str, item: Dict[str, Any], expected_version: Optional[int] = None, ttl: int = 1800) -> OrderMutationResult:
+        """Mock versioned item replace"""
+        if order_id not in self.orders:
+            return OrderMutationResult(status="NOT_FOUND")
+        order = self.orders[order_id]
+        if expected_version is not None and expected_version != order.get("version", 0):
+            return OrderMutationResult(status="CONFLICT", version=order.get("version", 0))
+        current = self._find_item(order_id, item.get("id"))
+        if not current:
+            return OrderMutationResult(status="ITEM_NOT_FOUND")
+        order["items"][order["items"].index(current)] = item
+        return self._mutated(order_id)
+    
+    async def clear_order_items(self, db, order_id: str, ttl: int = 1800) -> OrderMutationResult:
+        """Mock atomic clear"""
+        if order_id not in self.orders:
+            return OrderMutationResult(status="NOT_FOUND")
+        item_count = len(self.orders[order_id].get("items", []))
+        self.orders[order_id]["items"] = []
+        return self._mutated(order_id, item_count=item_count)
+    
     async def is_redis_available(self) -> bool:
         """Mock Redis availability - always returns True for testing"""
         return True
     
-    async def get_current_session_id(self) -> Optional[str]:
-        """Mock get current session ID"""
-        return self.current_session_id
+    async def get_current_session_id(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None) -> Optional[str]:
+        """Mock get current session ID for a lane"""
+        return self.lane_sessions.get((restaurant_id, lane_id))
     
-    async def set_current_session_id(self, session_id: str, ttl: int) -> bool:
-        """Mock set current session ID"""
-        self.current_session_id = session_id
+    async def set_current_session_id(self, session_id: str, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None, ttl: Optional[int] = None) -> bool:
+        """Mock set current session ID for a lane"""
+        self.lane_sessions[(restaurant_id, lane_id)] = session_id
+        self.session_lanes[session_id] = {"restaurant_id": restaurant_id, "lane_id": lane_id}
         return True
     
-    async def clear_current_session_id(self) -> bool:
-        """Mock clear current session ID"""
-        self.current_session_id = None
+    async def clear_current_session_id(self, restaurant_id: Optional[int] = None, lane_id: Optional[str] = None, session_id: Optional[str] = None) -> bool:
+        """Mock clear current session ID for a lane"""
+        current = self.lane_sessions.get((restaurant_id, lane_id))
+        if current is None or (session_id and current != session_id):
+            return False
+        del self.lane_sessions[(restaurant_id, lane_id)]
         return True
+    
+    async def get_session_lane(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Mock lookup of the lane a session is at"""
+        return self.session_lanes.get(session_id)
 
 
 class MockUnitOfWork:
@@ -207,7 +283,7 @@ class MockCustomizationValidationService:
     def __init__(self):
         pass
     
-    async def validate_customizations(self, menu_item_id: int, customizations: list, restaurant_id: int, uow):
+    async def validate_customizations(self, menu_item_id: int, customizations: list, restaurant_id: int, uow, ingredients=None):
         """Mock validate customizations - always returns valid for testing"""
         from app.services.customization_validation_service import ValidationResult
         
@@ -374,6 +450,96 @@ class MockOrderService:
         return f"item_{int(time.time() * 1000)}_{random.randint(1000, 9999)}"
 
 
+class MockFileStorageService(FileStorageInterface):
+    """In-memory FileStorageInterface keyed by file name, recording every storage call"""
+    
+    def __init__(self, objects: Optional[Dict[str, bytes]] = None, upload_delay: float = 0.0, failures: int = 0,
+                 fail_prefix: Optional[str] = None, down: bool = False, url_base: str = "https://bucket.s3.amazonaws.com"):
+        self.objects: Dict[str, bytes] = dict(objects or {})
+        self.upload_delay = upload_delay
+        self.failures = failures  # store_file fails this many times before succeeding
+        self.fail_prefix = fail_prefix  # store_file always fails for names with this prefix
+        self.down = down  # every call raises, like an unreachable bucket
+        self.url_base = url_base
+        self.calls: List[str] = []
+        self.checked: List[str] = []  # keys passed to file_exists
+        self.stored: List[Tuple[str, str, Optional[int], bytes]] = []
+        self.file_keys: Dict[str, str] = {}
+        self.transcripts: Dict[str, Dict[str, Any]] = {}
+    
+    async def _call(self, name: str) -> None:
+        self.calls.append(name)
+        if self.down:
+            raise ConnectionError("S3 unavailable")
+        # Every call yields to the event loop like a network round trip; uploads also take upload_delay
+        await asyncio.sleep(self.upload_delay if name.startswith("store_") else 0)
+    
+    def _stored(self, file_data: bytes, file_name: str, content_type: str, restaurant_id: Optional[int]) -> OrderResult:
+        file_id = str(uuid.uuid4())
+        self.objects[file_name] = file_data
+        self.file_keys[file_id] = file_name
+        self.stored.append((file_name, content_type, restaurant_id, file_data))
+        return OrderResult.success("stored", data={
+            "file_id": file_id,
+            "size": len(file_data),
+            "s3_key": file_name,
+            "s3_url": self.get_url(file_name)
+        })
+    
+    async def store_file(self, file_data: bytes, file_name: str, content_type: str, restaurant_id: int = None, order_id: int = None) -> OrderResult:
+        await self._call("store_file")
+        if self.calls.count("store_file") <= self.failures or (self.fail_prefix and file_name.startswith(self.fail_prefix)):
+            return OrderResult.error("S3 unavailable")
+        return self._stored(file_data, file_name, content_type, restaurant_id)
+    
+    async def store_stream(self, chunks: AsyncIterator[bytes], file_name: str, content_type: str, restaurant_id: int = None, order_id: int = None) -> OrderResult:
+        await self._call("store_stream")
+        file_data = b"".join([chunk async for chunk in chunks])
+        return self._stored(file_data, file_name, content_type, restaurant_id)
+    
+    async def file_exists(self, key: str) -> bool:
+        await self._call("file_exists")
+        self.checked.append(key)
+        return key in self.objects
+    
+    async def list_keys(self, prefix: str) -> List[str]:
+        await self._call("list_keys")
+        return [key for key in self.objects if key.startswith(prefix)]
+    
+    async def read_file(self, key: str) -> Optional[bytes]:
+        await self._call("read_file")
+        return self.objects.get(key)
+    
+    def get_url(self, key: str) -> str:
+        return f"{self.url_base}/{key}"
+    
+    async def get_file(self, file_id: str) -> OrderResult:
+        await self._call("get_file")
+        key = self.file_keys.get(file_id)
+        if key not in self.objects:
+            return OrderResult.error("File not found")
+        return OrderResult.success("retrieved", data={"file_id": file_id, "file_data": self.objects[key], "s3_key": key})
+    
+    async def delete_file(self, file_id: str) -> OrderResult:
+        await self._call("delete_file")
+        key = self.file_keys.pop(file_id, None)
+        if key not in self.objects:
+            return OrderResult.error("File not found")
+        del self.objects[key]
+        return OrderResult.success("deleted")
+    
+    async def store_transcript(self, file_id: str, transcript: str, metadata: Dict[str, Any]) -> OrderResult:
+        await self._call("store_transcript")
+        self.transcripts[file_id] = {"file_id": file_id, "transcript": transcript, "metadata": metadata}
+        return OrderResult.success("stored", data=self.transcripts[file_id])
+    
+    async def get_transcript(self, file_id: str) -> OrderResult:
+        await self._call("get_transcript")
+        if file_id not in self.transcripts:
+            return OrderResult.error("Transcript not found")
+        return OrderResult.success("retrieved", data=self.transcripts[file_id])
+
+
 class MockContainer:
     """Mock container that provides services with mocked dependencies"""
     
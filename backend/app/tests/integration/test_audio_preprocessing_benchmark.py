@@ -0,0 +1,80 @@
+"""
+Payload and STT latency benchmark for audio preprocessing
+Runs on the recordings in tests/test_audio. Decoding them needs ffmpeg (skipped
+without it); the latency comparison also needs OPENAI_API_KEY.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.models.language import Language
+from app.services.audio_preprocessor import AudioPreprocessor
+from app.services.speech_to_text_service import SpeechToTextService
+
+TEST_AUDIO_DIR = Path(__file__).parent.parent / "test_audio"
+RECORDINGS = sorted(TEST_AUDIO_DIR.glob("*.m4a")) + sorted(TEST_AUDIO_DIR.glob("*.webm"))
+RUNS = 3
+
+
+@pytest.fixture
+def preprocessor():
+    preprocessor = AudioPreprocessor()
+    if not preprocessor.ffmpeg:
+        pytest.skip("ffmpeg not installed; compressed recordings can't be decoded")
+    return preprocessor
+
+
+@pytest_asyncio.fixture
+async def stt_service():
+    if not (settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")):
+        pytest.skip("OPENAI_API_KEY not set")
+    service = SpeechToTextService()
+    yield service
+    await service.close()
+
+
+async def timed_transcription(stt_service, data, audio_format):
+    best = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = await stt_service.transcribe_audio(data, audio_format, Language.ENGLISH)
+        elapsed = time.perf_counter() - start
+        assert result.is_success, result.message
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result.data["transcript"]
+
+
+@pytest.mark.parametrize("recording", RECORDINGS, ids=lambda path: path.name)
+class TestAudioPreprocessingBenchmark:
+    """Prepared audio should be a fraction of the upload and transcribe faster"""
+
+    def test_payload_bytes(self, preprocessor, recording):
+        original = recording.read_bytes()
+        start = time.perf_counter()
+        prepared = preprocessor.prepare(original, recording.suffix[1:])
+        elapsed = time.perf_counter() - start
+
+        print(f"\n{recording.name}: {len(original)} -> {len(prepared.data)} bytes "
+              f"({len(prepared.data) / len(original):.0%}), {prepared.duration_seconds:.1f}s of speech, "
+              f"prepared in {elapsed * 1000:.0f} ms")
+        assert prepared.processed and prepared.has_speech
+        assert len(prepared.data) < len(original)
+
+    @pytest.mark.asyncio
+    async def test_stt_latency(self, preprocessor, stt_service, recording):
+        original = recording.read_bytes()
+        prepared = preprocessor.prepare(original, recording.suffix[1:])
+
+        original_latency, original_text = await timed_transcription(stt_service, original, recording.suffix[1:])
+        prepared_latency, prepared_text = await timed_transcription(stt_service, prepared.data, prepared.audio_format)
+
+        print(f"\n{recording.name}: STT {original_latency * 1000:.0f} ms -> {prepared_latency * 1000:.0f} ms (best of {RUNS})")
+        print(f"   original: {original_text!r}")
+        print(f"   prepared: {prepared_text!r}")
+        assert prepared_text.strip()
+        assert prepared_latency < original_latency * 1.1
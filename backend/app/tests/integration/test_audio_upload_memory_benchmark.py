@@ -0,0 +1,123 @@
+"""
+Memory benchmark for one upload turn: peak allocation with tracemalloc
+Compares the old handling (validation read, seek, second read, hex log,
+copies for spooling and STT) with the single shared buffer in AudioPipelineService
+"""
+
+import io
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.dto.order_result import OrderResult
+from app.services import audio_pipeline_service as pipeline_module
+from app.services.audio_buffer import as_bytes
+from app.services.audio_pipeline_service import AudioPipelineService
+
+RECORDING = b"\x1aE\xdf\xa3" + bytes(8 * 1024 * 1024)  # 8 MB, near the 10 MB upload limit
+MB = 1024 * 1024
+
+
+class CountingUpload(UploadFile):
+    reads = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads += 1
+        return await super().read(size)
+
+
+def upload():
+    # Starlette spools multipart uploads over 1 MB to disk, so every read allocates
+    spooled = tempfile.SpooledTemporaryFile(max_size=MB)
+    spooled.write(RECORDING)
+    spooled.seek(0)
+    return CountingUpload(spooled, filename="turn.webm", headers=Headers({"content-type": "audio/webm"}))
+
+
+class SpoolingVoiceService:
+    """Spools to disk and builds an STT request body the way the real services do, minus the network"""
+
+    def __init__(self):
+        self.canned_phrases = SimpleNamespace(load=AsyncMock(return_value={}))
+        self.get_canned_phrase = AsyncMock(return_value="https://cdn/come_again.mp3")
+
+    async def archive_uploaded_audio(self, audio_data, filename, content_type, restaurant_id, session_id=None):
+        with tempfile.TemporaryFile() as spool:
+            spool.write(audio_data)
+        return "archive-1"
+
+    async def transcribe_audio(self, audio_data, audio_format="webm", language="english"):
+        request_body = io.BytesIO(as_bytes(audio_data))
+        request_body.read()
+        return "a burger please"
+
+
+async def legacy_turn(audio_file, voice_service):
+    """The previous handling of one upload, step by step"""
+    content = await audio_file.read()                      # validation read
+    assert len(content) > 0
+    await audio_file.seek(0)
+    audio_data = await audio_file.read()                   # second read for the pipeline
+    preview = audio_data[:20].hex()                        # debug preview of the header
+    await voice_service.archive_uploaded_audio(bytes(audio_data), audio_file.filename, audio_file.content_type, 1)
+    request_body = io.BytesIO(bytes(memoryview(audio_data)))  # provider copied into its request body
+    request_body.read()
+    return preview
+
+
+async def measure(turn):
+    tracemalloc.start()
+    try:
+        await turn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(pipeline_module.settings, "AUDIO_PREPROCESSING_ENABLED", False)
+    monkeypatch.setattr(pipeline_module, "RestaurantRepository", lambda db: SimpleNamespace(
+        restaurant_exists_and_active=AsyncMock(return_value=True)
+    ))
+    validation_service = SimpleNamespace(validate_input=AsyncMock(return_value=OrderResult.success("ok")))
+    order_session_service = SimpleNamespace(get_conversation_workflow_state=AsyncMock(return_value={
+        "session_id": "session-1", "restaurant_id": 1, "conversation_history": [], "order_state": {"line_items": []}
+    }))
+    orchestrator = SimpleNamespace(process_conversation_turn=AsyncMock(return_value={
+        "session_id": "session-1", "response_text": "Added", "audio_url": "https://cdn/r.mp3", "success": True
+    }))
+    return AudioPipelineService(SpoolingVoiceService(), validation_service, order_session_service, orchestrator)
+
+
+class TestAudioUploadMemoryBenchmark:
+    """A turn should hold the recording once, not once per step"""
+
+    @pytest.mark.asyncio
+    async def test_single_read_lowers_peak_memory(self, pipeline):
+        legacy_file = upload()
+        legacy_peak = await measure(lambda: legacy_turn(legacy_file, SpoolingVoiceService()))
+
+        shared_file = upload()
+        result = {}
+
+        async def shared_turn():
+            result.update(await pipeline.process_audio_pipeline(shared_file, "session-1", 1, "en", db=None))
+
+        shared_peak = await measure(shared_turn)
+
+        print(
+            f"\npeak per turn for a {len(RECORDING) / MB:.0f} MB upload: "
+            f"legacy {legacy_peak / MB:.1f} MB ({legacy_file.reads} reads), "
+            f"shared buffer {shared_peak / MB:.1f} MB ({shared_file.reads} read)"
+        )
+        assert result["success"] is True
+        assert shared_file.reads == 1
+        # One copy of the recording instead of three
+        assert shared_peak < legacy_peak / 2
@@ -0,0 +1,78 @@
+"""
+Taking a confirmed order's stock off the inventory in one UPDATE
+Seeds ingredients with inventory in the database at DATABASE_URL inside a
+transaction that is rolled back; skipped when the database isn't reachable
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.unit_of_work import UnitOfWork
+from app.models.ingredient import Ingredient
+from app.models.inventory import Inventory
+from app.models.restaurant import Restaurant
+
+STOCK = {"Bun": 10, "Beef Patty": 1, "Cheese": 5}
+
+
+@pytest_asyncio.fixture
+async def db():
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception:
+        pytest.skip("Database not available")
+
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.rollback()
+
+
+@pytest_asyncio.fixture
+async def ingredient_ids(db):
+    restaurant = Restaurant(name="Consume Stock Burgers")
+    db.add(restaurant)
+    await db.flush()
+
+    ingredients = {}
+    for name, stock in STOCK.items():
+        ingredient = Ingredient(name=name, restaurant_id=restaurant.id, unit_cost=0.5)
+        ingredient.inventory = Inventory(current_stock=stock, min_stock_level=1, unit="piece")
+        db.add(ingredient)
+        ingredients[name] = ingredient
+    await db.flush()
+    return {name: ingredient.id for name, ingredient in ingredients.items()}
+
+
+async def stock_levels(db, ingredient_ids):
+    result = await db.execute(
+        select(Inventory.ingredient_id, Inventory.current_stock)
+        .where(Inventory.ingredient_id.in_(ingredient_ids.values()))
+        .execution_options(populate_existing=True)
+    )
+    levels = dict(result.all())
+    return {name: float(levels[ingredient_id]) for name, ingredient_id in ingredient_ids.items()}
+
+
+class TestConsumeStock:
+    """A short ingredient must not cost the rest of the order its stock update"""
+
+    @pytest.mark.asyncio
+    async def test_short_rows_are_skipped(self, db, ingredient_ids):
+        quantities = {ingredient_ids["Bun"]: 2, ingredient_ids["Beef Patty"]: 3, ingredient_ids["Cheese"]: 1}
+
+        consumed = await UnitOfWork(db).inventory.consume_stock(quantities)
+
+        assert sorted(consumed) == sorted([ingredient_ids["Bun"], ingredient_ids["Cheese"]])
+        assert await stock_levels(db, ingredient_ids) == {"Bun": 8, "Beef Patty": 1, "Cheese": 4}
+
+    @pytest.mark.asyncio
+    async def test_negative_inventory_allowed_bottoms_out_at_zero(self, db, ingredient_ids):
+        quantities = {ingredient_ids["Bun"]: 2, ingredient_ids["Beef Patty"]: 3, ingredient_ids["Cheese"]: 1}
+
+        consumed = await UnitOfWork(db).inventory.consume_stock(quantities, allow_negative=True)
+
+        assert sorted(consumed) == sorted(ingredient_ids.values())
+        assert await stock_levels(db, ingredient_ids) == {"Bun": 8, "Beef Patty": 0, "Cheese": 4}
@@ -0,0 +1,132 @@
+"""
+Multi-lane contention benchmark for inventory reservations
+Many lanes add the same item at once while only a few are left in stock,
+against the Redis at settings.REDIS_URL (skipped when it isn't reachable).
+The old read-then-decide check lets every lane through; the reservation
+scripts hand out exactly the stock there is
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+import pytest_asyncio
+
+from app.services.inventory_reservations import InventoryReservations
+from app.services.redis_service import RedisService
+
+LANES = 200
+SHAKES_IN_STOCK = 50
+
+
+@pytest_asyncio.fixture
+async def redis_service():
+    service = RedisService()
+    if not await service.connect():
+        pytest.skip("Redis not available")
+    yield service
+    await service.disconnect()
+
+
+@pytest.fixture
+def ingredient_ids():
+    # High random IDs keep the test away from real ingredients' counters
+    base = random.randint(10_000_000, 90_000_000)
+    return {"ice_cream": base, "milk": base + 1, "straw": base + 2}
+
+
+@pytest_asyncio.fixture
+async def reservations(redis_service, ingredient_ids):
+    reservations = InventoryReservations(redis_service)
+    order_ids = []
+    yield reservations, order_ids
+    client = redis_service.redis_client
+    for order_id in order_ids:
+        await reservations.release(order_id)
+    await client.delete(*[reservations.counter_key(i) for i in ingredient_ids.values()])
+
+
+def shake(ingredient_ids, quantity=1):
+    """Demand for one shake line: ingredient ID -> (quantity, stock on hand)"""
+    return {
+        ingredient_ids["ice_cream"]: (2.0 * quantity, 2.0 * SHAKES_IN_STOCK),
+        ingredient_ids["milk"]: (0.25 * quantity, 1000.0),
+        ingredient_ids["straw"]: (1.0 * quantity, 1000.0)
+    }
+
+
+async def legacy_add_shake(stock, demand):
+    """The old check: read the stock, decide, and take it later on confirm"""
+    await asyncio.sleep(0)
+    return all(stock[ingredient_id] >= quantity for ingredient_id, (quantity, _) in demand.items())
+
+
+class TestInventoryReservationContention:
+    """Concurrent lanes never hold more than the stock"""
+
+    @pytest.mark.asyncio
+    async def test_last_units_across_lanes(self, reservations, ingredient_ids):
+        reservations, order_ids = reservations
+        order_ids.extend(f"bench_{ingredient_ids['ice_cream']}_{lane}" for lane in range(LANES))
+        demand = shake(ingredient_ids)
+
+        stock = {ingredient_id: on_hand for ingredient_id, (_, on_hand) in demand.items()}
+        legacy = await asyncio.gather(*(legacy_add_shake(stock, demand) for _ in order_ids))
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(reservations.reserve(order_id, "item_1", demand) for order_id in order_ids))
+        elapsed = time.perf_counter() - start
+        accepted = [order_id for order_id, result in zip(order_ids, results) if result.is_success]
+        reserved = await reservations.get_reserved(list(ingredient_ids.values()))
+
+        print(
+            f"\n{LANES} lanes adding a shake, {SHAKES_IN_STOCK} in stock: legacy check accepted {sum(legacy)} "
+            f"({sum(legacy) - SHAKES_IN_STOCK} oversold); reservations accepted {len(accepted)} "
+            f"in {elapsed * 1000:.1f} ms ({LANES / elapsed:.0f} reservations/s)"
+        )
+        assert sum(legacy) == LANES
+        assert len(accepted) == SHAKES_IN_STOCK
+        assert all(result.is_insufficient for result in results if not result.is_success)
+        assert reserved[ingredient_ids["ice_cream"]] == pytest.approx(2.0 * SHAKES_IN_STOCK)
+        # Refused lines held nothing, not even the ingredients that weren't short
+        assert reserved[ingredient_ids["straw"]] == pytest.approx(SHAKES_IN_STOCK)
+
+        # Cancelled lanes give their shakes to the lanes still waiting
+        cancelled, waiting = accepted[:10], [o for o in order_ids if o not in accepted][:20]
+        outcome = await asyncio.gather(
+            *(reservations.release(order_id) for order_id in cancelled),
+            *(reservations.reserve(order_id, "item_1", demand) for order_id in waiting)
+        )
+        retried = sum(1 for result in outcome[len(cancelled):] if result.is_success)
+        reserved = await reservations.get_reserved([ingredient_ids["ice_cream"]])
+        assert reserved[ingredient_ids["ice_cream"]] <= 2.0 * SHAKES_IN_STOCK + 1e-6
+        assert SHAKES_IN_STOCK - len(cancelled) + retried == reserved[ingredient_ids["ice_cream"]] / 2
+
+    @pytest.mark.asyncio
+    async def test_line_changes_claim_and_expiry(self, reservations, ingredient_ids):
+        reservations, order_ids = reservations
+        order_id, other_id = f"bench_{ingredient_ids['milk']}_a", f"bench_{ingredient_ids['milk']}_b"
+        order_ids.extend([order_id, other_id])
+        ice_cream = ingredient_ids["ice_cream"]
+
+        assert (await reservations.reserve(order_id, "item_1", shake(ingredient_ids, 10))).is_success
+        assert (await reservations.reserve(order_id, "item_2", shake(ingredient_ids, 5))).is_success
+        # Raising a line counts what it already holds as its own
+        assert (await reservations.reserve(order_id, "item_1", shake(ingredient_ids, 40), replace=True)).is_success
+        short = await reservations.reserve(other_id, "item_1", shake(ingredient_ids, 10))
+        assert short.is_insufficient and short.ingredient_id == ice_cream and short.available == pytest.approx(10.0)
+
+        assert await reservations.release(order_id, "item_2") == 3
+        assert (await reservations.get(order_id))[ice_cream] == pytest.approx(80.0)
+
+        claim_id, quantities = await reservations.claim(order_id)
+        assert quantities[ice_cream] == pytest.approx(80.0)
+        assert await reservations.claim(order_id) == (None, {})
+        # Still held until the claim is released
+        assert (await reservations.get_reserved([ice_cream]))[ice_cream] == pytest.approx(80.0)
+        await reservations.release(claim_id)
+
+        assert (await reservations.reserve(other_id, "item_1", shake(ingredient_ids, 10), ttl=-1)).is_success
+        assert await reservations.release_expired() >= 1
+        assert (await reservations.get_reserved([ice_cream]))[ice_cream] == 0.0
@@ -0,0 +1,211 @@
+"""
+SQL statements per ADD_ITEM turn for inventory and customization validation
+Seeds a 12-ingredient burger and a 3-ingredient side in the database at
+DATABASE_URL inside a transaction that is rolled back, then counts statements
+for the old per-ingredient inventory lookups against one joined query per item
+and against the batched path: one ingredient snapshot per command batch, shared
+by every command's customization checks and stock holds (plain adds included,
+since every add reserves stock);
+skipped when the database isn't reachable
+"""
+
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+
+from app.commands.add_item_command import AddItemCommand
+from app.commands.command_context import CommandContext
+from app.commands.command_invoker import CommandInvoker
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.unit_of_work import UnitOfWork
+from app.dto.order_result import OrderResult
+from app.models.category import Category
+from app.models.ingredient import Ingredient
+from app.models.inventory import Inventory
+from app.models.menu_item import MenuItem
+from app.models.menu_item_ingredient import MenuItemIngredient
+from app.models.restaurant import Restaurant
+from app.services.customization_validation_service import CustomizationValidationService
+from app.services.inventory_reservations import ingredient_demand
+from app.services.menu_ingredient_snapshot import MenuIngredientSnapshot, customization_ingredient_names
+from app.services.order_validator import OrderValidator
+
+BURGER_INGREDIENTS = ["Bun", "Beef Patty", "Cheese", "Lettuce", "Tomato", "Onions", "Pickles",
+                      "Ketchup", "Mustard", "Mayo", "Bacon", "Special Sauce"]
+SIDE_INGREDIENTS = ["Potatoes", "Salt", "Ketchup"]
+TURN = [
+    ("burger", 2, ["no onions", "no pickles", "extra cheese", "add bacon"]),
+    ("side", 1, ["no salt"]),
+    ("burger", 1, ["extra special sauce"])
+]
+PLAIN_TURN = [("burger", 1), ("side", 2), ("burger", 3)]
+
+
+@pytest_asyncio.fixture
+async def db():
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception:
+        pytest.skip("Database not available")
+
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.rollback()
+
+
+@pytest_asyncio.fixture
+async def menu(db):
+    restaurant = Restaurant(name="Inventory Benchmark Burgers")
+    db.add(restaurant)
+    await db.flush()
+    category = Category(name="Bench Mains", restaurant_id=restaurant.id, is_active=True)
+    db.add(category)
+    await db.flush()
+
+    ingredients = {}
+    for name in dict.fromkeys(BURGER_INGREDIENTS + SIDE_INGREDIENTS):
+        ingredient = Ingredient(name=name, restaurant_id=restaurant.id, unit_cost=0.5)
+        ingredient.inventory = Inventory(current_stock=500, min_stock_level=10, unit="piece")
+        db.add(ingredient)
+        ingredients[name] = ingredient
+
+    items = {}
+    for key, name, recipe in (("burger", "Bench Burger", BURGER_INGREDIENTS), ("side", "Bench Fries", SIDE_INGREDIENTS)):
+        item = MenuItem(name=name, price=6.99, category_id=category.id, restaurant_id=restaurant.id, is_available=True)
+        db.add(item)
+        await db.flush()
+        db.add_all([
+            MenuItemIngredient(menu_item_id=item.id, ingredient_id=ingredients[n].id, quantity=1, unit="piece", additional_cost=0.5)
+            for n in recipe
+        ])
+        items[key] = item.id
+    await db.flush()
+    # Start from an empty identity map, as a turn's fresh session would
+    db.expunge_all()
+    return restaurant.id, items
+
+
+@pytest.fixture
+def statements():
+    counter = {"count": 0}
+
+    def count(*args):
+        counter["count"] += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+
+async def legacy_validate_inventory(uow, menu_item_id, quantity):
+    """The previous check: the item's ingredients, then each ingredient's inventory on its own"""
+    short = []
+    for menu_item_ingredient in await uow.menu_item_ingredients.get_by_menu_item(menu_item_id):
+        inventory = await uow.inventory.get_by_ingredient(menu_item_ingredient.ingredient_id)
+        if inventory and inventory.current_stock < float(menu_item_ingredient.quantity) * quantity:
+            short.append(menu_item_ingredient.ingredient_id)
+    return short
+
+
+class ValidatingOrderService:
+    """The database side of OrderService.add_item_to_order: customization checks and what the line holds"""
+
+    def __init__(self):
+        self.customization_validator = CustomizationValidationService()
+
+    async def add_item_to_order(self, db, menu_item_id, quantity, restaurant_id, customizations, ingredients=None, **kwargs):
+        uow = UnitOfWork(db)
+        results = await self.customization_validator.validate_customizations(
+            menu_item_id, customizations, restaurant_id, uow, ingredients
+        )
+        invalid = [error for result in results.values() if not result.is_valid for error in result.errors]
+        if invalid:
+            return OrderResult.error("Invalid customizations", invalid)
+        # What the line holds comes from the batch snapshot, like OrderService._reserve_inventory
+        if ingredients is None or not ingredients.has_menu_item(menu_item_id):
+            ingredients = await MenuIngredientSnapshot.load(uow, [menu_item_id])
+        removed, _ = customization_ingredient_names(customizations)
+        ingredient_demand(ingredients.menu_item_ingredients(menu_item_id), quantity, removed)
+        return OrderResult.success("Validated")
+
+
+class TestInventoryValidationBenchmark:
+    """A constant number of statements per turn instead of one per ingredient"""
+
+    @pytest.mark.asyncio
+    async def test_statements_per_add_item_turn(self, db, menu, statements):
+        restaurant_id, items = menu
+        uow = UnitOfWork(db)
+
+        statements["count"] = 0
+        start = time.perf_counter()
+        for key, quantity, _ in TURN:
+            assert await legacy_validate_inventory(uow, items[key], quantity) == []
+        legacy_seconds = time.perf_counter() - start
+        legacy_statements = statements["count"]
+        db.expunge_all()
+
+        statements["count"] = 0
+        joined = [await OrderValidator()._validate_inventory(uow, items[key], quantity) for key, quantity, _ in TURN]
+        joined_statements = statements["count"]
+        db.expunge_all()
+
+        context = CommandContext(session_id="bench", restaurant_id=restaurant_id, order_id=1)
+        context.set_order_service(ValidatingOrderService())
+        context.set_db_session(db)
+        commands = [
+            AddItemCommand(restaurant_id, 1, items[key], quantity=quantity, modifiers=modifiers)
+            for key, quantity, modifiers in TURN
+        ]
+        statements["count"] = 0
+        start = time.perf_counter()
+        turn = await CommandInvoker().execute_multiple_commands(commands, context)
+        turn_seconds = time.perf_counter() - start
+        turn_statements = statements["count"]
+
+        print(
+            f"\nADD_ITEM turn ({len(TURN)} commands, {len(BURGER_INGREDIENTS)}-ingredient burger): "
+            f"legacy inventory checks {legacy_statements} statements ({legacy_seconds * 1000:.1f} ms); "
+            f"joined inventory checks {joined_statements} statements; "
+            f"whole turn with customizations {turn_statements} statements ({turn_seconds * 1000:.1f} ms)"
+        )
+        assert legacy_statements == sum(
+            1 + len(BURGER_INGREDIENTS if key == "burger" else SIDE_INGREDIENTS) for key, _, _ in TURN
+        )
+        assert all(result.is_success for result in joined)
+        assert joined_statements == len(TURN)
+        assert turn.successful_commands == len(TURN)
+        # Menu item ingredients with inventory, and the restaurant ingredients the customizations add
+        assert turn_statements == 2
+
+    @pytest.mark.asyncio
+    async def test_statements_per_plain_add_item_turn(self, db, menu, statements):
+        """Adds without customizations share the batch snapshot as well"""
+        restaurant_id, items = menu
+        service = ValidatingOrderService()
+
+        statements["count"] = 0
+        for key, quantity in PLAIN_TURN:
+            assert (await service.add_item_to_order(db, items[key], quantity, restaurant_id, [])).is_success
+        per_command_statements = statements["count"]
+        db.expunge_all()
+
+        context = CommandContext(session_id="bench", restaurant_id=restaurant_id, order_id=1)
+        context.set_order_service(service)
+        context.set_db_session(db)
+        commands = [AddItemCommand(restaurant_id, 1, items[key], quantity=quantity) for key, quantity in PLAIN_TURN]
+        statements["count"] = 0
+        turn = await CommandInvoker().execute_multiple_commands(commands, context)
+        turn_statements = statements["count"]
+
+        print(
+            f"\nPlain ADD_ITEM turn ({len(PLAIN_TURN)} commands): "
+            f"{per_command_statements} statements loading per command, {turn_statements} with the batch snapshot"
+        )
+        assert per_command_statements == len(PLAIN_TURN)
+        assert turn.successful_commands == len(PLAIN_TURN)
+        # Menu item ingredients with inventory, once for the whole turn
+        assert turn_statements == 1
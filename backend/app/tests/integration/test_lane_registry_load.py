@@ -0,0 +1,112 @@
+"""
+Load test for the multi-lane session registry
+Drives many restaurant lanes at once against the Redis at settings.REDIS_URL
+and is skipped when it isn't reachable
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, Mock
+
+from app.services.redis_service import RedisService
+from app.services.order_session_service import OrderSessionService
+from app.services.order_service import OrderService
+
+RESTAURANTS = 10
+LANES_PER_RESTAURANT = 20
+
+
+@pytest_asyncio.fixture
+async def redis_service():
+    service = RedisService()
+    if not await service.connect():
+        pytest.skip("Redis not available")
+    yield service
+    await service.disconnect()
+
+
+@pytest.fixture
+def restaurant_ids():
+    # High random IDs keep the test away from real restaurants' lanes
+    base = random.randint(10_000_000, 90_000_000)
+    return [base + offset for offset in range(RESTAURANTS)]
+
+
+@pytest.fixture
+def order_service(redis_service):
+    voice_service = AsyncMock()
+    voice_service.generate_audio.return_value = "https://example.com/greeting.mp3"
+    return OrderService(
+        order_session_service=OrderSessionService(redis_service),
+        customization_validator=Mock(),
+        voice_service=voice_service,
+        order_validator=Mock()
+    )
+
+
+def all_lanes(restaurant_ids):
+    return [(restaurant_id, str(lane)) for restaurant_id in restaurant_ids for lane in range(1, LANES_PER_RESTAURANT + 1)]
+
+
+async def arrive(order_service, lanes):
+    results = await asyncio.gather(*(
+        order_service.handle_new_car(None, restaurant_id=restaurant_id, lane_id=lane_id)
+        for restaurant_id, lane_id in lanes
+    ))
+    assert all(result.is_success for result in results), [r.message for r in results if not r.is_success]
+    return [result.data["session"]["id"] for result in results]
+
+
+class TestLaneRegistryLoad:
+    """Many lanes served by one process without interfering with each other"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_new_cars_get_their_own_lane(self, order_service, restaurant_ids):
+        storage = order_service.storage
+        lanes = all_lanes(restaurant_ids)
+
+        start = time.perf_counter()
+        session_ids = await arrive(order_service, lanes)
+        elapsed = time.perf_counter() - start
+        print(f"\n{len(lanes)} concurrent new-car events in {elapsed:.2f}s ({len(lanes) / elapsed:.0f} lanes/s)")
+
+        try:
+            assert len(set(session_ids)) == len(lanes)
+            current = await asyncio.gather(*(storage.get_current_session_id(r, l) for r, l in lanes))
+            assert current == session_ids
+
+            for restaurant_id in restaurant_ids:
+                active = await storage.list_active_lanes(restaurant_id)
+                assert len(active) == LANES_PER_RESTAURANT
+
+            located = await storage.get_session_lane(session_ids[-1])
+            assert located == {"restaurant_id": lanes[-1][0], "lane_id": lanes[-1][1]}
+        finally:
+            await asyncio.gather(*(order_service.handle_next_car(r, l) for r, l in lanes))
+
+    @pytest.mark.asyncio
+    async def test_next_car_only_touches_its_own_lane(self, order_service, restaurant_ids):
+        storage = order_service.storage
+        lanes = all_lanes(restaurant_ids)
+        first_wave = await arrive(order_service, lanes)
+
+        try:
+            # Every other lane finishes while the rest keep ordering
+            leaving = lanes[::2]
+            staying = lanes[1::2]
+            results = await asyncio.gather(*(order_service.handle_next_car(r, l) for r, l in leaving))
+            assert all(result.is_success for result in results)
+
+            assert all(s is None for s in await asyncio.gather(*(storage.get_current_session_id(r, l) for r, l in leaving)))
+            assert await asyncio.gather(*(storage.get_current_session_id(r, l) for r, l in staying)) == first_wave[1::2]
+
+            # A new car at an occupied lane replaces (and cancels) only that lane's session
+            second_wave = await arrive(order_service, staying)
+            assert await asyncio.gather(*(storage.get_current_session_id(r, l) for r, l in staying)) == second_wave
+            assert all(s is None for s in await asyncio.gather(*(storage.get_session(s) for s in first_wave[1::2])))
+        finally:
+            await asyncio.gather(*(order_service.handle_next_car(r, l) for r, l in lanes))
@@ -0,0 +1,135 @@
+"""
+Menu cache benchmark: turn-path menu reads against the Redis at settings.REDIS_URL
+Compares the old whole-menu JSON string (GET, decode, MenuItem per item, linear
+scan by ID) with the versioned cache's in-process L1, and measures how quickly
+a menu change reaches a second worker over pub/sub; skipped when Redis isn't reachable
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import pytest
+import pytest_asyncio
+from redis.asyncio.connection import AbstractConnection
+
+from app.models.menu_item import MenuItem
+from app.services.redis_menu_cache_service import MenuSnapshotCache, RedisMenuCacheService
+from app.services.redis_service import RedisService
+
+ITEMS = 120
+READS = 500
+
+
+@pytest_asyncio.fixture
+async def redis_service():
+    service = RedisService()
+    if not await service.connect():
+        pytest.skip("Redis not available")
+    yield service
+    await service.disconnect()
+
+
+@pytest.fixture
+def restaurant_id():
+    # High random ID keeps the test away from real restaurants' menus
+    return random.randint(10_000_000, 90_000_000)
+
+
+@pytest.fixture
+def round_trips(monkeypatch):
+    counter = {"count": 0}
+    send = AbstractConnection.send_packed_command
+
+    async def counting_send(self, command, check_health=True):
+        counter["count"] += 1
+        return await send(self, command, check_health)
+
+    monkeypatch.setattr(AbstractConnection, "send_packed_command", counting_send)
+    return counter
+
+
+def menu(restaurant_id, price=5.99):
+    return [
+        MenuItem(
+            id=restaurant_id * 1000 + n, name=f"Menu Item {n}", description="Benchmark item", price=price + n,
+            category_id=1, restaurant_id=restaurant_id, is_available=True, is_upsell=False, is_special=False,
+            prep_time_minutes=5, display_order=n
+        )
+        for n in range(ITEMS)
+    ]
+
+
+async def legacy_get_menu_item_by_id(client, restaurant_id, menu_item_id):
+    """The previous read: whole-menu string, decoded and turned into ORM objects, then scanned"""
+    menu_data = json.loads(await client.get(f"legacy-menu:{restaurant_id}"))
+    for item in (MenuItem(**data) for data in menu_data):
+        if item.id == menu_item_id:
+            return item
+    return None
+
+
+def p99_ms(latencies):
+    return statistics.quantiles(latencies, n=100)[98] * 1000
+
+
+async def timed(read):
+    latencies = []
+    for _ in range(READS):
+        start = time.perf_counter()
+        await read()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+class TestMenuCacheBenchmark:
+    """Steady-state menu reads should not leave the process"""
+
+    @pytest.mark.asyncio
+    async def test_reads_and_cross_worker_invalidation(self, redis_service, restaurant_id, round_trips):
+        client = redis_service.redis_client
+        worker_a = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(), redis_client=client)
+        worker_b = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(), redis_client=client)
+        items = menu(restaurant_id)
+        wanted = items[-1].id
+
+        legacy_json = [{k: v for k, v in item.to_dict().items() if k not in ("tags", "created_at", "updated_at")} for item in items]
+        await client.set(f"legacy-menu:{restaurant_id}", json.dumps(legacy_json), ex=300)
+        try:
+            await worker_b.start_invalidation_listener()
+            await asyncio.sleep(0.1)
+            await worker_a.cache_menu_items(restaurant_id, items)
+            await worker_b.get_menu_items(restaurant_id)
+
+            round_trips["count"] = 0
+            legacy = await timed(lambda: legacy_get_menu_item_by_id(client, restaurant_id, wanted))
+            legacy_round_trips = round_trips["count"] / READS
+
+            round_trips["count"] = 0
+            cached = await timed(lambda: worker_b.get_menu_item_by_id(restaurant_id, wanted))
+            cached_round_trips = round_trips["count"] / READS
+
+            # A price change written by worker A reaches worker B's L1 over pub/sub
+            start = time.perf_counter()
+            await worker_a.cache_menu_items(restaurant_id, menu(restaurant_id, price=6.49))
+            while worker_b.snapshot_cache.peek(restaurant_id) is not None and time.perf_counter() - start < 2:
+                await asyncio.sleep(0.001)
+            propagation_ms = (time.perf_counter() - start) * 1000
+            updated = await worker_b.get_menu_item_by_id(restaurant_id, wanted)
+
+            print(
+                f"\n{ITEMS}-item menu, get_menu_item_by_id: legacy {legacy_round_trips:.0f} round trip, "
+                f"p99 {p99_ms(legacy):.3f} ms; L1 {cached_round_trips:.0f} round trips, p99 {p99_ms(cached):.4f} ms; "
+                f"change visible to the other worker after {propagation_ms:.1f} ms"
+            )
+            assert cached_round_trips == 0
+            assert legacy_round_trips == 1
+            assert p99_ms(cached) < p99_ms(legacy)
+            assert updated.price == pytest.approx(6.49 + ITEMS - 1)
+            assert propagation_ms < 2000
+        finally:
+            await worker_b.snapshot_cache.stop_listener()
+            await worker_a.invalidate_restaurant_cache(restaurant_id)
+            await client.delete(f"legacy-menu:{restaurant_id}")
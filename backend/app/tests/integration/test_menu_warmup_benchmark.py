@@ -0,0 +1,168 @@
+"""
+Cold-start benchmark for the menu cache warm-up: 1k restaurants x 300 items
+Menus are written to the Redis at settings.REDIS_URL (skipped when it isn't
+reachable). Postgres is simulated with a fixed per-query latency so the run
+shows how the loaders are structured, not the speed of a particular database:
+the old loader (one restaurant at a time, first 100 restaurants and first 100
+items each) against the paginated warm-up with bounded parallelism
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from app.models.menu_item import MenuItem
+from app.services import menu_cache_loader as loader_module
+from app.services.menu_cache_loader import MenuCacheLoader
+from app.services.redis_menu_cache_service import MenuSnapshotCache, RedisMenuCacheService
+from app.services.redis_service import RedisService
+
+RESTAURANTS = 1000
+ITEMS = 300
+QUERY_SECONDS = 0.002
+CONCURRENCY = 16
+
+
+def menu_row(restaurant_id, n):
+    return MenuItem(
+        id=restaurant_id * 1000 + n, name=f"Menu Item {n}", description="Benchmark item", price=4.99 + n % 7,
+        category_id=1, restaurant_id=restaurant_id, is_available=True, is_upsell=False, is_special=False,
+        prep_time_minutes=5, display_order=n
+    )
+
+
+class SimulatedDatabase:
+    """IDs and menus in memory; every query costs QUERY_SECONDS"""
+
+    def __init__(self, first_restaurant_id):
+        self.restaurant_ids = list(range(first_restaurant_id, first_restaurant_id + RESTAURANTS))
+        self.queries = 0
+
+    @asynccontextmanager
+    async def session(self):
+        yield self
+
+    async def query(self, rows):
+        self.queries += 1
+        await asyncio.sleep(QUERY_SECONDS)
+        return rows
+
+
+class SimulatedRestaurantRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def get_all(self, skip=0, limit=100):
+        return [SimpleNamespace(id=i) for i in await self.db.query(self.db.restaurant_ids[skip:skip + limit])]
+
+    async def stream_active_ids(self, page_size=1000):
+        for start in range(0, len(self.db.restaurant_ids), page_size):
+            yield await self.db.query(self.db.restaurant_ids[start:start + page_size])
+
+
+class SimulatedMenuItemRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def get_by_restaurant(self, restaurant_id, skip=0, limit=100):
+        return await self.db.query([menu_row(restaurant_id, n) for n in range(skip, min(skip + limit, ITEMS))])
+
+    async def get_all_by_restaurant(self, restaurant_id, page_size=500):
+        menu_items = []
+        for start in range(0, ITEMS + 1, page_size):
+            page = await self.get_by_restaurant(restaurant_id, start, page_size)
+            menu_items.extend(page)
+            if len(page) < page_size:
+                break
+        return menu_items
+
+
+async def legacy_load_all(cache, db):
+    """The old loader: get_all() and get_by_restaurant() with their default limit of 100, one restaurant at a time"""
+    for restaurant in await SimulatedRestaurantRepository(db).get_all():
+        menu_items = await SimulatedMenuItemRepository(db).get_by_restaurant(restaurant.id)
+        if menu_items:
+            await cache.cache_menu_items(restaurant.id, menu_items)
+
+
+async def clear_menus(cache, restaurant_ids):
+    """Delete the benchmark restaurants' version pointers and item hashes, and nothing else"""
+    client = cache.redis_client
+    ids = {str(restaurant_id) for restaurant_id in restaurant_ids}
+    keys = [cache._version_key(restaurant_id) for restaurant_id in restaurant_ids]
+    async for key in client.scan_iter(match=f"{cache.cache_prefix}*:items:*", count=1000):
+        if key.split(":")[1] in ids:
+            keys.append(key)
+    for start in range(0, len(keys), 1000):
+        await client.delete(*keys[start:start + 1000])
+    for restaurant_id in restaurant_ids:
+        cache.snapshot_cache.drop(restaurant_id)
+
+
+@pytest_asyncio.fixture
+async def redis_service():
+    service = RedisService()
+    if not await service.connect():
+        pytest.skip("Redis not available")
+    yield service
+    await service.disconnect()
+
+
+@pytest.fixture
+def first_restaurant_id():
+    # High random IDs keep the test away from real restaurants' menus
+    return random.randint(10_000, 90_000) * 1000
+
+
+class TestMenuWarmUpBenchmark:
+    """Every menu cached in full, in a fraction of the sequential time"""
+
+    @pytest.mark.asyncio
+    async def test_cold_start(self, redis_service, first_restaurant_id, monkeypatch):
+        monkeypatch.setattr(loader_module, "RestaurantRepository", SimulatedRestaurantRepository)
+        monkeypatch.setattr(loader_module, "MenuItemRepository", SimulatedMenuItemRepository)
+        client = redis_service.redis_client
+        db = SimulatedDatabase(first_restaurant_id)
+
+        try:
+            legacy_cache = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(), redis_client=client)
+            start = time.perf_counter()
+            await legacy_load_all(legacy_cache, db)
+            legacy_seconds = time.perf_counter() - start
+            legacy_restaurants = len(legacy_cache.snapshot_cache.get_stats()["menus"])
+            legacy_items = sum([len(await legacy_cache.get_menu_items(rid)) for rid in db.restaurant_ids[:legacy_restaurants]])
+            await clear_menus(legacy_cache, db.restaurant_ids)
+
+            # Fresh worker, empty Redis
+            db.queries = 0
+            cache = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(), redis_client=client)
+            loader = MenuCacheLoader(cache, session_factory=db.session)
+            stats = await loader.warm_up(concurrency=CONCURRENCY, page_size=500, reuse_cached=False)
+            warm_queries = db.queries
+
+            # A second worker finds everything in Redis and only fills its L1
+            db.queries = 0
+            second = MenuCacheLoader(
+                RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(), redis_client=client), session_factory=db.session
+            )
+            second_stats = await second.warm_up(concurrency=CONCURRENCY)
+
+            print(
+                f"\ncold start, {RESTAURANTS} restaurants x {ITEMS} items ({QUERY_SECONDS * 1000:.0f} ms/query): "
+                f"legacy {legacy_seconds:.2f}s, {legacy_restaurants} restaurants / {legacy_items} items cached; "
+                f"warm-up {stats['seconds']:.2f}s, {stats['restaurants']} restaurants / {stats['items']} items "
+                f"({warm_queries} queries, concurrency {CONCURRENCY}); "
+                f"second worker {second_stats['seconds']:.2f}s ({second_stats['from_cache']} from Redis, {db.queries} queries)"
+            )
+            assert legacy_restaurants == 100 and legacy_items == 100 * 100
+            assert stats["restaurants"] == RESTAURANTS
+            assert stats["items"] == RESTAURANTS * ITEMS
+            assert stats["failures"] == 0
+            assert second_stats["from_cache"] == RESTAURANTS
+        finally:
+            await clear_menus(RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(), redis_client=client), db.restaurant_ids)
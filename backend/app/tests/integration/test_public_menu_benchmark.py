@@ -0,0 +1,188 @@
+"""
+Query count and latency benchmark for GET /api/restaurants/{id}/menu
+Seeds a 120-item menu in the database at DATABASE_URL inside a transaction that
+is rolled back, then compares the old per-category/per-item queries with the
+single eager-loaded query and the cached, conditional response; skipped when
+the database isn't reachable
+"""
+
+import statistics
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import event, select, text
+
+from app.api import restaurants as restaurants_api
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.menu_item_tag import MenuItemTag
+from app.models.restaurant import Restaurant
+from app.models.tag import Tag
+from app.repository import CategoryRepository, MenuItemRepository, RestaurantRepository
+from app.services.public_menu_cache import PublicMenuCache
+
+CATEGORIES = 12
+ITEMS_PER_CATEGORY = 10
+REQUESTS = 200
+
+
+@pytest_asyncio.fixture
+async def db():
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception:
+        pytest.skip("Database not available")
+
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.rollback()
+
+
+@pytest_asyncio.fixture
+async def restaurant_id(db):
+    restaurant = Restaurant(name="Menu Benchmark Burgers", primary_color="#112233", secondary_color="#445566")
+    db.add(restaurant)
+    await db.flush()
+
+    tags = [Tag(name=f"Bench Tag {n}", color="#FF0000", restaurant_id=restaurant.id) for n in range(3)]
+    db.add_all(tags)
+    for c in range(CATEGORIES):
+        category = Category(name=f"Bench Category {c}", restaurant_id=restaurant.id, display_order=c, is_active=True)
+        db.add(category)
+        await db.flush()
+        for i in range(ITEMS_PER_CATEGORY):
+            item = MenuItem(
+                name=f"Bench Item {c}-{i}", description="Benchmark item", price=4.99 + i,
+                category_id=category.id, restaurant_id=restaurant.id, display_order=i,
+                is_available=True, prep_time_minutes=5
+            )
+            db.add(item)
+            await db.flush()
+            db.add_all([MenuItemTag(menu_item_id=item.id, tag_id=tag.id) for tag in tags[:i % 3]])
+    await db.flush()
+    # Start from an empty identity map, as a request's fresh session would
+    db.expunge_all()
+    return restaurant.id
+
+
+@pytest.fixture
+def queries():
+    counter = {"count": 0}
+
+    def count(*args):
+        counter["count"] += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+
+async def legacy_menu(restaurant_id: int, db):
+    """The previous endpoint: restaurant, categories, items per category, tags per item"""
+    restaurant = await RestaurantRepository(db).get_by_id(restaurant_id)
+    categories = await CategoryRepository(db).get_active_by_restaurant(restaurant_id)
+    menu_item_repo = MenuItemRepository(db)
+    menu_data = []
+    for category in categories:
+        category_items = []
+        for item in await menu_item_repo.get_available_by_category(category.id):
+            tag_result = await db.execute(
+                select(Tag).join(MenuItemTag, Tag.id == MenuItemTag.tag_id).where(MenuItemTag.menu_item_id == item.id)
+            )
+            category_items.append({
+                "id": item.id,
+                "name": item.name,
+                "price": float(item.price),
+                "description": item.description,
+                "image_url": item.image_url,
+                "sort_order": item.display_order,
+                "restaurant_id": item.restaurant_id,
+                "tags": [{"name": tag.name, "color": tag.color} for tag in tag_result.scalars().all()]
+            })
+        if category_items:
+            menu_data.append({
+                "id": category.id, "name": category.name, "description": category.description,
+                "sort_order": category.display_order, "items": category_items
+            })
+    return {
+        "restaurant": {
+            "id": restaurant.id, "name": restaurant.name, "primary_color": restaurant.primary_color,
+            "secondary_color": restaurant.secondary_color, "logo_url": restaurant.logo_url
+        },
+        "menu": menu_data,
+        "total_items": sum(len(category["items"]) for category in menu_data)
+    }
+
+
+def client_for(db, monkeypatch):
+    @asynccontextmanager
+    async def benchmark_session():
+        # The seeded menu is only visible inside the test's transaction
+        yield db
+
+    monkeypatch.setattr(restaurants_api, "public_menu_cache", PublicMenuCache(ttl_seconds=60, session_factory=benchmark_session))
+    app = FastAPI()
+    app.include_router(restaurants_api.router)
+
+    @app.get("/legacy/{restaurant_id}/menu")
+    async def legacy_route(restaurant_id: int):
+        return await legacy_menu(restaurant_id, db)
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def tags_sorted(menu):
+    # Neither query orders an item's tags
+    for category in menu["menu"]:
+        for item in category["items"]:
+            item["tags"].sort(key=lambda tag: tag["name"])
+    return menu
+
+
+async def run(client, path, queries, headers=None):
+    latencies = []
+    queries["count"] = 0
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers or {})
+        latencies.append(time.perf_counter() - start)
+    return response, queries["count"] / REQUESTS, statistics.quantiles(latencies, n=100)[98] * 1000
+
+
+class TestPublicMenuBenchmark:
+    """One query per menu build instead of one per category and item"""
+
+    @pytest.mark.asyncio
+    async def test_query_count_and_p99(self, db, restaurant_id, queries, monkeypatch):
+        async with client_for(db, monkeypatch) as client:
+            legacy, legacy_queries, legacy_p99 = await run(client, f"/legacy/{restaurant_id}/menu", queries)
+
+            queries["count"] = 0
+            first = await client.get(f"/api/restaurants/{restaurant_id}/menu", headers={"Accept-Encoding": "gzip"})
+            build_queries = queries["count"]
+
+            cached, cached_queries, cached_p99 = await run(
+                client, f"/api/restaurants/{restaurant_id}/menu", queries, {"Accept-Encoding": "gzip"}
+            )
+            revalidated, _, revalidated_p99 = await run(
+                client, f"/api/restaurants/{restaurant_id}/menu", queries, {"If-None-Match": first.headers["etag"]}
+            )
+
+        print(
+            f"\n{CATEGORIES * ITEMS_PER_CATEGORY}-item menu: legacy {legacy_queries:.0f} queries, p99 {legacy_p99:.2f} ms; "
+            f"rebuild {build_queries} query; cached {cached_queries:.0f} queries, p99 {cached_p99:.2f} ms "
+            f"({first.num_bytes_downloaded} bytes gzipped vs {legacy.num_bytes_downloaded}); 304 p99 {revalidated_p99:.2f} ms"
+        )
+        assert tags_sorted(first.json()) == tags_sorted(legacy.json())
+        assert legacy_queries == 2 + CATEGORIES + CATEGORIES * ITEMS_PER_CATEGORY
+        assert build_queries == 1
+        assert cached_queries == 0
+        assert cached.headers["content-encoding"] == "gzip"
+        assert revalidated.status_code == 304
+        assert cached_p99 < legacy_p99
@@ -0,0 +1,125 @@
+"""
+Concurrency stress test for atomic Redis order mutations
+Runs against the Redis at settings.REDIS_URL and is skipped when it isn't reachable
+"""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from app.services.redis_service import RedisService
+
+WORKERS = 20
+ITEMS_PER_WORKER = 10
+
+
+@pytest_asyncio.fixture
+async def redis_service():
+    service = RedisService()
+    if not await service.connect():
+        pytest.skip("Redis not available")
+    yield service
+    await service.disconnect()
+
+
+@pytest_asyncio.fixture
+async def order_id(redis_service):
+    order_id = f"stress_{uuid.uuid4().hex}"
+    result = await redis_service.orders.create(order_id, {"id": order_id, "items": [], "status": "ACTIVE"})
+    assert result.is_success
+    yield order_id
+    await redis_service.orders.delete(order_id)
+
+
+def make_item(worker: int, index: int, price: float = 1.25):
+    return {
+        "id": f"item_{worker}_{index}",
+        "menu_item_id": worker,
+        "menu_item": {"name": f"Item {worker}"},
+        "quantity": 1,
+        "unit_price": price,
+        "customizations": []
+    }
+
+
+class TestRedisOrderStoreConcurrency:
+    """Overlapping requests for the same order must not lose line items"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_adds_keep_every_item(self, redis_service, order_id):
+        store = redis_service.orders
+
+        async def worker(worker_id: int):
+            for index in range(ITEMS_PER_WORKER):
+                result = await store.add_item(order_id, make_item(worker_id, index))
+                assert result.is_success
+
+        await asyncio.gather(*(worker(w) for w in range(WORKERS)))
+
+        order = (await store.read(order_id)).order
+        expected_count = WORKERS * ITEMS_PER_WORKER
+        assert len(order["items"]) == expected_count
+        assert len({item["id"] for item in order["items"]}) == expected_count
+        assert order["subtotal"] == pytest.approx(expected_count * 1.25)
+        assert order["version"] == expected_count + 1  # create + one bump per add
+
+    @pytest.mark.asyncio
+    async def test_mixed_mutations_stay_consistent(self, redis_service, order_id):
+        """Adds, quantity changes and removes interleave without corrupting totals"""
+        store = redis_service.orders
+        for index in range(WORKERS):
+            await store.add_item(order_id, make_item(0, index, price=2.0))
+
+        async def add(index):
+            await store.add_item(order_id, make_item(1, index, price=3.0))
+
+        async def bump(index):
+            await store.set_item_quantity(order_id, f"item_0_{index}", 4)
+
+        async def remove(index):
+            await store.remove_item(order_id, f"item_0_{index}")
+
+        tasks = []
+        for index in range(WORKERS):
+            tasks.append(add(index))
+            tasks.append(bump(index) if index % 2 else remove(index))
+        await asyncio.gather(*tasks)
+
+        order = (await store.read(order_id)).order
+        kept = [item for item in order["items"] if item["id"].startswith("item_0_")]
+        added = [item for item in order["items"] if item["id"].startswith("item_1_")]
+        assert len(kept) == WORKERS // 2 and all(item["quantity"] == 4 for item in kept)
+        assert len(added) == WORKERS
+        assert order["subtotal"] == pytest.approx(len(kept) * 4 * 2.0 + WORKERS * 3.0)
+        assert order["total_amount"] == order["subtotal"]
+
+    @pytest.mark.asyncio
+    async def test_stale_item_replace_is_rejected(self, redis_service, order_id):
+        """Only one of several edits made from the same snapshot wins the version check"""
+        store = redis_service.orders
+        snapshot = await store.add_item(order_id, make_item(0, 0))
+
+        async def edit(instructions):
+            item = {**snapshot.order["items"][0], "special_instructions": instructions}
+            return await store.replace_item(order_id, item, expected_version=snapshot.version)
+
+        results = await asyncio.gather(*(edit(f"edit {n}") for n in range(10)))
+
+        assert sum(result.is_success for result in results) == 1
+        assert sum(result.is_conflict for result in results) == 9
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_order_is_migrated(self, redis_service):
+        order_id = f"stress_{uuid.uuid4().hex}"
+        legacy = '{"id": "%s", "status": "ACTIVE", "items": [{"id": "a", "quantity": 2, "unit_price": 1.5}]}' % order_id
+        await redis_service.redis_client.set(f"order:{order_id}", legacy)
+        try:
+            result = await redis_service.orders.add_item(order_id, make_item(0, 0))
+
+            assert result.is_success
+            assert [item["id"] for item in result.order["items"]] == ["a", "item_0_0"]
+            assert result.order["subtotal"] == pytest.approx(4.25)
+        finally:
+            await redis_service.orders.delete(order_id)
@@ -0,0 +1,129 @@
+"""
+Round-trip benchmark for session and order storage
+Counts the commands/pipelines sent to the Redis at settings.REDIS_URL for a
+new car and for one ordering turn; skipped when Redis isn't reachable
+"""
+
+import random
+import time
+
+import pytest
+import pytest_asyncio
+from redis.asyncio.connection import AbstractConnection
+from unittest.mock import AsyncMock, Mock
+
+from app.services.order_service import OrderService
+from app.services.order_session_service import OrderSessionService
+from app.services.redis_service import RedisService
+
+CARS = 20
+
+
+@pytest_asyncio.fixture
+async def redis_service():
+    service = RedisService()
+    if not await service.connect():
+        pytest.skip("Redis not available")
+    yield service
+    await service.disconnect()
+
+
+@pytest.fixture
+def order_service(redis_service):
+    voice_service = AsyncMock()
+    voice_service.generate_audio.return_value = "https://example.com/greeting.mp3"
+    return OrderService(
+        order_session_service=OrderSessionService(redis_service),
+        customization_validator=Mock(),
+        voice_service=voice_service,
+        order_validator=Mock()
+    )
+
+
+@pytest.fixture
+def restaurant_id():
+    # High random ID keeps the test away from real restaurants' lanes
+    return random.randint(10_000_000, 90_000_000)
+
+
+@pytest.fixture
+def round_trips(monkeypatch):
+    """Every single command and every pipeline goes out in one send_packed_command"""
+    counter = {"count": 0}
+    send = AbstractConnection.send_packed_command
+
+    async def counting_send(self, command, check_health=True):
+        counter["count"] += 1
+        return await send(self, command, check_health)
+
+    monkeypatch.setattr(AbstractConnection, "send_packed_command", counting_send)
+    return counter
+
+
+async def ping_per_call(redis_service):
+    """How is_connected() used to work: a PING before nearly every operation"""
+    await redis_service.redis_client.ping()
+    return True
+
+
+async def take_turn(order_service, session_id, index):
+    storage = order_service.storage
+    await storage.get_conversation_workflow_state(session_id, user_input="a burger please")
+    order_id = await order_service.find_order_for_session(None, session_id)
+    item = {"id": f"item_{index}", "menu_item_id": 1, "quantity": 1, "unit_price": 5.99}
+    result = await storage.add_order_item(None, order_id, item)
+    assert result.is_success
+
+
+class TestRedisRoundTripsBenchmark:
+    """A new car and a turn should each cost a handful of round trips, not one per call plus a PING"""
+
+    @pytest.mark.asyncio
+    async def test_round_trips_per_new_car_and_turn(self, order_service, redis_service, restaurant_id, round_trips, monkeypatch):
+        lanes = [str(lane) for lane in range(1, CARS + 1)]
+        # Warm up: load scripts and open the connection outside the measurement
+        warm = await order_service.handle_new_car(None, restaurant_id=restaurant_id, lane_id="warmup")
+        await take_turn(order_service, warm.data["session"]["id"], 0)
+
+        try:
+            round_trips["count"] = 0
+            start = time.perf_counter()
+            sessions = [
+                (await order_service.handle_new_car(None, restaurant_id=restaurant_id, lane_id=lane)).data["session"]["id"]
+                for lane in lanes
+            ]
+            new_car_elapsed = time.perf_counter() - start
+            new_car = round_trips["count"] / CARS
+
+            # A second car at every lane also cancels the previous session
+            round_trips["count"] = 0
+            sessions = [
+                (await order_service.handle_new_car(None, restaurant_id=restaurant_id, lane_id=lane)).data["session"]["id"]
+                for lane in lanes
+            ]
+            replacing_car = round_trips["count"] / CARS
+
+            round_trips["count"] = 0
+            for index, session_id in enumerate(sessions):
+                await take_turn(order_service, session_id, index)
+            turn = round_trips["count"] / CARS
+
+            monkeypatch.setattr(RedisService, "is_connected", ping_per_call)
+            round_trips["count"] = 0
+            for index, session_id in enumerate(sessions):
+                await take_turn(order_service, session_id, CARS + index)
+            pinging_turn = round_trips["count"] / CARS
+            monkeypatch.undo()
+
+            print(
+                f"\nround trips: new car {new_car:.1f} ({new_car_elapsed / CARS * 1000:.2f} ms), "
+                f"new car replacing a session {replacing_car:.1f}, "
+                f"turn {turn:.1f} (with a PING per call: {pinging_turn:.1f})"
+            )
+            assert new_car == 1
+            assert replacing_car == 2
+            assert turn == 3
+            assert pinging_turn > turn
+        finally:
+            for lane in lanes + ["warmup"]:
+                await order_service.handle_next_car(restaurant_id, lane)
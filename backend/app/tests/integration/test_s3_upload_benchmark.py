@@ -0,0 +1,83 @@
+"""
+Upload benchmark for the async S3 storage backend
+Runs against the S3-compatible endpoint at settings.AWS_ENDPOINT_URL (e.g. the
+MinIO from setup-minio-public.sh) and is skipped when none is configured or reachable
+"""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.services.file_storage_service import S3FileStorageService
+
+UPLOADS = 32
+PAYLOAD = b"\x00" * (256 * 1024)
+
+
+@pytest_asyncio.fixture
+async def storage():
+    if not settings.AWS_ENDPOINT_URL:
+        pytest.skip("No S3 endpoint configured (set AWS_ENDPOINT_URL to a MinIO/moto server)")
+    service = S3FileStorageService(settings.S3_BUCKET_NAME, settings.S3_REGION, settings.AWS_ENDPOINT_URL)
+    try:
+        await service._ensure_bucket_exists()
+    except Exception as e:
+        await service.close()
+        pytest.skip(f"S3 endpoint not available: {e}")
+    yield service
+    await service.close()
+
+
+@pytest.fixture
+def prefix():
+    return f"benchmarks/{uuid.uuid4().hex}"
+
+
+async def upload(storage, key):
+    result = await storage.store_file(PAYLOAD, key, "application/octet-stream")
+    assert result.is_success, result.message
+
+
+class TestS3UploadBenchmark:
+    """Concurrent uploads should overlap on the pooled client instead of serializing"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_uploads_do_not_serialize(self, storage, prefix):
+        # Warm the connection pool so both runs pay the same setup cost
+        await upload(storage, f"{prefix}/warmup.bin")
+
+        start = time.perf_counter()
+        for n in range(UPLOADS):
+            await upload(storage, f"{prefix}/serial_{n}.bin")
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(storage, f"{prefix}/concurrent_{n}.bin") for n in range(UPLOADS)))
+        concurrent = time.perf_counter() - start
+
+        print(f"\n{UPLOADS} x {len(PAYLOAD) // 1024} KiB uploads: serial {serial:.2f}s, concurrent {concurrent:.2f}s "
+              f"({serial / concurrent:.1f}x)")
+        assert concurrent < serial / 2
+
+    @pytest.mark.asyncio
+    async def test_streamed_multipart_round_trip(self, storage, prefix):
+        part_size = 5 * 1024 * 1024
+        data = bytes(range(256)) * ((2 * part_size + 1024) // 256)
+
+        async def chunks():
+            for offset in range(0, len(data), 64 * 1024):
+                yield data[offset:offset + 64 * 1024]
+
+        key = f"{prefix}/streamed.bin"
+        result = await storage.store_stream(chunks(), key, "application/octet-stream")
+        assert result.is_success, result.message
+
+        assert await storage.file_exists(key)
+        client = await storage._get_client()
+        response = await client.get_object(Bucket=storage.bucket_name, Key=key)
+        async with response["Body"] as body:
+            assert await body.read() == data
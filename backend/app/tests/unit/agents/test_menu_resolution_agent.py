@@ -124,9 +124,9 @@ class TestMenuResolutionAgent:
         mock_menu_service.get_menu_item_by_name.return_value = mock_menu_item
         
         # Mock LLM response with proper async mock
-        with patch('app.agents.command_agents.menu_resolution_agent.ChatOpenAI') as mock_llm_class:
+        with patch('app.agents.command_agents.menu_resolution_agent.llm_registry.get_llm') as mock_get_llm:
             mock_llm = AsyncMock()
-            mock_llm_class.return_value = mock_llm
+            mock_get_llm.return_value = mock_llm
             mock_llm.ainvoke.return_value = Mock(content="Quantum Cheeseburger")
             
             # Run agent
@@ -158,9 +158,9 @@ class TestMenuResolutionAgent:
         mock_menu_service.search_menu_items.return_value = ["Quantum Cheeseburger", "Neon Double Burger", "Big Mac"]
         
         # Mock LLM response that doesn't match any option
-        with patch('app.agents.command_agents.menu_resolution_agent.ChatOpenAI') as mock_llm_class:
+        with patch('app.agents.command_agents.menu_resolution_agent.llm_registry.get_llm') as mock_get_llm:
             mock_llm = AsyncMock()
-            mock_llm_class.return_value = mock_llm
+            mock_get_llm.return_value = mock_llm
             mock_llm.ainvoke.return_value = Mock(content="Something else")
             
             # Run agent
@@ -272,9 +272,9 @@ class TestMenuResolutionAgent:
         mock_menu_service.get_menu_item_by_name.return_value = mock_menu_item
         
         # Mock LLM for fries disambiguation
-        with patch('app.agents.command_agents.menu_resolution_agent.ChatOpenAI') as mock_llm_class:
+        with patch('app.agents.command_agents.menu_resolution_agent.llm_registry.get_llm') as mock_get_llm:
             mock_llm = AsyncMock()
-            mock_llm_class.return_value = mock_llm
+            mock_get_llm.return_value = mock_llm
             mock_llm.ainvoke.return_value = Mock(content="French Fries")
             
             # Run agent
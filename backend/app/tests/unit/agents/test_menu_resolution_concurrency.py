@@ -0,0 +1,162 @@
+"""
+Unit tests for concurrent item resolution and batched disambiguation in the Menu Resolution Agent
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.agents.command_agents.menu_resolution_agent import menu_resolution_agent
+from app.agents.agent_response.menu_resolution_response import BatchDisambiguationResponse, DisambiguationChoice
+from app.agents.agent_response.item_extraction_response import ItemExtractionResponse, ExtractedItem
+
+AGENT_MODULE = "app.agents.command_agents.menu_resolution_agent"
+
+
+def make_menu_item(item_id, name):
+    item = Mock()
+    item.id = item_id
+    item.name = name
+    return item
+
+
+MENU = {
+    "burger": [make_menu_item(1, "Cheeseburger"), make_menu_item(2, "Double Burger")],
+    "shake": [make_menu_item(3, "Vanilla Shake"), make_menu_item(4, "Chocolate Shake")],
+    "fries": [make_menu_item(5, "French Fries"), make_menu_item(6, "Large French Fries")],
+    "coke": [make_menu_item(7, "Coke")],
+    "pizza": [],
+}
+
+# Fuzzy-only hits: (item, score, exact)
+WEAK_MATCHES = {
+    "wings": [(make_menu_item(8, "Onion Rings"), 0.36, False)],
+}
+
+
+class SlowMenuService:
+    """Menu service stand-in with per-query latency and concurrency tracking"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.active = 0
+        self.peak = 0
+
+    async def search_menu_items_scored(self, restaurant_id, query):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(query, 0.01))
+            if query in WEAK_MATCHES:
+                return WEAK_MATCHES[query]
+            return [(item, 1.0, True) for item in MENU[query]]
+        finally:
+            self.active -= 1
+
+
+def make_extraction(*names):
+    return ItemExtractionResponse(
+        success=True,
+        confidence=0.9,
+        extracted_items=[ExtractedItem(item_name=name, quantity=1, confidence=0.9) for name in names]
+    )
+
+
+def make_context(menu_service):
+    return {"menu_service": menu_service, "shared_db_session": Mock(), "restaurant_id": "1"}
+
+
+class TestMenuResolutionConcurrency:
+    """Test fan-out, ordering and disambiguation modes"""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_original_order(self):
+        """Slow and fast lookups finish out of order but results follow the request"""
+        menu_service = SlowMenuService(delays={"coke": 0.05, "pizza": 0.0})
+
+        with patch(f"{AGENT_MODULE}.settings.MENU_RESOLUTION_MAX_CONCURRENCY", 2):
+            result = await menu_resolution_agent(make_extraction("coke", "pizza", "coke"), make_context(menu_service))
+
+        assert [item.item_name for item in result.resolved_items] == ["coke", "pizza", "coke"]
+        assert [item.menu_item_id for item in result.resolved_items] == [7, 0, 7]
+        assert menu_service.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_batched_disambiguation_uses_one_llm_call(self):
+        """All ambiguous items are resolved by a single structured LLM call"""
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke.return_value = BatchDisambiguationResponse(choices=[
+            DisambiguationChoice(request_number=1, choice="Cheeseburger"),
+            DisambiguationChoice(request_number=2, choice="CLARIFICATION_NEEDED"),
+            DisambiguationChoice(request_number=3, choice="French Fries"),
+        ])
+
+        with patch(f"{AGENT_MODULE}.settings.MENU_RESOLUTION_BATCH_DISAMBIGUATION", True), \
+                patch(f"{AGENT_MODULE}.llm_registry.get_llm", return_value=mock_llm) as mock_get_llm:
+            result = await menu_resolution_agent(
+                make_extraction("burger", "shake", "fries", "coke"), make_context(SlowMenuService())
+            )
+
+        mock_llm.ainvoke.assert_awaited_once()
+        assert mock_get_llm.call_args.kwargs["schema"] is BatchDisambiguationResponse
+        prompt = mock_llm.ainvoke.call_args[0][0]
+        assert "Vanilla Shake" in prompt and "Large French Fries" in prompt
+
+        burger, shake, fries, coke = result.resolved_items
+        assert (burger.menu_item_id, burger.confidence) == (1, 0.8)
+        assert shake.is_ambiguous and shake.suggested_options == ["Vanilla Shake", "Chocolate Shake"]
+        assert fries.menu_item_id == 5
+        assert coke.menu_item_id == 7
+        assert result.needs_clarification is True
+
+    @pytest.mark.asyncio
+    async def test_batched_disambiguation_failure_asks_for_clarification(self):
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke.side_effect = RuntimeError("LLM down")
+
+        with patch(f"{AGENT_MODULE}.settings.MENU_RESOLUTION_BATCH_DISAMBIGUATION", True), \
+                patch(f"{AGENT_MODULE}.llm_registry.get_llm", return_value=mock_llm):
+            result = await menu_resolution_agent(make_extraction("burger", "fries"), make_context(SlowMenuService()))
+
+        assert all(item.is_ambiguous for item in result.resolved_items)
+
+    @pytest.mark.asyncio
+    async def test_per_item_disambiguation_runs_concurrently(self):
+        """Without batching, one call per ambiguous item still overlaps instead of running serially"""
+        llm_latency = 0.1
+
+        async def slow_disambiguation(prompt):
+            await asyncio.sleep(llm_latency)
+            for name in ("Cheeseburger", "Vanilla Shake", "French Fries"):
+                if name in prompt:
+                    return Mock(content=name)
+
+        mock_llm = Mock()
+        mock_llm.ainvoke = AsyncMock(side_effect=slow_disambiguation)
+
+        with patch(f"{AGENT_MODULE}.settings.MENU_RESOLUTION_BATCH_DISAMBIGUATION", False), \
+                patch(f"{AGENT_MODULE}.llm_registry.get_llm", return_value=mock_llm):
+            start = time.perf_counter()
+            result = await menu_resolution_agent(
+                make_extraction("burger", "shake", "fries"), make_context(SlowMenuService())
+            )
+            elapsed = time.perf_counter() - start
+
+        assert mock_llm.ainvoke.await_count == 3
+        assert [item.menu_item_id for item in result.resolved_items] == [1, 3, 5]
+        # Serial disambiguation would take 3 * llm_latency
+        assert elapsed < llm_latency * 2
+
+    @pytest.mark.asyncio
+    async def test_weak_single_match_asks_for_confirmation(self):
+        """A lone fuzzy-only hit is confirmed with the customer instead of added"""
+        result = await menu_resolution_agent(make_extraction("wings", "coke"), make_context(SlowMenuService()))
+
+        wings, coke = result.resolved_items
+        assert wings.menu_item_id == 0 and wings.resolved_name is None
+        assert wings.is_ambiguous and wings.suggested_options == ["Onion Rings"]
+        assert coke.menu_item_id == 7
+        assert result.needs_clarification is True
+        assert result.clarification_questions == ["Did you mean: Onion Rings?"]
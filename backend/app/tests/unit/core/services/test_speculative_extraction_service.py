@@ -0,0 +1,109 @@
+"""
+Unit tests for speculative item extraction
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.services.conversation.speculative_extraction_service import SpeculativeExtractionService
+from app.agents.agent_response.item_extraction_response import ItemExtractionResponse, ExtractedItem
+
+EXTRACTION_TARGET = "app.core.services.conversation.speculative_extraction_service.item_extraction_agent"
+
+
+def make_slow_extraction(calls, delay=0.05):
+    """Build an item_extraction_agent stand-in that records calls and cancellations"""
+    async def extraction(user_input, context):
+        calls.append(user_input)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls.append("cancelled")
+            raise
+        return ItemExtractionResponse(
+            success=True,
+            confidence=0.9,
+            extracted_items=[ExtractedItem(item_name=user_input, quantity=1, confidence=0.9)]
+        )
+    return extraction
+
+
+class TestSpeculativeExtractionService:
+    """Test launch, hand-off and discard accounting"""
+
+    def test_disabled_does_not_start(self):
+        """No task is created when speculation is off"""
+        service = SpeculativeExtractionService(enabled=False)
+
+        assert service.start("I want a burger", "1", [], {}) is None
+        assert service.get_stats()["launched"] == 0
+
+    @pytest.mark.asyncio
+    async def test_claimed_extraction_is_saved(self):
+        """An ADD_ITEM turn reuses the in-flight extraction"""
+        calls = []
+        service = SpeculativeExtractionService(enabled=True)
+
+        with patch(EXTRACTION_TARGET, make_slow_extraction(calls)):
+            speculation = service.start("I want a burger", "1", [], {})
+            await asyncio.sleep(0)
+            task = service.claim(speculation)
+            response = await task
+            service.release(speculation)
+
+        assert response.success
+        assert calls == ["I want a burger"]
+        stats = service.get_stats()
+        assert stats["saved"] == 1
+        assert stats["wasted"] == 0
+        assert stats["hit_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_unclaimed_running_extraction_is_cancelled(self):
+        """Another intent cancels the started extraction and counts it as wasted"""
+        calls = []
+        service = SpeculativeExtractionService(enabled=True)
+
+        with patch(EXTRACTION_TARGET, make_slow_extraction(calls, delay=10)):
+            speculation = service.start("what's on the menu", "1", [], {})
+            await asyncio.sleep(0)
+            service.release(speculation)
+            await asyncio.sleep(0)
+
+        assert speculation.task.cancelled()
+        assert calls == ["what's on the menu", "cancelled"]
+        assert service.get_stats()["wasted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_release_before_start_skips_llm_call(self):
+        """A synchronous (fast-path) classification cancels before the call is made"""
+        calls = []
+        service = SpeculativeExtractionService(enabled=True)
+
+        with patch(EXTRACTION_TARGET, make_slow_extraction(calls)):
+            speculation = service.start("that's all", "1", [], {})
+            service.release(speculation)
+            await asyncio.sleep(0)
+
+        assert calls == []
+        stats = service.get_stats()
+        assert stats["skipped"] == 1
+        assert stats["wasted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_overlap_hides_extraction_latency(self):
+        """Extraction running alongside classification costs max() rather than sum() of latencies"""
+        calls = []
+        service = SpeculativeExtractionService(enabled=True)
+        loop = asyncio.get_running_loop()
+
+        with patch(EXTRACTION_TARGET, make_slow_extraction(calls, delay=0.1)):
+            start = loop.time()
+            speculation = service.start("two fries", "1", [], {})
+            await asyncio.sleep(0.1)  # Stand-in for the classification LLM call
+            await service.claim(speculation)
+            elapsed = loop.time() - start
+
+        assert elapsed < 0.18
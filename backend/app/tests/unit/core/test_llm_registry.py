@@ -0,0 +1,99 @@
+"""
+Unit tests for the shared LLM client registry
+"""
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.llm_registry import LLMClientRegistry, PooledLLM
+
+
+class DummySchema(BaseModel):
+    """Structured output schema used for binding tests"""
+    answer: str
+
+
+class SlowRunnable:
+    """Runnable stand-in that records peak concurrency"""
+
+    def __init__(self, delay: float = 0.01, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("LLM failed")
+            return f"echo: {input}"
+        finally:
+            self.active -= 1
+
+
+class TestLLMClientRegistry:
+    """Test client reuse, concurrency caps and metrics"""
+
+    @pytest.fixture
+    def registry(self):
+        return LLMClientRegistry(api_key="test-key", max_concurrency_per_model=2)
+
+    def test_same_key_returns_same_client(self, registry):
+        """Repeated lookups reuse the client and schema binding"""
+        first = registry.get_llm("gpt-4o", temperature=0.1, schema=DummySchema)
+        second = registry.get_llm("gpt-4o", temperature=0.1, schema=DummySchema)
+
+        assert first is second
+        metrics = registry.get_metrics()["gpt-4o"]
+        assert metrics["clients_created"] == 1
+        assert metrics["bindings_created"] == 1
+
+    def test_clients_share_pooled_transport(self, registry):
+        """Different keys get distinct clients on the same HTTP pool"""
+        plain = registry.get_chat_model("gpt-4o", temperature=0.1)
+        warm = registry.get_chat_model("gpt-4o", temperature=0.7)
+        structured = registry.get_llm("gpt-4o", temperature=0.1, schema=DummySchema)
+
+        assert plain is not warm
+        assert plain.http_async_client is warm.http_async_client
+        assert registry.get_llm("gpt-4o", temperature=0.1) is not structured
+        assert registry.get_metrics()["gpt-4o"]["clients_created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_per_model(self, registry):
+        """Calls beyond the per-model cap wait for a free slot"""
+        runnable = SlowRunnable()
+        llm = PooledLLM(runnable, "gpt-4o", registry._get_semaphore("gpt-4o"), registry._get_model_metrics("gpt-4o"))
+
+        results = await asyncio.gather(*(llm.ainvoke(i) for i in range(6)))
+
+        assert results == [f"echo: {i}" for i in range(6)]
+        assert runnable.peak == 2
+        metrics = registry.get_metrics()["gpt-4o"]
+        assert metrics["calls"] == 6
+        assert metrics["peak_in_flight"] == 2
+        assert metrics["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self, registry):
+        """Failed calls are recorded and re-raised"""
+        llm = PooledLLM(SlowRunnable(fail=True), "gpt-4o", registry._get_semaphore("gpt-4o"), registry._get_model_metrics("gpt-4o"))
+
+        with pytest.raises(RuntimeError):
+            await llm.ainvoke("hello")
+
+        assert registry.get_metrics()["gpt-4o"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_aclose_drops_clients(self, registry):
+        """Closing the registry closes the pool and forces new clients"""
+        first = registry.get_chat_model("gpt-4o")
+        await registry.aclose()
+
+        assert first.http_async_client.is_closed
+        assert registry.get_chat_model("gpt-4o") is not first
@@ -0,0 +1,141 @@
+"""
+Unit tests for write-behind archival of customer recordings
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.audio_archive_queue import AudioArchiveQueue
+from app.services.voice_service import VoiceService
+from app.tests.helpers.mock_services import MockFileStorageService
+
+
+def spooled(tmp_path):
+    return sorted(path.name for path in tmp_path.glob("*") if path.is_file())
+
+
+class TestAudioArchiveQueue:
+    """Recordings are spooled immediately and uploaded in the background"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_does_not_wait_for_upload(self, tmp_path):
+        storage = MockFileStorageService(upload_delay=0.3)
+        queue = AudioArchiveQueue(storage, spool_dir=str(tmp_path))
+
+        start = time.perf_counter()
+        archive_id = await queue.enqueue(b"audio", "turn.webm", "audio/webm", restaurant_id=1, session_id="s1")
+        assert time.perf_counter() - start < 0.3
+        assert spooled(tmp_path) == [f"{archive_id}.audio", f"{archive_id}.json"]
+        assert queue.get_stats()["backlog"] == 1
+        assert queue.get_stats()["backlog_bytes"] == 5
+
+        assert await queue.flush(timeout=2)
+        assert storage.stored == [("turn.webm", "audio/webm", 1, b"audio")]
+        assert spooled(tmp_path) == []
+        stats = queue.get_stats()
+        assert (stats["backlog"], stats["enqueued"], stats["uploaded"]) == (0, 1, 1)
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_uploads_are_retried(self, tmp_path):
+        storage = MockFileStorageService(failures=2)
+        queue = AudioArchiveQueue(storage, spool_dir=str(tmp_path), retry_base_seconds=0.01)
+
+        await queue.enqueue(b"audio", "turn.webm", "audio/webm", restaurant_id=1)
+        for _ in range(100):
+            if storage.stored:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(storage.stored) == 1
+        assert queue.get_stats()["retries"] == 2
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, tmp_path):
+        storage = MockFileStorageService(failures=100)
+        queue = AudioArchiveQueue(storage, spool_dir=str(tmp_path), max_attempts=3, retry_base_seconds=0.01)
+
+        archive_id = await queue.enqueue(b"audio", "turn.webm", "audio/webm")
+        for _ in range(100):
+            if queue.get_stats()["failed"]:
+                break
+            await asyncio.sleep(0.01)
+
+        assert storage.calls.count("store_file") == 3
+        assert queue.get_stats()["failed"] == 1
+        assert spooled(tmp_path) == []
+        assert sorted(path.name for path in (tmp_path / "failed").iterdir()) == [f"{archive_id}.audio", f"{archive_id}.json"]
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_flush_does_not_use_up_attempts(self, tmp_path):
+        storage = MockFileStorageService(failures=100)
+        queue = AudioArchiveQueue(storage, spool_dir=str(tmp_path), max_attempts=3, retry_base_seconds=60)
+
+        archive_id = await queue.enqueue(b"audio", "turn.webm", "audio/webm")
+        start = time.perf_counter()
+        assert not await queue.flush(timeout=5)
+        assert time.perf_counter() - start < 2
+
+        # The first upload plus one retry, neither counted against max_attempts
+        assert storage.calls.count("store_file") == 2
+        assert queue.get_stats()["failed"] == 0
+        assert spooled(tmp_path) == [f"{archive_id}.audio", f"{archive_id}.json"]
+        assert queue._read_metadata(archive_id)["attempts"] == 0
+        assert not (tmp_path / "failed").exists()
+
+        assert not await queue.stop(timeout=5)
+        assert storage.calls.count("store_file") == 3
+        assert spooled(tmp_path) == [f"{archive_id}.audio", f"{archive_id}.json"]
+
+    @pytest.mark.asyncio
+    async def test_flush_skips_retry_backoff(self, tmp_path):
+        storage = MockFileStorageService(failures=1)
+        queue = AudioArchiveQueue(storage, spool_dir=str(tmp_path), retry_base_seconds=60)
+
+        await queue.enqueue(b"audio", "turn.webm", "audio/webm")
+        start = time.perf_counter()
+        assert await queue.flush(timeout=5)
+        assert time.perf_counter() - start < 2
+        assert len(storage.stored) == 1
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_backlog_survives_restart(self, tmp_path):
+        down = MockFileStorageService(failures=100)
+        queue = AudioArchiveQueue(down, spool_dir=str(tmp_path), retry_base_seconds=60)
+        await queue.enqueue(b"one", "one.webm", "audio/webm", restaurant_id=1)
+        await queue.enqueue(b"two", "two.webm", "audio/webm", restaurant_id=2)
+        assert not await queue.stop(timeout=0.2)
+        assert len(spooled(tmp_path)) == 4
+
+        storage = MockFileStorageService()
+        restarted = AudioArchiveQueue(storage, spool_dir=str(tmp_path))
+        assert await restarted.start() == 2
+        assert restarted.get_stats()["backlog"] == 2
+        assert await restarted.flush(timeout=2)
+        assert sorted(name for name, _, _, _ in storage.stored) == ["one.webm", "two.webm"]
+        assert spooled(tmp_path) == []
+        await restarted.stop()
+
+    @pytest.mark.asyncio
+    async def test_voice_service_archives_through_queue(self, tmp_path, monkeypatch):
+        storage = MockFileStorageService(upload_delay=0.3)
+        voice_service = VoiceService(
+            text_to_speech_service=AsyncMock(),
+            speech_to_text_service=AsyncMock(),
+            file_storage_service=storage,
+            redis_service=AsyncMock()
+        )
+        voice_service.audio_archive = AudioArchiveQueue(storage, spool_dir=str(tmp_path))
+
+        start = time.perf_counter()
+        archive_id = await voice_service.archive_uploaded_audio(b"audio", "turn.m4a", "audio/m4a", restaurant_id=3, session_id="s1")
+        assert archive_id
+        assert time.perf_counter() - start < 0.3
+        assert await voice_service.audio_archive.stop(timeout=2)
+        assert storage.stored == [("turn.m4a", "audio/m4a", 3, b"audio")]
@@ -0,0 +1,106 @@
+"""
+Unit tests for reading an upload once and sharing the buffer through the pipeline
+"""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.dto.order_result import OrderResult
+from app.services import audio_pipeline_service as pipeline_module
+from app.services.audio_buffer import as_bytes, read_upload
+from app.services.audio_pipeline_service import AudioPipelineService
+
+
+class CountingUpload(UploadFile):
+    """UploadFile that counts reads"""
+
+    reads = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads += 1
+        return await super().read(size)
+
+
+def upload(data, content_type="audio/webm"):
+    return CountingUpload(io.BytesIO(data), filename="turn.webm", headers=Headers({"content-type": content_type}))
+
+
+class TestAudioBuffer:
+    """One read, then views over the same bytes"""
+
+    @pytest.mark.asyncio
+    async def test_read_upload_reads_once_from_start(self):
+        audio_file = upload(b"audio")
+        await audio_file.read()
+
+        view = await read_upload(audio_file)
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert bytes(view) == b"audio"
+        assert audio_file.reads == 2
+
+    def test_as_bytes_unwraps_whole_views(self):
+        data = b"audio"
+        assert as_bytes(data) is data
+        assert as_bytes(memoryview(data)) is data
+        assert as_bytes(memoryview(data)[1:]) == b"udio"
+        assert as_bytes(bytearray(data)) == data
+
+
+class TestPipelineSingleRead:
+    """Validation, archival and STT share the buffer from a single read"""
+
+    @pytest.fixture
+    def voice_service(self):
+        return SimpleNamespace(
+            canned_phrases=SimpleNamespace(ensure_loaded=AsyncMock()),
+            archive_uploaded_audio=AsyncMock(return_value="archive-1"),
+            transcribe_audio=AsyncMock(return_value="a burger please"),
+            get_canned_phrase=AsyncMock(return_value="https://cdn/come_again.mp3"),
+        )
+
+    @pytest.fixture
+    def pipeline(self, voice_service, monkeypatch):
+        monkeypatch.setattr(pipeline_module.settings, "AUDIO_PREPROCESSING_ENABLED", False)
+        monkeypatch.setattr(pipeline_module, "RestaurantRepository", lambda db: SimpleNamespace(
+            restaurant_exists_and_active=AsyncMock(return_value=True)
+        ))
+        validation_service = SimpleNamespace(validate_input=AsyncMock(return_value=OrderResult.success("ok")))
+        order_session_service = SimpleNamespace(
+            get_conversation_workflow_state=AsyncMock(return_value={
+                "session_id": "session-1",
+                "restaurant_id": 1,
+                "conversation_history": [],
+                "order_state": {"line_items": []},
+            })
+        )
+        orchestrator = SimpleNamespace(process_conversation_turn=AsyncMock(return_value={
+            "session_id": "session-1", "response_text": "Added", "audio_url": "https://cdn/r.mp3", "success": True
+        }))
+        return AudioPipelineService(voice_service, validation_service, order_session_service, orchestrator)
+
+    @pytest.mark.asyncio
+    async def test_upload_read_once_and_shared(self, pipeline, voice_service):
+        audio_file = upload(b"\x1aE\xdf\xa3" + bytes(4096))
+
+        result = await pipeline.process_audio_pipeline(audio_file, "session-1", 1, "en", db=None)
+
+        assert result["success"] is True
+        assert audio_file.reads == 1
+        archived = voice_service.archive_uploaded_audio.await_args.kwargs["audio_data"]
+        transcribed = voice_service.transcribe_audio.await_args.kwargs["audio_data"]
+        # Both see the upload's own bytes object, not copies of it
+        assert as_bytes(archived) is as_bytes(transcribed)
+
+    @pytest.mark.asyncio
+    async def test_empty_upload_rejected(self, pipeline, voice_service):
+        result = await pipeline.process_audio_pipeline(upload(b""), "session-1", 1, "en", db=None)
+
+        assert result["success"] is False
+        voice_service.archive_uploaded_audio.assert_not_awaited()
+        voice_service.transcribe_audio.assert_not_awaited()
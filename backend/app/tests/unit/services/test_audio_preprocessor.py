@@ -0,0 +1,140 @@
+"""
+Unit tests for trimming, downsampling and re-encoding audio before speech-to-text
+"""
+
+import io
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.services import audio_preprocessor as preprocessor_module
+from app.services.audio_pipeline_service import AudioPipelineService
+from app.services.audio_preprocessor import AudioPreprocessor, AudioTooLongError
+
+NO_FFMPEG = "no-such-ffmpeg-binary"
+
+
+def make_wav(seconds_of_speech, rate=44100, channels=2, lead=1.0, tail=1.0, noise_rms=600, seed=0):
+    """Engine noise, a spoken-ish tone, engine noise"""
+    rng = np.random.default_rng(seed)
+    total = int((lead + seconds_of_speech + tail) * rate)
+    samples = rng.normal(0, noise_rms, total)
+    start = int(lead * rate)
+    t = np.arange(int(seconds_of_speech * rate)) / rate
+    samples[start:start + len(t)] += 8000 * np.sin(2 * np.pi * 220 * t)
+    pcm = np.repeat(np.clip(samples, -32768, 32767).astype("<i2"), channels)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def read_wav(data):
+    with wave.open(io.BytesIO(data)) as wav:
+        return wav.getframerate(), wav.getnchannels(), wav.getnframes() / wav.getframerate()
+
+
+@pytest.fixture
+def preprocessor():
+    return AudioPreprocessor(ffmpeg_path=NO_FFMPEG)
+
+
+class TestAudioPreprocessor:
+    """Recordings shrink to 16 kHz mono speech"""
+
+    def test_trims_noise_and_downsamples(self, preprocessor):
+        original = make_wav(1.5)
+        prepared = preprocessor.prepare(original, "wav")
+
+        assert prepared.processed and prepared.audio_format == "wav"
+        rate, channels, duration = read_wav(prepared.data)
+        assert (rate, channels) == (16000, 1)
+        # 1.5 s of speech plus up to 200 ms padding each side; 2 s of engine noise gone
+        assert 1.5 <= duration <= 1.95
+        assert prepared.duration_seconds == pytest.approx(duration, abs=0.01)
+        assert len(prepared.data) < len(original) / 6
+
+    def test_integer_ratio_downsampling(self):
+        samples = np.ones(48000, dtype=np.float32)
+        assert len(AudioPreprocessor.resample(samples, 48000, 16000)) == 16000
+        assert len(AudioPreprocessor.resample(samples[:44100], 44100, 16000)) == 16000
+        assert AudioPreprocessor.resample(samples, 8000, 16000) is samples
+
+    def test_silence_and_noise_only_has_no_speech(self, preprocessor):
+        prepared = preprocessor.prepare(make_wav(0.0), "wav")
+        assert not prepared.has_speech
+        assert prepared.data == b""
+
+    def test_rejects_too_much_speech(self):
+        preprocessor = AudioPreprocessor(max_duration_seconds=1.0, ffmpeg_path=NO_FFMPEG)
+        with pytest.raises(AudioTooLongError):
+            preprocessor.prepare(make_wav(1.5), "wav")
+
+    def test_compressed_audio_passes_through_without_ffmpeg(self, preprocessor):
+        prepared = preprocessor.prepare(b"\x1aE\xdf\xa3webm-bytes", "webm")
+        assert not prepared.processed
+        assert prepared.has_speech
+        assert (prepared.data, prepared.audio_format) == (b"\x1aE\xdf\xa3webm-bytes", "webm")
+
+    def test_undecodable_wav_passes_through(self, preprocessor):
+        prepared = preprocessor.prepare(b"RIFF-not-really", "wav")
+        assert not prepared.processed and prepared.data == b"RIFF-not-really"
+
+    def test_disabled(self, preprocessor, monkeypatch):
+        monkeypatch.setattr(preprocessor_module.settings, "AUDIO_PREPROCESSING_ENABLED", False)
+        original = make_wav(1.0)
+        assert preprocessor.prepare(original, "wav").data == original
+
+
+class TestPipelineTranscription:
+    """The pipeline sends the prepared audio to speech-to-text"""
+
+    @pytest.fixture
+    def voice_service(self):
+        return SimpleNamespace(transcribe_audio=AsyncMock(return_value="two burgers"))
+
+    @pytest.fixture
+    def pipeline(self, voice_service):
+        pipeline = AudioPipelineService(voice_service, AsyncMock(), AsyncMock(), AsyncMock())
+        pipeline.audio_preprocessor = AudioPreprocessor(ffmpeg_path=NO_FFMPEG)
+        return pipeline
+
+    @staticmethod
+    def upload(data):
+        return UploadFile(io.BytesIO(data), filename="turn.wav", headers=Headers({"content-type": "audio/wav"}))
+
+    @pytest.mark.asyncio
+    async def test_transcribes_prepared_audio(self, pipeline, voice_service):
+        original = make_wav(1.5)
+        result = await pipeline._transcribe_audio(self.upload(original), original, "en")
+
+        assert result.is_success
+        assert result.data["transcript"] == "two burgers"
+        sent = voice_service.transcribe_audio.call_args.kwargs
+        assert sent["audio_format"] == "wav"
+        assert len(sent["audio_data"]) < len(original) / 6
+
+    @pytest.mark.asyncio
+    async def test_no_speech_skips_stt(self, pipeline, voice_service):
+        original = make_wav(0.0)
+        result = await pipeline._transcribe_audio(self.upload(original), original, "en")
+
+        assert result.is_error
+        voice_service.transcribe_audio.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_too_long_skips_stt(self, pipeline, voice_service):
+        pipeline.audio_preprocessor.max_duration_seconds = 1.0
+        original = make_wav(1.5)
+        result = await pipeline._transcribe_audio(self.upload(original), original, "en")
+
+        assert result.is_error and "max" in result.message
+        voice_service.transcribe_audio.assert_not_called()
@@ -0,0 +1,258 @@
+"""
+Unit tests for streaming audio ingestion with incremental transcription
+"""
+
+import asyncio
+import io
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.dto.order_result import OrderResult
+from app.services import audio_pipeline_service as pipeline_module
+from app.services.audio_pipeline_service import AudioPipelineService
+from app.services.speech_segmenter import SpeechSegmenter, pcm_to_wav
+
+SAMPLE_RATE = 16000
+STT_SECONDS_PER_AUDIO_SECOND = 0.1
+CHUNK_MS = 100
+CHUNK_DELAY = 0.02  # 5x faster than real time
+
+
+def tone(ms, amplitude=8000):
+    t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+
+
+def silence(ms):
+    return bytes(SAMPLE_RATE * ms // 1000 * 2)
+
+
+# "burger" ... pause ... "burger" ... pause ... "burger"
+UTTERANCE = silence(200) + tone(600) + silence(400) + tone(600) + silence(400) + tone(600) + silence(400)
+
+
+def chunks(pcm):
+    size = SAMPLE_RATE * CHUNK_MS // 1000 * 2
+    return [pcm[i:i + size] for i in range(0, len(pcm), size)]
+
+
+class FakeVoiceService:
+    """STT that takes time proportional to the audio and says "burger" per spoken word"""
+
+    def __init__(self):
+        self.transcribe_calls = []
+        self.stored = []
+        self.canned_phrases = SimpleNamespace(ensure_loaded=AsyncMock())
+        self.get_canned_phrase = AsyncMock(return_value="https://cdn/come_again.mp3")
+
+    async def transcribe_audio(self, audio_data, audio_format="webm", language="english"):
+        self.transcribe_calls.append((time.perf_counter(), audio_format))
+        with wave.open(io.BytesIO(audio_data)) as wav:
+            pcm = wav.readframes(wav.getnframes())
+        await asyncio.sleep(len(pcm) / 2 / SAMPLE_RATE * STT_SECONDS_PER_AUDIO_SECOND)
+        segmenter = SpeechSegmenter(SAMPLE_RATE)
+        words = len(segmenter.feed(pcm)) + (1 if segmenter.flush() else 0)
+        return " ".join(["burger"] * words)
+
+    async def archive_uploaded_audio(self, audio_data, filename, content_type, restaurant_id, session_id=None):
+        self.stored.append((filename, content_type, len(audio_data)))
+        return "archive-1"
+
+
+class FakeOrderSessionService:
+    async def get_conversation_workflow_state(self, session_id, user_input):
+        await asyncio.sleep(0.05)
+        return {
+            "session_id": session_id,
+            "restaurant_id": 1,
+            "user_input": user_input,
+            "conversation_history": [],
+            "order_state": {"line_items": []},
+        }
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.inputs = []
+
+    async def process_conversation_turn(self, user_input, session_id, restaurant_id, conversation_history, order_state):
+        self.inputs.append(user_input)
+        return {"session_id": session_id, "response_text": "Added burgers", "audio_url": "https://cdn/r.mp3", "success": True}
+
+
+class FakeRestaurantRepository:
+    exists = True
+
+    def __init__(self, db):
+        pass
+
+    async def restaurant_exists_and_active(self, restaurant_id):
+        await asyncio.sleep(0.05)
+        return self.exists
+
+
+@pytest.fixture(autouse=True)
+def restaurant_repository(monkeypatch):
+    FakeRestaurantRepository.exists = True
+    monkeypatch.setattr(pipeline_module, "RestaurantRepository", FakeRestaurantRepository)
+    return FakeRestaurantRepository
+
+
+@pytest.fixture
+def voice_service():
+    return FakeVoiceService()
+
+
+@pytest.fixture
+def orchestrator():
+    return FakeOrchestrator()
+
+
+@pytest.fixture
+def pipeline(voice_service, orchestrator):
+    validation_service = SimpleNamespace(validate_input=AsyncMock(return_value=OrderResult.success("ok")))
+    return AudioPipelineService(voice_service, validation_service, FakeOrderSessionService(), orchestrator)
+
+
+async def speak(stream, pcm):
+    """Feed audio at (accelerated) real-time pace"""
+    for chunk in chunks(pcm):
+        stream.feed(chunk)
+        await asyncio.sleep(CHUNK_DELAY)
+
+
+class TestSpeechSegmenter:
+    """Pause detection on 16-bit mono PCM"""
+
+    def test_cuts_at_pauses_and_drops_leading_silence(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE, min_silence_ms=300)
+        segments = []
+        for chunk in chunks(UTTERANCE):
+            segments.extend(segmenter.feed(chunk))
+
+        assert len(segments) == 3
+        assert segmenter.flush() is None
+        # Each segment is the word plus the pause that closed it, never the leading silence
+        assert all(len(tone(600)) <= len(segment) <= len(tone(600) + silence(400)) for segment in segments)
+
+    def test_chunks_split_mid_frame(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE, min_silence_ms=300)
+        segments = []
+        for i in range(0, len(UTTERANCE), 333):
+            segments.extend(segmenter.feed(UTTERANCE[i:i + 333]))
+        assert len(segments) == 3
+
+    def test_flush_returns_unfinished_speech(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE, min_silence_ms=300)
+        assert segmenter.feed(tone(500)) == []
+        assert len(segmenter.flush()) == len(tone(500))
+        assert segmenter.flush() is None
+
+    def test_long_speech_is_cut_at_max_segment(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE, min_silence_ms=300, max_segment_ms=1000)
+        assert len(segmenter.feed(tone(2500))) == 2
+
+    def test_pcm_to_wav(self):
+        with wave.open(io.BytesIO(pcm_to_wav(tone(100), SAMPLE_RATE))) as wav:
+            assert (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (SAMPLE_RATE, 1, 2)
+            assert wav.readframes(wav.getnframes()) == tone(100)
+
+
+class TestAudioStream:
+    """Transcription overlaps speech; the turn runs through the same orchestration"""
+
+    @pytest.mark.asyncio
+    async def test_segments_transcribed_before_end_of_speech(self, pipeline, voice_service, orchestrator):
+        partials = []
+
+        async def on_transcript(segment, text):
+            partials.append((segment, text))
+
+        stream = pipeline.open_audio_stream("session-1", 1, "en", db=None, on_transcript=on_transcript)
+        await speak(stream, UTTERANCE)
+
+        # Still talking as far as the server knows, but every word is already transcribed
+        assert stream.segments_started == 3
+        assert len(partials) >= 2
+        assert all(audio_format == "wav" for _, audio_format in voice_service.transcribe_calls)
+
+        result = await stream.finish()
+        assert result["success"] is True
+        assert orchestrator.inputs == ["burger burger burger"]
+        assert sorted(partials) == [(0, "burger"), (1, "burger"), (2, "burger")]
+        # The whole recording is still archived, as a WAV
+        assert voice_service.stored[0][1] == "audio/wav"
+
+    @pytest.mark.asyncio
+    async def test_stream_responds_sooner_than_upload(self, pipeline, voice_service, orchestrator):
+        wav_data = pcm_to_wav(UTTERANCE, SAMPLE_RATE)
+        upload = UploadFile(io.BytesIO(wav_data), filename="turn.wav", headers=Headers({"content-type": "audio/wav"}))
+        # The upload path can't start until the customer has finished speaking
+        await asyncio.sleep(len(chunks(UTTERANCE)) * CHUNK_DELAY)
+        start = time.perf_counter()
+        upload_result = await pipeline.process_audio_pipeline(upload, "session-1", 1, "en", db=None)
+        upload_latency = time.perf_counter() - start
+
+        stream = pipeline.open_audio_stream("session-1", 1, "en", db=None)
+        await speak(stream, UTTERANCE)
+        start = time.perf_counter()
+        stream_result = await stream.finish()
+        stream_latency = time.perf_counter() - start
+
+        assert upload_result["response_text"] == stream_result["response_text"]
+        assert orchestrator.inputs == ["burger burger burger", "burger burger burger"]
+        print(f"\nend of speech -> response: upload {upload_latency * 1000:.0f} ms, stream {stream_latency * 1000:.0f} ms")
+        assert stream_latency < upload_latency / 2
+
+    @pytest.mark.asyncio
+    async def test_container_format_transcribed_at_end(self, pipeline, voice_service, orchestrator):
+        stream = pipeline.open_audio_stream("session-1", 1, "en", db=None, audio_format="wav")
+        stream.feed(pcm_to_wav(UTTERANCE, SAMPLE_RATE))
+        assert voice_service.transcribe_calls == []
+
+        result = await stream.finish()
+        assert result["success"] is True
+        assert [audio_format for _, audio_format in voice_service.transcribe_calls] == ["wav"]
+        assert orchestrator.inputs == ["burger burger burger"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_restaurant_returns_error_state(self, pipeline, orchestrator, restaurant_repository):
+        restaurant_repository.exists = False
+        stream = pipeline.open_audio_stream("session-1", 99, "en", db=None)
+        await speak(stream, UTTERANCE)
+
+        result = await stream.finish()
+        assert result["success"] is False
+        assert "Restaurant 99 not found or inactive" in result["errors"][0]
+        assert orchestrator.inputs == []
+
+    @pytest.mark.asyncio
+    async def test_silence_only_falls_back(self, pipeline, voice_service, orchestrator):
+        stream = pipeline.open_audio_stream("session-1", 1, "en", db=None)
+        stream.feed(silence(1000))
+
+        result = await stream.finish()
+        assert result["error"] == "Speech transcription failed"
+        assert result["audio_url"] == "https://cdn/come_again.mp3"
+        assert voice_service.transcribe_calls == []
+        assert orchestrator.inputs == []
+
+    @pytest.mark.asyncio
+    async def test_size_limit_and_abort(self, pipeline, voice_service, monkeypatch):
+        monkeypatch.setattr(pipeline_module.settings, "STREAM_AUDIO_MAX_BYTES", len(tone(600)))
+        stream = pipeline.open_audio_stream("session-1", 1, "en", db=None)
+        stream.feed(tone(600))
+        with pytest.raises(ValueError):
+            stream.feed(silence(20))
+
+        await stream.abort()
+        with pytest.raises(ValueError):
+            stream.feed(b"")
+        assert voice_service.stored == []
@@ -0,0 +1,145 @@
+"""
+Unit tests for bulk canned audio generation
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.canned_audio_generator import CannedAudioGenerator
+from app.services.canned_phrase_table import CannedPhraseTable
+from app.constants.audio_phrases import AudioPhraseType, AudioPhraseConstants
+from app.tests.helpers.mock_services import MockFileStorageService
+
+TTS_DELAY = 0.02
+PHRASES = AudioPhraseConstants.get_all_phrase_types()
+SHARED_TEXTS = {
+    AudioPhraseConstants.get_phrase_text(phrase_type)
+    for phrase_type in PHRASES if CannedAudioGenerator.is_shared_phrase(phrase_type)
+}
+PER_RESTAURANT = sum(not CannedAudioGenerator.is_shared_phrase(phrase_type) for phrase_type in PHRASES)
+
+
+class SlowTTS:
+    def __init__(self):
+        self.texts = []
+        self.active = 0
+        self.peak = 0
+
+    async def generate_audio_stream(self, text, voice="nova"):
+        self.texts.append(text)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(TTS_DELAY)
+            yield text.encode()
+        finally:
+            self.active -= 1
+
+
+class FakeRedisService:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=1800):
+        self.values[key] = value
+        return True
+
+
+def make_generator(tts, storage, redis_service=None, tts_concurrency=4):
+    return CannedAudioGenerator(
+        tts, storage, CannedPhraseTable(storage), redis_service,
+        tts_concurrency=tts_concurrency, upload_concurrency=8, restaurant_concurrency=4
+    )
+
+
+RESTAURANTS = [(1, "Burger Barn"), (2, "Taco Town"), (3, "Pizza Place")]
+
+
+class TestCannedAudioGenerator:
+    """Bulk jobs dedupe shared phrases, respect limits and resume"""
+
+    @pytest.mark.asyncio
+    async def test_shared_phrases_are_synthesized_once_per_job(self):
+        tts, storage = SlowTTS(), MockFileStorageService()
+        generator = make_generator(tts, storage)
+
+        job = await generator.generate(RESTAURANTS)
+
+        assert job["status"] == "completed"
+        assert job["generated"] == len(PHRASES) * len(RESTAURANTS)
+        assert len(storage.objects) == len(PHRASES) * len(RESTAURANTS)
+        assert len(tts.texts) == len(SHARED_TEXTS) + PER_RESTAURANT * len(RESTAURANTS)
+        assert storage.objects[CannedPhraseTable.path(AudioPhraseType.GREETING, 2)] == b"Welcome to Taco Town, may I take your order?"
+        # Generated URLs are in the table, so the turn path needs no storage call
+        assert generator.canned_phrases.is_loaded(3)
+        assert await generator.canned_phrases.get(AudioPhraseType.COME_AGAIN, 3) == storage.get_url(
+            CannedPhraseTable.path(AudioPhraseType.COME_AGAIN, 3)
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_and_faster_than_sequential(self):
+        tts = SlowTTS()
+        generator = make_generator(tts, MockFileStorageService(), tts_concurrency=4)
+
+        start = time.perf_counter()
+        await generator.generate(RESTAURANTS)
+        elapsed = time.perf_counter() - start
+
+        assert tts.peak == 4
+        assert elapsed < len(tts.texts) * TTS_DELAY / 2
+
+    @pytest.mark.asyncio
+    async def test_existing_phrases_are_skipped(self):
+        tts, storage = SlowTTS(), MockFileStorageService()
+        storage.objects[CannedPhraseTable.path(AudioPhraseType.GREETING, 1)] = b"custom greeting"
+        generator = make_generator(tts, storage)
+
+        outcome = await generator.generate_restaurant(1, "Burger Barn")
+
+        assert outcome["skipped"] == 1 and outcome["generated"] == len(PHRASES) - 1
+        assert storage.objects[CannedPhraseTable.path(AudioPhraseType.GREETING, 1)] == b"custom greeting"
+        assert "Welcome to Burger Barn, may I take your order?" not in tts.texts
+
+    @pytest.mark.asyncio
+    async def test_resume_only_redoes_unfinished_restaurants(self):
+        redis_service = FakeRedisService()
+        storage = MockFileStorageService(fail_prefix="restaurants/2/")
+        job = await make_generator(SlowTTS(), storage, redis_service).generate(RESTAURANTS)
+
+        assert job["status"] == "incomplete"
+        assert sorted(job["completed_restaurants"]) == [1, 3]
+        assert job["failed"] == len(PHRASES)
+
+        # A fresh process (e.g. after a crash) picks the job up from Redis
+        storage.fail_prefix = None
+        storage.checked.clear()
+        generator = make_generator(SlowTTS(), storage, redis_service)
+        stored = await generator.get_job(job["job_id"])
+        assert stored["running"] is False
+
+        assert await generator.resume_job(job["job_id"])
+        await generator.wait_for_jobs()
+
+        resumed = await generator.get_job(job["job_id"])
+        assert resumed["status"] == "completed"
+        assert resumed["restaurants_done"] == len(RESTAURANTS)
+        assert storage.checked == [CannedPhraseTable.path(phrase_type, 2) for phrase_type in AudioPhraseType]
+        assert len(storage.objects) == len(PHRASES) * len(RESTAURANTS)
+        assert not await generator.resume_job(job["job_id"])
+
+    @pytest.mark.asyncio
+    async def test_storage_outage_does_not_regenerate_existing_phrases(self):
+        tts, storage = SlowTTS(), MockFileStorageService(down=True)
+        storage.objects[CannedPhraseTable.path(AudioPhraseType.GREETING, 1)] = b"custom greeting"
+
+        job = await make_generator(tts, storage).generate(RESTAURANTS[:1])
+
+        assert job["status"] == "incomplete"
+        assert job["completed_restaurants"] == [] and job["generated"] == 0
+        assert tts.texts == []
+        assert storage.objects == {CannedPhraseTable.path(AudioPhraseType.GREETING, 1): b"custom greeting"}
@@ -0,0 +1,134 @@
+"""
+Unit tests for the in-process canned phrase URL table
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.voice_service import VoiceService
+from app.services.canned_phrase_table import CannedPhraseTable
+from app.constants.audio_phrases import AudioPhraseType
+from app.tests.helpers.mock_services import MockFileStorageService
+
+
+def greeting_key(restaurant_id):
+    return CannedPhraseTable.path(AudioPhraseType.GREETING, restaurant_id)
+
+
+@pytest.fixture
+def storage():
+    keys = [greeting_key(1), greeting_key(2), "restaurants/1/audio/burger.png"]
+    return MockFileStorageService(objects=dict.fromkeys(keys, b"audio"))
+
+
+@pytest.fixture
+def voice_service(storage):
+    return VoiceService(
+        text_to_speech_service=AsyncMock(),
+        speech_to_text_service=AsyncMock(),
+        file_storage_service=storage,
+        redis_service=AsyncMock()
+    )
+
+
+class TestCannedPhraseTable:
+    """Canned responses resolve from memory after one load per restaurant"""
+
+    @pytest.mark.asyncio
+    async def test_turn_path_has_no_storage_io_after_first_lookup(self, voice_service, storage):
+        first = await voice_service.get_canned_phrase(AudioPhraseType.GREETING, 1)
+        storage.calls.clear()
+
+        for _ in range(50):
+            assert await voice_service.get_canned_phrase(AudioPhraseType.GREETING, 1) == first
+
+        assert first == storage.get_url(greeting_key(1))
+        assert storage.calls == []
+
+    @pytest.mark.asyncio
+    async def test_ensure_loaded_only_touches_storage_the_first_time(self, voice_service, storage):
+        """The streaming warm-up calls this on every turn"""
+        await voice_service.canned_phrases.ensure_loaded(1)
+        storage.calls.clear()
+
+        for _ in range(5):
+            await voice_service.canned_phrases.ensure_loaded(1)
+
+        assert storage.calls == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_lookups_share_one_load(self, voice_service, storage):
+        urls = await asyncio.gather(*(voice_service.get_canned_phrase(AudioPhraseType.GREETING, "1") for _ in range(20)))
+
+        assert set(urls) == {storage.get_url(greeting_key(1))}
+        assert storage.calls == ["file_exists"] * len(AudioPhraseType)
+
+    @pytest.mark.asyncio
+    async def test_load_cost_does_not_grow_with_archived_recordings(self, voice_service, storage):
+        """Recordings and fragments share the audio/ prefix; loading only checks the phrase keys"""
+        storage.objects.update((f"restaurants/1/audio/recording_{n}.webm", b"audio") for n in range(500))
+        storage.objects["restaurants/1/audio/fragments/alloy/burger.mp3"] = b"audio"
+
+        phrases = await voice_service.canned_phrases.load(1)
+
+        assert phrases == {AudioPhraseType.GREETING.value: storage.get_url(greeting_key(1))}
+        assert "list_keys" not in storage.calls
+        assert len(storage.calls) == len(AudioPhraseType)
+
+    @pytest.mark.asyncio
+    async def test_preload_and_int_or_str_ids_share_a_table(self, voice_service, storage):
+        assert await voice_service.canned_phrases.preload([1, 2]) == 2
+        storage.calls.clear()
+
+        assert await voice_service.canned_phrases.get(AudioPhraseType.GREETING, "2") == storage.get_url(greeting_key(2))
+        assert storage.calls == []
+
+    @pytest.mark.asyncio
+    async def test_phrase_added_elsewhere_is_found_and_recorded(self, voice_service, storage):
+        await voice_service.canned_phrases.load(1)
+        key = CannedPhraseTable.path(AudioPhraseType.COME_AGAIN, 1)
+        storage.objects[key] = b"audio"  # e.g. generated by another instance after our listing
+
+        assert await voice_service.get_canned_phrase(AudioPhraseType.COME_AGAIN, 1) == storage.get_url(key)
+        storage.calls.clear()
+        assert await voice_service.get_canned_phrase(AudioPhraseType.COME_AGAIN, 1) == storage.get_url(key)
+        assert storage.calls == []
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_on_next_lookup(self, voice_service, storage):
+        table = voice_service.canned_phrases
+        await table.get(AudioPhraseType.GREETING, 1)
+        del storage.objects[greeting_key(1)]
+
+        table.invalidate(1)
+
+        assert await table.get(AudioPhraseType.GREETING, 1) is None
+        assert storage.calls.count("file_exists") == 2 * len(AudioPhraseType)
+
+    @pytest.mark.asyncio
+    async def test_failed_load_keeps_last_entries_unless_asked_to_raise(self, voice_service, storage):
+        table = voice_service.canned_phrases
+        await table.load(1)
+        storage.down = True
+
+        assert await table.load(1) == {AudioPhraseType.GREETING.value: storage.get_url(greeting_key(1))}
+        with pytest.raises(ConnectionError):
+            await table.load(1, raise_errors=True)
+        assert table.get_stats()["load_failures"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_table_is_served_while_it_reloads_in_the_background(self, voice_service, storage):
+        table = voice_service.canned_phrases
+        first = await table.get(AudioPhraseType.GREETING, 1)
+        table.ttl_seconds = 0
+        del storage.objects[greeting_key(1)]
+        storage.calls.clear()
+
+        assert await table.get(AudioPhraseType.GREETING, 1) == first
+        assert storage.calls == []
+
+        await table.load(1)  # Joins the background reload
+        table.ttl_seconds = 60
+        assert await table.get(AudioPhraseType.GREETING, 1) is None
@@ -0,0 +1,207 @@
+"""
+Unit tests for inventory reservations across lanes: held on add, given back on
+remove/clear/cancel, taken off the database stock on confirm
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.dto.order_result import ErrorCode, OrderResult
+from app.models.order import OrderStatus
+from app.services.inventory_reservations import InventoryReservations, ReservationResult, ingredient_demand
+from app.services.menu_ingredient_snapshot import MenuIngredientSnapshot
+from app.services.order_service import OrderService
+from app.services.redis_order_store import OrderMutationResult
+
+BURGER = 1
+ORDER_ID = "redis_1"
+
+
+def recipe_line(ingredient_id, name, quantity=1, stock=10, tracked=True):
+    inventory = SimpleNamespace(id=100 + ingredient_id, current_stock=stock) if tracked else None
+    ingredient = SimpleNamespace(id=ingredient_id, name=name, inventory=inventory)
+    return SimpleNamespace(menu_item_id=BURGER, ingredient_id=ingredient_id, ingredient=ingredient, quantity=quantity)
+
+
+RECIPE = [recipe_line(1, "Bun"), recipe_line(2, "Onions", 0.5, 4), recipe_line(3, "Patty", 2, 6), recipe_line(4, "Salt", tracked=False)]
+
+
+@pytest_asyncio.fixture
+async def snapshot():
+    uow = Mock()
+    uow.menu_item_ingredients = AsyncMock()
+    uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {BURGER: RECIPE}
+    return await MenuIngredientSnapshot.load(uow, [BURGER])
+
+
+@pytest.fixture
+def reservations():
+    reservations = AsyncMock(spec=InventoryReservations)
+    reservations.reserve.return_value = ReservationResult(status="OK")
+    reservations.claim.return_value = ("redis_1:claim:abc", {1: 1.0, 3: 2.0})
+    return reservations
+
+
+@pytest.fixture
+def storage():
+    storage = AsyncMock()
+    storage.get_session.return_value = {"id": "s1", "order_id": ORDER_ID}
+    storage.get_order.return_value = {
+        "id": ORDER_ID,
+        "items": [{"id": "item_1", "menu_item_id": BURGER, "quantity": 1, "customizations": ["no onions"],
+                   "menu_item": {"name": "Burger"}}]
+    }
+    storage.add_order_item.return_value = OrderMutationResult(status="OK", order={"items": []})
+    storage.remove_order_item.return_value = OrderMutationResult(status="OK", order={"items": []}, item={"menu_item": {"name": "Burger"}})
+    storage.set_order_item_quantity.return_value = OrderMutationResult(status="OK", order=storage.get_order.return_value)
+    storage.clear_order_items.return_value = OrderMutationResult(status="OK", order={"items": []}, item_count=1)
+    storage.update_order.return_value = True
+    return storage
+
+
+@pytest.fixture
+def service(storage, reservations):
+    order_validator = Mock()
+    order_validator.validate_add_item = AsyncMock(return_value=OrderResult.success("ok"))
+    service = OrderService(storage, Mock(), Mock(), order_validator, inventory_reservations=reservations)
+    service._get_menu_item_details = AsyncMock(return_value={"id": BURGER, "name": "Burger", "price": 5.0, "restaurant_id": 7})
+    return service
+
+
+class TestIngredientDemand:
+    """What one order line holds"""
+
+    def test_scales_by_quantity_and_skips_removed_and_untracked(self):
+        demand = ingredient_demand(RECIPE, 2, removed=["onions"])
+
+        assert demand == {1: (2.0, 10.0), 3: (4.0, 6.0)}
+
+    def test_quantities_are_summed_per_ingredient(self):
+        quantities = InventoryReservations._quantities(["item_1|3", "2", "item_2|3", "4.5", "item_2|1", "1"])
+
+        assert quantities == {3: 6.5, 1: 1.0}
+
+
+class TestReservationsInOrderService:
+    """Cart operations keep the holds in step with the order"""
+
+    @pytest.mark.asyncio
+    async def test_add_item_reserves_before_saving(self, service, storage, reservations, snapshot):
+        result = await service.add_item_to_order(Mock(), ORDER_ID, BURGER, 2, "s1", 7, ingredients=snapshot)
+
+        assert result.is_success
+        order_id, order_item_id, demand = reservations.reserve.await_args.args
+        assert order_id == ORDER_ID and demand == {1: (2.0, 10.0), 2: (1.0, 4.0), 3: (4.0, 6.0)}
+        assert storage.add_order_item.await_args.args[2]["id"] == order_item_id
+
+    @pytest.mark.asyncio
+    async def test_shortage_refuses_the_item(self, service, storage, reservations, snapshot):
+        reservations.reserve.return_value = ReservationResult(status="INSUFFICIENT", ingredient_id=3, available=1.0)
+
+        with patch("app.services.order_service.settings.ALLOW_NEGATIVE_INVENTORY", False):
+            result = await service.add_item_to_order(Mock(), ORDER_ID, BURGER, 2, "s1", 7, ingredients=snapshot)
+
+        assert result.is_error
+        assert result.error_code == ErrorCode.INVENTORY_SHORTAGE
+        assert "Patty" in result.message
+        storage.add_order_item.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_down_does_not_block_orders(self, service, storage, reservations, snapshot):
+        reservations.reserve.return_value = ReservationResult(status="UNAVAILABLE")
+
+        result = await service.add_item_to_order(Mock(), ORDER_ID, BURGER, 1, "s1", 7, ingredients=snapshot)
+
+        assert result.is_success
+        storage.add_order_item.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_save_gives_the_hold_back(self, service, storage, reservations, snapshot):
+        storage.add_order_item.return_value = OrderMutationResult(status="ERROR")
+
+        result = await service.add_item_to_order(Mock(), ORDER_ID, BURGER, 1, "s1", 7, ingredients=snapshot)
+
+        assert result.is_error
+        order_item_id = reservations.reserve.await_args.args[1]
+        reservations.release.assert_awaited_once_with(ORDER_ID, order_item_id)
+
+    @pytest.mark.asyncio
+    async def test_quantity_change_replaces_the_line_hold(self, service, reservations, snapshot):
+        with patch("app.services.order_service.MenuIngredientSnapshot.load", AsyncMock(return_value=snapshot)):
+            result = await service.update_order_item_quantity(Mock(), ORDER_ID, "item_1", 3, "s1", 7)
+
+        assert result.is_success
+        assert reservations.reserve.await_args.args == (ORDER_ID, "item_1", {1: (3.0, 10.0), 3: (6.0, 6.0)})
+        assert reservations.reserve.await_args.kwargs["replace"] is True
+
+    @pytest.mark.asyncio
+    async def test_quantity_change_on_a_removed_line_releases_its_hold(self, service, storage, reservations, snapshot):
+        storage.set_order_item_quantity.return_value = OrderMutationResult(status="ITEM_NOT_FOUND")
+
+        with patch("app.services.order_service.MenuIngredientSnapshot.load", AsyncMock(return_value=snapshot)):
+            result = await service.update_order_item_quantity(Mock(), ORDER_ID, "item_1", 3, "s1", 7)
+
+        assert result.is_error
+        reservations.reserve.assert_awaited_once()
+        reservations.release.assert_awaited_once_with(ORDER_ID, "item_1")
+
+    @pytest.mark.asyncio
+    async def test_remove_clear_and_cancel_release(self, service, reservations):
+        await service.remove_item_from_order(Mock(), ORDER_ID, "item_1", "s1", 7)
+        reservations.release.assert_awaited_with(ORDER_ID, "item_1")
+
+        await service.clear_order(Mock(), ORDER_ID, "s1", 7)
+        reservations.release.assert_awaited_with(ORDER_ID)
+
+        reservations.release.reset_mock()
+        await service._cancel_session("s1")
+        reservations.release.assert_awaited_once_with(ORDER_ID)
+
+        reservations.release.reset_mock()
+        await service.update_order_status(Mock(), "order_1", OrderStatus.CANCELLED)
+        reservations.release.assert_awaited_once_with("order_1")
+
+    @pytest.mark.asyncio
+    async def test_confirm_takes_stock_then_releases_the_claim(self, service, reservations):
+        uow = Mock()
+        uow.inventory = AsyncMock()
+        uow.inventory.consume_stock.return_value = [1, 3]
+        uow.__aenter__ = AsyncMock(return_value=uow)
+        uow.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.services.order_service.UnitOfWork", return_value=uow):
+            result = await service.confirm_order(Mock(), ORDER_ID, "s1", 7)
+
+        assert result.is_success
+        reservations.claim.assert_awaited_once_with(ORDER_ID)
+        uow.inventory.consume_stock.assert_awaited_once_with({1: 1.0, 3: 2.0}, allow_negative=False)
+        reservations.release.assert_awaited_once_with("redis_1:claim:abc")
+
+    @pytest.mark.asyncio
+    async def test_confirm_with_negative_inventory_allowed_takes_all_stock(self, service, reservations):
+        uow = Mock()
+        uow.inventory = AsyncMock()
+        uow.inventory.consume_stock.return_value = [1, 3]
+        uow.__aenter__ = AsyncMock(return_value=uow)
+        uow.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.services.order_service.UnitOfWork", return_value=uow), \
+                patch("app.services.order_service.settings.ALLOW_NEGATIVE_INVENTORY", True):
+            result = await service.confirm_order(Mock(), ORDER_ID, "s1", 7)
+
+        assert result.is_success
+        uow.inventory.consume_stock.assert_awaited_once_with({1: 1.0, 3: 2.0}, allow_negative=True)
+        reservations.release.assert_awaited_once_with("redis_1:claim:abc")
+
+    @pytest.mark.asyncio
+    async def test_nothing_reserved_when_inventory_checking_is_off(self, service, storage, reservations):
+        with patch("app.services.order_service.settings.ENABLE_INVENTORY_CHECKING", False):
+            result = await service.add_item_to_order(Mock(), ORDER_ID, BURGER, 1, "s1", 7)
+            await service.clear_order(Mock(), ORDER_ID, "s1", 7)
+
+        assert result.is_success
+        reservations.reserve.assert_not_called()
+        reservations.release.assert_not_called()
@@ -0,0 +1,141 @@
+"""
+Unit tests for inventory and customization validation (one ingredient snapshot per command batch)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.commands.add_item_command import AddItemCommand
+from app.commands.command_context import CommandContext
+from app.commands.command_invoker import CommandInvoker
+from app.dto.order_result import OrderResult
+from app.services.customization_validation_service import CustomizationValidationService
+from app.services.menu_ingredient_snapshot import MenuIngredientSnapshot
+from app.services.order_validator import OrderValidator
+
+BURGER, FRIES = 1, 2
+
+
+def recipe_line(menu_item_id, ingredient_id, name, quantity=1, stock=10, min_stock=1):
+    inventory = SimpleNamespace(id=100 + ingredient_id, current_stock=stock, unit="piece", is_low_stock=stock <= min_stock)
+    ingredient = SimpleNamespace(id=ingredient_id, name=name, unit_cost=0.5, inventory=inventory)
+    return SimpleNamespace(
+        menu_item_id=menu_item_id, ingredient_id=ingredient_id, ingredient=ingredient,
+        quantity=quantity, unit="piece", additional_cost=0.25
+    )
+
+
+@pytest.fixture
+def uow():
+    uow = Mock()
+    uow.menu_item_ingredients = AsyncMock()
+    uow.ingredients = AsyncMock()
+    uow.inventory = AsyncMock()
+    uow.menu_item_ingredients.get_by_menu_items_with_inventory.side_effect = lambda ids: {
+        menu_item_id: {
+            BURGER: [recipe_line(BURGER, 1, "Bun"), recipe_line(BURGER, 2, "Onions"), recipe_line(BURGER, 3, "Ketchup", stock=2)],
+            FRIES: [recipe_line(FRIES, 4, "Potatoes"), recipe_line(FRIES, 3, "Ketchup", stock=2)]
+        }.get(menu_item_id, [])
+        for menu_item_id in ids
+    }
+    uow.ingredients.get_by_names_and_restaurant.side_effect = lambda names, restaurant_id: {
+        name: SimpleNamespace(name=name.title(), unit_cost=1.5)
+        for name in names if name in ("bun", "onions", "ketchup", "potatoes", "bacon")
+    }
+    return uow
+
+
+class TestInventoryValidation:
+    """Ingredients and their inventory come from one joined query"""
+
+    @pytest.mark.asyncio
+    async def test_one_query_per_item(self, uow):
+        result = await OrderValidator()._validate_inventory(uow, BURGER, 1)
+
+        assert result.is_success
+        uow.menu_item_ingredients.get_by_menu_items_with_inventory.assert_awaited_once_with([BURGER])
+        uow.inventory.get_by_ingredient.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_short_ingredient_is_reported(self, uow):
+        with patch("app.services.order_validator.settings.ALLOW_NEGATIVE_INVENTORY", False):
+            result = await OrderValidator()._validate_inventory(uow, BURGER, 3)
+
+        assert result.is_error
+        assert result.errors == ["Insufficient inventory for 'Ketchup': need 3.0 piece, have 2 piece"]
+
+
+class TestCustomizationsFromSnapshot:
+    """Customizations are checked against the preloaded snapshot"""
+
+    @pytest.mark.asyncio
+    async def test_validate_customizations_loads_once(self, uow):
+        results = await CustomizationValidationService().validate_customizations(
+            BURGER, ["no onions", "no bun", "extra ketchup", "add bacon"], 7, uow
+        )
+
+        assert all(result.is_valid for result in results.values())
+        assert results["extra ketchup"].extra_cost == 0.25
+        assert results["add bacon"].extra_cost == 1.5
+        assert uow.menu_item_ingredients.get_by_menu_items_with_inventory.await_count == 1
+        assert uow.ingredients.get_by_names_and_restaurant.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_prefetched_snapshot_means_no_queries(self, uow):
+        snapshot = await MenuIngredientSnapshot.load(uow, [BURGER, FRIES], restaurant_id=7, ingredient_names=["bacon"])
+        uow.reset_mock()
+
+        results = await CustomizationValidationService().validate_customizations(
+            FRIES, ["no potatoes", "add bacon"], 7, uow, snapshot
+        )
+
+        assert all(result.is_valid for result in results.values())
+        uow.menu_item_ingredients.get_by_menu_items_with_inventory.assert_not_called()
+        uow.ingredients.get_by_names_and_restaurant.assert_not_called()
+
+
+class TestCommandBatchPrefetch:
+    """The invoker loads one snapshot for every ADD_ITEM in the batch"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_shared_by_the_batch(self, uow):
+        order_service = Mock()
+        order_service.add_item_to_order = AsyncMock(return_value=OrderResult.success("Added"))
+        context = CommandContext(session_id="s1", restaurant_id="7", order_id=1)
+        context.set_order_service(order_service)
+        context.set_db_session(Mock())
+        commands = [
+            AddItemCommand(7, 1, BURGER, modifiers=["no onions", "add bacon"]),
+            AddItemCommand(7, 1, FRIES, modifiers=["extra ketchup"]),
+            AddItemCommand(7, 1, BURGER)
+        ]
+
+        with patch("app.core.unit_of_work.UnitOfWork", return_value=uow):
+            await CommandInvoker().execute_multiple_commands(commands, context)
+
+        uow.menu_item_ingredients.get_by_menu_items_with_inventory.assert_awaited_once_with([BURGER, FRIES])
+        uow.ingredients.get_by_names_and_restaurant.assert_awaited_once()
+        snapshot = context.ingredient_snapshot
+        assert snapshot.restaurant_id == 7 and snapshot.has_menu_item(FRIES)
+        assert all(call.kwargs["ingredients"] is snapshot for call in order_service.add_item_to_order.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_plain_adds_are_prefetched_too(self, uow):
+        """Every add reserves stock, so plain adds share the snapshot without looking up names"""
+        order_service = Mock()
+        order_service.add_item_to_order = AsyncMock(return_value=OrderResult.success("Added"))
+        context = CommandContext(session_id="s1", restaurant_id=7, order_id=1)
+        context.set_order_service(order_service)
+        context.set_db_session(Mock())
+        commands = [AddItemCommand(7, 1, BURGER), AddItemCommand(7, 1, FRIES), AddItemCommand(7, 1, BURGER)]
+
+        with patch("app.core.unit_of_work.UnitOfWork", return_value=uow):
+            await CommandInvoker().execute_multiple_commands(commands, context)
+
+        uow.menu_item_ingredients.get_by_menu_items_with_inventory.assert_awaited_once_with([BURGER, FRIES])
+        uow.ingredients.get_by_names_and_restaurant.assert_not_called()
+        snapshot = context.ingredient_snapshot
+        assert all(call.kwargs["ingredients"] is snapshot for call in order_service.add_item_to_order.await_args_list)
+
@@ -0,0 +1,196 @@
+"""
+Unit tests for the parallel, paginated menu cache warm-up and startup readiness
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import patch
+
+from app.core import startup
+from app.core.readiness import Readiness
+from app.repository.menu_item_repository import MenuItemRepository
+from app.services import menu_cache_loader as loader_module
+from app.services.menu_cache_loader import MenuCacheLoader
+
+
+class FakeDatabase:
+    """Restaurants and their menus, with concurrent-load tracking"""
+
+    def __init__(self, restaurants):
+        self.restaurants = restaurants
+        self.loading = 0
+        self.max_loading = 0
+        self.item_loads = 0
+
+    @asynccontextmanager
+    async def session(self):
+        yield self
+
+
+class FakeRestaurantRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def stream_active_ids(self, page_size=1000):
+        ids = sorted(self.db.restaurants)
+        for start in range(0, len(ids), page_size):
+            yield ids[start:start + page_size]
+
+
+class FakeMenuItemRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def get_all_by_restaurant(self, restaurant_id, page_size=500):
+        self.db.loading += 1
+        self.db.max_loading = max(self.db.max_loading, self.db.loading)
+        self.db.item_loads += 1
+        await asyncio.sleep(0.01)
+        self.db.loading -= 1
+        items = self.db.restaurants[restaurant_id]
+        if items is None:
+            raise RuntimeError("database went away")
+        return items
+
+
+class InMemoryMenuCache:
+    def __init__(self, cached=None):
+        self.menus = dict(cached or {})
+        self.available = True
+
+    async def get_menu_items(self, restaurant_id):
+        return self.menus.get(restaurant_id, [])
+
+    async def cache_menu_items(self, restaurant_id, menu_items):
+        self.menus[restaurant_id] = list(menu_items)
+
+    async def is_cache_available(self):
+        return self.available
+
+
+def items(count):
+    return [SimpleNamespace(id=n, name=f"Item {n}", is_available=True) for n in range(count)]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase({restaurant_id: items(250) for restaurant_id in range(1, 41)})
+    monkeypatch.setattr(loader_module, "RestaurantRepository", FakeRestaurantRepository)
+    monkeypatch.setattr(loader_module, "MenuItemRepository", FakeMenuItemRepository)
+    return database
+
+
+class TestMenuCacheWarmUp:
+    """Every restaurant, every item, a bounded number at a time"""
+
+    @pytest.mark.asyncio
+    async def test_loads_all_restaurants_in_parallel(self, database):
+        cache = InMemoryMenuCache()
+        loader = MenuCacheLoader(cache, session_factory=database.session)
+
+        stats = await loader.warm_up(concurrency=8, page_size=7)
+
+        assert stats["restaurants"] == 40
+        assert stats["items"] == 40 * 250
+        assert all(len(cache.menus[restaurant_id]) == 250 for restaurant_id in range(1, 41))
+        assert database.max_loading == 8
+
+    @pytest.mark.asyncio
+    async def test_menus_already_cached_are_not_reloaded(self, database):
+        cache = InMemoryMenuCache({restaurant_id: items(250) for restaurant_id in range(1, 31)})
+        loader = MenuCacheLoader(cache, session_factory=database.session)
+
+        stats = await loader.warm_up(concurrency=8)
+
+        assert stats["from_cache"] == 30
+        assert database.item_loads == 10
+
+    @pytest.mark.asyncio
+    async def test_failed_restaurant_does_not_stop_the_rest(self, database):
+        database.restaurants[5] = None
+        cache = InMemoryMenuCache()
+
+        stats = await MenuCacheLoader(cache, session_factory=database.session).warm_up(concurrency=4)
+
+        assert stats["failures"] == 1
+        assert len(cache.menus) == 39
+
+    @pytest.mark.asyncio
+    async def test_skipped_when_cache_unavailable(self, database):
+        cache = InMemoryMenuCache()
+        cache.available = False
+
+        stats = await MenuCacheLoader(cache, session_factory=database.session).warm_up()
+
+        assert stats["skipped"] is True
+        assert database.item_loads == 0
+
+
+class TestKeysetPagination:
+    """stream_by_restaurant pages on id instead of OFFSET and stops at a short page"""
+
+    @pytest.mark.asyncio
+    async def test_stream_by_restaurant(self):
+        pages = [[SimpleNamespace(id=n) for n in range(start, min(start + 3, 8))] for start in (1, 4, 7)]
+        statements = []
+
+        async def execute(statement):
+            statements.append(statement)
+            page = pages[len(statements) - 1]
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: page))
+
+        repository = MenuItemRepository(SimpleNamespace(execute=execute))
+        streamed = [item.id for page in [p async for p in repository.stream_by_restaurant(1, page_size=3)] for item in page]
+
+        assert streamed == list(range(1, 8))
+        assert len(statements) == 3
+        assert "OFFSET" not in str(statements[-1]).upper()
+        assert statements[-1].compile().params["id_1"] == 6
+
+
+class TestStartupReadiness:
+    """Not ready until the warm-up finishes or times out"""
+
+    @pytest.mark.asyncio
+    async def test_ready_after_warm_up(self, monkeypatch):
+        readiness = Readiness()
+        release = asyncio.Event()
+
+        async def warm_up(self):
+            await release.wait()
+            return {"restaurants": 3, "items": 30, "from_cache": 0, "failures": 0}
+
+        monkeypatch.setattr(startup, "readiness", readiness)
+        monkeypatch.setattr(startup.settings, "MENU_CACHE_WARMUP_ENABLED", True)
+        with patch.object(MenuCacheLoader, "warm_up", warm_up):
+            startup.start_menu_cache_warm_up()
+            assert not readiness.is_ready
+            await asyncio.sleep(0.01)
+            assert "menu_cache" in readiness.status()["pending"]
+
+            release.set()
+            await asyncio.gather(*startup._background_tasks)
+
+        assert readiness.is_ready
+        assert readiness.status()["completed"]["menu_cache"]["restaurants"] == 3
+
+    @pytest.mark.asyncio
+    async def test_ready_on_timeout_while_loading_continues(self, monkeypatch):
+        readiness = Readiness()
+        finished = asyncio.Event()
+
+        async def warm_up(self):
+            await asyncio.sleep(0.05)
+            finished.set()
+            return {}
+
+        monkeypatch.setattr(startup, "readiness", readiness)
+        monkeypatch.setattr(startup.settings, "MENU_CACHE_WARMUP_TIMEOUT_SECONDS", 0.01)
+        with patch.object(MenuCacheLoader, "warm_up", warm_up):
+            assert await startup.load_menu_cache_on_startup() is None
+            assert readiness.is_ready
+            assert readiness.status()["completed"]["menu_cache"]["timed_out"] is True
+            await asyncio.wait_for(finished.wait(), 1)
@@ -0,0 +1,174 @@
+"""
+Unit tests for the compiled menu search index
+"""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.menu_service import MenuService
+from app.services.menu_search_index import (
+    MenuSearchIndex, MenuIndexRegistry, phonetic_key, is_confident_match, normalize_menu_text, extract_menu_keywords
+)
+from app.models.menu_item import MenuItem
+
+
+def make_item(item_id, name, is_available=True):
+    return MenuItem(id=item_id, name=name, price=5.0, is_available=is_available, restaurant_id=1, category_id=1)
+
+
+@pytest.fixture
+def menu_items():
+    return [
+        make_item(1, "Quantum Cheeseburger"),
+        make_item(2, "Neon Double Burger"),
+        make_item(3, "French Fries"),
+        make_item(4, "Galactic Fries"),
+        make_item(5, "Quantum Cola"),
+        make_item(6, "Big Mac"),
+        make_item(7, "Chicken Nuggets"),
+        make_item(8, "Quarter Pounder"),
+    ]
+
+
+@pytest.fixture
+def index(menu_items):
+    return MenuSearchIndex(1, menu_items)
+
+
+def names(items):
+    return [item.name for item in items]
+
+
+class TestMenuSearchIndex:
+    """Test lookups against a compiled index"""
+
+    @pytest.mark.parametrize("query", [
+        "Quantum Cheeseburger", "quantum cheeseburger", "  Quantum   Cheeseburger!! ", "QUANTUM CHEESE BURGER"
+    ])
+    def test_exact_match_wins(self, index, query):
+        assert names(index.search(query)) == ["Quantum Cheeseburger"]
+
+    def test_full_keyword_coverage_preferred(self, index):
+        """Items matching every keyword beat items matching only some"""
+        assert names(index.search("I would like a quantum burger please")) == ["Quantum Cheeseburger"]
+
+    def test_partial_keyword_matches_are_ranked(self, index):
+        assert set(names(index.search("fries"))) == {"French Fries", "Galactic Fries"}
+        assert set(names(index.search("quantum"))) == {"Quantum Cheeseburger", "Quantum Cola"}
+
+    @pytest.mark.parametrize("query,expected", [
+        ("big mack", "Big Mac"),
+        ("chiken nugets", "Chicken Nuggets"),
+        ("kwarter pounder", "Quarter Pounder"),
+        ("galactik fries", "Galactic Fries"),
+    ])
+    def test_asr_misspellings(self, index, query, expected):
+        assert index.search(query)[0].name == expected
+
+    @pytest.mark.parametrize("query", ["", "   ", "the a an and", "pizza", "xyzabc123"])
+    def test_no_matches(self, index, query):
+        assert index.search(query) == []
+
+    def test_fuzzy_only_match_is_not_confident(self, menu_items):
+        """A query that only resembles an item's spelling is not auto-resolved"""
+        index = MenuSearchIndex(1, menu_items + [make_item(9, "Onion Rings")])
+
+        [(item, score, exact)] = index.search_scored("wings")
+        assert item.name == "Onion Rings"
+        assert not exact
+        assert not is_confident_match(score, exact)
+
+    @pytest.mark.parametrize("query", ["big mack", "quantum burger", "French Fries"])
+    def test_exact_keyword_match_is_confident(self, index, query):
+        _, score, exact = index.search_scored(query)[0]
+        assert exact and is_confident_match(score, exact)
+
+    def test_top_k_limit(self, index):
+        assert len(index.search("fries", limit=1)) == 1
+
+    def test_get_by_name_is_exact(self, index):
+        assert index.get_by_name("big mac").id == 6
+        assert index.get_by_name("big mack") is None
+
+    @pytest.mark.parametrize("text", [
+        "  Quantum Cheeseburger!  ", "Quantum... Cheeseburger!!!", "Quantum   Cheeseburger", "QUANTUM CHEESEBURGER"
+    ])
+    def test_normalize_menu_text(self, text):
+        assert normalize_menu_text(text) == "quantum cheeseburger"
+
+    @pytest.mark.parametrize("text,expected", [
+        ("I would like to add a Quantum Cheeseburger please", ["quantum", "cheeseburger"]),
+        ("the quantum burger meal", ["quantum", "burger"]),
+        ("a b c quantum cheeseburger", ["quantum", "cheeseburger"]),
+    ])
+    def test_extract_menu_keywords_drops_stopwords_and_short_words(self, text, expected):
+        assert extract_menu_keywords(text) == expected
+
+    def test_phonetic_key_ignores_short_keys(self):
+        assert phonetic_key("mack") == phonetic_key("mac")
+        assert phonetic_key("coke") == ""
+
+    def test_search_is_sub_millisecond(self):
+        """Large menus are searched through the index, not a linear scan"""
+        items = [make_item(i, f"Menu Item {i} Special Burger") for i in range(1, 1001)]
+        items.append(make_item(5000, "Big Mac"))
+        index = MenuSearchIndex(1, items)
+        index.search("big mack")  # Warm the token match cache
+
+        start = time.perf_counter()
+        for _ in range(200):
+            results = index.search("big mack")
+        elapsed_ms = (time.perf_counter() - start) * 1000 / 200
+
+        assert results[0].name == "Big Mac"
+        assert elapsed_ms < 1.0
+
+
+class TestMenuIndexRegistry:
+    """Test index reuse across menu versions"""
+
+    def test_unchanged_menu_reuses_index(self, menu_items):
+        registry = MenuIndexRegistry(ttl_seconds=60)
+        first = registry.build(1, menu_items)
+        second = registry.build(1, list(menu_items))
+
+        assert first is second
+        assert registry.get(1) is first
+        assert registry.get_stats()["builds"] == 1
+
+    def test_changed_menu_rebuilds_index(self, menu_items):
+        registry = MenuIndexRegistry(ttl_seconds=60)
+        first = registry.build(1, menu_items)
+        second = registry.build(1, menu_items + [make_item(9, "Apple Pie")])
+
+        assert second is not first
+        assert second.version != first.version
+
+    def test_expired_and_invalidated_entries_are_missed(self, menu_items):
+        registry = MenuIndexRegistry(ttl_seconds=0)
+        registry.build(1, menu_items)
+        assert registry.get(1) is None
+
+        registry = MenuIndexRegistry(ttl_seconds=60)
+        registry.build(1, menu_items)
+        registry.invalidate(1)
+        assert registry.get(1) is None
+
+
+class TestMenuServiceIndex:
+    """Test MenuService lookups go through the shared index"""
+
+    @pytest.mark.asyncio
+    async def test_menu_loaded_once_per_version(self, menu_items):
+        cache_service = AsyncMock()
+        cache_service.get_menu_items.return_value = menu_items
+        registry = MenuIndexRegistry(ttl_seconds=60)
+        menu_service = MenuService(AsyncMock(), cache_service, index_registry=registry)
+
+        assert names(await menu_service.search_menu_items(1, "big mack")) == ["Big Mac"]
+        assert (await menu_service.get_menu_item_by_name(1, "french fries")).id == 3
+        assert await menu_service.get_menu_item_by_name(1, "pizza") is None
+
+        cache_service.get_menu_items.assert_awaited_once_with(1)
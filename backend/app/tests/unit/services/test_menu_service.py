@@ -126,7 +126,7 @@ class TestMenuService:
         # Mock database response
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -145,7 +145,7 @@ class TestMenuService:
         # Mock database response
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -164,7 +164,7 @@ class TestMenuService:
         # Mock database response
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -198,7 +198,7 @@ class TestMenuService:
         # Mock database response
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -214,7 +214,7 @@ class TestMenuService:
         # Mock database response
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -293,7 +293,7 @@ class TestMenuService:
             
             mock_categories = [burger_category]
             mock_uow_instance.categories.get_by_restaurant = AsyncMock(return_value=mock_categories)
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__.return_value = mock_uow_instance
             
             result = await menu_service_with_cache.get_menu_items_by_category(1)
@@ -437,7 +437,7 @@ class TestMenuServiceSearch:
         """Test exact match search"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -458,7 +458,7 @@ class TestMenuServiceSearch:
         """Test keyword-based search"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -483,7 +483,7 @@ class TestMenuServiceSearch:
         """Test that stopwords are properly removed from queries"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -504,7 +504,7 @@ class TestMenuServiceSearch:
         """Test that punctuation is properly handled"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -521,7 +521,7 @@ class TestMenuServiceSearch:
         """Test that search is case insensitive"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -542,7 +542,7 @@ class TestMenuServiceSearch:
         """Test that whitespace is properly handled"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -559,7 +559,7 @@ class TestMenuServiceSearch:
         """Test that partial words match correctly"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -580,7 +580,7 @@ class TestMenuServiceSearch:
         """Test when no matches are found"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -597,7 +597,7 @@ class TestMenuServiceSearch:
         """Test that unavailable items are excluded from search results"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -610,7 +610,7 @@ class TestMenuServiceSearch:
         """Test when multiple items match the query"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -631,7 +631,7 @@ class TestMenuServiceSearch:
         """Test handling of empty queries"""
         with patch('app.services.menu_service.UnitOfWork') as mock_uow:
             mock_uow_instance = AsyncMock()
-            mock_uow_instance.menu_items.get_by_restaurant = AsyncMock(return_value=sample_menu_items)
+            mock_uow_instance.menu_items.get_all_by_restaurant = AsyncMock(return_value=sample_menu_items)
             mock_uow.return_value.__aenter__ = AsyncMock(return_value=mock_uow_instance)
             mock_uow.return_value.__aexit__ = AsyncMock(return_value=None)
             
@@ -646,52 +646,3 @@ class TestMenuServiceSearch:
             # Test only stopwords
             result = await menu_service.search_menu_items(1, "the a an and")
             assert result == []
-    
-    @pytest.mark.asyncio
-    async def test_normalize_query_method(self, menu_service):
-        """Test the _normalize_query method directly"""
-        # Test basic normalization
-        result = menu_service._normalize_query("  Quantum Cheeseburger!  ")
-        assert result == "quantum cheeseburger"
-        
-        # Test punctuation removal
-        result = menu_service._normalize_query("Quantum... Cheeseburger!!!")
-        assert result == "quantum cheeseburger"
-        
-        # Test whitespace collapse
-        result = menu_service._normalize_query("Quantum   Cheeseburger")
-        assert result == "quantum cheeseburger"
-        
-        # Test case normalization
-        result = menu_service._normalize_query("QUANTUM CHEESEBURGER")
-        assert result == "quantum cheeseburger"
-    
-    @pytest.mark.asyncio
-    async def test_extract_keywords_method(self, menu_service):
-        """Test the _extract_keywords method directly"""
-        # Test stopword removal
-        result = menu_service._extract_keywords("I would like to add a Quantum Cheeseburger please")
-        assert "quantum" in result
-        assert "cheeseburger" in result
-        assert "i" not in result
-        assert "would" not in result
-        assert "like" not in result
-        assert "to" not in result
-        assert "add" not in result
-        assert "a" not in result
-        assert "please" not in result
-        
-        # Test with common stopwords
-        result = menu_service._extract_keywords("the quantum burger meal")
-        assert "quantum" in result
-        assert "burger" in result
-        assert "the" not in result
-        assert "meal" not in result
-        
-        # Test with short words (should be filtered out)
-        result = menu_service._extract_keywords("a b c quantum cheeseburger")
-        assert "quantum" in result
-        assert "cheeseburger" in result
-        assert "a" not in result
-        assert "b" not in result
-        assert "c" not in result
@@ -0,0 +1,234 @@
+"""
+Unit tests for the public menu cache and the conditional menu endpoint
+"""
+
+import asyncio
+import gzip
+import json
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import restaurants as restaurants_api
+from app.services import public_menu_cache as cache_module
+from app.services.public_menu_cache import PublicMenuCache, accepts_gzip, etag_matches
+
+
+def tag(name, color="#ff0000"):
+    return SimpleNamespace(tag=SimpleNamespace(name=name, color=color))
+
+
+def item(item_id, name, display_order, tags=()):
+    return SimpleNamespace(
+        id=item_id, name=name, price=Decimal("5.99"), description=f"{name} description",
+        image_url=None, display_order=display_order, restaurant_id=1, tags=list(tags)
+    )
+
+
+def category(category_id, name, display_order, items):
+    return SimpleNamespace(id=category_id, name=name, description=None, display_order=display_order, menu_items=items)
+
+
+def restaurant(price=Decimal("5.99")):
+    burgers = category(1, "Burgers", 2, [item(2, "Cheeseburger", 2), item(1, "Big Burger", 1, [tag("Popular")])])
+    burgers.menu_items[0].price = price
+    return SimpleNamespace(
+        id=1, name="Test Burgers", primary_color="#000000", secondary_color="#ffffff", logo_url=None,
+        categories=[burgers, category(3, "Empty", 3, []), category(2, "Drinks", 1, [item(3, "Cola", 1)])]
+    )
+
+
+class Sessions:
+    """Session factory recording every session a build opens and whether it was closed"""
+
+    def __init__(self):
+        self.opened = []
+
+    @asynccontextmanager
+    async def __call__(self):
+        session = SimpleNamespace(closed=False)
+        self.opened.append(session)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+
+@pytest.fixture
+def sessions():
+    return Sessions()
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repo = SimpleNamespace(get_public_menu=AsyncMock(return_value=restaurant()))
+    monkeypatch.setattr(cache_module, "RestaurantRepository", lambda db: repo)
+    return repo
+
+
+@pytest.fixture
+def menu_cache(sessions):
+    return lambda ttl_seconds=60: PublicMenuCache(ttl_seconds=ttl_seconds, session_factory=sessions)
+
+
+class TestHeaderMatching:
+    """If-None-Match and Accept-Encoding parsing"""
+
+    def test_etag_matches(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"old", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"old"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+        assert etag_matches('"abc-gzip"', '"abc"')
+        assert etag_matches('W/"abc-gzip"', '"abc"')
+        assert not etag_matches('"old-gzip"', '"abc"')
+
+    def test_accepts_gzip(self):
+        assert accepts_gzip("gzip, deflate, br")
+        assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+        assert accepts_gzip("*")
+        assert not accepts_gzip("gzip;q=0")
+        assert not accepts_gzip("br")
+        assert not accepts_gzip(None)
+
+
+class TestPublicMenuCache:
+    """Built once per menu version from one repository call"""
+
+    @pytest.mark.asyncio
+    async def test_response_shape(self, repository, menu_cache):
+        menu = await menu_cache().get(1)
+
+        data = json.loads(menu.body)
+        assert [c["name"] for c in data["menu"]] == ["Drinks", "Burgers"]
+        assert [i["name"] for i in data["menu"][1]["items"]] == ["Big Burger", "Cheeseburger"]
+        assert data["menu"][1]["items"][0]["tags"] == [{"name": "Popular", "color": "#ff0000"}]
+        assert data["menu"][1]["items"][0]["price"] == 5.99
+        assert data["total_items"] == 3
+        assert gzip.decompress(menu.gzipped) == menu.body
+
+    @pytest.mark.asyncio
+    async def test_cached_until_invalidated(self, repository, menu_cache):
+        cache = menu_cache()
+
+        first = await cache.get(1)
+        assert await cache.get(1) is first
+        assert repository.get_public_menu.await_count == 1
+
+        repository.get_public_menu.return_value = restaurant(price=Decimal("6.49"))
+        cache.invalidate(1)
+        changed = await cache.get(1)
+        assert changed.etag != first.etag
+        assert repository.get_public_menu.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_rebuild_keeps_compressed_body(self, repository, menu_cache):
+        cache = menu_cache(ttl_seconds=0)
+
+        first = await cache.get(1)
+        second = await cache.get(1)
+        assert second is first
+        assert cache.get_stats()["unchanged_rebuilds"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_build(self, repository, menu_cache):
+        cache = menu_cache()
+
+        menus = await asyncio.gather(*(cache.get(1) for _ in range(10)))
+        assert all(menu is menus[0] for menu in menus)
+        assert repository.get_public_menu.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_restaurant_not_cached(self, repository, menu_cache):
+        repository.get_public_menu.return_value = None
+        cache = menu_cache()
+
+        assert await cache.get(99) is None
+        assert cache.get_stats()["restaurants"] == 0
+
+    @pytest.mark.asyncio
+    async def test_build_runs_on_its_own_session(self, repository, menu_cache, sessions):
+        await menu_cache().get(1)
+
+        assert len(sessions.opened) == 1 and sessions.opened[0].closed
+        assert repository.get_public_menu.await_args.args == (1,)
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_build_is_not_lost(self, repository, menu_cache):
+        cache = menu_cache()
+        reading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_read(restaurant_id):
+            reading.set()
+            await release.wait()
+            return restaurant()
+
+        repository.get_public_menu.side_effect = slow_read
+        stale_request = asyncio.create_task(cache.get(1))
+        await reading.wait()
+
+        # The menu changes while the build is still reading the old one
+        cache.invalidate(1)
+        repository.get_public_menu.side_effect = None
+        repository.get_public_menu.return_value = restaurant(price=Decimal("6.49"))
+        fresh = await cache.get(1)
+        release.set()
+        stale = await stale_request
+
+        assert fresh.etag != stale.etag
+        assert await cache.get(1) is fresh
+        assert repository.get_public_menu.await_count == 2
+
+
+class TestMenuEndpoint:
+    """ETag, Cache-Control and precompressed bodies on GET /api/restaurants/{id}/menu"""
+
+    @pytest.fixture
+    def client(self, repository, menu_cache, monkeypatch):
+        monkeypatch.setattr(restaurants_api, "public_menu_cache", menu_cache())
+        app = FastAPI()
+        app.include_router(restaurants_api.router)
+        return TestClient(app)
+
+    def test_etag_revalidation(self, client):
+        response = client.get("/api/restaurants/1/menu")
+        assert response.status_code == 200
+        assert response.json()["total_items"] == 3
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        etag = response.headers["etag"]
+
+        not_modified = client.get("/api/restaurants/1/menu", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+    def test_gzip_served_precompressed(self, client):
+        response = client.get("/api/restaurants/1/menu", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json()["restaurant"]["name"] == "Test Burgers"
+
+        identity = client.get("/api/restaurants/1/menu", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in identity.headers
+        assert identity.json() == response.json()
+
+        # Strong ETags differ per representation, and either revalidates
+        assert response.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+        for etag in (response.headers["etag"], identity.headers["etag"]):
+            not_modified = client.get(
+                "/api/restaurants/1/menu", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+            )
+            assert not_modified.status_code == 304
+            assert not_modified.headers["etag"] == response.headers["etag"]
+
+    def test_missing_restaurant(self, client, repository):
+        repository.get_public_menu.return_value = None
+        assert client.get("/api/restaurants/99/menu").status_code == 404
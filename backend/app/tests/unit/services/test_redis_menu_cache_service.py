@@ -0,0 +1,277 @@
+"""
+Unit tests for the versioned Redis menu cache and its in-process L1
+"""
+
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+from unittest.mock import patch
+
+from app.dto.cached_menu_item import CachedMenuItem
+from app.models.menu_item import MenuItem
+from app.services import redis_menu_cache_service as cache_module
+from app.services.redis_menu_cache_service import MenuSnapshot, MenuSnapshotCache, RedisMenuCacheService
+
+
+class FakeRedis:
+    """Just the commands the menu cache uses, counting round trips"""
+
+    def __init__(self):
+        self.strings = {}
+        self.hashes = {}
+        self.published = []
+        self.round_trips = 0
+
+    async def _run(self, name, *args, **kwargs):
+        return getattr(self, f"_{name}")(*args, **kwargs)
+
+    def _get(self, key):
+        return self.strings.get(key)
+
+    def _set(self, key, value, ex=None, get=False):
+        previous = self.strings.get(key)
+        self.strings[key] = value
+        return previous if get else True
+
+    def _getdel(self, key):
+        return self.strings.pop(key, None)
+
+    def _expire(self, key, seconds):
+        return key in self.strings or key in self.hashes
+
+    def _delete(self, *keys):
+        return sum(1 for key in keys if self.strings.pop(key, None) is not None or self.hashes.pop(key, None) is not None)
+
+    def _hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({str(k): v for k, v in mapping.items()})
+        return len(mapping)
+
+    def _hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def _publish(self, channel, message):
+        self.published.append(json.loads(message))
+        return 0
+
+    def __getattr__(self, name):
+        if f"_{name}" not in type(self).__dict__:
+            raise AttributeError(name)
+
+        async def command(*args, **kwargs):
+            self.round_trips += 1
+            return await self._run(name, *args, **kwargs)
+        return command
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def scan_iter(self, match, count=None):
+        self.round_trips += 1
+        prefix = match.rstrip("*")
+        for key in list(self.strings) + list(self.hashes):
+            if key.startswith(prefix):
+                yield key
+
+
+class FakePubSub:
+    """Subscribes once `subscribed` is set, then waits for messages that never come"""
+
+    def __init__(self, subscribed):
+        self.subscribed = subscribed
+
+    async def subscribe(self, channel):
+        await self.subscribed.wait()
+
+    async def listen(self):
+        await asyncio.Event().wait()
+        yield
+
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [await self.redis._run(name, *args, **kwargs) for name, args, kwargs in self.commands]
+
+
+def menu_item(item_id, name, price="5.99", is_available=True):
+    return MenuItem(
+        id=item_id, name=name, description=f"{name} description", price=Decimal(price), restaurant_id=1,
+        category_id=1, is_available=is_available, is_upsell=False, is_special=False, display_order=item_id
+    )
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def worker(redis_client):
+    return RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(refresh_seconds=60), redis_client=redis_client)
+
+
+@pytest.fixture
+def menu():
+    return [menu_item(1, "Big Burger"), menu_item(2, "Fries", "2.49"), menu_item(3, "Shake", is_available=False)]
+
+
+class TestCachedMenuItem:
+    """Immutable DTO round trip"""
+
+    def test_from_model_and_dict(self):
+        item = CachedMenuItem.from_model(menu_item(1, "Big Burger"))
+
+        assert item.price == 5.99
+        assert item.tags == ()
+        assert CachedMenuItem.from_dict(json.loads(json.dumps(item.to_dict()))) == item
+        with pytest.raises(Exception):
+            item.name = "Changed"
+
+    def test_from_dict_ignores_unknown_fields(self):
+        data = {**CachedMenuItem.from_model(menu_item(1, "Big Burger")).to_dict(), "calories": 550}
+        assert CachedMenuItem.from_dict(data).name == "Big Burger"
+
+
+class TestRedisMenuCache:
+    """Versioned per-item hashes behind an L1 keyed by version"""
+
+    @pytest.mark.asyncio
+    async def test_cache_writes_versioned_hash_and_publishes(self, worker, redis_client, menu):
+        await worker.cache_menu_items(1, menu)
+
+        version = redis_client.strings["menu:1:version"]
+        assert set(redis_client.hashes[f"menu:1:items:{version}"]) == {"1", "2", "3"}
+        assert redis_client.published == [{"restaurant_id": 1, "version": version}]
+
+    @pytest.mark.asyncio
+    async def test_steady_state_reads_do_not_touch_redis(self, worker, redis_client, menu):
+        await worker.cache_menu_items(1, menu)
+        redis_client.round_trips = 0
+
+        items = await worker.get_menu_items(1)
+        assert [item.name for item in items] == ["Big Burger", "Fries", "Shake"]
+        assert all(isinstance(item, CachedMenuItem) for item in items)
+        assert (await worker.get_menu_item_by_id(1, 2)).price == 2.49
+        assert await worker.get_available_items(1) == ["Big Burger", "Fries"]
+        assert [item.name for item in await worker.search_menu_items(1, "fri")] == ["Fries"]
+        assert redis_client.round_trips == 0
+
+    @pytest.mark.asyncio
+    async def test_cold_worker_loads_once(self, worker, redis_client, menu):
+        await worker.cache_menu_items(1, menu)
+        cold = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(refresh_seconds=60), redis_client=redis_client)
+        redis_client.round_trips = 0
+
+        results = await asyncio.gather(*(cold.get_menu_items(1) for _ in range(10)))
+        assert all(len(items) == 3 for items in results)
+        # Version pointer, then the item hash - shared by all ten callers
+        assert redis_client.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_same_menu_same_version(self, worker, redis_client, menu):
+        await worker.cache_menu_items(1, menu)
+        version = redis_client.strings["menu:1:version"]
+
+        await worker.cache_menu_items(1, list(reversed(menu)))
+        assert redis_client.strings["menu:1:version"] == version
+
+        menu[1].price = Decimal("2.99")
+        await worker.cache_menu_items(1, menu)
+        assert redis_client.strings["menu:1:version"] != version
+        assert (await worker.get_menu_item_by_id(1, 2)).price == 2.99
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_revalidating(self, redis_client, menu):
+        writer = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(), redis_client=redis_client)
+        reader = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(refresh_seconds=0), redis_client=redis_client)
+        await writer.cache_menu_items(1, menu)
+        await reader.get_menu_items(1)
+
+        # A change the reader missed (no listener): the stale copy is served, the refresh picks it up
+        menu[0].name = "Bigger Burger"
+        await writer.cache_menu_items(1, menu)
+        assert (await reader.get_menu_item_by_id(1, 1)).name == "Big Burger"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert (await reader.get_menu_item_by_id(1, 1)).name == "Bigger Burger"
+
+    @pytest.mark.asyncio
+    async def test_invalidation_message_drops_other_versions_only(self, worker, menu):
+        await worker.cache_menu_items(1, menu)
+        version = worker.snapshot_cache.peek(1).version
+
+        with patch.object(cache_module, "_menu_changed_locally") as changed:
+            worker.snapshot_cache.apply_invalidation({"restaurant_id": 1, "version": version})
+            assert worker.snapshot_cache.peek(1) is not None
+            changed.assert_not_called()
+
+            worker.snapshot_cache.apply_invalidation({"restaurant_id": 1, "version": "newer"})
+            assert worker.snapshot_cache.peek(1) is None
+            changed.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_restaurant(self, worker, redis_client, menu):
+        await worker.cache_menu_items(1, menu)
+
+        await worker.invalidate_restaurant_cache(1)
+
+        assert "menu:1:version" not in redis_client.strings
+        assert redis_client.published[-1] == {"restaurant_id": 1, "version": None}
+        assert await worker.get_menu_items(1) == []
+
+    @pytest.mark.asyncio
+    async def test_redis_down_keeps_serving_l1(self, redis_client, menu):
+        worker = RedisMenuCacheService(snapshot_cache=MenuSnapshotCache(refresh_seconds=0), redis_client=redis_client)
+        await worker.cache_menu_items(1, menu)
+
+        async def down(*args, **kwargs):
+            raise ConnectionError("Redis down")
+        redis_client._run = down
+
+        assert len(await worker.get_menu_items(1)) == 3
+        await asyncio.sleep(0)
+        assert len(await worker.get_menu_items(1)) == 3
+
+
+class TestInvalidationListener:
+    """Subscribing doesn't throw away what the startup warm-up loaded meanwhile"""
+
+    @pytest.mark.asyncio
+    async def test_first_subscribe_keeps_snapshots_loaded_since_start(self):
+        cache = MenuSnapshotCache(refresh_seconds=60)
+        subscribed = asyncio.Event()
+        client = type("Client", (), {"pubsub": lambda self, **kwargs: FakePubSub(subscribed)})()
+        cache.put(MenuSnapshot.build(1, "before", []))
+
+        with patch.object(cache_module, "_menu_changed_locally") as changed:
+            await cache.start_listener(client)
+            await asyncio.sleep(0)
+            cache.put(MenuSnapshot.build(2, "warm-up", []))
+            subscribed.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            await cache.stop_listener()
+
+        assert cache.peek(1) is None
+        assert cache.peek(2).version == "warm-up"
+        changed.assert_called_once_with(1)
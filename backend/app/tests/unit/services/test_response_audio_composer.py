@@ -0,0 +1,155 @@
+"""
+Unit tests and benchmark for splicing templated responses from audio fragments
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.mp3_frames import splice, split_frames, Mp3FormatError
+from app.services.response_audio_composer import ResponseAudioComposer, normalize
+from app.services.text_to_speech_service import TextToSpeechService
+from app.services.voice_service import VoiceService
+from app.tests.helpers.mock_services import MockFileStorageService
+
+VOICE = "nova"
+TTS_DELAY = 0.05
+FRAME_LENGTH = 192  # MPEG2 Layer III, 64 kbps, 24 kHz
+
+
+def mp3_frame(fill: int, header=b"\xff\xf3\x84\xc4") -> bytes:
+    return header + bytes([fill]) * (FRAME_LENGTH - 4)
+
+
+def mp3_clip(text: str, frames: int = 3) -> bytes:
+    """ID3 tag + Info header frame + audio frames tagged with the text"""
+    info = b"\xff\xf3\x84\xc4" + b"\x00" * 17 + b"Info" + b"\x00" * (FRAME_LENGTH - 25)
+    fill = sum(text.encode()) % 250 + 1
+    return b"ID3\x04\x00\x00\x00\x00\x00\x04tags" + info + mp3_frame(fill) * frames
+
+
+class ClipTTSProvider:
+    """Returns a valid MP3 clip per text after a network-like delay"""
+
+    def __init__(self):
+        self.texts = []
+
+    async def generate_audio_stream(self, text, voice="nova"):
+        self.texts.append(text)
+        await asyncio.sleep(TTS_DELAY)
+        yield mp3_clip(text)
+
+    def get_available_voices(self):
+        return [VOICE]
+
+
+@pytest.fixture
+def provider():
+    return ClipTTSProvider()
+
+
+@pytest.fixture
+def storage():
+    return MockFileStorageService()
+
+
+@pytest.fixture
+def voice_service(provider, storage):
+    return VoiceService(
+        text_to_speech_service=TextToSpeechService(provider),
+        speech_to_text_service=AsyncMock(),
+        file_storage_service=storage,
+        redis_service=None
+    )
+
+
+class TestMp3Frames:
+    """Splicing keeps only whole audio frames"""
+
+    def test_splice_drops_tags_and_info_frames(self):
+        spliced = splice([mp3_clip("added"), mp3_clip("two", frames=2)])
+
+        assert len(spliced) == 5 * FRAME_LENGTH
+        assert spliced.startswith(b"\xff\xf3") and b"Info" not in spliced and b"ID3" not in spliced
+        stream_format, frames = split_frames(spliced)
+        assert frames == spliced and stream_format == (2, 24000, 3)
+
+    def test_truncated_last_frame_is_dropped(self):
+        _, frames = split_frames(mp3_clip("x") + mp3_frame(7)[:50])
+        assert len(frames) == 3 * FRAME_LENGTH
+
+    def test_mismatched_formats_are_rejected(self):
+        # Same bitrate at 22.05 kHz: 208-byte frames
+        other_rate = b"\xff\xf3\x80\xc4" + b"\x01" * 204
+        with pytest.raises(Mp3FormatError):
+            splice([mp3_clip("a"), other_rate])
+
+    def test_non_mp3_is_rejected(self):
+        with pytest.raises(Mp3FormatError):
+            split_frames(b"RIFF....WAVEfmt ")
+
+
+class TestResponseAudioComposer:
+    """Templated responses are spliced; free-form text falls back to TTS"""
+
+    def test_normalize_spells_out_quantities(self):
+        assert normalize("Added 2x Big Burger to order.") == ["added", "two", "big", "burger", "to", "order"]
+        assert normalize("Sorry, we don't have") == ["sorry", "we", "dont", "have"]
+
+    @pytest.mark.asyncio
+    async def test_templated_response_is_spliced_without_tts(self, voice_service, provider, storage):
+        await voice_service.generate_all_canned_phrases(1, "Burger Barn", menu_item_names=["Big Burger", "Fries"])
+        provider.texts.clear()
+
+        text = "Added 2x Big Burger to order. Would you like anything else?"
+        url = await voice_service.generate_voice(text, voice=VOICE, restaurant_id=1)
+
+        assert url and provider.texts == []
+        assert voice_service.get_cache_stats()["spliced"] == 1
+        stored = storage.objects[url.split(".com/", 1)[1]]
+        expected = splice([mp3_clip(part) for part in ("Added", "two", "Big Burger", "to order", "Would you like anything else?")])
+        assert stored == expected
+
+    @pytest.mark.asyncio
+    async def test_uncovered_text_falls_back_to_tts(self, voice_service, provider):
+        await voice_service.fragments.prerender(1, ["Big Burger"], voice=VOICE)
+        provider.texts.clear()
+
+        assert await voice_service.generate_voice("Added 2x Milkshake to order", voice=VOICE, restaurant_id=1)
+
+        assert provider.texts == ["Added 2x Milkshake to order"]
+        assert voice_service.get_cache_stats()["synthesized"] == 1
+        assert voice_service.fragments.get_stats()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_fragments_are_rendered_once_for_all_restaurants(self, provider, storage):
+        composer = ResponseAudioComposer(TextToSpeechService(provider), storage)
+
+        first = await composer.prerender(1, ["Big Burger"], voice=VOICE)
+        second = await composer.prerender(2, ["Tacos"], voice=VOICE)
+
+        shared = len(ResponseAudioComposer.shared_fragments())
+        assert first == {"rendered": shared + 1, "skipped": 0, "failed": 0}
+        assert second == {"rendered": 1, "skipped": shared, "failed": 0}
+        assert await composer.plan("Added 1 Tacos to order", 1, VOICE) is None
+        assert len(await composer.plan("Added 1 Tacos to order", "2", VOICE)) == 4
+
+    @pytest.mark.asyncio
+    async def test_splicing_vs_synthesis_latency(self, voice_service, provider):
+        await voice_service.fragments.prerender(1, ["Big Burger", "Fries", "Cola"], voice=VOICE)
+        # Warm the fragment clip cache as steady-state traffic would
+        await voice_service.fragments.compose("Added 1 Fries to order", 1, VOICE)
+
+        start = time.perf_counter()
+        for n, item in enumerate(["Big Burger", "Fries", "Cola"], start=2):
+            assert await voice_service.fragments.compose(f"Added {n}x {item} to order", 1, VOICE)
+        spliced = (time.perf_counter() - start) / 3
+
+        start = time.perf_counter()
+        await voice_service.generate_voice("Added a Milkshake with extra whipped cream", voice=VOICE, restaurant_id=1)
+        synthesized = time.perf_counter() - start
+
+        print(f"\nResponse audio: spliced {spliced * 1000:.2f}ms vs synthesized {synthesized * 1000:.0f}ms")
+        assert spliced < synthesized / 10
@@ -0,0 +1,316 @@
+"""
+Unit tests for the async S3 storage backend, using an in-memory client with latency
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from botocore.exceptions import ClientError
+
+from app.services.file_storage_service import S3FileStorageService
+
+MODULE = "app.services.file_storage_service"
+MiB = 1024 * 1024
+
+
+def not_found(operation):
+    return ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, operation)
+
+
+class FakeS3Client:
+    """aiobotocore client stand-in that sleeps per call and tracks overlap"""
+
+    def __init__(self, latency=0.05, fail_part=None):
+        self.latency = latency
+        self.fail_part = fail_part
+        self.objects = {}
+        self.metadata = {}
+        self.uploads = {}
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def _call(self, name):
+        self.calls.append(name)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+
+    async def head_bucket(self, Bucket):
+        await self._call("head_bucket")
+
+    async def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        await self._call("put_object")
+        self.objects[Key] = bytes(Body if not isinstance(Body, str) else Body.encode())
+        self.metadata[Key] = Metadata or {}
+
+    async def get_object(self, Bucket, Key):
+        await self._call("get_object")
+        if Key not in self.objects:
+            raise not_found("GetObject")
+        return {"Body": FakeBody(self.objects[Key])}
+
+    async def delete_object(self, Bucket, Key):
+        await self._call("delete_object")
+        self.objects.pop(Key, None)
+
+    async def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        await self._call("list_objects_v2")
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys]} if keys else {}
+
+    def get_paginator(self, operation):
+        client = self
+
+        class Paginator:
+            async def paginate(self, Bucket, Prefix=""):
+                yield await client.list_objects_v2(Bucket=Bucket, Prefix=Prefix)
+
+        return Paginator()
+
+    async def head_object(self, Bucket, Key):
+        await self._call("head_object")
+        if Key not in self.objects:
+            raise not_found("HeadObject")
+        return {"Metadata": self.metadata.get(Key, {})}
+
+    async def create_multipart_upload(self, Bucket, Key, **kwargs):
+        await self._call("create_multipart_upload")
+        self.uploads["upload-1"] = {}
+        return {"UploadId": "upload-1"}
+
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        await self._call("upload_part")
+        if PartNumber == self.fail_part:
+            raise ClientError({"Error": {"Code": "InternalError", "Message": "boom"}}, "UploadPart")
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        await self._call("complete_multipart_upload")
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[part["PartNumber"]] for part in MultipartUpload["Parts"])
+
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        await self._call("abort_multipart_upload")
+        self.uploads.pop(UploadId, None)
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def read(self):
+        return self.data
+
+
+class FakeRedisHashes:
+    """Just the hash commands the file key index uses"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hmget(self, name, fields):
+        return [self.hashes.get(name, {}).get(field) for field in fields]
+
+    async def hset(self, name, mapping):
+        self.hashes.setdefault(name, {}).update(mapping)
+
+    async def hdel(self, name, *fields):
+        for field in fields:
+            self.hashes.get(name, {}).pop(field, None)
+
+    async def hlen(self, name):
+        return len(self.hashes.get(name, {}))
+
+    async def hexists(self, name, field):
+        return field in self.hashes.get(name, {})
+
+
+@pytest.fixture
+def fake_client():
+    return FakeS3Client()
+
+
+@pytest.fixture
+def storage(fake_client):
+    service = S3FileStorageService("test-bucket", region="us-east-1")
+    with patch.object(service, "_get_client", AsyncMock(return_value=fake_client)), \
+            patch(f"{MODULE}.settings.S3_MULTIPART_PART_SIZE_BYTES", 5 * MiB), \
+            patch(f"{MODULE}.settings.S3_MULTIPART_THRESHOLD_BYTES", 12 * MiB), \
+            patch(f"{MODULE}.settings.S3_MULTIPART_CONCURRENCY", 4):
+        yield service
+
+
+async def stream_of(data, chunk_size):
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+class TestS3FileStorageService:
+    """Test non-blocking uploads, bucket check caching and multipart streaming"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_uploads_overlap(self, storage, fake_client):
+        uploads = 20
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            storage.store_file(b"audio", f"canned-phrases/restaurant-1/phrase_{n}.mp3", "audio/mpeg")
+            for n in range(uploads)
+        ))
+        elapsed = time.perf_counter() - start
+
+        assert all(result.is_success for result in results)
+        assert len(fake_client.objects) == uploads
+        # Serialized uploads would take uploads * latency
+        assert fake_client.peak == uploads
+        assert elapsed < uploads * fake_client.latency / 4
+
+    @pytest.mark.asyncio
+    async def test_bucket_is_checked_once(self, storage, fake_client):
+        for n in range(3):
+            await storage.store_file(b"data", f"files/{n}.bin", "application/octet-stream")
+
+        assert fake_client.calls.count("head_bucket") == 1
+
+    @pytest.mark.asyncio
+    async def test_store_stream_uploads_parts_in_order(self, storage, fake_client):
+        data = bytes(range(256)) * (13 * MiB // 256)
+
+        result = await storage.store_stream(stream_of(data, 64 * 1024), "audio/streamed/reply.mp3", "audio/mpeg")
+
+        assert result.is_success
+        assert result.data["size"] == len(data)
+        assert fake_client.objects["audio/streamed/reply.mp3"] == data
+        assert fake_client.calls.count("upload_part") == 3
+        assert "put_object" not in fake_client.calls
+
+    @pytest.mark.asyncio
+    async def test_small_stream_uses_single_put(self, storage, fake_client):
+        result = await storage.store_stream(stream_of(b"x" * 1000, 100), "audio/streamed/short.mp3", "audio/mpeg")
+
+        assert result.is_success
+        assert fake_client.objects["audio/streamed/short.mp3"] == b"x" * 1000
+        assert "create_multipart_upload" not in fake_client.calls
+
+    @pytest.mark.asyncio
+    async def test_large_file_goes_multipart(self, storage, fake_client):
+        data = b"a" * (12 * MiB)
+
+        result = await storage.store_file(data, "audio/large.wav", "audio/wav")
+
+        assert result.is_success
+        assert fake_client.objects["audio/large.wav"] == data
+        assert fake_client.calls.count("upload_part") == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_part_aborts_upload(self, storage, fake_client):
+        fake_client.fail_part = 2
+
+        result = await storage.store_stream(stream_of(b"b" * (11 * MiB), MiB), "audio/broken.mp3", "audio/mpeg")
+
+        assert result.is_error
+        assert "abort_multipart_upload" in fake_client.calls
+        assert "complete_multipart_upload" not in fake_client.calls
+        assert fake_client.uploads == {}
+
+    @pytest.mark.asyncio
+    async def test_file_exists(self, storage, fake_client):
+        fake_client.objects["canned-phrases/restaurant-1/greeting.mp3"] = b"audio"
+
+        assert await storage.file_exists("canned-phrases/restaurant-1/greeting.mp3") is True
+        assert await storage.file_exists("canned-phrases/restaurant-1/missing.mp3") is False
+
+
+@pytest.fixture
+def indexed_storage(fake_client):
+    redis_service = Mock(connected=True, redis_client=FakeRedisHashes())
+    service = S3FileStorageService("test-bucket", region="us-east-1", redis_service=redis_service)
+    with patch.object(service, "_get_client", AsyncMock(return_value=fake_client)):
+        yield service
+
+
+class TestS3FileKeyIndex:
+    """Test keyed reads/deletes through the file_id -> key index"""
+
+    @pytest.mark.asyncio
+    async def test_get_and_delete_skip_listing(self, indexed_storage, fake_client):
+        stored = await indexed_storage.store_file(b"audio", "greeting.mp3", "audio/mpeg", restaurant_id=1, order_id=7)
+        file_id = stored.data["file_id"]
+
+        fetched = await indexed_storage.get_file(file_id)
+        deleted = await indexed_storage.delete_file(file_id)
+
+        assert fetched.is_success and fetched.data["file_data"] == b"audio"
+        assert fetched.data["s3_key"] == stored.data["s3_key"]
+        assert deleted.is_success
+        assert "list_objects_v2" not in fake_client.calls
+        assert await indexed_storage.key_index.lookup(file_id) == (None, False)
+
+    @pytest.mark.asyncio
+    async def test_unindexed_file_is_listed_once_then_indexed(self, indexed_storage, fake_client):
+        fake_client.objects["files/legacy-id.mp3"] = b"old"
+
+        assert (await indexed_storage.get_file("legacy-id")).is_success
+        assert (await indexed_storage.get_file("legacy-id")).is_success
+        assert fake_client.calls.count("list_objects_v2") == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_marks_index_complete(self, indexed_storage, fake_client):
+        fake_client.objects["files/abc.mp3"] = b"1"
+        fake_client.objects["restaurants/1/audio/hello.mp3"] = b"2"
+        fake_client.metadata["restaurants/1/audio/hello.mp3"] = {"file_id": "def"}
+        fake_client.objects["restaurants/1/images/logo.png"] = b"3"
+
+        stats = await indexed_storage.backfill_key_index()
+
+        assert stats == {"scanned": 3, "indexed": 2, "skipped": 1}
+        assert await indexed_storage.key_index.count() == 2
+        assert await indexed_storage.key_index.lookup("def") == ("restaurants/1/audio/hello.mp3", True)
+
+        # Misses are authoritative once the index is complete
+        fake_client.calls.clear()
+        assert (await indexed_storage.get_file("missing")).is_error
+        assert "list_objects_v2" not in fake_client.calls
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_dropped(self, indexed_storage, fake_client):
+        await indexed_storage.key_index.put("gone", "files/gone.mp3")
+
+        result = await indexed_storage.get_file("gone")
+
+        assert result.is_error and result.message == "File not found"
+        assert await indexed_storage.key_index.lookup("gone") == (None, False)
+
+    @pytest.mark.asyncio
+    async def test_file_stored_while_index_unwritable_stays_reachable(self, indexed_storage, fake_client):
+        await indexed_storage.backfill_key_index()
+        redis_client = indexed_storage.key_index.redis.redis_client
+        hset = redis_client.hset
+        redis_client.hset = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        stored = await indexed_storage.store_file(b"audio", "greeting.mp3", "audio/mpeg", restaurant_id=1, order_id=7)
+        file_id = stored.data["file_id"]
+
+        assert stored.is_success
+        # Misses list again, and this process still knows the unlisted restaurants/ key
+        assert await indexed_storage.key_index.lookup("missing") == (None, False)
+        assert (await indexed_storage.get_file(file_id)).data["file_data"] == b"audio"
+
+        redis_client.hset = hset
+        await indexed_storage.store_file(b"logo", "logo.png", "image/png", restaurant_id=1)
+
+        assert indexed_storage._unindexed == {}
+        assert (await indexed_storage.key_index.lookup(file_id))[0] == stored.data["s3_key"]
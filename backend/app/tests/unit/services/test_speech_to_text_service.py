@@ -0,0 +1,107 @@
+"""
+Unit tests for SpeechToTextService async transcription engine
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.models.language import Language
+from app.services.speech_to_text_service import SpeechToTextService
+from app.services.stt_provider import STTProvider, MockSTTProvider
+
+
+class HangingSTTProvider(STTProvider):
+    """Provider that never returns, to exercise timeouts and cancellation"""
+
+    def __init__(self):
+        self.cancelled = 0
+
+    async def transcribe(self, audio_data, file_name, language_code, prompt=None):
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+class TestSpeechToTextService:
+    """Test SpeechToTextService with local stand-in providers"""
+
+    @pytest.mark.asyncio
+    async def test_transcribe_audio_success(self):
+        """Transcript from the provider is returned in the OrderResult"""
+        provider = MockSTTProvider(transcript="  two cheeseburgers  ", latency=0)
+        service = SpeechToTextService(provider=provider)
+
+        result = await service.transcribe_audio(b"audio", "webm", Language.ENGLISH)
+
+        assert result.is_success
+        assert result.data["transcript"] == "two cheeseburgers"
+        assert provider.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_transcribe_audio_timeout_is_retried_then_fails(self):
+        """Each attempt is bounded by the per-call timeout"""
+        provider = HangingSTTProvider()
+        service = SpeechToTextService(provider=provider, timeout=0.01)
+        service.retry_delay = 0
+
+        result = await service.transcribe_audio(b"audio", "webm")
+
+        assert not result.is_success
+        assert "after 3 attempts" in result.message
+        stats = service.get_stats()
+        assert stats["timeouts"] == 3
+        assert stats["retries"] == 2
+        assert stats["in_flight"] == 0
+        assert provider.cancelled == 3
+
+    @pytest.mark.asyncio
+    async def test_cancellation_propagates_to_provider(self):
+        """Cancelling the caller cancels the in-flight provider call"""
+        provider = HangingSTTProvider()
+        service = SpeechToTextService(provider=provider, timeout=60)
+
+        task = asyncio.create_task(service.transcribe_audio(b"audio", "webm"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert provider.cancelled == 1
+        assert service.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_is_enforced(self):
+        """No more than max_concurrency provider calls run at once"""
+        peak = 0
+
+        class CountingProvider(MockSTTProvider):
+            async def transcribe(inner, *args, **kwargs):
+                nonlocal peak
+                peak = max(peak, service.get_stats()["in_flight"])
+                return await super().transcribe(*args, **kwargs)
+
+        service = SpeechToTextService(provider=CountingProvider(latency=0.02), max_concurrency=2)
+
+        results = await asyncio.gather(*(service.transcribe_audio(b"audio") for _ in range(6)))
+
+        assert all(r.is_success for r in results)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lanes_scale_linearly(self):
+        """N lanes transcribing at once take about one provider latency, not N"""
+        latency = 0.1
+        lanes = 20
+        service = SpeechToTextService(provider=MockSTTProvider(latency=latency), max_concurrency=lanes)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(service.transcribe_audio(b"audio") for _ in range(lanes)))
+        elapsed = time.perf_counter() - start
+
+        assert all(r.is_success for r in results)
+        # Serial execution would take lanes * latency (2s)
+        assert elapsed < latency * 3
@@ -70,7 +70,7 @@ class TestCustomizationValidationService:
         mock_menu_ingredient = Mock()
         mock_menu_ingredient.ingredient = mock_ingredient
         
-        mock_uow.menu_item_ingredients.get_by_menu_item.return_value = [mock_menu_ingredient]
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: [mock_menu_ingredient]}
         
         # Act
         result = await validation_service.validate_remove_ingredient(
@@ -92,7 +92,7 @@ class TestCustomizationValidationService:
         restaurant_id = 1
         
         # Mock ingredient does NOT exist in menu item
-        mock_uow.menu_item_ingredients.get_by_menu_item.return_value = []
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: []}
         mock_uow.menu_items.get_by_id.return_value = mock_menu_item
         
         # Act
@@ -119,8 +119,8 @@ class TestCustomizationValidationService:
         # Mock ingredient exists in restaurant and is free
         mock_ingredient.name = "Mustard"
         mock_ingredient.unit_cost = 0.0
-        mock_uow.ingredients.get_by_name_and_restaurant.return_value = mock_ingredient
-        mock_uow.menu_item_ingredients.get_by_menu_item.return_value = []
+        mock_uow.ingredients.get_by_names_and_restaurant.return_value = {ingredient_name: mock_ingredient}
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: []}
         
         # Act
         result = await validation_service.validate_add_ingredient(
@@ -146,8 +146,8 @@ class TestCustomizationValidationService:
         mock_ingredient = Mock()
         mock_ingredient.name = "Bacon"
         mock_ingredient.unit_cost = 1.50
-        mock_uow.ingredients.get_by_name_and_restaurant.return_value = mock_ingredient
-        mock_uow.menu_item_ingredients.get_by_menu_item.return_value = []
+        mock_uow.ingredients.get_by_names_and_restaurant.return_value = {ingredient_name: mock_ingredient}
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: []}
         
         # Act
         result = await validation_service.validate_add_ingredient(
@@ -170,7 +170,8 @@ class TestCustomizationValidationService:
         restaurant_id = 1
         
         # Mock ingredient does NOT exist in restaurant
-        mock_uow.ingredients.get_by_name_and_restaurant.return_value = None
+        mock_uow.ingredients.get_by_names_and_restaurant.return_value = {}
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: []}
         
         # Act
         result = await validation_service.validate_add_ingredient(
@@ -200,7 +201,8 @@ class TestCustomizationValidationService:
         mock_menu_ingredient.ingredient = mock_ingredient
         mock_menu_ingredient.additional_cost = 0.75
         
-        mock_uow.menu_item_ingredients.get_by_menu_item.return_value = [mock_menu_ingredient]
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: [mock_menu_ingredient]}
+        mock_uow.ingredients.get_by_names_and_restaurant.return_value = {ingredient_name: mock_ingredient}
         
         # Act
         cost = await validation_service.calculate_extra_cost(
@@ -221,8 +223,8 @@ class TestCustomizationValidationService:
         # Mock ingredient exists but not in menu item
         mock_ingredient = Mock()
         mock_ingredient.unit_cost = 2.00
-        mock_uow.ingredients.get_by_name_and_restaurant.return_value = mock_ingredient
-        mock_uow.menu_item_ingredients.get_by_menu_item.return_value = []
+        mock_uow.ingredients.get_by_names_and_restaurant.return_value = {ingredient_name: mock_ingredient}
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: []}
         
         # Act
         cost = await validation_service.calculate_extra_cost(
@@ -256,11 +258,8 @@ class TestCustomizationValidationService:
         mock_menu_ingredient_onion = Mock()
         mock_menu_ingredient_onion.ingredient = onion_ingredient
         
-        mock_uow.menu_item_ingredients.get_by_menu_item.return_value = [mock_menu_ingredient_onion]
-        mock_uow.ingredients.get_by_name_and_restaurant.side_effect = lambda name, rid: {
-            "mustard": mustard_ingredient,
-            "foie gras": None
-        }.get(name.lower())
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: [mock_menu_ingredient_onion]}
+        mock_uow.ingredients.get_by_names_and_restaurant.return_value = {"mustard": mustard_ingredient}
         
         # Act
         results = await validation_service.validate_customizations(
@@ -289,6 +288,12 @@ class TestCustomizationValidationService:
         customizations = ["well done", "extra crispy"]
         restaurant_id = 1
         
+        # "extra crispy" is read as adding an ingredient named "crispy"
+        crispy = Mock()
+        crispy.unit_cost = 0.0
+        mock_uow.menu_item_ingredients.get_by_menu_items_with_inventory.return_value = {menu_item_id: []}
+        mock_uow.ingredients.get_by_names_and_restaurant.return_value = {"crispy": crispy}
+        
         # Act
         results = await validation_service.validate_customizations(
             menu_item_id, customizations, restaurant_id, mock_uow
@@ -4,8 +4,9 @@ Unit tests for RedisService
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, call, patch
 from app.services.redis_service import RedisService
+from app.services.redis_order_store import OrderMutationResult
 
 
 class TestRedisService:
@@ -94,27 +95,34 @@ class TestRedisService:
     
     @pytest.mark.asyncio
     async def test_order_operations(self, redis_service):
-        """Test order-specific operations"""
+        """Test order-specific operations delegate to the order store"""
         # Mock connected Redis client
         mock_client = AsyncMock()
         redis_service.redis_client = mock_client
         redis_service.connected = True
         
         # Test get_order
-        order_data = {"id": "order_123", "status": "pending"}
-        mock_client.get = AsyncMock(return_value='{"id": "order_123", "status": "pending"}')
+        order_data = {"id": "order_123", "status": "pending", "items": [], "version": 1}
+        redis_service.orders.read = AsyncMock(return_value=OrderMutationResult(status="OK", order=order_data, version=1))
         result = await redis_service.get_order("order_123")
         assert result == order_data
         
+        redis_service.orders.read = AsyncMock(return_value=OrderMutationResult(status="NOT_FOUND"))
+        assert await redis_service.get_order("order_456") is None
+        
         # Test set_order
-        mock_client.setex = AsyncMock(return_value=True)
+        redis_service.orders.create = AsyncMock(return_value=OrderMutationResult(status="OK", order=order_data, version=1))
         result = await redis_service.set_order("order_123", order_data, 1800)
         assert result is True
+        redis_service.orders.create.assert_awaited_once_with("order_123", order_data, 1800)
         
-        # Test delete_order
-        mock_client.delete = AsyncMock(return_value=1)
+        # Test delete_order removes the header, items, lines and sequence keys together
+        mock_client.delete = AsyncMock(return_value=4)
         result = await redis_service.delete_order("order_123")
         assert result is True
+        mock_client.delete.assert_awaited_once_with(
+            "order:order_123", "order:order_123:items", "order:order_123:lines", "order:order_123:seq"
+        )
     
     @pytest.mark.asyncio
     async def test_disconnect(self, redis_service):
@@ -141,3 +149,42 @@ class TestRedisService:
         assert await redis_service.get_current_order("lane_1") is None
         assert await redis_service.set_current_order("lane_1", "order_123") is False
         assert await redis_service.clear_lane("lane_1") is False
+        assert await redis_service.mget(["a", "b"]) == [None, None]
+        assert await redis_service.set_many({"a": "1"}) is False
+        assert await redis_service.delete_many(["a"]) == 0
+        with pytest.raises(ConnectionError):
+            redis_service.pipeline()
+    
+    @pytest.mark.asyncio
+    async def test_is_connected_does_not_ping(self, redis_service):
+        """Connected checks rely on pool health checks instead of a PING per call"""
+        mock_client = AsyncMock()
+        redis_service.redis_client = mock_client
+        redis_service.connected = True
+        
+        assert await redis_service.is_connected() is True
+        assert await redis_service.ensure_connection() is True
+        mock_client.ping.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_batched_operations(self, redis_service):
+        """Test multi-key operations go out in one command or pipeline"""
+        mock_client = Mock()
+        pipe = Mock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        mock_client.pipeline.return_value = pipe
+        mock_client.mget = AsyncMock(return_value=["1", None])
+        mock_client.delete = AsyncMock(return_value=2)
+        redis_service.redis_client = mock_client
+        redis_service.connected = True
+        
+        assert await redis_service.mget(["a", "b"]) == ["1", None]
+        mock_client.mget.assert_awaited_once_with(["a", "b"])
+        
+        assert await redis_service.set_many({"a": "1", "b": "2"}, ttl=60) is True
+        mock_client.pipeline.assert_called_once_with(transaction=True)
+        assert pipe.setex.call_args_list == [call("a", 60, "1"), call("b", 60, "2")]
+        pipe.execute.assert_awaited_once()
+        
+        assert await redis_service.delete_many(["a", "b"]) == 2
+        mock_client.delete.assert_awaited_once_with("a", "b")
@@ -0,0 +1,105 @@
+"""
+Unit tests and time-to-first-byte benchmark for streaming TTS in VoiceService
+"""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.voice_service import VoiceService
+from app.services.text_to_speech_service import TextToSpeechService
+from app.services.tts_provider import MockTTSProvider
+from app.tests.helpers.mock_services import MockFileStorageService
+
+MODULE = "app.services.voice_service"
+CHUNKS = 10
+CHUNK_DELAY = 0.03
+UPLOAD_LATENCY = 0.1
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=1800):
+        self.values[key] = value
+        return True
+
+
+@pytest.fixture
+def storage():
+    return MockFileStorageService(upload_delay=UPLOAD_LATENCY)
+
+
+@pytest.fixture
+def voice_service(storage):
+    return VoiceService(
+        text_to_speech_service=TextToSpeechService(MockTTSProvider(chunk_count=CHUNKS, chunk_delay=CHUNK_DELAY)),
+        speech_to_text_service=AsyncMock(),
+        file_storage_service=storage,
+        redis_service=FakeRedis()
+    )
+
+
+class TestVoiceStreaming:
+    """Streaming mode forwards provider bytes and caches them in the background"""
+
+    @pytest.mark.asyncio
+    async def test_time_to_first_byte_vs_url_flow(self, voice_service):
+        # URL flow: the client can't start fetching audio until synthesis and upload finish
+        start = time.perf_counter()
+        url = await voice_service.generate_voice("Your total is five dollars", restaurant_id=1)
+        url_ttfb = time.perf_counter() - start
+        assert url
+
+        start = time.perf_counter()
+        stream = voice_service.stream_voice("Would you like fries with that?", restaurant_id=1)
+        await stream.__anext__()
+        stream_ttfb = time.perf_counter() - start
+        async for _ in stream:
+            pass
+        await voice_service.wait_for_background_tasks()
+
+        print(f"\nTime to first audio byte: URL flow {url_ttfb * 1000:.0f}ms (before the client's GET), "
+              f"streaming {stream_ttfb * 1000:.0f}ms")
+        assert url_ttfb >= CHUNKS * CHUNK_DELAY + UPLOAD_LATENCY
+        assert stream_ttfb < url_ttfb / 5
+
+    @pytest.mark.asyncio
+    async def test_stream_is_teed_into_cache(self, voice_service, storage):
+        streamed = b"".join([chunk async for chunk in voice_service.stream_voice("Anything else?", restaurant_id=1)])
+        await voice_service.wait_for_background_tasks()
+
+        assert len(streamed) == CHUNKS * 1024
+        assert list(storage.objects.values()) == [streamed]
+
+        cached_url = await voice_service.get_cached_voice_url("Anything else?", restaurant_id=1)
+        assert cached_url.endswith(".mp3") and cached_url.startswith("https://bucket")
+        # The URL flow now hits the cache instead of synthesizing again
+        assert await voice_service.generate_voice("Anything else?", restaurant_id=1) == cached_url
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_is_not_cached(self, voice_service, storage):
+        stream = voice_service.stream_voice("Pull up to the window", restaurant_id=1)
+        await stream.__anext__()
+        await stream.aclose()
+        await voice_service.wait_for_background_tasks()
+
+        assert storage.objects == {}
+        assert await voice_service.get_cached_voice_url("Pull up to the window", restaurant_id=1) is None
+
+    @pytest.mark.asyncio
+    async def test_streaming_mode_returns_stream_url(self, voice_service):
+        with patch(f"{MODULE}.settings.TTS_STREAMING_ENABLED", True):
+            start = time.perf_counter()
+            url = await voice_service._generate_tts("I added a burger", restaurant_id=1)
+            elapsed = time.perf_counter() - start
+
+        assert url.startswith("/api/ai/tts/stream/")
+        assert elapsed < CHUNK_DELAY  # nothing is synthesized until the URL is played
+        request = await voice_service.get_voice_stream_request(url.rsplit("/", 1)[1])
+        assert request["text"] == "I added a burger" and request["restaurant_id"] == 1
@@ -0,0 +1,136 @@
+"""
+Unit tests for the two-tier voice URL cache and synthesis single-flight in VoiceService
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.voice_service import VoiceService
+from app.services.text_to_speech_service import TextToSpeechService
+from app.services.tts_provider import MockTTSProvider
+from app.tests.helpers.mock_services import MockFileStorageService
+
+MODULE = "app.services.voice_service"
+PHRASE = "Sorry, we don't have that"
+
+
+class CountingTTSProvider(MockTTSProvider):
+    def __init__(self):
+        super().__init__(chunk_count=3, chunk_delay=0.02)
+        self.calls = 0
+
+    async def generate_audio_stream(self, text, voice="nova"):
+        self.calls += 1
+        async for chunk in super().generate_audio_stream(text, voice):
+            yield chunk
+
+
+class FakeRedisClient:
+    """Shared store standing in for one Redis used by several app instances"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+
+class FakeRedisService:
+    def __init__(self, client):
+        self.connected = True
+        self.redis_client = client
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.redis_client.values.get(key)
+
+    async def set(self, key, value, ttl=1800):
+        self.redis_client.values[key] = value
+        return True
+
+
+def make_voice_service(redis_client=None, tts_provider=None, storage=None):
+    return VoiceService(
+        text_to_speech_service=TextToSpeechService(tts_provider or CountingTTSProvider()),
+        speech_to_text_service=AsyncMock(),
+        file_storage_service=storage or MockFileStorageService(upload_delay=0.05),
+        redis_service=FakeRedisService(redis_client or FakeRedisClient())
+    )
+
+
+class TestVoiceUrlCache:
+    """Concurrent misses share one synthesis; hits skip Redis once warm"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_synthesis(self):
+        provider, storage = CountingTTSProvider(), MockFileStorageService(upload_delay=0.05)
+        voice_service = make_voice_service(tts_provider=provider, storage=storage)
+
+        urls = await asyncio.gather(*(voice_service.generate_voice(PHRASE, restaurant_id=1) for _ in range(20)))
+
+        assert len(set(urls)) == 1 and urls[0]
+        assert provider.calls == 1 and storage.calls.count("store_file") == 1
+        stats = voice_service.get_cache_stats()
+        assert stats["coalesced"] == 19
+        assert stats["synthesized"] == 1
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_memory_hit_skips_redis(self):
+        voice_service = make_voice_service()
+        url = await voice_service.generate_voice(PHRASE, restaurant_id=1)
+        redis_gets = voice_service.redis_service.gets
+
+        assert await voice_service.generate_voice(PHRASE, restaurant_id=1) == url
+
+        assert voice_service.redis_service.gets == redis_gets
+        assert voice_service.get_cache_stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_fills_memory(self):
+        shared = FakeRedisClient()
+        first, second = make_voice_service(shared), make_voice_service(shared)
+        url = await first.generate_voice(PHRASE, restaurant_id=1)
+
+        assert await second.generate_voice(PHRASE, restaurant_id=1) == url
+        assert await second.generate_voice(PHRASE, restaurant_id=1) == url
+
+        stats = second.get_cache_stats()
+        assert (stats["redis_hits"], stats["memory_hits"], stats["synthesized"]) == (1, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_least_recently_used(self):
+        voice_service = make_voice_service()
+        with patch(f"{MODULE}.settings.VOICE_URL_CACHE_SIZE", 2):
+            for text in ("one", "two", "one", "three"):
+                await voice_service.generate_voice(text, restaurant_id=1)
+
+        cached = [key.rsplit(":", 1)[1] for key in voice_service._url_cache]
+        expected = [voice_service._generate_cache_key(text, None, None, 1) for text in ("one", "three")]
+        assert cached == expected
+
+    @pytest.mark.asyncio
+    async def test_instances_share_synthesis_through_redis_lock(self):
+        shared = FakeRedisClient()
+        provider = CountingTTSProvider()
+        instances = [make_voice_service(shared, tts_provider=provider) for _ in range(3)]
+
+        with patch(f"{MODULE}.settings.VOICE_SYNTHESIS_POLL_SECONDS", 0.01):
+            urls = await asyncio.gather(*(instance.generate_voice(PHRASE, restaurant_id=1) for instance in instances))
+
+        assert len(set(urls)) == 1 and urls[0]
+        assert provider.calls == 1
+        assert sum(instance.get_cache_stats()["remote_coalesced"] for instance in instances) == 2
+        assert not any(key.endswith(":lock") for key in shared.values)
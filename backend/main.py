@@ -16,7 +16,8 @@ load_dotenv()
 
 from app.core.container import Container
 from app.core.logging import setup_logging, get_logger
-from app.core.startup import startup_tasks
+from app.core.startup import startup_tasks, shutdown_tasks
+from app.core.readiness import readiness
 from app.api import restaurants, ai, sessions, admin
 
 # Set up logging
@@ -51,7 +52,7 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
     try:
-        await startup_tasks()
+        await startup_tasks(container)
         logger.info("Application startup completed successfully")
     except Exception as e:
         logger.error(f"Application startup failed: {e}")
@@ -62,7 +63,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down application...")
     try:
-        container.shutdown_resources()
+        await shutdown_tasks(container)
+        await container.shutdown_resources()
         logger.info("Application shutdown completed")
     except Exception as e:
         logger.error(f"Application shutdown failed: {e}")
@@ -102,9 +104,15 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (503 until startup warm-up is done, so load balancers hold traffic)"""
     logger.info("Health check endpoint accessed")
-    return {"status": "healthy", "service": "ai-drivethru-backend"}
+    status = readiness.status()
+    if not status["ready"]:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "service": "ai-drivethru-backend", "readiness": status}
+        )
+    return {"status": "healthy", "service": "ai-drivethru-backend", "readiness": status}
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Backfill the S3 file_id -> object key index in Redis
+Indexes objects stored before the index existed so get_file/delete_file
+can skip listing the bucket. Safe to re-run.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.redis_service import RedisService
+from app.services.file_storage_service import S3FileStorageService
+
+
+async def backfill(prefix: str, concurrency: int) -> bool:
+    """Index every object under prefix"""
+    redis_service = RedisService()
+    if not await redis_service.connect():
+        print(f"❌ Could not connect to Redis at {settings.REDIS_URL}")
+        return False
+
+    file_storage = S3FileStorageService(
+        bucket_name=settings.S3_BUCKET_NAME,
+        region=settings.S3_REGION,
+        endpoint_url=settings.AWS_ENDPOINT_URL,
+        redis_service=redis_service
+    )
+
+    try:
+        print(f"🔍 Scanning s3://{settings.S3_BUCKET_NAME}/{prefix} ...")
+        start = time.perf_counter()
+        stats = await file_storage.backfill_key_index(prefix=prefix, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+
+        print(f"✅ Scanned {stats['scanned']} objects in {elapsed:.1f}s")
+        print(f"   Indexed: {stats['indexed']}")
+        print(f"   Skipped (no file_id): {stats['skipped']}")
+        if prefix:
+            print("ℹ️  Partial scan - run without --prefix to mark the index complete")
+        else:
+            print("✅ Index marked complete - lookups no longer fall back to listing")
+        return True
+    except Exception as e:
+        print(f"❌ Backfill failed: {e}")
+        return False
+    finally:
+        await file_storage.close()
+        await redis_service.disconnect()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Backfill the S3 file_id -> key index in Redis")
+    parser.add_argument(
+        "--prefix",
+        default="",
+        help="Only index keys under this prefix (e.g. restaurants/1/)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Max concurrent HEAD requests for keys without the file ID in their name"
+    )
+    args = parser.parse_args()
+
+    ok = asyncio.run(backfill(args.prefix, args.concurrency))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Bulk canned audio generation for many restaurants
+Generates every missing canned phrase with bounded TTS/upload concurrency.
+Restaurant-independent phrases are synthesized once for the whole run, and
+menu item names are rendered as fragments for spliced responses.
+Safe to re-run; use --resume JOB_ID to pick up an interrupted job.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.models.restaurant import Restaurant
+from app.models.menu_item import MenuItem
+from app.services.redis_service import RedisService
+from app.services.file_storage_service import S3FileStorageService
+from app.services.canned_audio_generator import CannedAudioGenerator
+from app.services.canned_phrase_table import CannedPhraseTable
+from app.services.response_audio_composer import ResponseAudioComposer
+from app.services.text_to_speech_service import TextToSpeechService
+from app.services.tts_provider import OpenAITTSProvider
+
+
+async def load_restaurants(restaurant_ids):
+    """(id, name, menu item names) for the given restaurants, or every active restaurant"""
+    query = select(Restaurant.id, Restaurant.name).order_by(Restaurant.id)
+    if restaurant_ids:
+        query = query.where(Restaurant.id.in_(restaurant_ids))
+    else:
+        query = query.where(Restaurant.is_active.is_(True))
+
+    async with get_async_session() as db:
+        rows = (await db.execute(query)).all()
+        menu_items = await db.execute(
+            select(MenuItem.restaurant_id, MenuItem.name).where(MenuItem.restaurant_id.in_([row.id for row in rows]))
+        )
+        names = {row.id: [] for row in rows}
+        for restaurant_id, name in menu_items.all():
+            names[restaurant_id].append(name)
+        return [(row.id, row.name, names[row.id]) for row in rows]
+
+
+def print_progress(job):
+    """Print one line per finished restaurant"""
+    print(f"   [{job['restaurants_done']}/{job['total_restaurants']}] "
+          f"generated {job['generated']}, already present {job['skipped']}, failed {job['failed']}")
+
+
+async def generate(args) -> bool:
+    """Run (or resume) a bulk generation job"""
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+    if not openai_api_key:
+        print("❌ OPENAI_API_KEY not found")
+        return False
+
+    redis_service = RedisService()
+    if not await redis_service.connect():
+        # Still works, but progress can't be resumed by job ID
+        print(f"⚠️  Could not connect to Redis at {settings.REDIS_URL} - job progress won't be saved")
+        redis_service = None
+
+    file_storage = S3FileStorageService(
+        bucket_name=settings.S3_BUCKET_NAME,
+        region=settings.S3_REGION,
+        endpoint_url=settings.AWS_ENDPOINT_URL
+    )
+    tts_service = TextToSpeechService(OpenAITTSProvider(openai_api_key))
+    canned_audio = CannedAudioGenerator(
+        tts_service,
+        file_storage,
+        CannedPhraseTable(file_storage),
+        redis_service,
+        tts_concurrency=args.tts_concurrency,
+        upload_concurrency=args.upload_concurrency,
+        restaurant_concurrency=args.restaurant_concurrency,
+        fragments=ResponseAudioComposer(tts_service, file_storage)
+    )
+
+    try:
+        if args.resume:
+            job = await canned_audio.get_job(args.resume)
+            if not job:
+                print(f"❌ Job {args.resume} not found")
+                return False
+            restaurants = [tuple(restaurant) for restaurant in job["restaurants"]]
+        else:
+            restaurants = await load_restaurants(args.restaurant_id)
+        if not restaurants:
+            print("❌ No matching restaurants")
+            return False
+
+        print(f"🎵 Generating canned audio for {len(restaurants)} restaurants...")
+        start = time.perf_counter()
+        job = await canned_audio.generate(restaurants, job_id=args.resume, on_progress=print_progress)
+        elapsed = time.perf_counter() - start
+
+        print(f"✅ Job {job['job_id']} {job['status']} in {elapsed:.1f}s")
+        print(f"   Generated: {job['generated']}")
+        print(f"   Already present: {job['skipped']}")
+        print(f"   Shared phrases synthesized once: {job['shared_phrases_synthesized']}")
+        print(f"   Response fragments rendered: {job['fragments_rendered']}")
+        if job["failed"]:
+            print(f"❌ Failed: {job['failed']}")
+            for error in job["errors"]:
+                print(f"   - {error}")
+            print(f"ℹ️  Re-run with --resume {job['job_id']} to retry")
+        return job["status"] == "completed"
+    except Exception as e:
+        print(f"❌ Generation failed: {e}")
+        return False
+    finally:
+        await file_storage.close()
+        if redis_service:
+            await redis_service.disconnect()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Generate canned audio for many restaurants")
+    parser.add_argument(
+        "--restaurant-id",
+        type=int,
+        action="append",
+        help="Restaurant to generate for (repeatable; default: all active restaurants)"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="JOB_ID",
+        help="Resume an interrupted job"
+    )
+    parser.add_argument(
+        "--tts-concurrency",
+        type=int,
+        default=settings.CANNED_AUDIO_TTS_CONCURRENCY,
+        help="Max concurrent TTS requests"
+    )
+    parser.add_argument(
+        "--upload-concurrency",
+        type=int,
+        default=settings.CANNED_AUDIO_UPLOAD_CONCURRENCY,
+        help="Max concurrent uploads"
+    )
+    parser.add_argument(
+        "--restaurant-concurrency",
+        type=int,
+        default=settings.CANNED_AUDIO_RESTAURANT_CONCURRENCY,
+        help="Max restaurants in progress at once"
+    )
+    args = parser.parse_args()
+
+    ok = asyncio.run(generate(args))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,9 @@ from app.core.database import get_async_session
 from app.services.excel_import_service import ExcelImportService
 from app.services.restaurant_import_service import RestaurantImportService
 from app.services.file_storage_service import S3FileStorageService
-from app.services.canned_audio_service import CannedAudioService
-from app.services.tts_service import TTSService
+from app.services.canned_audio_generator import CannedAudioGenerator
+from app.services.canned_phrase_table import CannedPhraseTable
+from app.services.text_to_speech_service import TextToSpeechService
 from app.services.tts_provider import OpenAITTSProvider
 from app.constants.audio_phrases import AudioPhraseConstants
 
@@ -166,6 +167,7 @@ async def import_restaurant_data(
                 if generate_audio:
                     print("🎵 Generating canned audio phrases...")
                     audio_result = await generate_canned_audio(
+                        restaurant_id=restaurant_id,
                         restaurant_slug=restaurant_slug,
                         restaurant_name=restaurant_name,
                         db=db,
@@ -336,11 +338,14 @@ def generate_restaurant_suggestions(restaurant_data: dict) -> dict:
     return suggestions
 
 
-async def generate_canned_audio(restaurant_slug: str, restaurant_name: str, db, restaurant_data: dict = None) -> Optional[Dict]:
+async def generate_canned_audio(restaurant_id: int, restaurant_slug: str, restaurant_name: str, db, restaurant_data: dict = None) -> Optional[Dict]:
     """
     Generate canned audio phrases for a restaurant
     
+    Phrases already in storage are skipped, so re-running after a failure only generates what's missing.
+    
     Args:
+        restaurant_id: Restaurant ID (audio is stored under restaurants/{id}/audio/)
         restaurant_slug: Restaurant slug for file naming
         restaurant_name: Restaurant name for customization
         db: Database session
@@ -362,9 +367,8 @@ async def generate_canned_audio(restaurant_slug: str, restaurant_name: str, db,
         endpoint_url = os.getenv('AWS_ENDPOINT_URL')
         
         file_storage = S3FileStorageService(bucket_name, region, endpoint_url)
-        tts_provider = OpenAITTSProvider(openai_api_key)
-        tts_service = TTSService(tts_provider)
-        canned_audio_service = CannedAudioService(file_storage, tts_service)
+        tts_service = TextToSpeechService(OpenAITTSProvider(openai_api_key))
+        canned_audio = CannedAudioGenerator(tts_service, file_storage, CannedPhraseTable(file_storage))
         
         print(f"   🎤 Generating audio for restaurant: {restaurant_name}")
         print(f"   📁 Restaurant slug: {restaurant_slug}")
@@ -379,14 +383,16 @@ async def generate_canned_audio(restaurant_slug: str, restaurant_name: str, db,
         else:
             print("   ⚠️  No restaurant data provided for suggestions")
         
-        # Generate all canned audio phrases
-        results = await canned_audio_service.generate_all_canned_audio(
-            restaurant_slug=restaurant_slug,
-            restaurant_name=restaurant_name
-        )
+        # Generate all canned audio phrases (concurrently, skipping ones already stored)
+        try:
+            outcome = await canned_audio.generate_restaurant(restaurant_id, restaurant_name)
+        finally:
+            await file_storage.close()
+        results = outcome["urls"]
         
-        generated_count = len(results)
+        generated_count = outcome["generated"]
         errors = []
+        print(f"   ⏭️  {outcome['skipped']} phrases already present")
         
         # Report results
         for phrase_type, url in results.items():
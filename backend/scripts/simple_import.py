@@ -214,6 +214,8 @@ class RestaurantImporter:
                     print(f"  ✅ Uploaded {image_file}")
                 else:
                     print(f"  ❌ Failed to upload {image_file}: {result.message}")
+        
+        await file_storage.close()
 
 
 async def main():